@@ -24,6 +24,7 @@ Date: September 2025
 from .data_loader import DataLoader
 from .strategy_engine import ICTStrategyEngine  
 from .performance_analyzer import PerformanceAnalyzer
+from .backtest_runner import BacktestRunner
 
 __version__ = "1.0.0"
-__all__ = ["DataLoader", "ICTStrategyEngine", "PerformanceAnalyzer"]
+__all__ = ["DataLoader", "ICTStrategyEngine", "PerformanceAnalyzer", "BacktestRunner"]
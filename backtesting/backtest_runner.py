@@ -11,24 +11,135 @@ Features:
 - Walk-forward analysis
 - Out-of-sample testing
 - Comprehensive reporting
+- Process-pool execution of symbols/windows (data loaded once per symbol)
 
 Author: GitHub Copilot Trading Algorithm
 Date: September 2025
 """
 
 import os
+import time
 import logging
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import json
 
 from .data_loader import DataLoader
-from .strategy_engine import StrategyEngine
+from .strategy_engine import ICTStrategyEngine
 from .performance_analyzer import PerformanceAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Per-process strategy components, built once by the pool initializer
+_worker_components: Dict = {}
+
+
+def _init_backtest_worker(config_path: str) -> None:
+    """Process-pool initializer: build the strategy engine once per worker."""
+    _worker_components['strategy_engine'] = ICTStrategyEngine(config_path)
+    _worker_components['performance_analyzer'] = PerformanceAnalyzer()
+
+
+def _backtest_price_data(strategy_engine: ICTStrategyEngine, performance_analyzer: PerformanceAnalyzer,
+                         symbol: str, timeframe: str, start_date: str, end_date: str,
+                         price_data: pd.DataFrame, data_quality: Dict,
+                         random_seed: Optional[int] = None) -> Tuple[Dict, object]:
+    """
+    Simulate, backtest and analyze one symbol/period on already loaded data.
+
+    Shared by the in-process path and the pool workers.
+
+    Returns:
+        Tuple of (comprehensive results dict, PerformanceMetrics or None if no signals)
+    """
+    signals = strategy_engine.simulate_ict_strategy(symbol, price_data, random_seed=random_seed)
+    
+    if not signals:
+        logger.warning(f"No signals generated for {symbol}")
+        return BacktestRunner._empty_backtest_result(symbol, timeframe, start_date, end_date), None
+    
+    backtest_results = strategy_engine.backtest_ict_signals(signals, price_data)
+    
+    if backtest_results['trades']:
+        performance_metrics = performance_analyzer.analyze_trades(backtest_results['trades'])
+    else:
+        performance_metrics = performance_analyzer._empty_metrics()
+    
+    comprehensive_results = {
+        'backtest_info': {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'start_date': start_date,
+            'end_date': end_date,
+            'data_points': len(price_data),
+            'data_quality': data_quality,
+            'random_seed': strategy_engine.last_simulation_seed,
+            'backtest_timestamp': datetime.now().isoformat()
+        },
+        'signals': {
+            'total_signals': len(signals),
+            'buy_signals': len([s for s in signals if s.action == 'BUY']),
+            'sell_signals': len([s for s in signals if s.action == 'SELL']),
+            'average_confidence': sum(s.confidence for s in signals) / len(signals) if signals else 0,
+            'signals_detail': [BacktestRunner._signal_to_dict(s) for s in signals[:50]]  # Limit for file size
+        },
+        'backtest_results': backtest_results,
+        'performance_metrics': performance_metrics.to_dict(),
+        'summary': {
+            'total_return': performance_metrics.total_return,
+            'cagr': performance_metrics.cagr,
+            'sharpe_ratio': performance_metrics.sharpe_ratio,
+            'max_drawdown': performance_metrics.max_drawdown,
+            'win_rate': performance_metrics.win_rate,
+            'profit_factor': performance_metrics.profit_factor,
+            'total_trades': performance_metrics.total_trades
+        }
+    }
+    return comprehensive_results, performance_metrics
+
+
+def _run_backtest_task(task: Dict, components: Optional[Dict] = None) -> Dict:
+    """
+    Pool worker entry point for one symbol/window task.
+
+    Never raises: failures are reported in the returned outcome so the
+    parent keeps streaming the remaining results.
+
+    Args:
+        task: Task built by BacktestRunner._make_task
+        components: Strategy engine/analyzer to use (defaults to this worker's)
+    """
+    components = components or _worker_components
+    started = time.perf_counter()
+    outcome = {
+        'task_id': task['task_id'],
+        'symbol': task['symbol'],
+        'start_date': task['start_date'],
+        'end_date': task['end_date'],
+        'worker_pid': os.getpid(),
+        'result': None,
+        'metrics': None,
+        'error': None
+    }
+    try:
+        result, metrics = _backtest_price_data(
+            components['strategy_engine'],
+            components['performance_analyzer'],
+            task['symbol'], task['timeframe'], task['start_date'], task['end_date'],
+            task['price_data'], task['data_quality'], task['random_seed']
+        )
+        outcome['result'] = result
+        outcome['metrics'] = metrics
+        outcome['status'] = 'completed'
+    except Exception as e:
+        outcome['status'] = 'failed'
+        outcome['error'] = str(e)
+    outcome['elapsed_seconds'] = time.perf_counter() - started
+    return outcome
+
 
 class BacktestRunner:
     """
@@ -38,13 +149,25 @@ class BacktestRunner:
     analysis to provide complete backtesting capabilities.
     """
     
-    def __init__(self, config_path: str = "config/"):
-        """Initialize backtesting components."""
+    def __init__(self, config_path: str = "config/", max_workers: Optional[int] = None,
+                 random_seed: Optional[int] = None):
+        """
+        Initialize backtesting components.
+        
+        Args:
+            config_path: Configuration directory
+            max_workers: Worker processes for multi-symbol and walk-forward runs
+                (env BACKTEST_WORKERS, default CPU count; 1 runs in-process)
+            random_seed: Run seed for signal generation; None draws a fresh seed per
+                run, recorded in the results so the run can be replayed
+        """
         self.config_path = config_path
+        self.max_workers = max(1, max_workers or int(os.getenv('BACKTEST_WORKERS', os.cpu_count() or 1)))
+        self.random_seed = random_seed
         
         # Initialize components
         self.data_loader = DataLoader(config_path)
-        self.strategy_engine = StrategyEngine(config_path)
+        self.strategy_engine = ICTStrategyEngine(config_path)
         self.performance_analyzer = PerformanceAnalyzer()
         
         # Results storage
@@ -87,69 +210,21 @@ class BacktestRunner:
             data_quality = self.data_loader.validate_data_quality(price_data, symbol)
             logger.info(f"Data quality: {data_quality['status']}")
             
-            # Step 3: Generate trading signals
-            logger.info("Generating trading signals...")
-            signals = self.strategy_engine.simulate_strategy(symbol, price_data)
-            
-            if not signals:
-                logger.warning(f"No signals generated for {symbol}")
-                return self._empty_backtest_result(symbol, timeframe, start_date, end_date)
-            
-            # Step 4: Execute backtest
-            logger.info("Running backtest simulation...")
-            backtest_results = self.strategy_engine.backtest_signals(signals, price_data)
-            
-            # Step 5: Analyze performance
-            logger.info("Analyzing performance...")
-            if backtest_results['trades']:
-                performance_metrics = self.performance_analyzer.analyze_trades(backtest_results['trades'])
-            else:
-                performance_metrics = self.performance_analyzer._empty_metrics()
+            # Steps 3-6: Generate signals, backtest and analyze performance
+            logger.info("Generating trading signals and running backtest simulation...")
+            comprehensive_results, performance_metrics = _backtest_price_data(
+                self.strategy_engine, self.performance_analyzer,
+                symbol, timeframe, start_date, end_date, price_data, data_quality,
+                random_seed=self.random_seed
+            )
             
-            # Step 6: Compile comprehensive results
-            comprehensive_results = {
-                'backtest_info': {
-                    'symbol': symbol,
-                    'timeframe': timeframe,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'data_points': len(price_data),
-                    'data_quality': data_quality,
-                    'backtest_timestamp': datetime.now().isoformat()
-                },
-                'signals': {
-                    'total_signals': len(signals),
-                    'buy_signals': len([s for s in signals if s.action == 'BUY']),
-                    'sell_signals': len([s for s in signals if s.action == 'SELL']),
-                    'average_confidence': sum(s.confidence for s in signals) / len(signals) if signals else 0,
-                    'signals_detail': [self._signal_to_dict(s) for s in signals[:50]]  # Limit for file size
-                },
-                'backtest_results': backtest_results,
-                'performance_metrics': performance_metrics.to_dict(),
-                'summary': {
-                    'total_return': performance_metrics.total_return,
-                    'cagr': performance_metrics.cagr,
-                    'sharpe_ratio': performance_metrics.sharpe_ratio,
-                    'max_drawdown': performance_metrics.max_drawdown,
-                    'win_rate': performance_metrics.win_rate,
-                    'profit_factor': performance_metrics.profit_factor,
-                    'total_trades': performance_metrics.total_trades
-                }
-            }
+            if performance_metrics is None:
+                return comprehensive_results
             
             # Step 7: Save results if requested
             if save_results:
-                filename = f"backtest_{symbol.replace('/', '_')}_{timeframe}_{start_date}_{end_date}.json"
-                filepath = os.path.join(self.results_directory, filename)
-                self._save_results(comprehensive_results, filepath)
-                
-                # Generate and save performance report
-                report = self.performance_analyzer.generate_performance_report(
-                    performance_metrics, f"{symbol} {timeframe} Strategy"
-                )
-                report_filepath = filepath.replace('.json', '_report.txt')
-                with open(report_filepath, 'w') as f:
-                    f.write(report)
+                self._save_backtest_files(comprehensive_results, performance_metrics,
+                                          symbol, timeframe, start_date, end_date)
             
             logger.info(f"Backtest completed: {performance_metrics.total_return:.2f}% return, {performance_metrics.win_rate:.1f}% win rate")
             return comprehensive_results
@@ -158,6 +233,111 @@ class BacktestRunner:
             logger.error(f"Backtest failed for {symbol}: {e}")
             raise
     
+    def _save_backtest_files(self, results: Dict, performance_metrics, symbol: str,
+                             timeframe: str, start_date: str, end_date: str) -> None:
+        """Save a single backtest's JSON results and text performance report."""
+        filename = f"backtest_{symbol.replace('/', '_')}_{timeframe}_{start_date}_{end_date}.json"
+        filepath = os.path.join(self.results_directory, filename)
+        self._save_results(results, filepath)
+        
+        # Generate and save performance report
+        report = self.performance_analyzer.generate_performance_report(
+            performance_metrics, f"{symbol} {timeframe} Strategy"
+        )
+        report_filepath = filepath.replace('.json', '_report.txt')
+        with open(report_filepath, 'w') as f:
+            f.write(report)
+    
+    def _resolve_run_seed(self) -> int:
+        """Seed shared by every task of a run, so parallel runs match sequential ones."""
+        return self.random_seed if self.random_seed is not None else np.random.SeedSequence().entropy
+    
+    def _make_task(self, task_id: int, symbol: str, timeframe: str, start_date: str, end_date: str,
+                   price_data: pd.DataFrame, random_seed: int) -> Dict:
+        """Build a picklable backtest task for one symbol/period."""
+        return {
+            'task_id': task_id,
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'start_date': start_date,
+            'end_date': end_date,
+            'price_data': price_data,
+            'data_quality': self.data_loader.validate_data_quality(price_data, symbol),
+            'random_seed': random_seed
+        }
+    
+    def iter_backtest_tasks(self, tasks: List[Dict]) -> Iterator[Dict]:
+        """
+        Execute backtest tasks, yielding outcomes in completion order.
+        
+        Runs on a ProcessPoolExecutor when more than one worker and task are
+        available, otherwise in-process with this runner's engine.
+        
+        Args:
+            tasks: Tasks built by _make_task
+            
+        Yields:
+            Outcome dicts with task_id, symbol, dates, status, result, metrics,
+            error, elapsed_seconds and worker_pid
+        """
+        workers = min(self.max_workers, len(tasks))
+        
+        if workers <= 1:
+            components = {
+                'strategy_engine': self.strategy_engine,
+                'performance_analyzer': self.performance_analyzer
+            }
+            for task in tasks:
+                yield _run_backtest_task(task, components)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_backtest_worker,
+                                 initargs=(self.config_path,)) as executor:
+            futures = [executor.submit(_run_backtest_task, task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+    
+    def _collect_outcomes(self, tasks: List[Dict], label: str) -> Tuple[Dict[int, Dict], Dict]:
+        """
+        Run tasks and gather outcomes plus an execution/timing summary.
+        
+        Returns:
+            Tuple of (outcomes by task_id, execution summary for the consolidated JSON)
+        """
+        started = time.perf_counter()
+        outcomes = {}
+        task_timings = []
+        
+        for outcome in self.iter_backtest_tasks(tasks):
+            outcomes[outcome['task_id']] = outcome
+            task_timings.append({
+                'task_id': outcome['task_id'],
+                'symbol': outcome['symbol'],
+                'start_date': outcome['start_date'],
+                'end_date': outcome['end_date'],
+                'status': outcome['status'],
+                'elapsed_seconds': round(outcome['elapsed_seconds'], 3),
+                'worker_pid': outcome['worker_pid']
+            })
+            if outcome['status'] == 'completed':
+                logger.info(f"[{label}] {len(outcomes)}/{len(tasks)} done: {outcome['symbol']} "
+                            f"{outcome['start_date']} to {outcome['end_date']} ({outcome['elapsed_seconds']:.1f}s)")
+            else:
+                logger.error(f"[{label}] {outcome['symbol']} {outcome['start_date']} to "
+                             f"{outcome['end_date']} failed: {outcome['error']}")
+        
+        wall_time = time.perf_counter() - started
+        task_time = sum(t['elapsed_seconds'] for t in task_timings)
+        execution = {
+            'backend': 'process_pool' if min(self.max_workers, len(tasks)) > 1 else 'in_process',
+            'max_workers': self.max_workers,
+            'wall_time_seconds': round(wall_time, 3),
+            'total_task_seconds': round(task_time, 3),
+            'parallel_speedup': round(task_time / wall_time, 2) if wall_time > 0 else None,
+            'tasks': task_timings  # Completion order
+        }
+        return outcomes, execution
+    
     def run_multi_symbol_backtest(self, symbols: List[str], timeframe: str, 
                                  start_date: str, end_date: str) -> Dict[str, Dict]:
         """
@@ -172,28 +352,42 @@ class BacktestRunner:
         Returns:
             Dictionary mapping symbol to backtest results
         """
-        logger.info(f"Running multi-symbol backtest for {len(symbols)} symbols")
+        logger.info(f"Running multi-symbol backtest for {len(symbols)} symbols "
+                    f"({min(self.max_workers, len(symbols))} workers)")
         
+        run_seed = self._resolve_run_seed()
         results = {}
+        tasks = []
         
-        for i, symbol in enumerate(symbols):
+        # Data is loaded in this process; workers only simulate
+        for symbol in symbols:
             try:
-                logger.info(f"Processing {symbol} ({i+1}/{len(symbols)})")
-                
-                result = self.run_single_backtest(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    start_date=start_date,
-                    end_date=end_date,
-                    save_results=True
+                price_data = self.data_loader.download_ohlcv(
+                    symbol=symbol, timeframe=timeframe, start_date=start_date, end_date=end_date
                 )
-                
-                results[symbol] = result
-                
+                if price_data.empty:
+                    raise ValueError(f"No price data available for {symbol}")
+                tasks.append(self._make_task(len(tasks), symbol, timeframe, start_date, end_date,
+                                             price_data, run_seed))
             except Exception as e:
-                logger.error(f"Failed to backtest {symbol}: {e}")
+                logger.error(f"Failed to load data for {symbol}: {e}")
+                results[symbol] = self._empty_backtest_result(symbol, timeframe, start_date, end_date)
+        
+        outcomes, execution = self._collect_outcomes(tasks, "multi-symbol")
+        
+        for task in tasks:
+            symbol = task['symbol']
+            outcome = outcomes[task['task_id']]
+            if outcome['status'] != 'completed':
                 results[symbol] = self._empty_backtest_result(symbol, timeframe, start_date, end_date)
                 continue
+            results[symbol] = outcome['result']
+            if outcome['metrics'] is not None:
+                self._save_backtest_files(outcome['result'], outcome['metrics'],
+                                          symbol, timeframe, start_date, end_date)
+        
+        # Keep the caller's symbol order
+        results = {symbol: results[symbol] for symbol in symbols if symbol in results}
         
         # Generate comparative analysis
         comparison_report = self._generate_comparison_report(results, timeframe, start_date, end_date)
@@ -209,10 +403,12 @@ class BacktestRunner:
                 'timeframe': timeframe,
                 'start_date': start_date,
                 'end_date': end_date,
+                'random_seed': run_seed,
                 'backtest_timestamp': datetime.now().isoformat()
             },
             'individual_results': results,
-            'comparison_analysis': comparison_report
+            'comparison_analysis': comparison_report,
+            'execution': execution
         }
         
         self._save_results(consolidated_results, consolidated_filepath)
@@ -237,9 +433,109 @@ class BacktestRunner:
         Returns:
             Dictionary containing walk-forward analysis results
         """
-        logger.info(f"Starting walk-forward analysis for {symbol}")
+        return self.run_multi_symbol_walk_forward(
+            [symbol], timeframe, start_date, end_date, window_months, step_months
+        )[symbol]
+    
+    def run_multi_symbol_walk_forward(self, symbols: List[str], timeframe: str,
+                                      start_date: str, end_date: str,
+                                      window_months: int = 6, step_months: int = 1) -> Dict[str, Dict]:
+        """
+        Run walk-forward analysis for several symbols on one worker pool.
+        
+        Each symbol's full range is loaded once and sliced per window; every
+        symbol/window pair is an independent task.
+        
+        Args:
+            symbols: Trading pair symbols
+            timeframe: Candlestick timeframe
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            window_months: Analysis window in months
+            step_months: Step size in months
+            
+        Returns:
+            Dictionary mapping symbol to walk-forward analysis results
+        """
+        windows = self._walk_forward_windows(start_date, end_date, window_months, step_months)
+        logger.info(f"Starting walk-forward analysis: {len(symbols)} symbols x {len(windows)} windows")
+        
+        run_seed = self._resolve_run_seed()
+        tasks = []
+        task_windows = {}
         
-        # Generate date windows
+        for symbol in symbols:
+            try:
+                price_data = self.data_loader.download_ohlcv(
+                    symbol=symbol, timeframe=timeframe, start_date=start_date, end_date=end_date
+                )
+            except Exception as e:
+                logger.error(f"Failed to load data for {symbol}: {e}")
+                continue
+            
+            for i, (window_start, window_end) in enumerate(windows):
+                # Same inclusive range download_ohlcv would return for the window
+                window_data = price_data.loc[pd.to_datetime(window_start):pd.to_datetime(window_end)]
+                if window_data.empty:
+                    logger.error(f"No data for {symbol} window {window_start} to {window_end}")
+                    continue
+                task = self._make_task(len(tasks), symbol, timeframe, window_start, window_end,
+                                       window_data, run_seed)
+                task_windows[task['task_id']] = i + 1
+                tasks.append(task)
+        
+        outcomes, execution = self._collect_outcomes(tasks, "walk-forward")
+        
+        all_results = {}
+        for symbol in symbols:
+            symbol_tasks = [task for task in tasks if task['symbol'] == symbol]
+            window_results = [
+                {
+                    'window_id': task_windows[task['task_id']],
+                    'start_date': task['start_date'],
+                    'end_date': task['end_date'],
+                    'results': outcomes[task['task_id']]['result']
+                }
+                for task in symbol_tasks
+                if outcomes[task['task_id']]['status'] == 'completed'
+            ]
+            
+            # Analyze walk-forward consistency
+            consistency_analysis = self._analyze_walk_forward_consistency(window_results)
+            
+            # Compile results
+            walk_forward_results = {
+                'analysis_info': {
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'total_period': f"{start_date} to {end_date}",
+                    'window_months': window_months,
+                    'step_months': step_months,
+                    'total_windows': len(window_results),
+                    'random_seed': run_seed,
+                    'analysis_timestamp': datetime.now().isoformat()
+                },
+                'window_results': window_results,
+                'consistency_analysis': consistency_analysis,
+                'execution': dict(execution, tasks=[t for t in execution['tasks'] if t['symbol'] == symbol])
+            }
+            
+            # Save results
+            filepath = os.path.join(
+                self.results_directory,
+                f"walk_forward_{symbol.replace('/', '_')}_{timeframe}_{start_date}_{end_date}.json"
+            )
+            self._save_results(walk_forward_results, filepath)
+            
+            logger.info(f"Walk-forward analysis completed for {symbol}: {consistency_analysis['overall_consistency']}")
+            all_results[symbol] = walk_forward_results
+        
+        return all_results
+    
+    @staticmethod
+    def _walk_forward_windows(start_date: str, end_date: str,
+                              window_months: int, step_months: int) -> List[Tuple[str, str]]:
+        """Generate (start, end) date windows for walk-forward analysis."""
         start_dt = pd.to_datetime(start_date)
         end_dt = pd.to_datetime(end_date)
         
@@ -254,79 +550,28 @@ class BacktestRunner:
             ))
             current_start += pd.DateOffset(months=step_months)
         
-        logger.info(f"Running {len(windows)} walk-forward windows")
-        
-        # Run backtests for each window
-        window_results = []
-        
-        for i, (window_start, window_end) in enumerate(windows):
-            try:
-                logger.info(f"Processing window {i+1}/{len(windows)}: {window_start} to {window_end}")
-                
-                result = self.run_single_backtest(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    start_date=window_start,
-                    end_date=window_end,
-                    save_results=False  # Save consolidated results only
-                )
-                
-                window_results.append({
-                    'window_id': i + 1,
-                    'start_date': window_start,
-                    'end_date': window_end,
-                    'results': result
-                })
-                
-            except Exception as e:
-                logger.error(f"Failed to process window {window_start} to {window_end}: {e}")
-                continue
-        
-        # Analyze walk-forward consistency
-        consistency_analysis = self._analyze_walk_forward_consistency(window_results)
-        
-        # Compile results
-        walk_forward_results = {
-            'analysis_info': {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'total_period': f"{start_date} to {end_date}",
-                'window_months': window_months,
-                'step_months': step_months,
-                'total_windows': len(window_results),
-                'analysis_timestamp': datetime.now().isoformat()
-            },
-            'window_results': window_results,
-            'consistency_analysis': consistency_analysis
-        }
-        
-        # Save results
-        filepath = os.path.join(
-            self.results_directory,
-            f"walk_forward_{symbol.replace('/', '_')}_{timeframe}_{start_date}_{end_date}.json"
-        )
-        self._save_results(walk_forward_results, filepath)
-        
-        logger.info(f"Walk-forward analysis completed: {consistency_analysis['overall_consistency']}")
-        return walk_forward_results
+        return windows
     
-    def _signal_to_dict(self, signal) -> Dict:
-        """Convert TradingSignal to dictionary."""
+    @staticmethod
+    def _signal_to_dict(signal) -> Dict:
+        """Convert ICTTradingSignal to dictionary."""
         return {
             'timestamp': signal.timestamp.isoformat(),
             'symbol': signal.symbol,
             'action': signal.action,
             'confidence': signal.confidence,
-            'price': signal.price,
+            'price': signal.entry_price,
             'stop_loss': signal.stop_loss,
             'take_profit': signal.take_profit,
             'position_size': signal.position_size,
-            'market_phase': signal.market_phase,
+            'market_phase': signal.market_regime,
+            'confluence_score': signal.confluence_score,
             'indicators': signal.indicators,
             'reasoning': signal.reasoning
         }
     
-    def _empty_backtest_result(self, symbol: str, timeframe: str, start_date: str, end_date: str) -> Dict:
+    @staticmethod
+    def _empty_backtest_result(symbol: str, timeframe: str, start_date: str, end_date: str) -> Dict:
         """Generate empty backtest result."""
         return {
             'backtest_info': {
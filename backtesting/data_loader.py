@@ -8,7 +8,7 @@ market data for backtesting purposes.
 Features:
 - Multi-timeframe OHLCV data retrieval
 - Rate limiting and API management  
-- Data caching and persistence
+- Columnar memory-mapped candle store (only missing ranges are downloaded)
 - Memory-efficient processing
 - Comprehensive error handling
 
@@ -32,6 +32,8 @@ import ccxt
 from utils.config_loader import ConfigLoader
 from utils.crypto_pairs import CryptoPairs
 
+from .ohlcv_store import OHLCVStore
+
 logger = logging.getLogger(__name__)
 
 class DataLoader:
@@ -61,6 +63,7 @@ class DataLoader:
         # Data caching configuration
         self.cache_directory = "data/cache/"
         os.makedirs(self.cache_directory, exist_ok=True)
+        self.ohlcv_store = OHLCVStore(os.path.join(self.cache_directory, "ohlcv"))
         
         # Supported timeframes
         self.timeframes = {
@@ -103,11 +106,11 @@ class DataLoader:
             raise RuntimeError(f"Exchange initialization failed: {e}")
     
     def get_cache_filename(self, symbol: str, timeframe: str, start_date: str, end_date: str) -> str:
-        """Generate cache filename for historical data."""
+        """Generate legacy JSON cache filename for historical data."""
         return f"{symbol}_{timeframe}_{start_date}_{end_date}.json"
     
     def load_from_cache(self, cache_filename: str) -> Optional[pd.DataFrame]:
-        """Load historical data from cache if available."""
+        """Load historical data from a legacy JSON cache file if available."""
         cache_path = os.path.join(self.cache_directory, cache_filename)
         
         if not os.path.exists(cache_path):
@@ -129,7 +132,7 @@ class DataLoader:
             return None
     
     def save_to_cache(self, df: pd.DataFrame, cache_filename: str) -> None:
-        """Save historical data to cache for future use."""
+        """Save historical data to a legacy JSON cache file (the OHLCV store supersedes this)."""
         cache_path = os.path.join(self.cache_directory, cache_filename)
         
         try:
@@ -155,10 +158,11 @@ class DataLoader:
             timeframe: Candlestick timeframe (e.g., '1h', '4h', '1d')
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
-            use_cache: Whether to use cached data if available
+            use_cache: Read through the OHLCV store, downloading only missing ranges
             
         Returns:
-            DataFrame with OHLCV data indexed by timestamp
+            DataFrame with OHLCV data indexed by timestamp (memory-mapped, read-only
+            columns when served from the store)
         """
         # Validate inputs
         if not self.crypto_pairs.is_pair_supported(symbol):
@@ -167,19 +171,47 @@ class DataLoader:
         if timeframe not in self.timeframes:
             raise ValueError(f"Unsupported timeframe: {timeframe}")
         
-        # Check cache first
-        cache_filename = self.get_cache_filename(symbol, timeframe, start_date, end_date)
+        if not use_cache:
+            start_ms = int(pd.to_datetime(start_date).timestamp() * 1000)
+            end_ms = int(pd.to_datetime(end_date).timestamp() * 1000)
+            df = self._fetch_ohlcv_range(symbol, timeframe, start_ms, end_ms)
+            if df.empty:
+                raise RuntimeError(f"No data downloaded for {symbol} {timeframe}")
+            return df.loc[pd.to_datetime(start_date):pd.to_datetime(end_date)]
+        
+        # Import a legacy JSON cache entry for this exact range into the store
+        legacy_cache = None
+        if self.ohlcv_store.missing_ranges(symbol, timeframe, start_date, end_date):
+            legacy_cache = self.load_from_cache(self.get_cache_filename(symbol, timeframe, start_date, end_date))
+        if legacy_cache is not None:
+            self.ohlcv_store.write(symbol, timeframe, legacy_cache[['open', 'high', 'low', 'close', 'volume']],
+                                   covered_start=start_date, covered_end=end_date)
+        
+        # Only intervals not yet in the store are downloaded
+        df = self.ohlcv_store.load_or_fetch(symbol, timeframe, start_date, end_date, self._fetch_ohlcv_range)
         
-        if use_cache:
-            cached_data = self.load_from_cache(cache_filename)
-            if cached_data is not None:
-                return cached_data
+        if df.empty:
+            raise RuntimeError(f"No data downloaded for {symbol} {timeframe}")
         
-        # Convert dates to timestamps
-        start_timestamp = int(pd.to_datetime(start_date).timestamp() * 1000)
-        end_timestamp = int(pd.to_datetime(end_date).timestamp() * 1000)
+        logger.info(f"Loaded {len(df)} {timeframe} candles for {symbol} from the OHLCV store")
+        return df
+    
+    def _fetch_ohlcv_range(self, symbol: str, timeframe: str, start_timestamp: int,
+                           end_timestamp: int) -> pd.DataFrame:
+        """
+        Download candles between two millisecond timestamps from the exchange.
         
-        logger.info(f"Downloading {symbol} {timeframe} data from {start_date} to {end_date}")
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candlestick timeframe
+            start_timestamp: Start time in ms
+            end_timestamp: End time in ms
+            
+        Returns:
+            DataFrame with OHLCV data indexed by timestamp (may be empty)
+        """
+        logger.info(f"Downloading {symbol} {timeframe} data from "
+                    f"{pd.Timestamp(start_timestamp, unit='ms')} to {pd.Timestamp(end_timestamp, unit='ms')}")
         
         all_ohlcv = []
         current_timestamp = start_timestamp
@@ -212,9 +244,6 @@ class DataLoader:
                 time.sleep(2)  # Wait longer on error
                 continue
         
-        if not all_ohlcv:
-            raise RuntimeError(f"No data downloaded for {symbol} {timeframe}")
-        
         # Convert to DataFrame
         df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
@@ -223,17 +252,7 @@ class DataLoader:
         # Remove duplicates and sort
         df = df[~df.index.duplicated()].sort_index()
         
-        # Filter to requested date range
-        start_dt = pd.to_datetime(start_date)
-        end_dt = pd.to_datetime(end_date)
-        df = df.loc[start_dt:end_dt]
-        
         logger.info(f"Successfully downloaded {len(df)} {timeframe} candles for {symbol}")
-        
-        # Save to cache
-        if use_cache:
-            self.save_to_cache(df, cache_filename)
-        
         return df
     
     def download_multiple_pairs(self, symbols: List[str], timeframe: str,
@@ -0,0 +1,259 @@
+"""
+Intrabar Exit Simulator
+=======================
+
+Resolves when and how backtest positions exit: the first bar after entry
+whose high/low touches the stop loss or take profit, a time limit, or the
+end of the data.
+
+The first-touch search runs for all positions at once. Each pass gathers a
+window of bars after every unresolved position into a 2-D array, tests the
+stop/target levels on it and takes the first hit per row; the window
+doubles on every pass, so the number of Python iterations grows with the
+logarithm of the longest hold, not with the number of bars or positions.
+
+When one bar touches both levels, the order inside the bar is unknown.
+A bar that opens beyond a level hits that level first; otherwise the
+optional lower-timeframe candles covering the bar are searched the same
+way, and anything still ambiguous is resolved to the stop (conservative).
+
+Usage:
+    simulator = ExitSimulator(df_1h, lower_tf_data=df_5m, max_hold_bars=48)
+    exits = simulator.simulate(entry_pos, is_long, stop_loss, take_profit)
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on gathered (position x bar) cells per search pass
+MAX_WINDOW_CELLS = 4_000_000
+
+
+def first_touch(high: np.ndarray, low: np.ndarray, start: np.ndarray, end: np.ndarray,
+                is_long: np.ndarray, stop: np.ndarray, target: np.ndarray,
+                initial_window: int = 32) -> np.ndarray:
+    """
+    Position of the first bar in [start, end] touching stop or target.
+
+    Longs are stopped by low <= stop and take profit on high >= target;
+    shorts the other way round. NaN levels never touch.
+
+    Args:
+        high, low: Bar high/low arrays
+        start, end: Inclusive bar range to search, per position
+        is_long: True for long positions
+        stop, target: Stop loss / take profit level per position
+        initial_window: Bars gathered per position in the first pass
+
+    Returns:
+        Bar position of the first touch per position, -1 if none
+    """
+    start = np.asarray(start, dtype=np.int64)
+    end = np.minimum(np.asarray(end, dtype=np.int64), len(high) - 1)
+    hits = np.full(len(start), -1, dtype=np.int64)
+
+    pending = np.flatnonzero(start <= end)
+    scanned = np.zeros(len(start), dtype=np.int64)
+    window = max(1, initial_window)
+
+    while pending.size:
+        rows_per_chunk = max(1, MAX_WINDOW_CELLS // window)
+        offsets = np.arange(window)
+        resolved = []
+
+        for chunk in range(0, pending.size, rows_per_chunk):
+            rows = pending[chunk:chunk + rows_per_chunk]
+            bars = (start[rows] + scanned[rows])[:, None] + offsets
+            in_range = bars <= end[rows, None]
+            bars = np.minimum(bars, len(high) - 1)
+
+            bar_high, bar_low = high[bars], low[bars]
+            long_rows = is_long[rows, None]
+            row_stop, row_target = stop[rows, None], target[rows, None]
+            touched = in_range & np.where(
+                long_rows,
+                (bar_low <= row_stop) | (bar_high >= row_target),
+                (bar_high >= row_stop) | (bar_low <= row_target)
+            )
+
+            first = touched.argmax(axis=1)
+            found = touched[np.arange(len(rows)), first]
+            hits[rows[found]] = bars[found, first[found]]
+            resolved.append(found)
+
+        scanned[pending] += window
+        found = np.concatenate(resolved)
+        pending = pending[~found & (start[pending] + scanned[pending] <= end[pending])]
+        window *= 2
+
+    return hits
+
+
+def _level_hits(high: np.ndarray, low: np.ndarray, bars: np.ndarray, is_long: np.ndarray,
+                stop: np.ndarray, target: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Whether each bar touches the stop and/or the target."""
+    bar_high, bar_low = high[bars], low[bars]
+    stop_hit = np.where(is_long, bar_low <= stop, bar_high >= stop)
+    target_hit = np.where(is_long, bar_high >= target, bar_low <= target)
+    return stop_hit, target_hit
+
+
+@dataclass
+class ExitResults:
+    """Exit bar, price and reason per simulated position"""
+    exit_pos: np.ndarray
+    exit_time: pd.DatetimeIndex
+    exit_price: np.ndarray
+    exit_reason: np.ndarray
+    ambiguous: np.ndarray  # Stop and target touched on the same bar
+
+
+class ExitSimulator:
+    """
+    Stop loss / take profit / time-limit exits on OHLC bars
+
+    Entries are assumed at the close of the entry bar, so the search starts
+    on the following bar. Stops and targets fill at their level, or at the
+    bar's open when the bar gaps through it.
+    """
+
+    def __init__(self, price_data: pd.DataFrame, lower_tf_data: Optional[pd.DataFrame] = None,
+                 max_hold_bars: Optional[int] = None):
+        """
+        Args:
+            price_data: OHLC bars the positions are held on (sorted DatetimeIndex)
+            lower_tf_data: Optional finer candles used to order same-bar SL/TP touches
+            max_hold_bars: Close positions at this many bars after entry (None = no limit)
+        """
+        self.index = price_data.index
+        self.close = price_data['close'].to_numpy(dtype=np.float64)
+        self.open = self._column(price_data, 'open')
+        self.high = self._column(price_data, 'high')
+        self.low = self._column(price_data, 'low')
+        self.max_hold_bars = max_hold_bars
+
+        # Each bar spans [its timestamp, next bar's timestamp)
+        if len(self.index) > 1:
+            bar_length = pd.Series(self.index).diff().median()
+            self.bar_end = self.index[1:].append(pd.DatetimeIndex([self.index[-1] + bar_length]))
+        else:
+            self.bar_end = self.index
+
+        self.lower_tf = None
+        if lower_tf_data is not None and not lower_tf_data.empty:
+            self.lower_tf = {
+                'index': lower_tf_data.index,
+                'high': self._column(lower_tf_data, 'high'),
+                'low': self._column(lower_tf_data, 'low'),
+            }
+
+    @staticmethod
+    def _column(df: pd.DataFrame, column: str) -> np.ndarray:
+        """OHLC column as float64, falling back to close when it is missing."""
+        return df[column if column in df.columns else 'close'].to_numpy(dtype=np.float64)
+
+    def simulate(self, entry_pos: np.ndarray, is_long: np.ndarray,
+                 stop: np.ndarray, target: np.ndarray) -> ExitResults:
+        """
+        Resolve the exit of every position.
+
+        Args:
+            entry_pos: Bar position of each entry (-1 = before the first bar)
+            is_long: True for longs, False for shorts
+            stop, target: Stop loss / take profit levels
+
+        Returns:
+            ExitResults aligned with the inputs
+        """
+        entry_pos = np.asarray(entry_pos, dtype=np.int64)
+        is_long = np.asarray(is_long, dtype=bool)
+        stop = np.asarray(stop, dtype=np.float64)
+        target = np.asarray(target, dtype=np.float64)
+        last_bar = len(self.close) - 1
+
+        if self.max_hold_bars is not None:
+            end = np.minimum(entry_pos + self.max_hold_bars, last_bar)
+            time_limited = entry_pos + self.max_hold_bars <= last_bar
+        else:
+            end = np.full(len(entry_pos), last_bar, dtype=np.int64)
+            time_limited = np.zeros(len(entry_pos), dtype=bool)
+        end = np.maximum(end, 0)
+
+        hit_pos = first_touch(self.high, self.low, entry_pos + 1, end, is_long, stop, target)
+        hit = hit_pos >= 0
+        exit_pos = np.where(hit, hit_pos, end)
+
+        # Which level(s) the exit bar touched
+        stop_hit, target_hit = _level_hits(self.high, self.low, exit_pos, is_long, stop, target)
+        stop_hit &= hit
+        target_hit &= hit
+        ambiguous = stop_hit & target_hit
+
+        stop_first = stop_hit & ~target_hit
+        if ambiguous.any():
+            stop_first |= ambiguous & self._stop_touched_first(exit_pos, is_long, stop, target, ambiguous)
+
+        bar_open = self.open[exit_pos]
+        stop_fill = np.where(is_long, np.minimum(bar_open, stop), np.maximum(bar_open, stop))
+        target_fill = np.where(is_long, np.maximum(bar_open, target), np.minimum(bar_open, target))
+
+        exit_price = np.where(
+            hit,
+            np.where(stop_first, stop_fill, target_fill),
+            self.close[exit_pos]
+        )
+        exit_reason = np.where(
+            hit,
+            np.where(stop_first, 'STOP_LOSS', 'TAKE_PROFIT'),
+            np.where(time_limited, 'TIME_LIMIT', 'BACKTEST_END')
+        ).astype(object)
+
+        return ExitResults(
+            exit_pos=exit_pos,
+            exit_time=self.index[exit_pos],
+            exit_price=exit_price,
+            exit_reason=exit_reason,
+            ambiguous=ambiguous
+        )
+
+    def _stop_touched_first(self, exit_pos: np.ndarray, is_long: np.ndarray, stop: np.ndarray,
+                            target: np.ndarray, ambiguous: np.ndarray) -> np.ndarray:
+        """
+        Order same-bar stop/target touches.
+
+        Returns:
+            True where the stop is taken to have been hit first (meaningful
+            only for the ambiguous positions)
+        """
+        bar_open = self.open[exit_pos]
+        opened_past_stop = np.where(is_long, bar_open <= stop, bar_open >= stop)
+        opened_past_target = np.where(is_long, bar_open >= target, bar_open <= target)
+
+        # Conservative default: stop first unless the bar opened through the target
+        stop_first = ~opened_past_target | opened_past_stop
+
+        undecided = np.flatnonzero(ambiguous & ~opened_past_stop & ~opened_past_target)
+        if self.lower_tf is None or not undecided.size:
+            return stop_first
+
+        ltf = self.lower_tf
+        ltf_start = ltf['index'].searchsorted(self.index[exit_pos[undecided]], side='left')
+        ltf_end = ltf['index'].searchsorted(self.bar_end[exit_pos[undecided]], side='left') - 1
+
+        ltf_hit = first_touch(ltf['high'], ltf['low'], ltf_start, ltf_end, is_long[undecided],
+                              stop[undecided], target[undecided], initial_window=16)
+        found = ltf_hit >= 0
+        ltf_stop, ltf_target = _level_hits(ltf['high'], ltf['low'], np.maximum(ltf_hit, 0),
+                                           is_long[undecided], stop[undecided], target[undecided])
+
+        # Target first only when the finer candle touched the target alone
+        stop_first[undecided] = ~(found & ltf_target & ~ltf_stop)
+        logger.debug(f"Lower-timeframe drill-down resolved {int((found & (ltf_stop != ltf_target)).sum())}"
+                     f"/{undecided.size} same-bar SL/TP touches")
+        return stop_first
@@ -0,0 +1,441 @@
+"""
+Columnar OHLCV Store
+===================
+
+On-disk candle store for backtests, partitioned by symbol and timeframe.
+
+Each partition keeps one raw binary file per column (timestamp, open, high,
+low, close, volume) plus a small ``meta.json`` with the row count, the
+current file generation and the time ranges already fetched. Reads memory-map the column files and slice
+them with a binary search on the timestamp column, so a range query returns
+a DataFrame whose columns are read-only views of the files (no parsing, no
+copy). Writes append in place when the new candles are newer than the
+stored ones. Back-fills write a new generation of column files next to the
+current one, and ``meta.json`` is switched to it last.
+
+Because coverage is tracked separately from the candles, overlapping date
+ranges share one partition and only the missing intervals are downloaded.
+
+Usage:
+    store = OHLCVStore("data/cache/ohlcv/")
+    df = store.load_or_fetch("BTC/USDT", "1h", "2024-01-01", "2024-06-01", fetch_fn)
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Backtest timeframe -> Bybit kline interval
+BYBIT_INTERVALS = {
+    '1m': '1', '3m': '3', '5m': '5', '15m': '15', '30m': '30',
+    '1h': '60', '2h': '120', '4h': '240', '6h': '360', '12h': '720',
+    '1d': 'D', '1w': 'W'
+}
+
+# Candle length per timeframe
+TIMEFRAME_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000, '12h': 43_200_000,
+    '1d': 86_400_000, '1w': 604_800_000
+}
+
+DateLike = Union[str, pd.Timestamp, datetime]
+FetchFn = Callable[[str, str, int, int], pd.DataFrame]
+
+
+def _to_ns(value: DateLike) -> int:
+    """Timestamp-like value to int64 nanoseconds since epoch (naive = UTC)."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value)
+
+
+def _timeframe_ms(timeframe: str) -> int:
+    """Candle length in milliseconds"""
+    if timeframe in TIMEFRAME_MS:
+        return TIMEFRAME_MS[timeframe]
+    return pd.Timedelta(timeframe).value // 1_000_000
+
+
+def _merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """Merge overlapping or touching [start, end] ranges."""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class OHLCVStore:
+    """
+    Symbol/timeframe-partitioned columnar candle store
+
+    Thread-safe within a process; readers in other processes only ever see
+    complete rows because the row count and generation in ``meta.json`` are
+    updated atomically after the column files are written. Appends first cut
+    every column back to the committed row count, so rows left over by an
+    interrupted write are overwritten rather than shifting later ones.
+    """
+
+    def __init__(self, root: str = "data/cache/ohlcv/"):
+        """
+        Initialize store
+
+        Args:
+            root: Directory holding one sub-directory per symbol/timeframe
+        """
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _partition_dir(self, symbol: str, timeframe: str) -> str:
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        return os.path.join(self.root, safe_symbol, timeframe)
+
+    def _generation_dir(self, partition: str, generation: int) -> str:
+        # Generation 0 lives in the partition directory itself
+        return os.path.join(partition, f"gen-{generation}") if generation else partition
+
+    def _column_path(self, partition: str, column: str, generation: int = 0) -> str:
+        return os.path.join(self._generation_dir(partition, generation), f"{column}.bin")
+
+    def _load_meta(self, partition: str) -> Dict:
+        meta_path = os.path.join(partition, 'meta.json')
+        if not os.path.exists(meta_path):
+            return {'rows': 0, 'generation': 0, 'coverage': []}
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        meta.setdefault('generation', 0)
+        return meta
+
+    def _save_meta(self, partition: str, meta: Dict) -> None:
+        meta_path = os.path.join(partition, 'meta.json')
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _memmap(self, partition: str, column: str, rows: int, generation: int = 0) -> np.ndarray:
+        dtype = np.int64 if column == 'timestamp' else np.float64
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._column_path(partition, column, generation), dtype=dtype, mode='r', shape=(rows,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def coverage(self, symbol: str, timeframe: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Time ranges already fetched for a symbol/timeframe."""
+        meta = self._load_meta(self._partition_dir(symbol, timeframe))
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in meta['coverage']]
+
+    def missing_ranges(self, symbol: str, timeframe: str,
+                       start: DateLike, end: DateLike) -> List[Tuple[int, int]]:
+        """
+        Sub-ranges of [start, end] not yet fetched
+
+        Returns:
+            List of (start_ms, end_ms) intervals, inclusive
+        """
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        meta = self._load_meta(self._partition_dir(symbol, timeframe))
+
+        missing = []
+        cursor = start_ns
+        for covered_start, covered_end in meta['coverage']:
+            if covered_end < cursor:
+                continue
+            if covered_start > end_ns:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - 1))
+            cursor = max(cursor, covered_end + 1)
+            if cursor > end_ns:
+                break
+        if cursor <= end_ns:
+            missing.append((cursor, end_ns))
+
+        # Round gap starts up so a covered millisecond is never re-requested,
+        # dropping sub-millisecond slivers between adjacent coverage ranges
+        ranges = [(-(-s // 1_000_000), e // 1_000_000) for s, e in missing]
+        return [(s, e) for s, e in ranges if s <= e]
+
+    def read(self, symbol: str, timeframe: str,
+             start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> pd.DataFrame:
+        """
+        Candles in [start, end] as a memory-mapped DataFrame
+
+        The OHLCV columns are read-only views of the column files; take
+        ``.copy()`` before modifying them in place.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe (e.g. '1h')
+            start: Inclusive start (None = first stored candle)
+            end: Inclusive end (None = last stored candle)
+
+        Returns:
+            OHLCV DataFrame indexed by timestamp (empty if nothing stored)
+        """
+        partition = self._partition_dir(symbol, timeframe)
+        meta = self._load_meta(partition)
+        rows, generation = meta['rows'], meta['generation']
+
+        timestamps = self._memmap(partition, 'timestamp', rows, generation)
+        lo = 0 if start is None else int(np.searchsorted(timestamps, _to_ns(start), side='left'))
+        hi = rows if end is None else int(np.searchsorted(timestamps, _to_ns(end), side='right'))
+
+        index = pd.DatetimeIndex(np.asarray(timestamps[lo:hi]).view('datetime64[ns]'), name='timestamp')
+        columns = {column: self._memmap(partition, column, rows, generation)[lo:hi] for column in COLUMNS}
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame,
+              covered_start: Optional[DateLike] = None, covered_end: Optional[DateLike] = None) -> int:
+        """
+        Merge candles into the store and mark a range as fetched
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            df: OHLCV DataFrame indexed by timestamp
+            covered_start: Start of the fetched range (default: first candle)
+            covered_end: End of the fetched range (default: last candle)
+
+        Returns:
+            Number of stored rows after the merge
+        """
+        partition = self._partition_dir(symbol, timeframe)
+
+        with self._lock:
+            os.makedirs(partition, exist_ok=True)
+            meta = self._load_meta(partition)
+            rows, generation = meta['rows'], meta['generation']
+            old_generation = generation
+
+            if not df.empty:
+                df = df[~df.index.duplicated(keep='last')].sort_index()
+                index = df.index if df.index.tz is None else df.index.tz_convert('UTC').tz_localize(None)
+                new_ts = np.asarray(index.values, dtype='datetime64[ns]').view(np.int64)
+                new_cols = {column: df[column].to_numpy(dtype=np.float64) for column in COLUMNS}
+
+                last_ts = self._memmap(partition, 'timestamp', rows, generation)[-1] if rows else None
+                if last_ts is not None and new_ts[0] == last_ts:
+                    # Refreshed still-forming candle: replace it in place
+                    self._overwrite_last(partition, generation, rows,
+                                         {column: values[0] for column, values in new_cols.items()})
+                    new_ts = new_ts[1:]
+                    new_cols = {column: values[1:] for column, values in new_cols.items()}
+
+                if len(new_ts) == 0:
+                    pass
+                elif last_ts is None or new_ts[0] > last_ts:
+                    self._append(partition, generation, rows, new_ts, new_cols)
+                    rows += len(new_ts)
+                else:
+                    generation += 1
+                    rows = self._rewrite(partition, old_generation, generation, rows, new_ts, new_cols)
+
+            if covered_start is None and not df.empty:
+                covered_start = df.index[0]
+            if covered_end is None and not df.empty:
+                covered_end = df.index[-1]
+            if covered_start is not None and covered_end is not None and _to_ns(covered_start) <= _to_ns(covered_end):
+                meta['coverage'] = _merge_ranges(meta['coverage'] + [[_to_ns(covered_start), _to_ns(covered_end)]])
+
+            meta['rows'] = rows
+            meta['generation'] = generation
+            meta['updated_at'] = time.time()
+            self._save_meta(partition, meta)
+            if generation != old_generation:
+                self._remove_generation(partition, old_generation)
+
+        return rows
+
+    def _append(self, partition: str, generation: int, rows: int,
+                timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> None:
+        """Write rows after the committed `rows` of every column file."""
+        values = {'timestamp': timestamps.astype(np.int64), **columns}
+        offset = rows * 8
+        for column, data in values.items():
+            path = self._column_path(partition, column, generation)
+            with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+                # Bytes past the committed rows are from an interrupted write
+                f.truncate(offset)
+                f.seek(offset)
+                f.write(data.tobytes())
+
+    def _overwrite_last(self, partition: str, generation: int, rows: int, values: Dict[str, float]) -> None:
+        """Overwrite the newest stored row's OHLCV values."""
+        for column in COLUMNS:
+            column_map = np.memmap(self._column_path(partition, column, generation),
+                                   dtype=np.float64, mode='r+', shape=(rows,))
+            column_map[-1] = values[column]
+            column_map.flush()
+            del column_map
+
+    def _rewrite(self, partition: str, old_generation: int, generation: int, rows: int,
+                 timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Merge back-filled or overlapping rows (new values win) into a new generation.
+
+        The current generation stays untouched until meta.json points at the
+        new one, so a crash leaves the partition as it was.
+        """
+        old_ts = np.array(self._memmap(partition, 'timestamp', rows, old_generation))
+        keep = ~np.isin(old_ts, timestamps)
+        merged_ts = np.concatenate([old_ts[keep], timestamps])
+        order = np.argsort(merged_ts, kind='stable')
+
+        merged = {'timestamp': merged_ts[order]}
+        for column in COLUMNS:
+            old = np.array(self._memmap(partition, column, rows, old_generation))
+            merged[column] = np.concatenate([old[keep], columns[column]])[order]
+
+        # Leftovers of an earlier crashed rewrite to the same generation are replaced
+        os.makedirs(self._generation_dir(partition, generation), exist_ok=True)
+        for column, values in merged.items():
+            with open(self._column_path(partition, column, generation), 'wb') as f:
+                f.write(values.tobytes())
+
+        return len(merged_ts)
+
+    def _remove_generation(self, partition: str, generation: int) -> None:
+        """Delete a superseded generation (open memory maps stay valid)."""
+        if generation:
+            shutil.rmtree(self._generation_dir(partition, generation), ignore_errors=True)
+            return
+        for column in ('timestamp',) + COLUMNS:
+            path = self._column_path(partition, column)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    def load_or_fetch(self, symbol: str, timeframe: str, start: DateLike, end: DateLike,
+                      fetch_fn: FetchFn) -> pd.DataFrame:
+        """
+        Read [start, end], downloading only the intervals not yet stored
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            start: Inclusive start
+            end: Inclusive end
+            fetch_fn: Callable (symbol, timeframe, start_ms, end_ms) -> OHLCV DataFrame
+
+        Returns:
+            Memory-mapped OHLCV DataFrame for the range
+        """
+        now_ms = int(time.time() * 1000)
+        tf_ms = _timeframe_ms(timeframe)
+        for start_ms, end_ms in self.missing_ranges(symbol, timeframe, start, end):
+            logger.info(f"Fetching {symbol} {timeframe} "
+                        f"{pd.Timestamp(start_ms, unit='ms')} to {pd.Timestamp(end_ms, unit='ms')}")
+            fetched = fetch_fn(symbol, timeframe, start_ms, end_ms)
+            if fetched is None:
+                continue
+            # Keep partitions append-only: candles outside the window belong to other fetches
+            fetched = fetched.loc[pd.Timestamp(start_ms, unit='ms'):pd.Timestamp(end_ms, unit='ms')]
+
+            # Candles still forming (open + timeframe in the future) are not final:
+            # drop them and leave everything not yet closed uncovered, so the next
+            # read fetches them again
+            open_ms = fetched.index.values.astype('datetime64[ms]').astype(np.int64)
+            closed = open_ms + tf_ms <= now_ms
+            fetched = fetched[closed]
+
+            # An empty response may be a transient gap; only ranges that returned data count as fetched
+            if fetched.empty:
+                continue
+            # Coverage ends with the last candle received, so the tail of a fetch
+            # that stopped early (e.g. an empty page mid-range) is fetched again
+            covered_end_ms = min(end_ms, int(open_ms[closed].max()) + tf_ms - 1)
+            self.write(symbol, timeframe, fetched,
+                       covered_start=pd.Timestamp(start_ms, unit='ms'),
+                       covered_end=pd.Timestamp(covered_end_ms, unit='ms'))
+
+        return self.read(symbol, timeframe, start, end)
+
+
+def fetch_bybit_klines(symbol: str, timeframe: str, start_ms: int, end_ms: int,
+                       category: str = 'linear', timeout: int = 30) -> Optional[pd.DataFrame]:
+    """
+    Download [start_ms, end_ms] from Bybit's public v5 kline endpoint
+
+    Pages backwards from end_ms (Bybit returns the newest ``limit`` candles
+    of the requested window, newest first).
+
+    Returns:
+        OHLCV DataFrame, or None if a request failed (so coverage is not recorded)
+    """
+    import requests
+
+    symbol = symbol.replace('/', '')
+    interval = BYBIT_INTERVALS.get(timeframe, timeframe)
+    url = "https://api.bybit.com/v5/market/kline"
+
+    all_candles = []
+    current_end = end_ms
+    while current_end >= start_ms:
+        params = {
+            'category': category,
+            'symbol': symbol,
+            'interval': interval,
+            'start': start_ms,
+            'end': current_end,
+            'limit': 1000
+        }
+        response = requests.get(url, params=params, timeout=timeout)
+        if response.status_code != 200:
+            logger.error(f"Bybit kline API error: {response.status_code}")
+            return None
+
+        data = response.json()
+        if data.get('retCode') != 0:
+            logger.error(f"Bybit kline API error: {data.get('retMsg')}")
+            return None
+
+        candles = data.get('result', {}).get('list') or []
+        if not candles:
+            break
+
+        all_candles.extend(candles)
+        oldest = int(candles[-1][0])
+        if oldest <= start_ms or len(candles) < 1000:
+            break
+        current_end = oldest - 1
+
+    if not all_candles:
+        return pd.DataFrame(columns=list(COLUMNS), index=pd.DatetimeIndex([], name='timestamp'))
+
+    rows = np.asarray([candle[:6] for candle in all_candles], dtype=np.float64)
+    df = pd.DataFrame(rows[:, 1:6], columns=list(COLUMNS),
+                      index=pd.DatetimeIndex(pd.to_datetime(rows[:, 0].astype(np.int64), unit='ms'), name='timestamp'))
+    df = df[~df.index.duplicated(keep='first')].sort_index()
+    return df
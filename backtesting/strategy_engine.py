@@ -35,7 +35,8 @@ import pandas as pd
 import numpy as np
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-import time
+import zlib
+import heapq
 
 # Add path for imports
 project_root = os.path.join(os.path.dirname(__file__), '..')
@@ -49,6 +50,18 @@ sys.path.append(utils_path)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    from .exit_simulator import ExitSimulator
+except ImportError:
+    # Loaded by file path outside the package (see core/monitors/ict_enhanced_monitor.py)
+    import importlib.util
+    _exit_spec = importlib.util.spec_from_file_location(
+        "exit_simulator", os.path.join(os.path.dirname(os.path.abspath(__file__)), "exit_simulator.py")
+    )
+    _exit_module = importlib.util.module_from_spec(_exit_spec)
+    _exit_spec.loader.exec_module(_exit_module)
+    ExitSimulator = _exit_module.ExitSimulator
+
 def _try_import(module_name: str):
     """Try multiple import paths for a module and return the module or None."""
     try:
@@ -63,6 +76,7 @@ VolatilityAnalyzer = None
 CorrelationAnalyzer = None
 SignalQualityAnalyzer = None
 MeanReversionAnalyzer = None
+StreamingIndicators = None
 
 _cmod = _try_import('crypto_pairs') or _try_import('utils.crypto_pairs') or _try_import('src.utils.crypto_pairs')
 if _cmod:
@@ -88,6 +102,10 @@ _mrmod = _try_import('mean_reversion') or _try_import('utils.mean_reversion') or
 if _mrmod:
     MeanReversionAnalyzer = getattr(_mrmod, 'MeanReversionAnalyzer', None)
 
+_simod = _try_import('streaming_indicators') or _try_import('utils.streaming_indicators') or _try_import('src.utils.streaming_indicators')
+if _simod:
+    StreamingIndicators = getattr(_simod, 'StreamingIndicators', None)
+
 if not any([CryptoPairs, RiskManager, VolatilityAnalyzer, CorrelationAnalyzer, SignalQualityAnalyzer, MeanReversionAnalyzer]):
     logger.warning('Could not import any utility modules from expected paths; proceeding with None defaults')
 
@@ -115,16 +133,125 @@ class ICTTradingSignal:
     dynamic_rr_calculation: Dict
     indicators: Dict[str, float]
     reasoning: str
+    rng_seed: Optional[int] = None  # Run seed the signal's random draws derive from (None = unseeded)
+
+def nearest_positions(index: pd.DatetimeIndex, timestamps) -> np.ndarray:
+    """
+    Positions of the nearest index entries for one or more timestamps.
+
+    Binary search over the sorted index; equidistant timestamps resolve to the
+    later entry, matching index.get_indexer(..., method='nearest').
+
+    Args:
+        index: Sorted DatetimeIndex to search in
+        timestamps: Timestamp or sequence/index of timestamps
+
+    Returns:
+        Integer positions (zeros if the index is empty)
+    """
+    targets = pd.DatetimeIndex([timestamps] if isinstance(timestamps, (pd.Timestamp, datetime)) else timestamps)
+    if len(index) == 0:
+        return np.zeros(len(targets), dtype=np.intp)
+
+    values = np.asarray(index.values, dtype='datetime64[ns]').view(np.int64)
+    target_values = np.asarray(targets.values, dtype='datetime64[ns]').view(np.int64)
+
+    right = np.minimum(np.searchsorted(values, target_values, side='left'), len(values) - 1)
+    left = np.maximum(right - 1, 0)
+    take_left = (target_values - values[left]) < (values[right] - target_values)
+    return np.where(take_left, left, right)
 
 @dataclass 
 class MultiTimeframeData:
-    """Container for multi-timeframe OHLCV data."""
+    """
+    Container for multi-timeframe OHLCV data.
+
+    The base_to_* tables map every base (1H) bar position to its nearest
+    4H/15m/5m candle position, resolved once when the data is prepared so
+    analyzers never search the frame indexes per call.
+    """
     tf_4h: pd.DataFrame
     tf_15m: pd.DataFrame
     tf_5m: pd.DataFrame
     current_index_4h: int
     current_index_15m: int
     current_index_5m: int
+    base_index: Optional[pd.DatetimeIndex] = None
+    base_to_4h: Optional[np.ndarray] = None
+    base_to_15m: Optional[np.ndarray] = None
+    base_to_5m: Optional[np.ndarray] = None
+
+    def base_position(self, timestamp: pd.Timestamp) -> Optional[int]:
+        """Position of a timestamp in the base index, or None if it is not a base bar"""
+        if self.base_index is None or len(self.base_index) == 0:
+            return None
+        position = int(self.base_index.searchsorted(timestamp))
+        if position < len(self.base_index) and self.base_index[position] == timestamp:
+            return position
+        return None
+
+    def _position(self, table: Optional[np.ndarray], frame: pd.DataFrame,
+                  timestamp: pd.Timestamp, bar: Optional[int]) -> int:
+        if table is not None:
+            if bar is None:
+                bar = self.base_position(timestamp)
+            if bar is not None:
+                return int(table[bar])
+        # Timestamp between base bars (or no table): search the frame directly
+        return int(nearest_positions(frame.index, timestamp)[0])
+
+    def position_4h(self, timestamp: pd.Timestamp, bar: Optional[int] = None) -> int:
+        """Nearest 4H candle position for a timestamp (or its base bar position)"""
+        return self._position(self.base_to_4h, self.tf_4h, timestamp, bar)
+
+    def position_15m(self, timestamp: pd.Timestamp, bar: Optional[int] = None) -> int:
+        """Nearest 15m candle position for a timestamp (or its base bar position)"""
+        return self._position(self.base_to_15m, self.tf_15m, timestamp, bar)
+
+    def position_5m(self, timestamp: pd.Timestamp, bar: Optional[int] = None) -> int:
+        """Nearest 5m candle position for a timestamp (or its base bar position)"""
+        return self._position(self.base_to_5m, self.tf_5m, timestamp, bar)
+
+@dataclass
+class ConfluenceFeatures:
+    """
+    Confluence analyzer inputs for every base (1H) bar, precomputed in one
+    vectorized pass over the 4H and 15m frames.
+
+    Every array has one entry per base bar. Analyzers given these features
+    read a single element instead of re-slicing and re-aggregating the frames.
+    """
+    idx_4h: np.ndarray  # Nearest 4H position per base bar
+    idx_15m: np.ndarray  # Nearest 15m position per base bar
+
+    # 4H: market regime (10-candle window) and directional bias (5-candle window)
+    regime_avg_change: np.ndarray
+    regime_directional_ratio: np.ndarray
+    bias_avg_change: np.ndarray
+
+    # 4H: supply/demand zones (21-candle range, prior 10-candle volume)
+    close_4h: np.ndarray
+    volume_4h: np.ndarray
+    sd_recent_high: np.ndarray
+    sd_recent_low: np.ndarray
+    sd_avg_volume: np.ndarray
+
+    # 4H: liquidity levels (5-candle extremes, 16-candle volume)
+    liq_recent_high: np.ndarray
+    liq_recent_low: np.ndarray
+    liq_avg_volume: np.ndarray
+
+    # 15m: entry price, FVG volatility, order blocks, structure, premium/discount
+    close_15m: np.ndarray
+    fvg_avg_change: np.ndarray
+    ob_range_percent: np.ndarray
+    ob_volume_factor: np.ndarray
+    structure_change: np.ndarray
+    pd_price_position: np.ndarray
+
+    # 15m: ATR and normalized volatility as of each base bar (for stop placement)
+    atr_15m: Optional[np.ndarray] = None
+    volatility_15m: Optional[np.ndarray] = None
 
 class ICTStrategyEngine:
     """
@@ -139,8 +266,19 @@ class ICTStrategyEngine:
     - Liquidity sweep detection
     """
     
-    def __init__(self, config_path: str = "config/"):
-        """Initialize ICT strategy engine with quant enhancements."""
+    def __init__(self, config_path: str = "config/", random_seed: Optional[int] = None):
+        """
+        Initialize ICT strategy engine with quant enhancements.
+        
+        Args:
+            config_path: Directory with pair/risk configuration
+            random_seed: Run seed for the probabilistic confluence draws. None keeps
+                live behaviour (fresh entropy per signal) for generate_ict_signal;
+                backtests then draw and record a seed per run.
+        """
+        self.random_seed = random_seed
+        self.last_simulation_seed: Optional[int] = None
+        
         # Try to load utilities if available
         if CryptoPairs:
             self.crypto_pairs = CryptoPairs(config_path)
@@ -162,6 +300,14 @@ class ICTStrategyEngine:
             self.mean_reversion_analyzer = None
             logger.info("⚠️  Quant enhancements DISABLED (baseline mode)")
         
+        # 15m ATR/volatility/Bollinger/z-score per symbol, advanced only by new candles
+        # on the per-signal (live) path instead of recomputed over the whole frame
+        self.streaming_indicators = None
+        if StreamingIndicators and self.volatility_analyzer:
+            self.streaming_indicators = StreamingIndicators.for_analyzers(
+                self.volatility_analyzer, self.mean_reversion_analyzer
+            )
+        
         # Active positions tracking for correlation analysis
         self.active_positions = []
         
@@ -180,6 +326,7 @@ class ICTStrategyEngine:
             # Risk Management
             'fixed_risk_percentage': 0.01,  # 1% fixed risk per trade
             'max_positions': 3,  # Maximum concurrent positions
+            'max_hold_hours': None,  # Backtest time-limit exit (None = hold until SL/TP)
             'base_stop_multiplier': 0.008,  # Base stop loss %
             'confidence_stop_range': 0.007,  # Additional stop based on confidence
             
@@ -211,6 +358,32 @@ class ICTStrategyEngine:
         
         logger.info("ICT Strategy Engine initialized with multi-timeframe analysis")
     
+    def signal_rng(self, symbol: str, current_time: pd.Timestamp,
+                   random_seed: Optional[int] = None) -> np.random.Generator:
+        """
+        Random stream for one symbol/bar signal evaluation.
+        
+        Seeded runs derive an independent substream per (symbol, bar timestamp)
+        from the run seed, equivalent to SeedSequence.spawn but addressable by
+        key, so a bar gets the same draws whether a backtest runs sequentially,
+        sharded across processes, or resumes from a cache.
+        
+        Args:
+            symbol: Trading symbol
+            current_time: Bar timestamp being evaluated
+            random_seed: Run seed (defaults to the engine's random_seed)
+            
+        Returns:
+            numpy Generator (fresh OS entropy when no seed is configured)
+        """
+        seed = self.random_seed if random_seed is None else random_seed
+        if seed is None:
+            return np.random.default_rng()
+        
+        symbol_key = zlib.crc32(symbol.encode('utf-8'))
+        bar_key = int(pd.Timestamp(current_time).value) & 0xFFFFFFFFFFFFFFFF
+        return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(symbol_key, bar_key)))
+    
     def _get_nearest_index(self, index: pd.DatetimeIndex, timestamp: pd.Timestamp) -> int:
         """
         Get nearest index position for a timestamp in a pandas-version-agnostic way.
@@ -225,19 +398,7 @@ class ICTStrategyEngine:
         Returns:
             Integer index position of nearest timestamp
         """
-        try:
-            # Try exact match first
-            return index.get_loc(timestamp)
-        except KeyError:
-            # Find nearest using get_indexer with nearest method
-            indexer = index.get_indexer([timestamp], method='nearest')
-            return indexer[0] if len(indexer) > 0 else 0
-        except TypeError:
-            # Fallback: manual search for nearest
-            if len(index) == 0:
-                return 0
-            time_diffs = abs(index - timestamp)
-            return time_diffs.argmin()
+        return int(nearest_positions(index, timestamp)[0])
     
     def prepare_multitimeframe_data(self, df_1h: pd.DataFrame) -> MultiTimeframeData:
         """
@@ -276,55 +437,203 @@ class ICTStrategyEngine:
             'volume': 'sum'
         }).interpolate().dropna()
         
+        # Resolve every base bar to its 4H/15m/5m candle once
+        base_index = df_1h.index
+        
         return MultiTimeframeData(
             tf_4h=tf_4h,
             tf_15m=tf_15m,
             tf_5m=tf_5m,
             current_index_4h=0,
             current_index_15m=0,
-            current_index_5m=0
+            current_index_5m=0,
+            base_index=base_index,
+            base_to_4h=nearest_positions(tf_4h.index, base_index),
+            base_to_15m=nearest_positions(tf_15m.index, base_index),
+            base_to_5m=nearest_positions(tf_5m.index, base_index)
+        )
+
+    def precompute_confluence_features(self, mtf_data: MultiTimeframeData,
+                                       base_index: pd.DatetimeIndex) -> ConfluenceFeatures:
+        """
+        Precompute every confluence analyzer input for a whole history.
+
+        Rolling max/min, pct-change means, volume ratios and range positions
+        are computed once per frame and gathered onto the base (1H) bars, so
+        bar-by-bar signal generation becomes array lookups. Values match the
+        per-bar analyzers, which slice the same windows around the nearest
+        4H/15m candle.
+
+        Args:
+            mtf_data: Multi-timeframe data from prepare_multitimeframe_data
+            base_index: Base bar timestamps signals are generated at
+
+        Returns:
+            ConfluenceFeatures aligned to base_index
+        """
+        tf_4h = mtf_data.tf_4h
+        tf_15m = mtf_data.tf_15m
+
+        # Reuse the alignment tables when features are built for the prepared base bars
+        if mtf_data.base_index is not None and base_index.equals(mtf_data.base_index):
+            idx_4h = mtf_data.base_to_4h
+            idx_15m = mtf_data.base_to_15m
+        else:
+            idx_4h = nearest_positions(tf_4h.index, base_index)
+            idx_15m = nearest_positions(tf_15m.index, base_index)
+
+        # ---- 4H frame ----
+        close_4h = tf_4h['close']
+        volume_4h = tf_4h['volume']
+        changes_4h = close_4h.pct_change()
+
+        positive_moves = (changes_4h > 0).rolling(10).sum()
+        negative_moves = (changes_4h < 0).rolling(10).sum()
+        total_moves = changes_4h.rolling(10).count()
+        directional_ratio = np.where(
+            total_moves > 0,
+            np.maximum(positive_moves, negative_moves) / total_moves.where(total_moves > 0, 1),
+            0.5
         )
+
+        # ---- 15m frame ----
+        close_15m = tf_15m['close']
+        volume_15m = tf_15m['volume']
+        ob_high = tf_15m['high'].rolling(11).max()
+        ob_low = tf_15m['low'].rolling(11).min()
+        ob_avg_volume = volume_15m.rolling(11).mean()
+        pd_high = tf_15m['high'].rolling(21).max()
+        pd_low = tf_15m['low'].rolling(21).min()
+        pd_range = pd_high - pd_low
+        close_5_ago = close_15m.shift(5)
+
+        def at_4h(values) -> np.ndarray:
+            return np.asarray(values, dtype=np.float64)[idx_4h]
+
+        def at_15m(values) -> np.ndarray:
+            return np.asarray(values, dtype=np.float64)[idx_15m]
+
+        features = ConfluenceFeatures(
+            idx_4h=idx_4h,
+            idx_15m=idx_15m,
+            regime_avg_change=at_4h(changes_4h.rolling(10).mean() * 100),
+            regime_directional_ratio=at_4h(directional_ratio),
+            bias_avg_change=at_4h(changes_4h.rolling(5).mean() * 100),
+            close_4h=at_4h(close_4h),
+            volume_4h=at_4h(volume_4h),
+            sd_recent_high=at_4h(tf_4h['high'].rolling(21).max()),
+            sd_recent_low=at_4h(tf_4h['low'].rolling(21).min()),
+            sd_avg_volume=at_4h(volume_4h.rolling(10).mean().shift(1)),
+            liq_recent_high=at_4h(tf_4h['high'].rolling(5).max()),
+            liq_recent_low=at_4h(tf_4h['low'].rolling(5).min()),
+            liq_avg_volume=at_4h(volume_4h.rolling(16).mean()),
+            close_15m=at_15m(close_15m),
+            fvg_avg_change=at_15m(close_15m.pct_change().abs().rolling(5).mean() * 100),
+            ob_range_percent=at_15m(((ob_high - ob_low) / close_15m) * 100),
+            ob_volume_factor=at_15m(np.where(
+                ob_avg_volume > 0,
+                np.minimum(volume_15m / ob_avg_volume.where(ob_avg_volume > 0, 1), 2.0),
+                1.0
+            )),
+            structure_change=at_15m(((close_15m - close_5_ago) / close_5_ago) * 100),
+            pd_price_position=at_15m(np.where(
+                pd_range > 0,
+                (close_15m - pd_low) / pd_range.where(pd_range > 0, 1),
+                0.5
+            ))
+        )
+
+        # ATR/volatility as of each bar (stop placement only runs for passing signals,
+        # but recomputing them over the full history per signal dominates long backtests)
+        if self.volatility_analyzer:
+            # Rows up to and including each bar, matching tf_15m.loc[:current_time]
+            loc_15m = tf_15m.index.searchsorted(base_index, side='right') - 1
+            valid = loc_15m >= 0
+            loc_15m = np.clip(loc_15m, 0, None)
+
+            atr = self.volatility_analyzer.calculate_atr(tf_15m, self.volatility_analyzer.atr_period).to_numpy()
+            volatility = (close_15m.pct_change().rolling(20).std() * np.sqrt(365)).to_numpy()
+            # calculate_normalized_volatility falls back to 0.03 below 20 candles
+            volatility = np.where(np.arange(len(tf_15m)) < 19, 0.03, volatility)
+
+            features.atr_15m = np.where(valid, atr[loc_15m], np.nan)
+            features.volatility_15m = np.where(valid, volatility[loc_15m], 0.03)
+
+        return features
+
+    def _streaming_15m_values(self, symbol: str, mtf_data: MultiTimeframeData,
+                              current_time: pd.Timestamp) -> Tuple[Optional[Dict], Optional[float]]:
+        """
+        15m indicator values as of current_time from the symbol's stream.
+        
+        Equal to running the analyzers over tf_15m.loc[:current_time], but
+        only candles the stream has not seen are replayed. 15m candles after
+        the previous 1H bar are interpolated from the current (live: still
+        forming) 1H candle, so they are evaluated without being committed.
+        
+        Returns:
+            Tuple of (indicator values, close of the last 15m candle), or (None, None)
+        """
+        frame = mtf_data.tf_15m.loc[:current_time]
+        if frame.empty:
+            return None, None
+        
+        final_until = None
+        base_index = mtf_data.base_index
+        if base_index is not None and len(base_index) > 0:
+            previous = int(base_index.searchsorted(current_time)) - 1
+            final_until = base_index[previous] if previous >= 0 else frame.index[0] - pd.Timedelta(1, 'ns')
+        
+        values = self.streaming_indicators.sync(symbol, '15m', frame, final_until=final_until)
+        return values, float(frame['close'].iloc[-1])
     
-    def detect_market_regime(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp) -> str:
+    def detect_market_regime(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp,
+                             features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> str:
         """
         Detect market regime using 4H timeframe analysis.
-        
+
         Args:
             mtf_data: Multi-timeframe data
             current_time: Current timestamp
-            
+            features: Precomputed confluence features (batch mode)
+            bar: Position of current_time in the base (1H) index, if known
+
         Returns:
             Market regime: 'trending' or 'sideways'
         """
-        tf_4h = mtf_data.tf_4h
-        
-        # Find current 4H index using pandas-agnostic helper
-        try:
-            current_4h_idx = self._get_nearest_index(tf_4h.index, current_time)
-        except (KeyError, IndexError):
-            return 'sideways'
-        
-        if current_4h_idx < 10:  # Need sufficient history
-            return 'sideways'
-        
-        # Analyze last 10 4H candles for trend detection
-        recent_data = tf_4h.iloc[current_4h_idx-10:current_4h_idx+1]
-        
-        # Calculate price momentum and trend strength
-        price_changes = recent_data['close'].pct_change().dropna()
-        avg_change = price_changes.mean() * 100
-        trend_strength = abs(avg_change)
-        
-        # Calculate trending ratio (% of moves in same direction)
-        positive_moves = (price_changes > 0).sum()
-        negative_moves = (price_changes < 0).sum()
-        total_moves = len(price_changes)
-        
-        if total_moves > 0:
-            directional_ratio = max(positive_moves, negative_moves) / total_moves
+        if features is not None:
+            if features.idx_4h[bar] < 10:  # Need sufficient history
+                return 'sideways'
+            avg_change = features.regime_avg_change[bar]
+            trend_strength = abs(avg_change)
+            directional_ratio = features.regime_directional_ratio[bar]
         else:
-            directional_ratio = 0.5
-        
+            tf_4h = mtf_data.tf_4h
+
+            # Nearest 4H candle from the precomputed alignment table
+            current_4h_idx = mtf_data.position_4h(current_time, bar)
+
+            if current_4h_idx < 10:  # Need sufficient history
+                return 'sideways'
+
+            # Analyze last 10 4H candles for trend detection
+            recent_data = tf_4h.iloc[current_4h_idx-10:current_4h_idx+1]
+
+            # Calculate price momentum and trend strength
+            price_changes = recent_data['close'].pct_change().dropna()
+            avg_change = price_changes.mean() * 100
+            trend_strength = abs(avg_change)
+
+            # Calculate trending ratio (% of moves in same direction)
+            positive_moves = (price_changes > 0).sum()
+            negative_moves = (price_changes < 0).sum()
+            total_moves = len(price_changes)
+
+            if total_moves > 0:
+                directional_ratio = max(positive_moves, negative_moves) / total_moves
+            else:
+                directional_ratio = 0.5
+
         # Determine regime
         if trend_strength > self.ict_params['trend_threshold'] and directional_ratio >= 0.6:
             regime = 'trending'
@@ -334,16 +643,21 @@ class ICTStrategyEngine:
         logger.debug(f"Market Regime: {regime} (strength: {trend_strength:.2f}%, ratio: {directional_ratio:.2f})")
         return regime
     
-    def analyze_supply_demand_zones(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp) -> Dict:
+    def analyze_supply_demand_zones(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp,
+                                    features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> Dict:
         """Analyze supply and demand zones using multi-timeframe confluence."""
         tf_4h = mtf_data.tf_4h
         # tf_15m not used, removed to fix linting issue
         
-        try:
-            current_4h_idx = self._get_nearest_index(tf_4h.index, current_time)
-            current_price = tf_4h.iloc[current_4h_idx]['close']
-        except (KeyError, IndexError):
-            return {'score': 0, 'factors': []}
+        if features is not None:
+            current_4h_idx = features.idx_4h[bar]
+            current_price = features.close_4h[bar]
+        else:
+            try:
+                current_4h_idx = mtf_data.position_4h(current_time, bar)
+                current_price = tf_4h.iloc[current_4h_idx]['close']
+            except (KeyError, IndexError):
+                return {'score': 0, 'factors': []}
         
         confluence_score = 0
         factors = []
@@ -352,13 +666,17 @@ class ICTStrategyEngine:
             return {'score': confluence_score, 'factors': factors}
         
         # Look for recent swing highs/lows as supply/demand zones
-        recent_4h = tf_4h.iloc[current_4h_idx-20:current_4h_idx+1]
-        highs = recent_4h['high']
-        lows = recent_4h['low']
-        
-        # Identify key levels
-        recent_high = highs.max()
-        recent_low = lows.min()
+        if features is not None:
+            recent_high = features.sd_recent_high[bar]
+            recent_low = features.sd_recent_low[bar]
+        else:
+            recent_4h = tf_4h.iloc[current_4h_idx-20:current_4h_idx+1]
+            highs = recent_4h['high']
+            lows = recent_4h['low']
+
+            # Identify key levels
+            recent_high = highs.max()
+            recent_low = lows.min()
         
         # Distance to key levels
         distance_to_high = abs(current_price - recent_high) / current_price
@@ -376,8 +694,12 @@ class ICTStrategyEngine:
         
         # Volume analysis for zone strength
         if current_4h_idx > 0:
-            recent_volume = tf_4h.iloc[current_4h_idx]['volume']
-            avg_volume = tf_4h.iloc[current_4h_idx-10:current_4h_idx]['volume'].mean()
+            if features is not None:
+                recent_volume = features.volume_4h[bar]
+                avg_volume = features.sd_avg_volume[bar]
+            else:
+                recent_volume = tf_4h.iloc[current_4h_idx]['volume']
+                avg_volume = tf_4h.iloc[current_4h_idx-10:current_4h_idx]['volume'].mean()
             
             if recent_volume > avg_volume * 1.5:
                 confluence_score += 0.08
@@ -385,15 +707,20 @@ class ICTStrategyEngine:
         
         return {'score': confluence_score, 'factors': factors}
     
-    def analyze_liquidity_levels(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp) -> Dict:
+    def analyze_liquidity_levels(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp,
+                                 features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> Dict:
         """Analyze liquidity levels and potential sweep opportunities."""
         tf_4h = mtf_data.tf_4h
         
-        try:
-            current_4h_idx = self._get_nearest_index(tf_4h.index, current_time)
-            current_price = tf_4h.iloc[current_4h_idx]['close']
-        except (KeyError, IndexError):
-            return {'score': 0, 'factors': []}
+        if features is not None:
+            current_4h_idx = features.idx_4h[bar]
+            current_price = features.close_4h[bar]
+        else:
+            try:
+                current_4h_idx = mtf_data.position_4h(current_time, bar)
+                current_price = tf_4h.iloc[current_4h_idx]['close']
+            except (KeyError, IndexError):
+                return {'score': 0, 'factors': []}
         
         confluence_score = 0
         factors = []
@@ -401,16 +728,20 @@ class ICTStrategyEngine:
         if current_4h_idx < 15:
             return {'score': confluence_score, 'factors': factors}
         
-        # Analyze recent price action for liquidity sweeps
-        recent_data = tf_4h.iloc[current_4h_idx-15:current_4h_idx+1]
-        
-        # Look for equal highs/lows (liquidity pools)
-        highs = recent_data['high']
-        lows = recent_data['low']
-        
-        # Find potential liquidity levels
-        recent_high = highs.rolling(window=5).max().iloc[-1]
-        recent_low = lows.rolling(window=5).min().iloc[-1]
+        if features is not None:
+            recent_high = features.liq_recent_high[bar]
+            recent_low = features.liq_recent_low[bar]
+        else:
+            # Analyze recent price action for liquidity sweeps
+            recent_data = tf_4h.iloc[current_4h_idx-15:current_4h_idx+1]
+
+            # Look for equal highs/lows (liquidity pools)
+            highs = recent_data['high']
+            lows = recent_data['low']
+
+            # Find potential liquidity levels
+            recent_high = highs.rolling(window=5).max().iloc[-1]
+            recent_low = lows.rolling(window=5).min().iloc[-1]
         
         # Check for liquidity sweep setups
         price_near_high = abs(current_price - recent_high) / current_price < 0.015
@@ -425,8 +756,12 @@ class ICTStrategyEngine:
             factors.append("Sell-side Liquidity Sweep Setup")
         
         # Volume confirmation for liquidity levels
-        current_volume = tf_4h.iloc[current_4h_idx]['volume']
-        avg_volume = recent_data['volume'].mean()
+        if features is not None:
+            current_volume = features.volume_4h[bar]
+            avg_volume = features.liq_avg_volume[bar]
+        else:
+            current_volume = tf_4h.iloc[current_4h_idx]['volume']
+            avg_volume = recent_data['volume'].mean()
         
         if current_volume > avg_volume * 1.3:
             confluence_score += 0.06
@@ -451,23 +786,27 @@ class ICTStrategyEngine:
         else:  # Off-hours
             return 0.6
     
-    def calculate_directional_bias(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp) -> Dict:
+    def calculate_directional_bias(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp,
+                                   features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> Dict:
         """Calculate directional bias using 4H timeframe."""
         tf_4h = mtf_data.tf_4h
         
-        try:
-            current_4h_idx = self._get_nearest_index(tf_4h.index, current_time)
-        except (KeyError, IndexError):
-            return {'direction': 'NEUTRAL', 'strength': 0.5}
+        if features is not None:
+            current_4h_idx = features.idx_4h[bar]
+        else:
+            current_4h_idx = mtf_data.position_4h(current_time, bar)
         
         if current_4h_idx < 5:
             return {'direction': 'NEUTRAL', 'strength': 0.5}
         
-        # Analyze last 5 4H candles for directional bias
-        recent_closes = tf_4h.iloc[current_4h_idx-5:current_4h_idx+1]['close']
-        price_changes = recent_closes.pct_change().dropna()
-        
-        avg_change = price_changes.mean() * 100
+        if features is not None:
+            avg_change = features.bias_avg_change[bar]
+        else:
+            # Analyze last 5 4H candles for directional bias
+            recent_closes = tf_4h.iloc[current_4h_idx-5:current_4h_idx+1]['close']
+            price_changes = recent_closes.pct_change().dropna()
+
+            avg_change = price_changes.mean() * 100
         
         if avg_change > 1.5:
             return {'direction': 'BULLISH', 'strength': min(avg_change / 5.0, 1.0)}
@@ -476,7 +815,9 @@ class ICTStrategyEngine:
         else:
             return {'direction': 'NEUTRAL', 'strength': 0.5}
     
-    def generate_ict_signal(self, symbol: str, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, account_balance: float = 10000) -> Optional[ICTTradingSignal]:
+    def generate_ict_signal(self, symbol: str, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, account_balance: float = 10000,
+                            features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None,
+                            random_seed: Optional[int] = None) -> Optional[ICTTradingSignal]:
         """
         Generate ICT trading signal using multi-timeframe confluence analysis.
         
@@ -485,15 +826,22 @@ class ICTStrategyEngine:
             mtf_data: Multi-timeframe OHLCV data
             current_time: Current timestamp for analysis
             account_balance: Current account balance for 1% risk calculation (default: 10000 for backtesting)
+            features: Precomputed confluence features for batch backtests (see precompute_confluence_features)
+            bar: Position of current_time in the base (1H) index (resolved from mtf_data if None)
+            random_seed: Run seed for the signal's random draws (defaults to the engine's random_seed)
             
         Returns:
             ICTTradingSignal or None if no signal generated
         """
+        # Resolve the base bar once; analyzers read the alignment tables with it
+        if bar is None:
+            bar = mtf_data.base_position(current_time)
+        
         # Step 1: Market regime detection (4H timeframe)
-        market_regime = self.detect_market_regime(mtf_data, current_time)
+        market_regime = self.detect_market_regime(mtf_data, current_time, features, bar)
         
         # Step 2: Directional bias (4H timeframe)
-        directional_bias = self.calculate_directional_bias(mtf_data, current_time)
+        directional_bias = self.calculate_directional_bias(mtf_data, current_time, features, bar)
         
         # Step 3: Session multiplier
         session_multiplier = self.get_session_multiplier(current_time)
@@ -505,20 +853,25 @@ class ICTStrategyEngine:
         adjusted_prob = base_prob * session_multiplier * regime_multiplier
         
         # Step 5: Probabilistic signal generation
-        rng = np.random.default_rng(int(time.time() * 1000000) % 2**32)
+        if random_seed is None:
+            random_seed = self.random_seed
+        rng = self.signal_rng(symbol, current_time, random_seed)
         signal_chance = rng.random()
         
         if signal_chance >= adjusted_prob:
             return None  # No signal generated
         
         # Step 6: Get current price data
-        try:
-            tf_15m = mtf_data.tf_15m
-            current_15m_idx = self._get_nearest_index(tf_15m.index, current_time)
-            current_price_data = tf_15m.iloc[current_15m_idx]
-            entry_price = current_price_data['close']
-        except (KeyError, IndexError):
-            return None
+        if features is not None:
+            entry_price = features.close_15m[bar]
+        else:
+            try:
+                tf_15m = mtf_data.tf_15m
+                current_15m_idx = mtf_data.position_15m(current_time, bar)
+                current_price_data = tf_15m.iloc[current_15m_idx]
+                entry_price = current_price_data['close']
+            except (KeyError, IndexError):
+                return None
         
         # Step 7: ICT Confluence Analysis
         confluence_score = 0.05  # Base confluence
@@ -529,32 +882,32 @@ class ICTStrategyEngine:
             return None
         
         # Supply/Demand Zone Analysis
-        supply_demand = self.analyze_supply_demand_zones(mtf_data, current_time)
+        supply_demand = self.analyze_supply_demand_zones(mtf_data, current_time, features, bar)
         confluence_score += supply_demand['score']
         confluence_factors.extend(supply_demand['factors'])
         
         # Liquidity Level Analysis
-        liquidity = self.analyze_liquidity_levels(mtf_data, current_time)
+        liquidity = self.analyze_liquidity_levels(mtf_data, current_time, features, bar)
         confluence_score += liquidity['score']
         confluence_factors.extend(liquidity['factors'])
         
         # Fair Value Gap Analysis
-        fvg_analysis = self._analyze_fair_value_gaps(mtf_data, current_time, rng)
+        fvg_analysis = self._analyze_fair_value_gaps(mtf_data, current_time, rng, features, bar)
         confluence_score += fvg_analysis['score']
         confluence_factors.extend(fvg_analysis['factors'])
         
         # Order Block Analysis
-        ob_analysis = self._analyze_order_blocks(mtf_data, current_time, rng)
+        ob_analysis = self._analyze_order_blocks(mtf_data, current_time, rng, features, bar)
         confluence_score += ob_analysis['score']
         confluence_factors.extend(ob_analysis['factors'])
         
         # Market Structure Analysis
-        structure_analysis = self._analyze_market_structure(mtf_data, current_time, market_regime, rng)
+        structure_analysis = self._analyze_market_structure(mtf_data, current_time, market_regime, rng, features, bar)
         confluence_score += structure_analysis['score']
         confluence_factors.extend(structure_analysis['factors'])
         
         # Premium/Discount Analysis
-        premium_discount = self._analyze_premium_discount(mtf_data, current_time)
+        premium_discount = self._analyze_premium_discount(mtf_data, current_time, features, bar)
         confluence_score += premium_discount['score']
         confluence_factors.extend(premium_discount['factors'])
         
@@ -580,14 +933,28 @@ class ICTStrategyEngine:
         
         logger.debug(f"💰 Risk Calculation: Balance=${portfolio_balance:.2f} × {fixed_risk_percentage*100}% = ${risk_amount:.2f} per trade")
         
+        # Per-signal path: indicator values from the symbol's 15m stream
+        stream_values, stream_close = None, None
+        if features is None and self.streaming_indicators is not None:
+            stream_values, stream_close = self._streaming_15m_values(symbol, mtf_data, current_time)
+        
         # =================================================================
         # STEP 1: Calculate ATR-based stop loss first
         # =================================================================
         if self.volatility_analyzer:
-            atr_analysis = self.volatility_analyzer.get_atr_analysis(
-                mtf_data.tf_15m.loc[:current_time],
-                entry_price
-            )
+            if features is not None and features.atr_15m is not None:
+                atr_analysis = self.volatility_analyzer.get_atr_analysis_from_values(
+                    features.atr_15m[bar], features.volatility_15m[bar], entry_price
+                )
+            elif stream_values is not None:
+                atr_analysis = self.volatility_analyzer.get_atr_analysis_from_values(
+                    stream_values['atr'], stream_values['volatility'], entry_price
+                )
+            else:
+                atr_analysis = self.volatility_analyzer.get_atr_analysis(
+                    mtf_data.tf_15m.loc[:current_time],
+                    entry_price
+                )
             stop_loss = self.volatility_analyzer.calculate_dynamic_stop_loss(
                 entry_price=entry_price,
                 atr=atr_analysis['atr'],
@@ -637,13 +1004,20 @@ class ICTStrategyEngine:
         # QUANT ENHANCEMENTS: Mean Reversion, Signal Quality
         # =================================================================
         position_size_multiplier = 1.0
-        if self.mean_reversion_analyzer:
-            mr_analysis = self.mean_reversion_analyzer.analyze_price_extension(
-                mtf_data.tf_15m.loc[:current_time],
-                action
-            )
-            # Only use multiplier if explicitly enabled in config
-            use_mr_multiplier = self.ict_params.get('quant_enhancements', {}).get('mean_reversion', {}).get('use_position_multiplier', False)
+        # Only use multiplier if explicitly enabled in config
+        use_mr_multiplier = self.ict_params.get('quant_enhancements', {}).get('mean_reversion', {}).get('use_position_multiplier', False)
+        # Batch backtests skip the log-only analysis when the multiplier is disabled
+        if self.mean_reversion_analyzer and (use_mr_multiplier or features is None):
+            if stream_values is not None:
+                mr_analysis = self.mean_reversion_analyzer.analyze_price_extension_from_values(
+                    stream_close, stream_values['bb_upper'], stream_values['bb_middle'],
+                    stream_values['bb_lower'], stream_values['zscore'], action
+                )
+            else:
+                mr_analysis = self.mean_reversion_analyzer.analyze_price_extension(
+                    mtf_data.tf_15m.loc[:current_time],
+                    action
+                )
             if use_mr_multiplier:
                 position_size_multiplier = mr_analysis['position_multiplier']
                 logger.debug(f"📉 Mean Reversion: {mr_analysis['condition']} | Size adjust: {position_size_multiplier}x")
@@ -729,7 +1103,8 @@ class ICTStrategyEngine:
                 'target_type': target_type,
                 'actual_rr': actual_rr_ratio
             },
-            reasoning="; ".join(confluence_factors[:3])  # Top 3 factors
+            reasoning="; ".join(confluence_factors[:3]),  # Top 3 factors
+            rng_seed=random_seed
         )
         
         logger.info(f"ICT Signal: {symbol} {action} @ ${entry_price:.4f} | Confluence: {confluence_score:.3f} | RR: 1:{actual_rr_ratio:.1f} ({target_type})")
@@ -748,14 +1123,15 @@ class ICTStrategyEngine:
         
         return True
     
-    def _analyze_fair_value_gaps(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, rng: np.random.Generator) -> Dict:
+    def _analyze_fair_value_gaps(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, rng: np.random.Generator,
+                                 features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> Dict:
         """Analyze Fair Value Gaps using 15m timeframe."""
         tf_15m = mtf_data.tf_15m
         
-        try:
-            current_idx = self._get_nearest_index(tf_15m.index, current_time)
-        except (KeyError, IndexError):
-            return {'score': 0, 'factors': []}
+        if features is not None:
+            current_idx = features.idx_15m[bar]
+        else:
+            current_idx = mtf_data.position_15m(current_time, bar)
         
         if current_idx < 5:
             return {'score': 0, 'factors': []}
@@ -764,9 +1140,12 @@ class ICTStrategyEngine:
         factors = []
         
         # Calculate recent volatility for FVG analysis
-        recent_data = tf_15m.iloc[current_idx-5:current_idx+1]
-        price_changes = recent_data['close'].pct_change().abs()
-        avg_change = price_changes.mean() * 100
+        if features is not None:
+            avg_change = features.fvg_avg_change[bar]
+        else:
+            recent_data = tf_15m.iloc[current_idx-5:current_idx+1]
+            price_changes = recent_data['close'].pct_change().abs()
+            avg_change = price_changes.mean() * 100
         
         # FVG analysis based on volatility
         if avg_change > 1.5:  # High volatility = guaranteed FVG
@@ -781,15 +1160,19 @@ class ICTStrategyEngine:
         
         return {'score': confluence_score, 'factors': factors}
     
-    def _analyze_order_blocks(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, rng: np.random.Generator) -> Dict:
+    def _analyze_order_blocks(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, rng: np.random.Generator,
+                              features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> Dict:
         """Analyze Order Blocks using 15m timeframe."""
         tf_15m = mtf_data.tf_15m
         
-        try:
-            current_idx = self._get_nearest_index(tf_15m.index, current_time)
-            current_data = tf_15m.iloc[current_idx]
-        except (KeyError, IndexError):
-            return {'score': 0, 'factors': []}
+        if features is not None:
+            current_idx = features.idx_15m[bar]
+        else:
+            try:
+                current_idx = mtf_data.position_15m(current_time, bar)
+                current_data = tf_15m.iloc[current_idx]
+            except (KeyError, IndexError):
+                return {'score': 0, 'factors': []}
         
         if current_idx < 10:
             return {'score': 0, 'factors': []}
@@ -797,19 +1180,23 @@ class ICTStrategyEngine:
         confluence_score = 0
         factors = []
         
-        # Calculate recent price range for OB analysis
-        recent_data = tf_15m.iloc[current_idx-10:current_idx+1]
-        high_24h = recent_data['high'].max()
-        low_24h = recent_data['low'].min()
-        current_price = current_data['close']
-        
-        range_24h = high_24h - low_24h
-        range_percent = (range_24h / current_price) * 100
-        
-        # Volume analysis
-        current_volume = current_data['volume']
-        avg_volume = recent_data['volume'].mean()
-        volume_factor = min(current_volume / avg_volume, 2.0) if avg_volume > 0 else 1.0
+        if features is not None:
+            range_percent = features.ob_range_percent[bar]
+            volume_factor = features.ob_volume_factor[bar]
+        else:
+            # Calculate recent price range for OB analysis
+            recent_data = tf_15m.iloc[current_idx-10:current_idx+1]
+            high_24h = recent_data['high'].max()
+            low_24h = recent_data['low'].min()
+            current_price = current_data['close']
+
+            range_24h = high_24h - low_24h
+            range_percent = (range_24h / current_price) * 100
+
+            # Volume analysis
+            current_volume = current_data['volume']
+            avg_volume = recent_data['volume'].mean()
+            volume_factor = min(current_volume / avg_volume, 2.0) if avg_volume > 0 else 1.0
         
         # Order block analysis
         if range_percent > 3:  # Wide range = strong order blocks
@@ -824,14 +1211,15 @@ class ICTStrategyEngine:
         
         return {'score': confluence_score, 'factors': factors}
     
-    def _analyze_market_structure(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, market_regime: str, rng: np.random.Generator) -> Dict:
+    def _analyze_market_structure(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp, market_regime: str, rng: np.random.Generator,
+                                  features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> Dict:
         """Analyze Market Structure Shifts."""
         tf_15m = mtf_data.tf_15m
         
-        try:
-            current_idx = self._get_nearest_index(tf_15m.index, current_time)
-        except (KeyError, IndexError):
-            return {'score': 0, 'factors': []}
+        if features is not None:
+            current_idx = features.idx_15m[bar]
+        else:
+            current_idx = mtf_data.position_15m(current_time, bar)
         
         if current_idx < 5:
             return {'score': 0, 'factors': []}
@@ -840,9 +1228,12 @@ class ICTStrategyEngine:
         factors = []
         
         # Calculate recent momentum
-        recent_data = tf_15m.iloc[current_idx-5:current_idx+1]
-        price_change = ((recent_data['close'].iloc[-1] - recent_data['close'].iloc[0]) / 
-                       recent_data['close'].iloc[0]) * 100
+        if features is not None:
+            price_change = features.structure_change[bar]
+        else:
+            recent_data = tf_15m.iloc[current_idx-5:current_idx+1]
+            price_change = ((recent_data['close'].iloc[-1] - recent_data['close'].iloc[0]) / 
+                           recent_data['close'].iloc[0]) * 100
         
         change_magnitude = abs(price_change)
         
@@ -863,14 +1254,15 @@ class ICTStrategyEngine:
         
         return {'score': confluence_score, 'factors': factors}
     
-    def _analyze_premium_discount(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp) -> Dict:
+    def _analyze_premium_discount(self, mtf_data: MultiTimeframeData, current_time: pd.Timestamp,
+                                  features: Optional[ConfluenceFeatures] = None, bar: Optional[int] = None) -> Dict:
         """Analyze Premium/Discount zones."""
         tf_15m = mtf_data.tf_15m
         
-        try:
-            current_idx = self._get_nearest_index(tf_15m.index, current_time)
-        except (KeyError, IndexError):
-            return {'score': 0, 'factors': []}
+        if features is not None:
+            current_idx = features.idx_15m[bar]
+        else:
+            current_idx = mtf_data.position_15m(current_time, bar)
         
         if current_idx < 20:
             return {'score': 0, 'factors': []}
@@ -879,16 +1271,19 @@ class ICTStrategyEngine:
         factors = []
         
         # Calculate position within recent range
-        recent_data = tf_15m.iloc[current_idx-20:current_idx+1]
-        high_24h = recent_data['high'].max()
-        low_24h = recent_data['low'].min()
-        current_price = recent_data['close'].iloc[-1]
-        
-        range_24h = high_24h - low_24h
-        if range_24h > 0:
-            price_position = (current_price - low_24h) / range_24h
+        if features is not None:
+            price_position = features.pd_price_position[bar]
         else:
-            price_position = 0.5
+            recent_data = tf_15m.iloc[current_idx-20:current_idx+1]
+            high_24h = recent_data['high'].max()
+            low_24h = recent_data['low'].min()
+            current_price = recent_data['close'].iloc[-1]
+
+            range_24h = high_24h - low_24h
+            if range_24h > 0:
+                price_position = (current_price - low_24h) / range_24h
+            else:
+                price_position = 0.5
         
         # Premium/Discount analysis
         if price_position < 0.20:  # Deep discount
@@ -1116,21 +1511,35 @@ class ICTStrategyEngine:
             # Lower confluence - use 5m for scalping
             return '5m'
     
-    def simulate_ict_strategy(self, symbol: str, df: pd.DataFrame) -> List[ICTTradingSignal]:
+    def simulate_ict_strategy(self, symbol: str, df: pd.DataFrame, vectorized: bool = True,
+                              random_seed: Optional[int] = None) -> List[ICTTradingSignal]:
         """
         Run ICT strategy simulation on historical data with multi-timeframe analysis.
         
         Args:
             symbol: Trading pair symbol (e.g., 'BTCUSDT')
             df: Historical 1H OHLCV data
+            vectorized: Precompute all confluence inputs in one pass over the
+                history (default). False re-slices the frames at every bar,
+                like live signal generation does.
+            random_seed: Run seed; defaults to the engine's random_seed, or a fresh
+                one. Recorded in last_simulation_seed and on every signal so the
+                run can be reproduced exactly.
             
         Returns:
             List of generated ICT trading signals
         """
-        logger.info(f"Running ICT strategy simulation for {symbol} ({len(df)} bars)")
+        if random_seed is None:
+            random_seed = self.random_seed
+        if random_seed is None:
+            random_seed = np.random.SeedSequence().entropy
+        self.last_simulation_seed = random_seed
+        
+        logger.info(f"Running ICT strategy simulation for {symbol} ({len(df)} bars, seed {random_seed})")
         
         # Prepare multi-timeframe data
         mtf_data = self.prepare_multitimeframe_data(df)
+        features = self.precompute_confluence_features(mtf_data, df.index) if vectorized else None
         
         signals = []
         
@@ -1143,7 +1552,9 @@ class ICTStrategyEngine:
                 current_time = df.index[i]
                 
                 # Generate ICT signal at this timestamp
-                signal = self.generate_ict_signal(symbol, mtf_data, current_time)
+                signal = self.generate_ict_signal(symbol, mtf_data, current_time,
+                                                  features=features, bar=i if features is not None else None,
+                                                  random_seed=random_seed)
                 
                 if signal:
                     signals.append(signal)
@@ -1157,14 +1568,22 @@ class ICTStrategyEngine:
         return signals
     
     def backtest_ict_signals(self, signals: List[ICTTradingSignal], price_data: pd.DataFrame, 
-                            starting_balance: float = 10000) -> Dict:
+                            starting_balance: float = 10000,
+                            lower_tf_data: Optional[pd.DataFrame] = None) -> Dict:
         """
         Backtest ICT signals with enhanced position management.
         
+        BUY signals open longs and SELL signals open shorts at the close of
+        the signal bar. Each position exits on the first bar whose high/low
+        touches its stop loss or take profit, after ``max_hold_hours`` (if
+        set), or at the end of the data. Several positions per symbol may be
+        open at once, up to ``max_positions`` in total.
+        
         Args:
             signals: List of ICT trading signals
             price_data: Historical price data for execution
             starting_balance: Starting portfolio balance
+            lower_tf_data: Optional finer candles to order same-bar SL/TP touches
             
         Returns:
             Comprehensive backtest results
@@ -1172,133 +1591,71 @@ class ICTStrategyEngine:
         logger.info(f"Backtesting {len(signals)} ICT signals with ${starting_balance:,.2f} starting balance")
         
         trades = []
-        positions = {}
         portfolio_balance = starting_balance
-        max_portfolio_balance = starting_balance
         
-        # Enhanced metrics tracking (removed unused variables)
-        # daily_balances and monthly_returns were not used in the function
-        
-        for signal in signals:
-            try:
-                # Get execution price from price data
-                try:
-                    execution_row = price_data.loc[signal.timestamp]
-                    execution_price = execution_row['close']
-                except KeyError:
-                    # Use signal entry price if exact timestamp not found
-                    execution_price = signal.entry_price
+        entries = sorted((s for s in signals if s.action in ('BUY', 'SELL')), key=lambda s: s.timestamp)
+        if entries and not price_data.empty:
+            # Entry bar: the last bar at or before the signal
+            index = price_data.index
+            timestamps = pd.DatetimeIndex([s.timestamp for s in entries])
+            entry_pos = index.searchsorted(timestamps, side='right') - 1
+            exact = (entry_pos >= 0) & (index[np.maximum(entry_pos, 0)] == timestamps)
+            close = price_data['close'].to_numpy(dtype=np.float64)
+            execution_price = np.where(exact, close[np.maximum(entry_pos, 0)],
+                                       [s.entry_price for s in entries])
+            
+            # Exits do not depend on each other, so all are resolved in one pass
+            simulator = ExitSimulator(price_data, lower_tf_data, self._max_hold_bars(index))
+            exits = simulator.simulate(
+                entry_pos,
+                np.array([s.action == 'BUY' for s in entries]),
+                np.array([s.stop_loss for s in entries], dtype=np.float64),
+                np.array([s.take_profit for s in entries], dtype=np.float64)
+            )
+            
+            # Capital and position limits in signal order; positions are released at their exit bar
+            open_positions = []  # (exit_pos, order, cost, trade_record)
+            for i, signal in enumerate(entries):
+                while open_positions and open_positions[0][0] <= entry_pos[i]:
+                    _, _, cost, trade_record = heapq.heappop(open_positions)
+                    portfolio_balance += cost + trade_record['pnl']
+                    trades.append(trade_record)
                 
-                if signal.action == 'BUY':
-                    # Calculate position cost
-                    trade_cost = signal.position_size * execution_price
-                    
-                    # Check if we have enough capital and position limits
-                    if (trade_cost <= portfolio_balance and 
-                        len(positions) < self.ict_params['max_positions']):
-                        
-                        positions[signal.symbol] = {
-                            'symbol': signal.symbol,
-                            'side': 'LONG',
-                            'entry_price': execution_price,
-                            'entry_time': signal.timestamp,
-                            'size': signal.position_size,
-                            'stop_loss': signal.stop_loss,
-                            'take_profit': signal.take_profit,
-                            'risk_amount': signal.risk_amount,
-                            'rr_ratio': signal.risk_reward_ratio,
-                            'confidence': signal.confidence,
-                            'confluence_score': signal.confluence_score
-                        }
-                        
-                        portfolio_balance -= trade_cost
-                        logger.debug(f"Opened LONG {signal.symbol} @ ${execution_price:.2f} | Size: {signal.position_size:.4f}")
+                price = float(execution_price[i])
+                trade_cost = signal.position_size * price
+                if trade_cost > portfolio_balance or len(open_positions) >= self.ict_params['max_positions']:
+                    continue
+                portfolio_balance -= trade_cost
                 
-                elif signal.action == 'SELL' and signal.symbol in positions:
-                    # Close existing position
-                    position = positions[signal.symbol]
-                    
-                    if position['side'] == 'LONG':
-                        # Calculate P&L
-                        exit_value = position['size'] * execution_price
-                        entry_cost = position['size'] * position['entry_price']
-                        pnl = exit_value - entry_cost
-                        pnl_percent = (pnl / entry_cost) * 100
-                        
-                        # Update portfolio balance
-                        portfolio_balance += exit_value
-                        max_portfolio_balance = max(max_portfolio_balance, portfolio_balance)
-                        
-                        # Calculate hold time
-                        hold_time_hours = (signal.timestamp - position['entry_time']).total_seconds() / 3600
-                        
-                        # Record trade
-                        trade_record = {
-                            'symbol': signal.symbol,
-                            'entry_time': position['entry_time'],
-                            'exit_time': signal.timestamp,
-                            'entry_price': position['entry_price'],
-                            'exit_price': execution_price,
-                            'size': position['size'],
-                            'pnl': pnl,
-                            'pnl_percent': pnl_percent,
-                            'hold_time_hours': hold_time_hours,
-                            'risk_amount': position['risk_amount'],
-                            'rr_ratio': position['rr_ratio'],
-                            'confidence': position['confidence'],
-                            'confluence_score': position['confluence_score'],
-                            'exit_reason': 'MANUAL_EXIT'
-                        }
-                        
-                        trades.append(trade_record)
-                        del positions[signal.symbol]
-                        
-                        logger.debug(f"Closed LONG {signal.symbol} @ ${execution_price:.2f} | P&L: ${pnl:.2f} ({pnl_percent:.1f}%)")
-                
-            except Exception as e:
-                logger.error(f"Error processing ICT signal {signal.timestamp}: {e}")
-                continue
-        
-        # Process remaining open positions (mark-to-market at final price)
-        if positions and not price_data.empty:
-            final_price_row = price_data.iloc[-1]
-            final_timestamp = price_data.index[-1]
+                side = 'LONG' if signal.action == 'BUY' else 'SHORT'
+                exit_price = float(exits.exit_price[i])
+                pnl = signal.position_size * (exit_price - price if side == 'LONG' else price - exit_price)
+                trade_record = {
+                    'symbol': signal.symbol,
+                    'side': side,
+                    'entry_time': signal.timestamp,
+                    'exit_time': exits.exit_time[i],
+                    'entry_price': price,
+                    'exit_price': exit_price,
+                    'stop_loss': signal.stop_loss,
+                    'take_profit': signal.take_profit,
+                    'size': signal.position_size,
+                    'pnl': pnl,
+                    'pnl_percent': (pnl / trade_cost) * 100 if trade_cost else 0.0,
+                    'hold_time_hours': (exits.exit_time[i] - signal.timestamp).total_seconds() / 3600,
+                    'risk_amount': signal.risk_amount,
+                    'rr_ratio': signal.risk_reward_ratio,
+                    'confidence': signal.confidence,
+                    'confluence_score': signal.confluence_score,
+                    'exit_reason': exits.exit_reason[i]
+                }
+                heapq.heappush(open_positions, (int(exits.exit_pos[i]), i, trade_cost, trade_record))
+                logger.debug(f"Opened {side} {signal.symbol} @ ${price:.2f} | Size: {signal.position_size:.4f} "
+                             f"| Exit: {trade_record['exit_reason']} @ ${exit_price:.2f}")
             
-            for symbol, position in positions.items():
-                try:
-                    # Get final price for this symbol (use close price)
-                    final_price = final_price_row['close']
-                    
-                    exit_value = position['size'] * final_price
-                    entry_cost = position['size'] * position['entry_price']
-                    pnl = exit_value - entry_cost
-                    pnl_percent = (pnl / entry_cost) * 100
-                    
-                    portfolio_balance += exit_value
-                    
-                    hold_time_hours = (final_timestamp - position['entry_time']).total_seconds() / 3600
-                    
-                    trade_record = {
-                        'symbol': symbol,
-                        'entry_time': position['entry_time'],
-                        'exit_time': final_timestamp,
-                        'entry_price': position['entry_price'],
-                        'exit_price': final_price,
-                        'size': position['size'],
-                        'pnl': pnl,
-                        'pnl_percent': pnl_percent,
-                        'hold_time_hours': hold_time_hours,
-                        'risk_amount': position['risk_amount'],
-                        'rr_ratio': position['rr_ratio'],
-                        'confidence': position['confidence'],
-                        'confluence_score': position['confluence_score'],
-                        'exit_reason': 'BACKTEST_END'
-                    }
-                    
-                    trades.append(trade_record)
-                    
-                except Exception as e:
-                    logger.error(f"Error closing position for {symbol}: {e}")
+            for _, _, cost, trade_record in sorted(open_positions, key=lambda p: (p[0], p[1])):
+                portfolio_balance += cost + trade_record['pnl']
+                trades.append(trade_record)
         
         # Calculate comprehensive performance metrics
         if trades:
@@ -1307,6 +1664,7 @@ class ICTStrategyEngine:
             losing_trades = trades_df[trades_df['pnl'] <= 0]
             
             # Calculate metrics by RR tier
+            exit_reasons = trades_df['exit_reason'].value_counts().to_dict()
             rr_performance = {}
             for rr_tier in [3, 5, 8]:
                 tier_trades = trades_df[trades_df['rr_ratio'] == rr_tier]
@@ -1331,13 +1689,13 @@ class ICTStrategyEngine:
                 'average_loss': losing_trades['pnl'].mean() if not losing_trades.empty else 0,
                 'profit_factor': (abs(winning_trades['pnl'].sum() / losing_trades['pnl'].sum()) 
                                 if not losing_trades.empty and losing_trades['pnl'].sum() != 0 else float('inf')),
-                'max_drawdown': ((max_portfolio_balance - portfolio_balance) / max_portfolio_balance * 100 
-                               if max_portfolio_balance > 0 else 0),
+                'max_drawdown': self._realized_max_drawdown(starting_balance, trades_df['pnl']),
                 'final_balance': portfolio_balance,
                 'average_hold_time': trades_df['hold_time_hours'].mean(),
                 'average_confidence': trades_df['confidence'].mean(),
                 'average_confluence': trades_df['confluence_score'].mean(),
                 'rr_tier_performance': rr_performance,
+                'exit_reasons': exit_reasons,
                 'trades': trades
             }
         else:
@@ -1355,6 +1713,23 @@ class ICTStrategyEngine:
         logger.info(f"ICT Backtest complete: {results['total_trades']} trades, "
                    f"{results['win_rate']:.1f}% win rate, {results['total_return']:.2f}% return")
         return results
+    
+    def _max_hold_bars(self, index: pd.DatetimeIndex) -> Optional[int]:
+        """Convert the max_hold_hours limit to a bar count for the given index."""
+        max_hold_hours = self.ict_params.get('max_hold_hours')
+        if max_hold_hours is None or len(index) < 2:
+            return None
+        bar_hours = pd.Series(index).diff().median().total_seconds() / 3600
+        return max(1, int(np.ceil(max_hold_hours / bar_hours)))
+    
+    @staticmethod
+    def _realized_max_drawdown(starting_balance: float, pnl: pd.Series) -> float:
+        """Largest peak-to-trough drop (%) of the balance after each closed trade."""
+        equity = starting_balance + np.concatenate([[0.0], pnl.cumsum().to_numpy()])
+        peaks = np.maximum.accumulate(equity)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peaks > 0, (peaks - equity) / peaks * 100, 0.0)
+        return float(drawdowns.max())
 
 
 # Legacy compatibility classes (for existing backtest runner)
@@ -9,6 +9,9 @@ with Bybit LIVE trading environment.
 
 This module provides:
 - BybitClient: Core API client for Bybit mainnet/testnet
+- BybitClientRegistry: Long-lived pooled clients shared across components
+- KlineCache: Incremental per-symbol candle store (REST + websocket fed)
+- MarketDataHub: Single websocket feeding latest tickers to all consumers
 - BybitTradingExecutor: Signal processing and trade execution
 - BybitWebSocketClient: Real-time market data and order updates
 - BybitIntegrationManager: Main orchestration layer
@@ -36,6 +39,9 @@ __author__ = "Trading Algorithm Development Team"
 
 # Core imports
 from .bybit_client import BybitClient, format_bybit_symbol, calculate_quantity_precision
+from .client_pool import BybitClientRegistry, ConnectionPoolStats, get_client_registry
+from .kline_cache import KlineCache, KlineRingBuffer
+from .market_data_hub import MarketDataHub, Ticker, TickerSubscription
 from .trading_executor import (
     BybitTradingExecutor, 
     TradingSignal, 
@@ -60,6 +66,10 @@ from .integration_manager import (
 __all__ = [
     # Main classes
     "BybitClient",
+    "BybitClientRegistry",
+    "KlineCache",
+    "KlineRingBuffer",
+    "MarketDataHub",
     "BybitTradingExecutor", 
     "BybitWebSocketClient",
     "BybitIntegrationManager",
@@ -68,9 +78,12 @@ __all__ = [
     "TradingSignal",
     "TradeExecution",
     "MarketData",
+    "Ticker",
+    "TickerSubscription",
     "OrderUpdate", 
     "PositionUpdate",
     "IntegrationStatus",
+    "ConnectionPoolStats",
     
     # Enums
     "OrderStatus",
@@ -80,6 +93,7 @@ __all__ = [
     # Utility functions
     "format_bybit_symbol",
     "calculate_quantity_precision",
+    "get_client_registry",
     "load_config_from_env",
     "create_integration_manager"
 ]
\ No newline at end of file
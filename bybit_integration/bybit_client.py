@@ -15,7 +15,7 @@ import hashlib
 import asyncio
 import aiohttp
 import requests
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime
 import json
 import logging
@@ -35,7 +35,8 @@ class BybitClient:
     - Balance retrieval
     """
     
-    def __init__(self, api_key: str = None, api_secret: str = None, testnet: bool = False):
+    def __init__(self, api_key: str = None, api_secret: str = None, testnet: bool = False,
+                 session_provider: Optional[Callable[[], aiohttp.ClientSession]] = None):
         """
         Initialize Bybit Live Client
         
@@ -43,6 +44,9 @@ class BybitClient:
             api_key: Bybit API key (from environment if not provided)
             api_secret: Bybit API secret (from environment if not provided)
             testnet: Use testnet environment (optional, defaults to FALSE = LIVE)
+            session_provider: Callable returning a shared, pooled aiohttp session
+                (see client_pool.BybitClientRegistry). The client never closes a
+                borrowed session; the registry owns its lifecycle.
         
         ⚠️  DEFAULT IS LIVE MAINNET - REAL MONEY!
         """
@@ -67,6 +71,8 @@ class BybitClient:
             logger.warning("🚨 LIVE TRADING MODE - ALL ORDERS ARE REAL!")
             
         self.session = None
+        self.session_provider = session_provider
+        self.sync_session = None  # Keep-alive requests.Session for *_sync methods
         self.last_request_time = 0
         self.rate_limit_delay = 0.1  # 100ms between requests
         
@@ -102,18 +108,34 @@ class BybitClient:
             "Content-Type": "application/json"
         }
 
-    def _ensure_session(self):
-        """Ensure aiohttp session is available"""
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        aiohttp session for the current request.
+        
+        Pooled clients borrow the calling loop's session on every request and
+        never store it: a shared client may be used from several loops.
+        """
+        if self.session_provider is not None:
+            return self.session_provider()
         if self.session is None or self.session.closed:
             self.session = aiohttp.ClientSession()
+        return self.session
+
+    def _get_sync_session(self) -> requests.Session:
+        """Keep-alive HTTP session for the synchronous order/balance methods"""
+        if self.sync_session is None:
+            self.sync_session = requests.Session()
+        return self.sync_session
 
     async def _rate_limit(self):
         """Implement rate limiting to avoid API limits"""
+        # Reserve the next slot before sleeping so concurrent callers sharing
+        # this client are spaced out instead of all passing at once
         current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
+        next_slot = max(current_time, self.last_request_time + self.rate_limit_delay)
+        self.last_request_time = next_slot
+        if next_slot > current_time:
+            await asyncio.sleep(next_slot - current_time)
 
     async def _make_request(self, method: str, endpoint: str, params: Dict = None) -> Dict:
         """
@@ -131,8 +153,8 @@ class BybitClient:
             logger.error("❌ Missing Bybit API credentials")
             return {}
             
-        self._ensure_session()
         await self._rate_limit()
+        session = self._get_session()
         
         url = f"{self.base_url}{endpoint}"
         params = params or {}
@@ -141,14 +163,14 @@ class BybitClient:
             query_string = "&".join([f"{k}={v}" for k, v in params.items()])
             headers = self._prepare_headers(query_string)
             
-            async with self.session.get(url, headers=headers, params=params) as response:
+            async with session.get(url, headers=headers, params=params) as response:
                 data = await response.json()
                 
         else:  # POST, PUT, DELETE
             payload = json.dumps(params) if params else ""
             headers = self._prepare_headers(payload)
             
-            async with self.session.post(url, headers=headers, json=params) as response:
+            async with session.post(url, headers=headers, json=params) as response:
                 data = await response.json()
         
         if data.get('retCode') != 0:
@@ -230,7 +252,7 @@ class BybitClient:
                 'X-BAPI-SIGN': signature
             }
             
-            response = requests.get(url, params={'accountType': 'UNIFIED'}, headers=headers, timeout=10)
+            response = self._get_sync_session().get(url, params={'accountType': 'UNIFIED'}, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -341,7 +363,7 @@ class BybitClient:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(url, headers=headers, data=query_string, timeout=10)
+            response = self._get_sync_session().post(url, headers=headers, data=query_string, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -430,7 +452,7 @@ class BybitClient:
                 'X-BAPI-SIGN': signature
             }
             
-            response = requests.get(url, params=query_params, headers=headers, timeout=10)
+            response = self._get_sync_session().get(url, params=query_params, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -668,7 +690,8 @@ class BybitClient:
             logger.error(f"❌ Failed to get ticker: {e}")
             return {}
 
-    async def get_kline_data(self, symbol: str, interval: str = "1", limit: int = 200) -> List[Dict]:
+    async def get_kline_data(self, symbol: str, interval: str = "1", limit: int = 200,
+                             start: Optional[int] = None) -> List[Dict]:
         """
         Get candlestick/kline data
         
@@ -676,6 +699,7 @@ class BybitClient:
             symbol: Trading pair
             interval: Time interval ("1", "5", "15", "30", "60", "240", "D")
             limit: Number of candles to retrieve
+            start: Only return candles opening at or after this time (ms)
             
         Returns:
             List of candlestick data
@@ -687,6 +711,8 @@ class BybitClient:
                 "interval": interval,
                 "limit": limit
             }
+            if start is not None:
+                params["start"] = int(start)
             
             result = await self._make_request("GET", "/v5/market/kline", params)
             return result.get('list', [])
@@ -712,10 +738,14 @@ class BybitClient:
             return False
 
     async def close(self):
-        """Close the aiohttp session"""
+        """Close the client's HTTP sessions (borrowed pooled sessions are left to the registry)"""
         if self.session and not self.session.closed:
             await self.session.close()
             logger.info("🔌 Bybit client session closed")
+        self.session = None
+        if self.sync_session is not None:
+            self.sync_session.close()
+            self.sync_session = None
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -0,0 +1,337 @@
+"""
+Bybit Client Registry
+====================
+
+Long-lived, pooled HTTP clients shared across the ICT monitor, the
+ICT-Bybit bridge and the trading executor.
+
+Every 30-second scan used to open a fresh BybitClient (and aiohttp session)
+per call, paying new TCP+TLS handshakes for every symbol. The registry keeps
+one tuned aiohttp session per event loop (keep-alive, DNS cache, per-host
+connection limit) and one BybitClient per credential set, and tracks how
+often pooled connections are reused.
+
+Usage:
+    from bybit_integration.client_pool import get_client_registry
+
+    registry = get_client_registry()
+    client = registry.get_client()          # credentials from .env
+    ticker = await client.get_ticker("BTCUSDT")
+
+    # On shutdown (inside the loop that used the client)
+    await registry.aclose()
+"""
+
+import os
+import asyncio
+import atexit
+import threading
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .bybit_client import BybitClient
+
+logger = logging.getLogger(__name__)
+
+# Project-level .env (one directory above bybit_integration/)
+DEFAULT_ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+
+
+@dataclass
+class ConnectionPoolStats:
+    """Connection-reuse counters for the pooled sessions"""
+    sessions_created: int = 0
+    requests_started: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests served over an already-open connection"""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        stats = asdict(self)
+        stats['reuse_ratio'] = round(self.reuse_ratio, 4)
+        return stats
+
+
+class BybitClientRegistry:
+    """
+    Process-wide registry of pooled Bybit clients
+
+    aiohttp sessions are bound to the event loop that created them, so the
+    registry keeps one session per running loop. BybitClient instances are
+    keyed by (api_key, testnet) and borrow the session of whichever loop
+    they are called from.
+    """
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 20,
+                 keepalive_timeout: float = 60.0,
+                 dns_cache_ttl: int = 300,
+                 request_timeout: float = 15.0,
+                 env_path: str = DEFAULT_ENV_PATH):
+        """
+        Initialize client registry
+
+        Args:
+            limit: Total simultaneous connections per session
+            limit_per_host: Simultaneous connections per host (api.bybit.com)
+            keepalive_timeout: Seconds an idle connection is kept open
+            dns_cache_ttl: Seconds resolved addresses are cached
+            request_timeout: Total timeout per HTTP request in seconds
+            env_path: .env file loaded once for default credentials
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self.env_path = env_path
+
+        self.stats = ConnectionPoolStats()
+
+        self._lock = threading.Lock()
+        self._env_loaded = False
+        self._clients: Dict[Tuple[str, bool], BybitClient] = {}
+        # id(loop) -> (loop, session)
+        self._sessions: Dict[int, Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+        # id(loop) -> task closing that loop's session on shutdown
+        self._shutdown_tasks: Dict[int, asyncio.Task] = {}
+        # Tasks closing sessions of loops that were closed without shutting them down
+        self._orphan_close_tasks = set()
+
+    def _load_env(self):
+        """Load .env once instead of on every price/kline fetch"""
+        if self._env_loaded:
+            return
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(self.env_path)
+        except ImportError:
+            logger.debug("python-dotenv not installed, using process environment only")
+        self._env_loaded = True
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Trace hooks feeding the connection-reuse counters"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.stats.requests_started += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.stats.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a session with a tuned keep-alive connector"""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            enable_cleanup_closed=True
+        )
+        self.stats.sessions_created += 1
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            trace_configs=[self._build_trace_config()]
+        )
+
+    @staticmethod
+    async def _close_on_loop_shutdown(session: aiohttp.ClientSession):
+        """
+        Close the session when its loop shuts down
+
+        Waits until cancelled; asyncio.run() cancels pending tasks before
+        closing the loop, so per-call asyncio.run(...) users get their
+        session closed while the loop can still close its transports.
+        """
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            if not session.closed:
+                await session.close()
+
+    @staticmethod
+    async def _close_orphaned(sessions: List[aiohttp.ClientSession]):
+        """
+        Close sessions whose loop was closed without closing them
+
+        Their connections can no longer be closed on that loop:
+        ClientSession.close() marks them closed and drops the connections,
+        and the transports close their sockets once collected.
+        """
+        for session in sessions:
+            await session.close()
+
+    def _drop_closed_loops(self) -> List[aiohttp.ClientSession]:
+        """Forget sessions of closed loops, returning the ones still open (lock held)"""
+        orphaned = []
+        for loop_id, (other_loop, session) in list(self._sessions.items()):
+            if other_loop.is_closed():
+                del self._sessions[loop_id]
+                # The waiter can never run again; asyncio reports it when collected
+                self._shutdown_tasks.pop(loop_id, None)
+                if not session.closed:
+                    orphaned.append(session)
+        return orphaned
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session for the running event loop
+
+        Must be called from within a coroutine. The session is closed when
+        its loop shuts down; sessions of loops closed some other way are
+        released and discarded here.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            orphaned = self._drop_closed_loops()
+
+            entry = self._sessions.get(id(loop))
+            if entry is None or entry[1].closed:
+                session = self._create_session()
+                self._sessions[id(loop)] = (loop, session)
+                self._shutdown_tasks[id(loop)] = loop.create_task(self._close_on_loop_shutdown(session))
+                logger.info(f"🔗 Pooled Bybit HTTP session created (per-host limit {self.limit_per_host})")
+            else:
+                session = entry[1]
+
+        if orphaned:
+            task = loop.create_task(self._close_orphaned(orphaned))
+            self._orphan_close_tasks.add(task)
+            task.add_done_callback(self._orphan_close_tasks.discard)
+        return session
+
+    def get_client(self,
+                   api_key: str = None,
+                   api_secret: str = None,
+                   testnet: Optional[bool] = None) -> BybitClient:
+        """
+        Borrow the shared BybitClient for a credential set
+
+        Args:
+            api_key: Bybit API key (from environment if not provided)
+            api_secret: Bybit API secret (from environment if not provided)
+            testnet: Use testnet (from BYBIT_TESTNET if not provided)
+
+        Returns:
+            Long-lived BybitClient using the pooled session
+        """
+        self._load_env()
+        api_key = api_key or os.getenv('BYBIT_API_KEY')
+        api_secret = api_secret or os.getenv('BYBIT_API_SECRET')
+        if testnet is None:
+            testnet = os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
+
+        key = (api_key, testnet)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = BybitClient(
+                    api_key=api_key,
+                    api_secret=api_secret,
+                    testnet=testnet,
+                    session_provider=self.get_session
+                )
+                self._clients[key] = client
+            return client
+
+    def get_stats(self) -> Dict:
+        """Connection-reuse counters plus pool configuration"""
+        with self._lock:
+            open_sessions = sum(1 for _, session in self._sessions.values() if not session.closed)
+            clients = len(self._clients)
+        stats = self.stats.to_dict()
+        stats.update({
+            'open_sessions': open_sessions,
+            'clients': clients,
+            'limit_per_host': self.limit_per_host,
+            'keepalive_timeout': self.keepalive_timeout
+        })
+        return stats
+
+    async def close_loop_sessions(self):
+        """Close the pooled session owned by the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._sessions.pop(id(loop), None)
+            task = self._shutdown_tasks.pop(id(loop), None)
+        if task is not None:
+            task.cancel()
+        if entry and not entry[1].closed:
+            await entry[1].close()
+            logger.info(f"🔌 Pooled Bybit session closed | {self.stats.to_dict()}")
+
+    async def aclose(self):
+        """
+        Shutdown hook for async owners (bridge, integration manager)
+
+        Closes the current loop's session and sessions of loops that are
+        already closed. Sessions of other live loops are closed by their own
+        loop's close_loop_sessions().
+        """
+        await self.close_loop_sessions()
+        with self._lock:
+            orphaned = self._drop_closed_loops()
+        await self._close_orphaned(orphaned)
+
+    def shutdown(self):
+        """
+        Synchronous shutdown hook (atexit / monitor stop)
+
+        Schedules close on each session's own loop if it is still running,
+        or runs it there if the loop is idle. Sessions of closed loops are
+        closed on a throwaway loop.
+        """
+        with self._lock:
+            orphaned = self._drop_closed_loops()
+            entries = list(self._sessions.values())
+            self._sessions.clear()
+            self._shutdown_tasks.clear()
+
+        for loop, session in entries:
+            if session.closed:
+                continue
+            try:
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(session.close(), loop)
+                else:
+                    loop.run_until_complete(session.close())
+            except Exception as e:
+                logger.debug(f"Could not close pooled session cleanly: {e}")
+        if orphaned:
+            try:
+                asyncio.run(self._close_orphaned(orphaned))
+            except Exception as e:
+                logger.debug(f"Could not close pooled sessions of closed loops: {e}")
+
+
+_registry: Optional[BybitClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> BybitClientRegistry:
+    """Get the process-wide client registry (created on first use)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = BybitClientRegistry()
+            atexit.register(_registry.shutdown)
+        return _registry
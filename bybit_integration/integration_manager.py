@@ -26,6 +26,7 @@ import aiohttp
 from concurrent.futures import ThreadPoolExecutor
 
 from .bybit_client import BybitClient
+from .client_pool import get_client_registry
 from .trading_executor import BybitTradingExecutor, TradingSignal, TradeExecution
 from .websocket_client import BybitWebSocketClient, MarketData, OrderUpdate, PositionUpdate
 
@@ -82,8 +83,9 @@ class BybitIntegrationManager:
         self.auto_trading = auto_trading
         self.testnet = testnet
         
-        # Initialize clients
-        self.bybit_client = BybitClient(api_key, api_secret, testnet)
+        # Initialize clients (REST client is borrowed from the shared pool)
+        self.client_registry = get_client_registry()
+        self.bybit_client = self.client_registry.get_client(api_key, api_secret, testnet)
         self.websocket_client = BybitWebSocketClient(api_key, api_secret, testnet)
         
         # Initialize trading executor with strict 1% risk and dynamic RR
@@ -129,8 +131,8 @@ class BybitIntegrationManager:
         try:
             logger.info("🔄 Initializing Bybit integration components...")
             
-            # Create HTTP session
-            self.http_session = aiohttp.ClientSession()
+            # Borrow pooled HTTP session
+            self.http_session = self.client_registry.get_session()
             
             # Test Bybit connection
             connection_test = await self.bybit_client.test_connection()
@@ -419,12 +421,10 @@ class BybitIntegrationManager:
             # Close WebSocket connections
             await self.websocket_client.stop()
             
-            # Close HTTP session
-            if self.http_session:
-                await self.http_session.close()
-            
-            # Close Bybit client
+            # Release pooled HTTP sessions
+            self.http_session = None
             await self.bybit_client.close()
+            await self.client_registry.aclose()
             
             logger.info("✅ Integration system stopped")
             
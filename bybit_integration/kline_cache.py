@@ -0,0 +1,320 @@
+"""
+Incremental Kline Cache
+======================
+
+Per-symbol rolling candle store for the ICT monitor.
+
+The monitor used to pull the full 200-candle 1H history for every symbol
+every 30 seconds and rebuild a DataFrame row by row, even though at most one
+candle had changed. The cache is seeded once per symbol/interval, then only
+fetches candles from the last stored timestamp onwards (or takes them from
+the websocket ``kline`` topic) and hands the strategy engine a zero-copy
+DataFrame view over its NumPy buffers.
+
+Usage:
+    cache = KlineCache()
+    df_1h = await cache.refresh(client, "BTCUSDT", interval="60", window=200)
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bybit kline interval -> candle length in milliseconds
+INTERVAL_MS = {
+    '1': 60_000,
+    '3': 180_000,
+    '5': 300_000,
+    '15': 900_000,
+    '30': 1_800_000,
+    '60': 3_600_000,
+    '120': 7_200_000,
+    '240': 14_400_000,
+    '360': 21_600_000,
+    '720': 43_200_000,
+    'D': 86_400_000,
+}
+
+# Bybit returns at most 1000 candles per kline request
+MAX_KLINES_PER_REQUEST = 1000
+
+NS_PER_MS = 1_000_000
+
+
+class KlineRingBuffer:
+    """
+    Fixed-capacity OHLCV candle store backed by NumPy arrays
+
+    Rows live in a buffer of twice the capacity and are compacted to the
+    front only when the tail is reached, so the stored candles are always
+    one contiguous slice. That keeps appends amortized O(1) and lets
+    ``view()`` return a DataFrame that shares memory with the buffer.
+    """
+
+    COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize candle store
+
+        Args:
+            capacity: Maximum number of candles retained
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)  # Candle open time, ns
+        self._ohlcv = np.zeros((2 * capacity, len(self.COLUMNS)), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_timestamp_ms(self) -> Optional[int]:
+        """Open time of the newest stored candle in milliseconds"""
+        if self._end == self._start:
+            return None
+        return int(self._timestamps[self._end - 1] // NS_PER_MS)
+
+    def clear(self):
+        """Drop all stored candles"""
+        self._start = 0
+        self._end = 0
+
+    def upsert(self, timestamps_ms: np.ndarray, ohlcv: np.ndarray) -> int:
+        """
+        Merge candles into the store
+
+        Candles older than the newest stored candle are ignored, a candle with
+        the same open time replaces the stored one (the still-forming candle),
+        and newer candles are appended.
+
+        Args:
+            timestamps_ms: Candle open times in ms, ascending
+            ohlcv: Array of shape (n, 5) with open/high/low/close/volume
+
+        Returns:
+            Number of new candles appended
+        """
+        if len(timestamps_ms) == 0:
+            return 0
+
+        timestamps_ns = np.asarray(timestamps_ms, dtype=np.int64) * NS_PER_MS
+        ohlcv = np.asarray(ohlcv, dtype=np.float64)
+
+        if len(self) > 0:
+            last_ns = self._timestamps[self._end - 1]
+            same = timestamps_ns == last_ns
+            if same.any():
+                self._ohlcv[self._end - 1] = ohlcv[same][-1]
+            newer = timestamps_ns > last_ns
+            timestamps_ns = timestamps_ns[newer]
+            ohlcv = ohlcv[newer]
+
+        if len(timestamps_ns) == 0:
+            return 0
+
+        self._append(timestamps_ns, ohlcv)
+        return len(timestamps_ns)
+
+    def _append(self, timestamps_ns: np.ndarray, ohlcv: np.ndarray):
+        """Append rows, compacting to the front of the buffer when needed"""
+        n = len(timestamps_ns)
+        if n >= self.capacity:
+            self._timestamps[:self.capacity] = timestamps_ns[-self.capacity:]
+            self._ohlcv[:self.capacity] = ohlcv[-self.capacity:]
+            self._start, self._end = 0, self.capacity
+            return
+
+        if self._end + n > len(self._timestamps):
+            keep = min(len(self), self.capacity - n)
+            src = slice(self._end - keep, self._end)
+            self._timestamps[:keep] = self._timestamps[src]
+            self._ohlcv[:keep] = self._ohlcv[src]
+            self._start, self._end = 0, keep
+
+        self._timestamps[self._end:self._end + n] = timestamps_ns
+        self._ohlcv[self._end:self._end + n] = ohlcv
+        self._end += n
+
+        # Enforce capacity by advancing the window start
+        if len(self) > self.capacity:
+            self._start = self._end - self.capacity
+
+    def view(self, window: Optional[int] = None) -> pd.DataFrame:
+        """
+        DataFrame over the newest candles without copying the OHLCV data
+
+        The returned frame shares memory with the buffer and is only valid
+        until the next upsert; callers that keep it across updates should
+        take ``.copy()``.
+
+        Args:
+            window: Number of most recent candles (all stored if None)
+
+        Returns:
+            OHLCV DataFrame indexed by candle open time
+        """
+        start = self._start if window is None else max(self._start, self._end - window)
+        index = pd.DatetimeIndex(self._timestamps[start:self._end].view('datetime64[ns]'), name='timestamp')
+        return pd.DataFrame(self._ohlcv[start:self._end], index=index,
+                            columns=list(self.COLUMNS), copy=False)
+
+
+def parse_rest_klines(klines: List) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert Bybit REST klines to ascending timestamp/OHLCV arrays
+
+    Bybit format (newest first): [startTime, open, high, low, close, volume, turnover]
+    """
+    rows = np.asarray([candle[:6] for candle in klines if len(candle) >= 6], dtype=np.float64)
+    if rows.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=np.float64)
+    rows = rows[np.argsort(rows[:, 0], kind='stable')]
+    return rows[:, 0].astype(np.int64), rows[:, 1:6]
+
+
+def parse_ws_klines(klines: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert websocket ``kline`` topic payloads to ascending timestamp/OHLCV arrays
+
+    Websocket format: {"start", "open", "high", "low", "close", "volume", "confirm", ...}
+    """
+    rows = np.asarray([
+        [k['start'], k['open'], k['high'], k['low'], k['close'], k['volume']]
+        for k in klines
+    ], dtype=np.float64)
+    if rows.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=np.float64)
+    rows = rows[np.argsort(rows[:, 0], kind='stable')]
+    return rows[:, 0].astype(np.int64), rows[:, 1:6]
+
+
+class KlineCache:
+    """
+    Rolling candle stores keyed by (symbol, interval)
+
+    Seeds each store with one full REST request, then keeps it current with
+    incremental REST fetches starting at the last stored candle, or skips
+    REST entirely while the websocket ``kline`` topic is feeding it.
+    """
+
+    def __init__(self, capacity: int = 1000, ws_stale_after: float = 90.0):
+        """
+        Initialize kline cache
+
+        Args:
+            capacity: Candles retained per symbol/interval
+            ws_stale_after: Seconds after the last websocket update before
+                REST polling resumes for that symbol/interval
+        """
+        self.capacity = capacity
+        self.ws_stale_after = ws_stale_after
+
+        self._buffers: Dict[Tuple[str, str], KlineRingBuffer] = {}
+        self._ws_updated_at: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'rest_seeds': 0,
+            'rest_incremental': 0,
+            'rest_skipped': 0,
+            'candles_fetched': 0,
+            'ws_updates': 0
+        }
+
+    def get_buffer(self, symbol: str, interval: str) -> KlineRingBuffer:
+        """Get (or create) the candle store for a symbol/interval"""
+        key = (symbol, interval)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = KlineRingBuffer(self.capacity)
+                self._buffers[key] = buffer
+            return buffer
+
+    def apply_rest_klines(self, symbol: str, interval: str, klines: List) -> int:
+        """Merge a REST kline response into the store, returns new candle count"""
+        timestamps_ms, ohlcv = parse_rest_klines(klines)
+        self.stats['candles_fetched'] += len(timestamps_ms)
+        return self.get_buffer(symbol, interval).upsert(timestamps_ms, ohlcv)
+
+    def apply_ws_klines(self, symbol: str, interval: str, klines: List[Dict]) -> int:
+        """Merge websocket ``kline`` topic updates into the store"""
+        buffer = self.get_buffer(symbol, interval)
+        if len(buffer) == 0:
+            # Needs a REST seed first, otherwise the history would have a gap
+            return 0
+        timestamps_ms, ohlcv = parse_ws_klines(klines)
+        self._ws_updated_at[(symbol, interval)] = time.time()
+        self.stats['ws_updates'] += 1
+        return buffer.upsert(timestamps_ms, ohlcv)
+
+    def _ws_is_fresh(self, symbol: str, interval: str) -> bool:
+        updated_at = self._ws_updated_at.get((symbol, interval))
+        return updated_at is not None and (time.time() - updated_at) < self.ws_stale_after
+
+    async def refresh(self, client, symbol: str, interval: str = "60",
+                      window: int = 200) -> Optional[pd.DataFrame]:
+        """
+        Bring a symbol's candles up to date and return a view of the newest ones
+
+        Args:
+            client: BybitClient used for REST fetches
+            symbol: Trading symbol (e.g. 'BTCUSDT')
+            interval: Bybit kline interval (e.g. '60' for 1H)
+            window: Number of candles in the returned view
+
+        Returns:
+            Zero-copy OHLCV DataFrame of the last ``window`` candles, or None
+        """
+        buffer = self.get_buffer(symbol, interval)
+        interval_ms = INTERVAL_MS.get(interval)
+        now_ms = int(time.time() * 1000)
+
+        last_ms = buffer.last_timestamp_ms
+        missing = None
+        if last_ms is not None and interval_ms:
+            missing = (now_ms - last_ms) // interval_ms + 1
+
+        needs_seed = (
+            len(buffer) < window
+            or missing is None
+            or missing >= min(self.capacity, MAX_KLINES_PER_REQUEST)
+        )
+
+        if needs_seed:
+            limit = min(max(window, 1), MAX_KLINES_PER_REQUEST)
+            klines = await client.get_kline_data(symbol=symbol, interval=interval, limit=limit)
+            if not klines:
+                return buffer.view(window) if len(buffer) else None
+            buffer.clear()
+            self.apply_rest_klines(symbol, interval, klines)
+            self.stats['rest_seeds'] += 1
+            logger.info(f"📊 Seeded {len(buffer)} {interval} klines for {symbol}")
+        elif self._ws_is_fresh(symbol, interval):
+            self.stats['rest_skipped'] += 1
+        else:
+            # Re-fetch the last stored (possibly still forming) candle plus anything newer
+            klines = await client.get_kline_data(symbol=symbol, interval=interval,
+                                                 limit=missing + 1, start=last_ms)
+            if klines:
+                added = self.apply_rest_klines(symbol, interval, klines)
+                logger.debug(f"📊 {symbol} {interval}: {len(klines)} klines fetched, {added} new")
+            self.stats['rest_incremental'] += 1
+
+        return buffer.view(window)
+
+    def get_stats(self) -> Dict:
+        """Fetch/update counters plus number of cached series"""
+        stats = dict(self.stats)
+        stats['series'] = len(self._buffers)
+        return stats
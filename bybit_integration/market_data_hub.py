@@ -0,0 +1,478 @@
+"""
+Market Data Hub
+===============
+
+Single websocket connection feeding every consumer of live market data.
+
+The monitor used to poll ``/v5/market/tickers`` once per symbol per 30s
+cycle while the websocket clients in this package streamed the same data
+unused. The hub owns one public websocket for all symbols and keeps:
+
+- a latest-ticker table of immutable ``Ticker`` snapshots. Only the hub's
+  event loop writes it, by swapping whole entries, so any thread can read
+  it without a lock.
+- an asyncio fan-out. Each subscriber has a conflating mailbox that holds
+  at most one pending ticker per symbol, so a slow consumer skips stale
+  updates instead of building a backlog.
+- optionally, ``kline`` topics merged into a KlineCache (see
+  kline_cache.py), which then stops polling REST for those candles.
+
+Usage:
+    hub = MarketDataHub(['BTCUSDT', 'ETHUSDT'])
+    asyncio.create_task(hub.run())
+
+    subscription = hub.subscribe()
+    async for tickers in subscription:
+        ...  # {symbol: Ticker}, newest per symbol
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_LINEAR_URL = "wss://stream.bybit.com/v5/public/linear"
+PUBLIC_LINEAR_TESTNET_URL = "wss://stream-testnet.bybit.com/v5/public/linear"
+
+# Bybit accepts at most 10 topics per subscribe request on public streams
+MAX_TOPICS_PER_SUBSCRIBE = 10
+
+# Bybit ticker field -> (Ticker attribute, scale)
+TICKER_FIELDS = {
+    'lastPrice': ('price', 1.0),
+    'bid1Price': ('bid', 1.0),
+    'ask1Price': ('ask', 1.0),
+    'volume24h': ('volume_24h', 1.0),
+    'price24hPcnt': ('change_24h', 100.0),  # Fraction -> percentage
+    'highPrice24h': ('high_24h', 1.0),
+    'lowPrice24h': ('low_24h', 1.0),
+}
+
+
+@dataclass(frozen=True)
+class Ticker:
+    """Immutable latest-ticker snapshot for one symbol"""
+    symbol: str
+    price: float
+    bid: float = 0.0
+    ask: float = 0.0
+    volume_24h: float = 0.0
+    change_24h: float = 0.0
+    high_24h: float = 0.0
+    low_24h: float = 0.0
+    exchange_ts: int = 0       # Exchange timestamp, ms
+    received_at: float = 0.0   # Local receive time, epoch seconds
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the ticker was received"""
+        return (time.time() if now is None else now) - self.received_at
+
+    def to_price_dict(self) -> Dict:
+        """Price entry in the monitor's format (see ICTCryptoMonitor.get_real_time_prices)"""
+        return {
+            'price': self.price,
+            'change_24h': self.change_24h,
+            'volume': self.volume_24h,
+            'high_24h': self.high_24h,
+            'low_24h': self.low_24h,
+            'timestamp': datetime.fromtimestamp(self.received_at).isoformat()
+        }
+
+
+def merge_ticker(previous: Optional[Ticker], symbol: str, data: Dict,
+                 exchange_ts: int = 0, received_at: Optional[float] = None) -> Optional[Ticker]:
+    """
+    Apply a ticker snapshot or delta to the previous snapshot
+
+    Deltas only carry the fields that changed; fields that are missing or
+    unparsable keep their previous value. A delta without a previous
+    snapshot is dropped unless it carries a price.
+
+    Args:
+        previous: Current snapshot for the symbol (None before the first one)
+        symbol: Trading symbol
+        data: Bybit ticker payload
+        exchange_ts: Message timestamp in ms
+        received_at: Local receive time (now if None)
+
+    Returns:
+        New Ticker, or None if there is nothing to build it from
+    """
+    changes = {}
+    for field, (attribute, scale) in TICKER_FIELDS.items():
+        value = data.get(field)
+        if value in (None, ''):
+            continue
+        try:
+            changes[attribute] = float(value) * scale
+        except (TypeError, ValueError):
+            continue
+
+    # A zero/negative last price is never valid for these markets
+    if changes.get('price', 1.0) <= 0:
+        changes.pop('price')
+
+    received_at = time.time() if received_at is None else received_at
+    if previous is None:
+        if 'price' not in changes:
+            return None
+        return Ticker(symbol=symbol, exchange_ts=exchange_ts, received_at=received_at, **changes)
+    return replace(previous, exchange_ts=exchange_ts, received_at=received_at, **changes)
+
+
+class TickerSubscription:
+    """
+    Conflating mailbox of one hub consumer
+
+    Holds at most one pending ticker per symbol: an update that arrives
+    before the consumer took the previous one replaces it (and counts as
+    dropped). The hub may offer from any thread; the consumer awaits on
+    the event loop it subscribed from.
+    """
+
+    def __init__(self, hub: 'MarketDataHub', symbols: Optional[Iterable[str]] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize subscription
+
+        Args:
+            hub: Hub delivering the tickers
+            symbols: Symbols of interest (all if None)
+            loop: Consumer event loop (the running loop if None)
+        """
+        self.hub = hub
+        self.symbols = frozenset(symbols) if symbols is not None else None
+        self._loop = loop or asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Ticker] = {}
+        self.closed = False
+
+        self.delivered = 0
+        self.dropped = 0
+
+    def wants(self, symbol: str) -> bool:
+        return self.symbols is None or symbol in self.symbols
+
+    def offer(self, ticker: Ticker):
+        """Queue a ticker, replacing one still pending for the same symbol (any thread)"""
+        with self._lock:
+            if ticker.symbol in self._pending:
+                self.dropped += 1
+            was_empty = not self._pending
+            self._pending[ticker.symbol] = ticker
+
+        # Only the first pending update needs to wake the consumer
+        if was_empty and not self.closed:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is self._loop:
+                self._ready.set()
+            else:
+                try:
+                    self._loop.call_soon_threadsafe(self._ready.set)
+                except RuntimeError:
+                    # Consumer loop already closed
+                    self.closed = True
+
+    def take(self) -> Dict[str, Ticker]:
+        """Pending tickers without waiting ({} if none)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._ready.clear()
+        self.delivered += len(pending)
+        return pending
+
+    async def get(self, timeout: Optional[float] = None) -> Dict[str, Ticker]:
+        """
+        Wait for updates
+
+        Args:
+            timeout: Seconds to wait at most (forever if None)
+
+        Returns:
+            Newest pending ticker per symbol ({} on timeout)
+        """
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return {}
+        return self.take()
+
+    def close(self):
+        """Stop receiving updates"""
+        self.closed = True
+        self.hub.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Ticker]:
+        while not self.closed:
+            tickers = await self.get()
+            if tickers:
+                return tickers
+        raise StopAsyncIteration
+
+
+class MarketDataHub:
+    """
+    One public websocket for all symbols, shared by every market data consumer
+
+    Features:
+    - Ticker (and optional kline) topics for all symbols on one connection
+    - Lock-free latest-ticker table readable from any thread
+    - Conflating asyncio fan-out to subscribers
+    - Application-level ping and reconnection with backoff
+    """
+
+    def __init__(self, symbols: Iterable[str], testnet: bool = False,
+                 kline_cache=None, kline_intervals: Iterable[str] = (),
+                 ping_interval: float = 20.0, max_backoff: float = 30.0,
+                 ws_url: Optional[str] = None):
+        """
+        Initialize market data hub
+
+        Args:
+            symbols: Symbols to stream (e.g. ['BTCUSDT', 'ETHUSDT'])
+            testnet: Use the testnet public stream
+            kline_cache: KlineCache to feed from kline topics (optional)
+            kline_intervals: Kline intervals to stream into kline_cache (e.g. ['60'])
+            ping_interval: Seconds between application pings
+            max_backoff: Longest reconnect delay in seconds
+            ws_url: Override the public stream URL
+        """
+        self.symbols: List[str] = list(dict.fromkeys(symbols))
+        self.ws_url = ws_url or (PUBLIC_LINEAR_TESTNET_URL if testnet else PUBLIC_LINEAR_URL)
+        self.kline_cache = kline_cache
+        self.kline_intervals = tuple(kline_intervals) if kline_cache is not None else ()
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+
+        # Latest-ticker table: only the hub loop writes, by replacing whole
+        # entries (new symbols swap in a new dict), so readers need no lock
+        self._latest: Dict[str, Ticker] = {}
+        self._subscribers: Tuple[TickerSubscription, ...] = ()
+        self._subscribers_lock = threading.Lock()
+
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+        self.connected = False
+
+        self.stats = {
+            'messages': 0,
+            'ticker_updates': 0,
+            'kline_updates': 0,
+            'deltas_skipped': 0,
+            'connects': 0,
+            'errors': 0,
+        }
+        self._last_message_at: Optional[float] = None
+
+    @property
+    def feeds_klines(self) -> bool:
+        """Whether kline topics are merged into a KlineCache"""
+        return bool(self.kline_intervals)
+
+    def topics(self) -> List[str]:
+        """Websocket topics for all symbols"""
+        topics = [f"tickers.{symbol}" for symbol in self.symbols]
+        topics += [f"kline.{interval}.{symbol}" for interval in self.kline_intervals for symbol in self.symbols]
+        return topics
+
+    # Consumer API
+
+    def get_ticker(self, symbol: str) -> Optional[Ticker]:
+        """Latest ticker for a symbol (any thread)"""
+        return self._latest.get(symbol)
+
+    def snapshot(self, max_age: Optional[float] = None) -> Dict[str, Ticker]:
+        """
+        Latest tickers for all symbols (any thread)
+
+        Args:
+            max_age: Leave out tickers older than this many seconds
+
+        Returns:
+            Dict of symbol -> Ticker
+        """
+        latest = dict(self._latest)
+        if max_age is None:
+            return latest
+        now = time.time()
+        return {symbol: ticker for symbol, ticker in latest.items() if ticker.age(now) <= max_age}
+
+    def subscribe(self, symbols: Optional[Iterable[str]] = None,
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> TickerSubscription:
+        """
+        Register a consumer
+
+        Args:
+            symbols: Symbols of interest (all if None)
+            loop: Consumer event loop (the running loop if None)
+
+        Returns:
+            TickerSubscription to await updates on
+        """
+        subscription = TickerSubscription(self, symbols, loop)
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: TickerSubscription):
+        with self._subscribers_lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+    # Message handling
+
+    def handle_message(self, message) -> int:
+        """
+        Apply one websocket message
+
+        Args:
+            message: Raw JSON text or decoded message
+
+        Returns:
+            Number of ticker updates published
+        """
+        data = json.loads(message) if isinstance(message, (str, bytes)) else message
+        self.stats['messages'] += 1
+        self._last_message_at = time.time()
+
+        topic = data.get('topic', '')
+        if topic.startswith('tickers.'):
+            return self._apply_ticker(topic.split('.', 1)[1], data)
+        if topic.startswith('kline.'):
+            self._apply_klines(topic, data)
+        elif data.get('op') == 'subscribe' and not data.get('success', True):
+            logger.warning(f"⚠️  Market data subscription failed: {data.get('ret_msg', data)}")
+        return 0
+
+    def _apply_ticker(self, symbol: str, data: Dict) -> int:
+        payload = data.get('data') or {}
+        previous = None if data.get('type') == 'snapshot' else self._latest.get(symbol)
+        ticker = merge_ticker(previous, symbol, payload, exchange_ts=int(data.get('ts', 0)))
+        if ticker is None:
+            self.stats['deltas_skipped'] += 1
+            return 0
+
+        if symbol in self._latest:
+            self._latest[symbol] = ticker
+        else:
+            self._latest = {**self._latest, symbol: ticker}
+        self.stats['ticker_updates'] += 1
+
+        for subscription in self._subscribers:
+            if subscription.wants(symbol):
+                subscription.offer(ticker)
+        return 1
+
+    def _apply_klines(self, topic: str, data: Dict):
+        # Topic format: kline.{interval}.{symbol}
+        _, interval, symbol = topic.split('.', 2)
+        if self.kline_cache is not None and data.get('data'):
+            self.kline_cache.apply_ws_klines(symbol, interval, data['data'])
+            self.stats['kline_updates'] += 1
+
+    # Connection
+
+    async def run(self):
+        """Stream until stop(), reconnecting with exponential backoff"""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        attempt = 0
+
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=None) as websocket:
+                    self._ws = websocket
+                    self.connected = True
+                    self.stats['connects'] += 1
+                    attempt = 0
+                    logger.info(f"🔗 Market data hub connected ({len(self.symbols)} symbols)")
+
+                    await self._subscribe(websocket)
+                    pinger = asyncio.create_task(self._ping(websocket))
+                    try:
+                        async for message in websocket:
+                            try:
+                                self.handle_message(message)
+                            except Exception as e:
+                                self.stats['errors'] += 1
+                                logger.error(f"❌ Market data message error: {e}")
+                    finally:
+                        pinger.cancel()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"🔌 Market data hub connection error: {e}")
+            finally:
+                self.connected = False
+                self._ws = None
+
+            if not self._stopping:
+                attempt += 1
+                wait_time = min(2 ** attempt, self.max_backoff)
+                logger.warning(f"🔌 Market data hub disconnected, reconnecting in {wait_time}s...")
+                await asyncio.sleep(wait_time)
+
+        logger.info("🛑 Market data hub stopped")
+
+    async def _subscribe(self, websocket):
+        topics = self.topics()
+        for start in range(0, len(topics), MAX_TOPICS_PER_SUBSCRIBE):
+            await websocket.send(json.dumps({
+                "op": "subscribe",
+                "args": topics[start:start + MAX_TOPICS_PER_SUBSCRIBE]
+            }))
+        logger.info(f"📡 Market data hub subscribed to {len(topics)} topics")
+
+    async def _ping(self, websocket):
+        """Bybit drops public connections without an application ping every ~20s"""
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await websocket.send(json.dumps({"op": "ping"}))
+
+    def stop(self):
+        """Stop streaming (any thread)"""
+        self._stopping = True
+        websocket, loop = self._ws, self._loop
+        if websocket is None or loop is None or loop.is_closed():
+            return
+        try:
+            if asyncio.get_running_loop() is loop:
+                loop.create_task(websocket.close())
+                return
+        except RuntimeError:
+            pass
+        asyncio.run_coroutine_threadsafe(websocket.close(), loop)
+
+    def get_stats(self) -> Dict:
+        """Connection, update and per-subscriber delivery counters"""
+        stats = dict(self.stats)
+        stats.update({
+            'connected': self.connected,
+            'symbols': len(self.symbols),
+            'subscribers': [
+                {'symbols': sorted(s.symbols) if s.symbols else 'all',
+                 'delivered': s.delivered, 'dropped': s.dropped}
+                for s in self._subscribers
+            ],
+            'last_message_age': (round(time.time() - self._last_message_at, 3)
+                                 if self._last_message_at else None),
+        })
+        return stats
@@ -12,6 +12,7 @@ Features:
 - High-frequency price updates
 - Market data validation
 - Fallback to REST API if WebSocket fails
+- Fixed-size NumPy tick history per symbol for windowed change/volatility/VWAP
 """
 
 import asyncio
@@ -19,12 +20,112 @@ import json
 import logging
 import websockets
 import aiohttp
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 import time
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+NS_PER_MINUTE = 60_000_000_000
+
+
+class TickRingBuffer:
+    """
+    Fixed-capacity tick store backed by NumPy arrays
+
+    Same layout as KlineRingBuffer (kline_cache.py): rows live in buffers of
+    twice the capacity and are compacted to the front only when the tail is
+    reached, so the stored ticks are always one contiguous, time-ordered
+    slice. Appends write into the preallocated arrays (amortized O(1), no
+    per-tick allocation) and window queries are a ``searchsorted``.
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        """
+        Initialize tick store
+
+        Args:
+            capacity: Maximum number of ticks retained
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)  # Receive time, ns
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._volumes = np.zeros(2 * capacity, dtype=np.float64)   # Volume traded since previous tick
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, timestamp_ns: int, price: float, volume: float = 0.0):
+        """
+        Store one tick
+
+        Args:
+            timestamp_ns: Tick time in ns (clamped so the history stays ordered)
+            price: Tick price
+            volume: Volume traded since the previous tick
+        """
+        if self._end == len(self._timestamps):
+            keep = self.capacity - 1
+            src = slice(self._end - keep, self._end)
+            self._timestamps[:keep] = self._timestamps[src]
+            self._prices[:keep] = self._prices[src]
+            self._volumes[:keep] = self._volumes[src]
+            self._start, self._end = 0, keep
+
+        if self._end > self._start:
+            timestamp_ns = max(timestamp_ns, int(self._timestamps[self._end - 1]))
+        self._timestamps[self._end] = timestamp_ns
+        self._prices[self._end] = price
+        self._volumes[self._end] = volume
+        self._end += 1
+
+        if self._end - self._start > self.capacity:
+            self._start += 1
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return float(self._prices[self._end - 1]) if self._end > self._start else None
+
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[self._start:self._end]
+
+    def prices(self) -> np.ndarray:
+        return self._prices[self._start:self._end]
+
+    def volumes(self) -> np.ndarray:
+        return self._volumes[self._start:self._end]
+
+    def index_at(self, timestamp_ns: int) -> int:
+        """Position (within the stored slice) of the first tick at or after timestamp_ns"""
+        return int(np.searchsorted(self.timestamps(), timestamp_ns, side='left'))
+
+    def window(self, since_ns: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Ticks at or after a time, as views into the buffer
+
+        Args:
+            since_ns: Window start in ns
+
+        Returns:
+            (timestamps, prices, volumes) arrays, valid until the next append
+        """
+        start = self._start + self.index_at(since_ns)
+        return (self._timestamps[start:self._end], self._prices[start:self._end],
+                self._volumes[start:self._end])
+
+    def price_at(self, timestamp_ns: int) -> Optional[float]:
+        """Price of the last tick at or before a time (oldest tick if none is that old)"""
+        if self._end == self._start:
+            return None
+        position = int(np.searchsorted(self.timestamps(), timestamp_ns, side='right')) - 1
+        return float(self._prices[self._start + max(position, 0)])
+
 class BybitRealTimePrices:
     """
     Real-time price data from Bybit WebSocket
@@ -36,13 +137,14 @@ class BybitRealTimePrices:
     - Volume and volatility metrics
     """
     
-    def __init__(self, symbols: List[str], testnet: bool = True):
+    def __init__(self, symbols: List[str], testnet: bool = True, history_depth: int = 10_000):
         """
         Initialize real-time price tracker
         
         Args:
             symbols: List of symbols to track (e.g., ['BTCUSDT', 'ETHUSDT'])
             testnet: Use testnet WebSocket URLs
+            history_depth: Ticks of price history kept per symbol
         """
         self.symbols = [self._format_symbol(symbol) for symbol in symbols]
         self.testnet = testnet
@@ -57,7 +159,9 @@ class BybitRealTimePrices:
         
         # Price data storage
         self.prices: Dict[str, Dict] = {}
-        self.price_history: Dict[str, List] = {}
+        self.history_depth = history_depth
+        self.price_history: Dict[str, TickRingBuffer] = {}
+        self._last_volume_24h: Dict[str, float] = {}
         self.callbacks: List[Callable] = []
         
         # Connection state
@@ -291,16 +395,18 @@ class BybitRealTimePrices:
     
     def _update_price_history(self, symbol, price_data):
         """Update price history for symbol"""
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
+        history = self.price_history.get(symbol)
+        if history is None:
+            history = self.price_history[symbol] = TickRingBuffer(self.history_depth)
         
-        self.price_history[symbol].append({
-            'price': price_data['price'],
-            'timestamp': price_data['timestamp']
-        })
+        # Volume traded since the last tick, from the rolling 24h volume
+        # (0 when the 24h window drops more than was traded)
+        volume_24h = price_data.get('volume_24h', 0.0)
+        previous_volume = self._last_volume_24h.get(symbol)
+        self._last_volume_24h[symbol] = volume_24h
+        volume = max(volume_24h - previous_volume, 0.0) if previous_volume else 0.0
         
-        if len(self.price_history[symbol]) > 100:
-            self.price_history[symbol] = self.price_history[symbol][-100:]
+        history.append(time.time_ns(), price_data['price'], volume)
     
     def _log_price_change(self, symbol, price_data, old_price):
         """Log significant price changes"""
@@ -522,25 +628,14 @@ class BybitRealTimePrices:
         """Calculate price change over specified minutes"""
         try:
             symbol = self._format_symbol(symbol)
-            history = self.price_history.get(symbol, [])
+            history = self.price_history.get(symbol)
             
-            if len(history) < 2:
+            if history is None or len(history) < 2:
                 return 0.0
             
-            current_time = datetime.now()
-            cutoff_time = current_time - datetime.timedelta(minutes=minutes)
-            
-            # Find price from specified minutes ago
-            old_price = None
-            for entry in reversed(history):
-                if entry['timestamp'] <= cutoff_time:
-                    old_price = entry['price']
-                    break
-            
-            if old_price is None:
-                old_price = history[0]['price']  # Use oldest available
-            
-            current_price = history[-1]['price']
+            # Price from specified minutes ago (oldest available if history is shorter)
+            old_price = history.price_at(time.time_ns() - minutes * NS_PER_MINUTE)
+            current_price = history.last_price
             
             if old_price > 0:
                 return ((current_price - old_price) / old_price) * 100
@@ -555,34 +650,52 @@ class BybitRealTimePrices:
         """Calculate price volatility over specified minutes"""
         try:
             symbol = self._format_symbol(symbol)
-            history = self.price_history.get(symbol, [])
+            history = self.price_history.get(symbol)
             
-            if len(history) < 10:  # Need at least 10 data points
+            if history is None or len(history) < 10:  # Need at least 10 data points
                 return 0.0
             
-            current_time = datetime.now()
-            cutoff_time = current_time - datetime.timedelta(minutes=minutes)
-            
             # Get prices from specified time period
-            recent_prices = [
-                entry['price'] for entry in history 
-                if entry['timestamp'] >= cutoff_time
-            ]
+            _, recent_prices, _ = history.window(time.time_ns() - minutes * NS_PER_MINUTE)
             
             if len(recent_prices) < 3:
                 return 0.0
             
             # Calculate standard deviation as volatility measure
-            mean_price = sum(recent_prices) / len(recent_prices)
-            variance = sum((price - mean_price) ** 2 for price in recent_prices) / len(recent_prices)
-            volatility = (variance ** 0.5) / mean_price * 100  # As percentage
-            
-            return volatility
+            mean_price = recent_prices.mean()
+            if mean_price <= 0:
+                return 0.0
+            return float(recent_prices.std() / mean_price * 100)  # As percentage
             
         except Exception as e:
             logger.error(f"❌ Error calculating volatility: {e}")
             return 0.0
 
+    def get_vwap(self, symbol: str, minutes: int = 15) -> float:
+        """Calculate volume-weighted average price over specified minutes
+        
+        Falls back to the mean tick price when no volume was traded in the window.
+        """
+        try:
+            symbol = self._format_symbol(symbol)
+            history = self.price_history.get(symbol)
+            
+            if history is None or len(history) == 0:
+                return 0.0
+            
+            _, prices, volumes = history.window(time.time_ns() - minutes * NS_PER_MINUTE)
+            if len(prices) == 0:
+                return 0.0
+            
+            total_volume = volumes.sum()
+            if total_volume > 0:
+                return float(np.dot(prices, volumes) / total_volume)
+            return float(prices.mean())
+            
+        except Exception as e:
+            logger.error(f"❌ Error calculating VWAP: {e}")
+            return 0.0
+
     def is_connected(self) -> bool:
         """Check if WebSocket is connected"""
         return self.ws_connected
@@ -19,6 +19,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 
 from .bybit_client import BybitClient, format_bybit_symbol, calculate_quantity_precision
+from .client_pool import get_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +89,7 @@ class BybitTradingExecutor:
     """
     
     def __init__(self, 
-                 bybit_client: BybitClient,
+                 bybit_client: Optional[BybitClient] = None,
                  max_positions: int = 3,
                  max_risk_per_trade: float = 0.01,   # 1% per trade - STRICT LIMIT
                  max_portfolio_risk: float = 0.03,   # 3% total portfolio  
@@ -100,14 +101,14 @@ class BybitTradingExecutor:
         ⚠️  WARNING: THIS WILL PLACE REAL ORDERS ⚠️
         
         Args:
-            bybit_client: Configured Bybit API client
+            bybit_client: Configured Bybit API client (shared pooled client if not provided)
             max_positions: Maximum concurrent positions
             max_risk_per_trade: Maximum risk per individual trade (1% strict limit)
             max_portfolio_risk: Maximum total portfolio risk
             min_confidence: Minimum signal confidence to trade
             dynamic_take_profit: Use dynamic take profit based on signal quality
         """
-        self.client = bybit_client
+        self.client = bybit_client or get_client_registry().get_client()
         self.max_positions = max_positions
         self.max_risk_per_trade = max_risk_per_trade
         self.max_portfolio_risk = max_portfolio_risk
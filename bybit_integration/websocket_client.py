@@ -115,6 +115,7 @@ class BybitWebSocketClient:
         }
         
         # Data storage
+        self.kline_cache = None  # Optional KlineCache fed by the kline topic
         self.latest_prices: Dict[str, float] = {}
         self.latest_orders: Dict[str, OrderUpdate] = {}
         self.latest_positions: Dict[str, PositionUpdate] = {}
@@ -336,6 +337,11 @@ class BybitWebSocketClient:
         try:
             kline_data = data.get("data", [])
             
+            # Topic format: kline.{interval}.{symbol}
+            if self.kline_cache is not None and kline_data:
+                _, interval, symbol = data.get("topic", "").split(".", 2)
+                self.kline_cache.apply_ws_klines(symbol, interval, kline_data)
+            
             for callback in self.callbacks[SubscriptionType.KLINE]:
                 try:
                     await callback(kline_data)
@@ -480,6 +486,20 @@ class BybitWebSocketClient:
             
         logger.info("💱 Subscribed to trades: {symbol}")
 
+    def subscribe_klines(self, symbol: str, interval: str = "60", callback: Callable = None):
+        """Subscribe to kline/candlestick updates for a symbol"""
+        topic = f"kline.{interval}.{symbol}"
+        self.subscriptions[topic] = SubscriptionType.KLINE
+        
+        if callback:
+            self.callbacks[SubscriptionType.KLINE].append(callback)
+            
+        logger.info(f"🕯️ Subscribed to klines: {symbol} ({interval})")
+
+    def attach_kline_cache(self, kline_cache):
+        """Feed kline topic updates into a KlineCache (see kline_cache.py)"""
+        self.kline_cache = kline_cache
+
     def subscribe_orders(self, callback: Callable = None):
         """Subscribe to order updates"""
         if not self.api_key:
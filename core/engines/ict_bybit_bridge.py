@@ -29,7 +29,7 @@ import aiohttp
 # Add the bybit_integration directory to the path
 sys.path.append('/Users/kirstonkwasi-kumah/Desktop/Trading Algoithm')
 
-from bybit_integration import BybitIntegrationManager, create_integration_manager
+from bybit_integration import BybitIntegrationManager, create_integration_manager, get_client_registry
 from bybit_integration.config import load_config_from_env, validate_config
 
 # Configure logging
@@ -121,8 +121,8 @@ class ICTBybitBridge:
             else:
                 logger.info("🧪 Dry run mode - Bybit integration simulated")
             
-            # Create HTTP session for ICT monitor
-            self.ict_session = aiohttp.ClientSession()
+            # Borrow pooled HTTP session for ICT monitor polling
+            self.ict_session = get_client_registry().get_session()
             
             # Test ICT monitor connection
             await self._test_ict_connection()
@@ -419,16 +419,18 @@ class ICTBybitBridge:
             
             self.running = False
             
-            # Close HTTP session
-            if self.ict_session:
-                await self.ict_session.close()
+            # Final performance report (while the pooled session is still open)
+            await self.compare_performance()
             
             # Stop Bybit manager
             if self.bybit_manager:
                 await self.bybit_manager.stop()
             
-            # Final performance report
-            await self.compare_performance()
+            # Release pooled HTTP sessions
+            self.ict_session = None
+            registry = get_client_registry()
+            logger.info(f"🔗 Connection pool stats: {registry.get_stats()}")
+            await registry.aclose()
             
             logger.info("✅ Bridge shutdown complete")
             
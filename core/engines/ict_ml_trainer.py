@@ -7,11 +7,12 @@ Train machine learning models on ICT paper trading results to enhance
 signal generation and confluence scoring.
 
 Features:
-- Feature extraction from ICT signals and market data
+- Columnar feature extraction from ICT signals and market data
 - Training on paper trade outcomes (win/loss/pnl)
 - Model evaluation and validation
 - Automatic model deployment to monitor
 - Continuous learning from new trades
+- Batched inference for every signal of a scan cycle
 
 Author: GitHub Copilot Trading Algorithm
 Date: September 2025
@@ -24,6 +25,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import json
 import os
+import threading
 from pathlib import Path
 
 # ML imports
@@ -41,12 +43,82 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Feature matrix layout. Bump the version whenever columns change so
+# models trained on another layout are not fed misaligned features.
+FEATURE_SCHEMA_VERSION = 1
+CRYPTOS = ('BTC', 'ETH', 'SOL', 'XRP')
+TIMEFRAMES = ('1m', '5m', '15m', '1h', '4h')
+FEATURE_COLUMNS = (
+    'confidence', 'risk_amount', 'entry_price', 'stop_loss', 'take_profit', 'risk_reward_ratio',
+    'action_buy', 'action_sell',
+    *(f'crypto_{crypto.lower()}' for crypto in CRYPTOS),
+    *(f'tf_{timeframe}' for timeframe in TIMEFRAMES),
+    'ml_boost', 'ict_confidence',
+    'hour', 'day_of_week', 'is_market_hours', 'session_asia', 'session_london', 'session_ny',
+    'price', 'change_24h', 'volume', 'high_24h', 'low_24h', 'price_position'
+)
+_COLUMN_INDEX = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
+NEUTRAL_PREDICTION = {
+    'ml_boost': 0.0,
+    'success_probability': 0.5,
+    'expected_pnl': 0.0,
+    'confidence_multiplier': 1.0
+}
+
+# Loaded model bundles keyed by (path, mtime) so each file is unpickled once
+_model_cache: Dict[Tuple[str, int], Dict] = {}
+_model_cache_lock = threading.Lock()
+
+
+def load_model_bundle(path) -> Optional[Dict]:
+    """
+    Load a combined model file once; later calls reuse it until the file changes.
+
+    Args:
+        path: Path to crypto_ml_model.pkl
+
+    Returns:
+        Model bundle dict, or None if missing or unreadable
+    """
+    path = Path(path).resolve()
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        return None
+
+    with _model_cache_lock:
+        if key not in _model_cache:
+            try:
+                bundle = joblib.load(path)
+            except Exception as e:
+                logger.error(f"Error loading models from {path}: {e}")
+                return None
+            # Drop bundles of older versions of this file
+            for stale in [k for k in _model_cache if k[0] == key[0]]:
+                del _model_cache[stale]
+            _model_cache[key] = bundle
+        return _model_cache[key]
+
+
+def _parse_timestamp(timestamp):
+    """Timestamp as datetime; None when absent, False when unparseable"""
+    if not timestamp:
+        return None
+    try:
+        if isinstance(timestamp, str):
+            return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return timestamp if hasattr(timestamp, 'hour') else False
+    except ValueError:
+        return False
+
+
 class ICTMLTrainer:
     """Train ML models on ICT paper trading data."""
     
-    def __init__(self):
+    def __init__(self, models_dir: str = "models"):
         """Initialize the ML trainer."""
-        self.models_dir = Path("models")
+        self.models_dir = Path(models_dir)
         self.models_dir.mkdir(exist_ok=True)
         
         # Feature engineering components
@@ -57,104 +129,91 @@ class ICTMLTrainer:
         self.signal_classifier = None  # Predicts signal success probability
         self.pnl_regressor = None      # Predicts expected PnL
         self.confluence_enhancer = None # Enhances confluence scoring
+        self.feature_schema_version = FEATURE_SCHEMA_VERSION
         
         logger.info("ICT ML Trainer initialized")
     
-    def extract_features_from_signal(self, signal: Dict, market_data: Dict = None) -> Dict:
-        """Extract ML features from an ICT signal."""
-        features = {}
+    def build_feature_matrix(self, signals: List[Dict], market_data: Dict = None) -> np.ndarray:
+        """
+        Build the feature matrix for many signals at once.
+        
+        Args:
+            signals: ICT signals
+            market_data: Crypto -> market snapshot (price, change_24h, volume, high_24h, low_24h)
+            
+        Returns:
+            float32 array of shape (len(signals), len(FEATURE_COLUMNS)) in FEATURE_COLUMNS order
+        """
+        n = len(signals)
+        X = np.zeros((n, len(FEATURE_COLUMNS)), dtype=np.float32)
+        if n == 0:
+            return X
+        col = _COLUMN_INDEX
+        
+        def values(key, default):
+            return np.array([signal.get(key, default) for signal in signals], dtype=np.float64)
         
         # Basic signal features
-        features['confidence'] = signal.get('confidence', 0.0)
-        features['risk_amount'] = signal.get('risk_amount', 100.0)
-        features['entry_price'] = signal.get('entry_price', 0.0)
-        features['stop_loss'] = signal.get('stop_loss', 0.0)
-        features['take_profit'] = signal.get('take_profit', 0.0)
-        
-        # Calculate risk/reward ratio
-        entry = features['entry_price']
-        sl = features['stop_loss']
-        tp = features['take_profit']
-        
-        if entry > 0 and sl > 0 and tp > 0:
-            risk = abs(entry - sl)
-            reward = abs(tp - entry)
-            features['risk_reward_ratio'] = reward / risk if risk > 0 else 0
-        else:
-            features['risk_reward_ratio'] = 0
-        
-        # Action encoding
-        features['action_buy'] = 1 if signal.get('action') == 'BUY' else 0
-        features['action_sell'] = 1 if signal.get('action') == 'SELL' else 0
-        
-        # Crypto encoding
-        crypto = signal.get('crypto', 'BTC')
-        features['crypto_btc'] = 1 if crypto == 'BTC' else 0
-        features['crypto_eth'] = 1 if crypto == 'ETH' else 0
-        features['crypto_sol'] = 1 if crypto == 'SOL' else 0
-        features['crypto_xrp'] = 1 if crypto == 'XRP' else 0
-        
-        # Timeframe encoding
-        timeframe = signal.get('timeframe', '5m')
-        features['tf_1m'] = 1 if timeframe == '1m' else 0
-        features['tf_5m'] = 1 if timeframe == '5m' else 0
-        features['tf_15m'] = 1 if timeframe == '15m' else 0
-        features['tf_1h'] = 1 if timeframe == '1h' else 0
-        features['tf_4h'] = 1 if timeframe == '4h' else 0
+        entry = values('entry_price', 0.0)
+        sl = values('stop_loss', 0.0)
+        tp = values('take_profit', 0.0)
+        X[:, col['confidence']] = values('confidence', 0.0)
+        X[:, col['risk_amount']] = values('risk_amount', 100.0)
+        X[:, col['entry_price']] = entry
+        X[:, col['stop_loss']] = sl
+        X[:, col['take_profit']] = tp
+        
+        # Risk/reward ratio (0 when any level is missing or there is no risk)
+        risk = np.abs(entry - sl)
+        valid = (entry > 0) & (sl > 0) & (tp > 0) & (risk > 0)
+        X[:, col['risk_reward_ratio']] = np.divide(np.abs(tp - entry), risk, out=np.zeros(n), where=valid)
+        
+        # One-hot encodings
+        actions = np.array([signal.get('action') for signal in signals], dtype=object)
+        X[:, col['action_buy']] = actions == 'BUY'
+        X[:, col['action_sell']] = actions == 'SELL'
+        cryptos = [signal.get('crypto', 'BTC') for signal in signals]
+        crypto_codes = np.array(cryptos, dtype=object)[:, None]
+        X[:, col['crypto_btc']:col['crypto_btc'] + len(CRYPTOS)] = crypto_codes == np.array(CRYPTOS, dtype=object)
+        timeframes = np.array([signal.get('timeframe', '5m') for signal in signals], dtype=object)[:, None]
+        X[:, col['tf_1m']:col['tf_1m'] + len(TIMEFRAMES)] = timeframes == np.array(TIMEFRAMES, dtype=object)
         
         # ICT-specific features
-        features['ml_boost'] = signal.get('ml_boost', 0.0)
-        features['ict_confidence'] = signal.get('ict_confidence', 0.0)
-        
-        # Time-based features
-        timestamp = signal.get('timestamp')
-        if timestamp:
-            try:
-                if isinstance(timestamp, str):
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                else:
-                    dt = timestamp
-                
-                features['hour'] = dt.hour
-                features['day_of_week'] = dt.weekday()
-                features['is_market_hours'] = 1 if 8 <= dt.hour <= 22 else 0
-                
-                # Session encoding
-                features['session_asia'] = 1 if (dt.hour >= 23 or dt.hour <= 8) else 0
-                features['session_london'] = 1 if (8 <= dt.hour <= 16) else 0
-                features['session_ny'] = 1 if (13 <= dt.hour <= 22) else 0
-            except Exception:
-                features['hour'] = 12
-                features['day_of_week'] = 1
-                features['is_market_hours'] = 1
-                features['session_asia'] = 0
-                features['session_london'] = 1
-                features['session_ny'] = 0
-        
-        # Market data features (if available)
-        if market_data and crypto in market_data:
-            market = market_data[crypto]
-            features['price'] = market.get('price', entry)
-            features['change_24h'] = market.get('change_24h', 0.0)
-            features['volume'] = market.get('volume', 0.0)
-            features['high_24h'] = market.get('high_24h', entry)
-            features['low_24h'] = market.get('low_24h', entry)
-            
-            # Price position features
-            if features['high_24h'] > features['low_24h']:
-                price_range = features['high_24h'] - features['low_24h']
-                features['price_position'] = (features['price'] - features['low_24h']) / price_range
-            else:
-                features['price_position'] = 0.5
-        else:
-            features['price'] = entry
-            features['change_24h'] = 0.0
-            features['volume'] = 0.0
-            features['high_24h'] = entry
-            features['low_24h'] = entry
-            features['price_position'] = 0.5
-        
-        return features
+        X[:, col['ml_boost']] = values('ml_boost', 0.0)
+        X[:, col['ict_confidence']] = values('ict_confidence', 0.0)
+        
+        # Time-based features: zeros without a timestamp, daytime defaults if unparseable
+        parsed = [_parse_timestamp(signal.get('timestamp')) for signal in signals]
+        has_time = np.array([dt is not None for dt in parsed])
+        hour = np.array([dt.hour if dt else 12 for dt in parsed], dtype=np.float64)
+        weekday = np.array([dt.weekday() if dt else 1 for dt in parsed], dtype=np.float64)
+        X[:, col['hour']] = np.where(has_time, hour, 0)
+        X[:, col['day_of_week']] = np.where(has_time, weekday, 0)
+        X[:, col['is_market_hours']] = has_time & (hour >= 8) & (hour <= 22)
+        X[:, col['session_asia']] = has_time & ((hour >= 23) | (hour <= 8))
+        X[:, col['session_london']] = has_time & (hour >= 8) & (hour <= 16)
+        X[:, col['session_ny']] = has_time & (hour >= 13) & (hour <= 22)
+        
+        # Market data features (signal levels when there is no snapshot)
+        market_data = market_data or {}
+        markets = [market_data.get(crypto) or {} for crypto in cryptos]
+        price = np.array([m.get('price', e) for m, e in zip(markets, entry)], dtype=np.float64)
+        high = np.array([m.get('high_24h', e) for m, e in zip(markets, entry)], dtype=np.float64)
+        low = np.array([m.get('low_24h', e) for m, e in zip(markets, entry)], dtype=np.float64)
+        X[:, col['price']] = price
+        X[:, col['change_24h']] = [m.get('change_24h', 0.0) for m in markets]
+        X[:, col['volume']] = [m.get('volume', 0.0) for m in markets]
+        X[:, col['high_24h']] = high
+        X[:, col['low_24h']] = low
+        X[:, col['price_position']] = np.divide(price - low, high - low, out=np.full(n, 0.5), where=high > low)
+        
+        # Fields present but None (or NaN) count as 0, like the former fillna(0)
+        return np.nan_to_num(X, copy=False, nan=0.0)
+    
+    def extract_features_from_signal(self, signal: Dict, market_data: Dict = None) -> Dict:
+        """Extract ML features from an ICT signal."""
+        row = self.build_feature_matrix([signal], market_data)[0]
+        return dict(zip(FEATURE_COLUMNS, row.tolist()))
     
     def extract_target_from_trade(self, trade: Dict) -> Tuple[int, float]:
         """Extract target variables from completed paper trade."""
@@ -167,12 +226,17 @@ class ICTMLTrainer:
     
     def prepare_training_data(self, trading_journal: List[Dict], market_data_history: Dict = None) -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
         """Prepare training data from trading journal."""
-        features_list = []
+        signals = []
         success_targets = []
         pnl_targets = []
         
         logger.info(f"Preparing training data from {len(trading_journal)} trades...")
         
+        # Get market data for the trades if available
+        # In a real implementation, you'd look up historical market data per trade
+        # For now, we'll use current data as a placeholder
+        trade_market_data = market_data_history or None
+        
         for trade in trading_journal:
             # Skip incomplete trades
             if 'final_pnl' not in trade and 'pnl' not in trade:
@@ -193,22 +257,17 @@ class ICTMLTrainer:
                 'ict_confidence': trade.get('confidence', 0.7)
             }
             
-            # Get market data for this trade if available
-            trade_market_data = None
-            if market_data_history:
-                # In a real implementation, you'd look up historical market data
-                # For now, we'll use current data as a placeholder
-                trade_market_data = market_data_history
-            
-            features = self.extract_features_from_signal(signal_data, trade_market_data)
             success, pnl = self.extract_target_from_trade(trade)
             
-            features_list.append(features)
+            signals.append(signal_data)
             success_targets.append(success)
             pnl_targets.append(pnl)
         
-        # Convert to DataFrame
-        features_df = pd.DataFrame(features_list)
+        # One feature matrix for the whole journal
+        features_df = pd.DataFrame(
+            self.build_feature_matrix(signals, trade_market_data),
+            columns=list(FEATURE_COLUMNS)
+        )
         success_series = pd.Series(success_targets)
         pnl_series = pd.Series(pnl_targets)
         
@@ -227,8 +286,10 @@ class ICTMLTrainer:
         logger.info("Training ML models...")
         results = {}
         
-        # Prepare data
-        X = features_df.fillna(0)  # Handle any missing values
+        # Prepare data (plain arrays: inference passes matrices, not DataFrames)
+        if tuple(features_df.columns) != FEATURE_COLUMNS:
+            features_df = features_df.reindex(columns=list(FEATURE_COLUMNS))
+        X = features_df.fillna(0).to_numpy(dtype=np.float32)  # Handle any missing values
         y_success = success_targets
         y_pnl = pnl_targets
         
@@ -335,6 +396,8 @@ class ICTMLTrainer:
                 'pnl_regressor': self.pnl_regressor,
                 'scaler': self.scaler,
                 'version': '1.0',
+                'feature_schema_version': FEATURE_SCHEMA_VERSION,
+                'feature_columns': list(FEATURE_COLUMNS),
                 'trained_at': datetime.now().isoformat()
             }
             joblib.dump(combined_model, self.models_dir / "crypto_ml_model.pkl")
@@ -345,57 +408,84 @@ class ICTMLTrainer:
             logger.error(f"Error saving models: {e}")
             return False
     
-    def predict_signal_enhancement(self, signal: Dict, market_data: Dict = None) -> Dict:
-        """Predict enhancements for a signal using trained models."""
-        if not ML_AVAILABLE or not self.signal_classifier or not self.pnl_regressor:
-            return {
-                'ml_boost': 0.0,
-                'success_probability': 0.5,
-                'expected_pnl': 0.0,
-                'confidence_multiplier': 1.0
-            }
+    def load_models(self, path=None) -> bool:
+        """
+        Load the combined model file (memoized across trainers until the file changes).
         
-        try:
-            # Extract features
-            features = self.extract_features_from_signal(signal, market_data)
-            features_df = pd.DataFrame([features])
-            X = self.scaler.transform(features_df.fillna(0))
+        Args:
+            path: Model file (models_dir/crypto_ml_model.pkl if None)
             
-            # Predict success probability
-            success_prob = self.signal_classifier.predict_proba(X)[0][1]  # Probability of success
+        Returns:
+            True if models with a matching feature schema were loaded
+        """
+        if not ML_AVAILABLE:
+            return False
+        
+        bundle = load_model_bundle(path or self.models_dir / "crypto_ml_model.pkl")
+        if not bundle:
+            return False
+        
+        schema = bundle.get('feature_schema_version')
+        if schema != FEATURE_SCHEMA_VERSION:
+            logger.warning(f"Model feature schema {schema} does not match {FEATURE_SCHEMA_VERSION}; retrain the models")
+            return False
+        
+        self.signal_classifier = bundle['signal_classifier']
+        self.pnl_regressor = bundle['pnl_regressor']
+        self.scaler = bundle['scaler']
+        self.feature_schema_version = schema
+        return True
+    
+    def predict_batch(self, signals: List[Dict], market_data: Dict = None) -> List[Dict]:
+        """
+        Predict enhancements for all signals of a scan cycle in one model call.
+        
+        Args:
+            signals: ICT signals
+            market_data: Crypto -> market snapshot
             
-            # Predict expected PnL
-            expected_pnl = self.pnl_regressor.predict(X)[0]
+        Returns:
+            One prediction dict per signal, in order
+        """
+        if not ML_AVAILABLE or not self.signal_classifier or not self.pnl_regressor or not signals:
+            return [dict(NEUTRAL_PREDICTION) for _ in signals]
+        
+        try:
+            X = self.scaler.transform(self.build_feature_matrix(signals, market_data))
             
-            # Calculate ML boost (how much to add to confidence)
-            base_confidence = signal.get('confidence', 0.7)
+            # Probability of success and expected PnL for every signal
+            success_prob = self.signal_classifier.predict_proba(X)[:, 1]
+            expected_pnl = self.pnl_regressor.predict(X)
             
-            # ML boost calculation based on model predictions
-            if success_prob > 0.7 and expected_pnl > 50:  # High confidence, good expected return
-                ml_boost = min(0.15, (success_prob - 0.7) * 0.5)  # Cap at 15% boost
-            elif success_prob > 0.6 and expected_pnl > 0:  # Moderate confidence
-                ml_boost = min(0.1, (success_prob - 0.6) * 0.3)   # Cap at 10% boost
-            else:
-                ml_boost = 0.0  # No boost for low confidence predictions
+            # ML boost (how much to add to confidence)
+            ml_boost = np.select(
+                [(success_prob > 0.7) & (expected_pnl > 50),  # High confidence, good expected return
+                 (success_prob > 0.6) & (expected_pnl > 0)],  # Moderate confidence
+                [np.minimum(0.15, (success_prob - 0.7) * 0.5),  # Cap at 15% boost
+                 np.minimum(0.1, (success_prob - 0.6) * 0.3)],  # Cap at 10% boost
+                default=0.0  # No boost for low confidence predictions
+            )
             
             # Confidence multiplier for risk sizing
-            confidence_multiplier = min(1.5, max(0.5, success_prob * 2))
+            confidence_multiplier = np.clip(success_prob * 2, 0.5, 1.5)
             
-            return {
-                'ml_boost': ml_boost,
-                'success_probability': success_prob,
-                'expected_pnl': expected_pnl,
-                'confidence_multiplier': confidence_multiplier
-            }
+            return [
+                {
+                    'ml_boost': float(boost),
+                    'success_probability': float(prob),
+                    'expected_pnl': float(pnl),
+                    'confidence_multiplier': float(multiplier)
+                }
+                for boost, prob, pnl, multiplier in zip(ml_boost, success_prob, expected_pnl, confidence_multiplier)
+            ]
             
         except Exception as e:
             logger.error(f"Error in ML prediction: {e}")
-            return {
-                'ml_boost': 0.0,
-                'success_probability': 0.5,
-                'expected_pnl': 0.0,
-                'confidence_multiplier': 1.0
-            }
+            return [dict(NEUTRAL_PREDICTION) for _ in signals]
+    
+    def predict_signal_enhancement(self, signal: Dict, market_data: Dict = None) -> Dict:
+        """Predict enhancements for a signal using trained models."""
+        return self.predict_batch([signal], market_data)[0]
     
     def train_from_monitor_data(self, monitor_data_file: str = "monitor_data.json") -> bool:
         """Train models from monitor's trading journal data."""
@@ -28,6 +28,7 @@ from flask import Flask, render_template_string, jsonify, request, send_from_dir
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 import jwt
 import bcrypt
 import pandas as pd
@@ -40,6 +41,9 @@ sys.path.append(project_root)
 # Import database and trading modules
 from database.trading_database import TradingDatabase
 from trading.intraday_trade_manager import create_trade_manager
+from bybit_integration.kline_cache import KlineCache
+from bybit_integration.market_data_hub import MarketDataHub
+from trading.paper_trade_book import PaperTradeBook
 
 # Add utils directory to path for quant modules
 utils_path = os.path.join(project_root, 'utils')
@@ -95,6 +99,8 @@ class ICTCryptoMonitor:
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         db_path = os.path.join(project_root, "data", "trading.db")
         self.db = TradingDatabase(db_path)
+        # Scan-loop writes are batched by a background writer; trade writes stay durable
+        self.db.start_write_behind()
         
         # Exact same symbols as previous monitor
         self.symbols = ['BTCUSDT', 'SOLUSDT', 'ETHUSDT', 'XRPUSDT']
@@ -178,6 +184,13 @@ class ICTCryptoMonitor:
         self.live_trading_enabled = True
         self.account_balance = 0.0  # Fetched from Bybit API
         self.bybit_client = None  # Initialized lazily when needed
+        self.kline_cache = KlineCache(capacity=1000)  # Incremental 1H candle store per symbol
+        # One public websocket for tickers and 1H klines of all symbols (started by the analysis loop)
+        self.market_data = MarketDataHub(self.symbols, kline_cache=self.kline_cache, kline_intervals=('60',))
+        self.price_stale_after = 10.0  # Seconds before a streamed price falls back to REST
+        self.paper_trade_book = PaperTradeBook()  # In-memory OPEN paper trades for mark-to-market
+        self.paper_trade_resync_seconds = 300  # Full reload catches trades closed outside the monitor
+        self._last_paper_trade_resync = 0.0
         self.account_blown = False  # Track if account is blown
         self.blow_up_threshold = 10.0  # Blow up when balance <= $10
         self.total_pnl = 0.0
@@ -423,25 +436,13 @@ class ICTCryptoMonitor:
         return 0  # Return 0 for archived count (backward compatibility)
     
     def _get_bybit_client(self):
-        """Lazy initialization of Bybit client"""
+        """Lazy initialization of Bybit client (borrowed from the shared connection pool)"""
         if self.bybit_client is None:
             sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-            from bybit_integration.bybit_client import BybitClient
-            from dotenv import load_dotenv
+            from bybit_integration.client_pool import get_client_registry
             
-            # Load API credentials
-            env_path = os.path.join(os.path.dirname(__file__), '../../.env')
-            load_dotenv(env_path)
-            
-            api_key = os.getenv('BYBIT_API_KEY')
-            api_secret = os.getenv('BYBIT_API_SECRET')
-            testnet = os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
-            
-            self.bybit_client = BybitClient(
-                api_key=api_key,
-                api_secret=api_secret,
-                testnet=testnet
-            )
+            # Registry loads .env once and keeps one pooled keep-alive session per event loop
+            self.bybit_client = get_client_registry().get_client()
             logger.info("✅ Bybit client initialized for live trading")
         
         return self.bybit_client
@@ -688,106 +689,47 @@ class ICTCryptoMonitor:
             
             return None
     
+    def _sync_paper_trade_book(self):
+        """Bring the in-memory open-trade book up to date with the database"""
+        now = time.time()
+        if now - self._last_paper_trade_resync >= self.paper_trade_resync_seconds:
+            self.paper_trade_book.load(self.db.get_open_paper_trades())
+            self._last_paper_trade_resync = now
+        else:
+            # Only trades inserted since the last sync (id range scan on the primary key)
+            self.paper_trade_book.add(self.db.get_open_paper_trades(after_id=self.paper_trade_book.last_trade_id))
+    
     def update_paper_trades(self, current_prices):
         """Update active trades with current prices and check for TP/SL"""
         if not current_prices:
             return 0
         
-        closed_count = 0
-        
-        # Use database method with proper connection management
         try:
-            # Query paper_trades table for OPEN trades using database connection
-            with self.db._get_connection() as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute('SELECT * FROM paper_trades WHERE status = "OPEN"')
-                open_trades = cursor.fetchall()
-                
-                for trade_row in open_trades:
-                    trade = dict(trade_row)
-                    crypto = trade['symbol'].replace('USDT', '')
-                    
-                    if crypto not in current_prices:
-                        continue
-                    
-                    current_price = current_prices[crypto]['price']
-                    entry_price = trade['entry_price']
-                    stop_loss = trade['stop_loss']
-                    take_profit = trade['take_profit']
-                    position_size = trade['position_size']
-                    direction = trade['direction']
-                    trade_id = trade['id']
-                    
-                    # CRITICAL: Validate price is reasonable (within 20% of entry)
-                    # Prevents corrupted price data from closing trades incorrectly
-                    if current_price <= 0 or current_price > entry_price * 1.5 or current_price < entry_price * 0.5:
-                        logger.warning(f"⚠️ Invalid price detected for {crypto}: ${current_price:.2f} (entry: ${entry_price:.2f}) - skipping update")
-                        continue
-                    
-                    # Calculate unrealized PnL
-                    if direction == 'BUY':
-                        unrealized_pnl = (current_price - entry_price) * position_size
-                    else:  # SELL
-                        unrealized_pnl = (entry_price - current_price) * position_size
-                    
-                    # Update current_price and unrealized_pnl in database
-                    conn.execute('''
-                        UPDATE paper_trades 
-                        SET current_price = ?, unrealized_pnl = ?
-                        WHERE id = ?
-                    ''', (current_price, unrealized_pnl, trade_id))
-                    conn.commit()  # Commit after each update to release lock
-                    
-                    # Check for TP/SL hits
-                    should_close = False
-                    close_reason = ""
-                    
-                    if direction == 'BUY':
-                        if current_price <= stop_loss:
-                            should_close = True
-                            close_reason = "STOP_LOSS"
-                        elif current_price >= take_profit:
-                            should_close = True
-                            close_reason = "TAKE_PROFIT"
-                    else:  # SELL
-                        if current_price >= stop_loss:
-                            should_close = True
-                            close_reason = "STOP_LOSS"
-                        elif current_price <= take_profit:
-                            should_close = True
-                            close_reason = "TAKE_PROFIT"
-                    
-                    # Close trade if TP/SL hit
-                    if should_close:
-                        # Update paper_trades table
-                        conn.execute('''
-                            UPDATE paper_trades 
-                            SET status = ?, exit_price = ?, exit_time = datetime('now'), realized_pnl = ?
-                            WHERE id = ?
-                        ''', (close_reason, current_price, unrealized_pnl, trade_id))
-                        conn.commit()  # Commit close immediately
-                        
-                        # Close signal in signals table
-                        signal_id = trade['signal_id']
-                        self.db.close_signal(signal_id, current_price, close_reason)
-                        
-                        # Update account balance
-                        self.account_balance += unrealized_pnl
-                        closed_count += 1
-                        
-                        logger.info(f"📄 PAPER TRADE CLOSED: {crypto} {direction} | {close_reason} | PnL: ${unrealized_pnl:.2f} | New Balance: ${self.account_balance:.2f}")
-                        
-                        # Add to journal (use correct method signature)
-                        try:
-                            self.db.add_journal_entry(
-                                entry_type='TRADE_CLOSED',
-                                title=f"{crypto} {direction} - {close_reason}",
-                                content=f"Closed at ${current_price:.2f} | PnL: ${unrealized_pnl:.2f}",
-                                signal_id=signal_id
-                            )
-                        except Exception as journal_error:
-                            logger.warning(f"⚠️  Could not add journal entry: {journal_error}")
-                
+            self._sync_paper_trade_book()
+            if not len(self.paper_trade_book):
+                return 0
+            
+            # Mark every open trade at once; prices are validated against entry inside the book
+            marks = self.paper_trade_book.mark({
+                crypto: data['price'] for crypto, data in current_prices.items() if 'price' in data
+            })
+            closing = marks.closing
+            closes = [{
+                'id': int(marks.trade_ids[i]),
+                'signal_id': marks.rows[i].get('signal_id'),
+                'exit_price': float(marks.current_price[i]),
+                'realized_pnl': float(marks.unrealized_pnl[i]),
+                'close_reason': str(marks.close_reason[i])
+            } for i in closing]
+            
+            # One transaction for all PnL updates and TP/SL closes
+            closed_ids = set(self.db.mark_paper_trades(
+                list(zip(marks.current_price.tolist(), marks.unrealized_pnl.tolist(), marks.trade_ids.tolist())),
+                closes
+            ))
+            # Trades closed elsewhere in the meantime are dropped from the book as well
+            self.paper_trade_book.remove(close['id'] for close in closes)
+            
         except sqlite3.OperationalError as e:
             logger.warning(f"⚠️  Database busy during paper trade update: {e}")
             # Don't fail the entire cycle, just skip this update
@@ -796,101 +738,113 @@ class ICTCryptoMonitor:
             logger.error(f"❌ Error updating paper trades: {e}")
             return 0
         
+        closed_count = 0
+        for i, close in zip(closing, closes):
+            if close['id'] not in closed_ids:
+                continue
+            crypto = marks.rows[i]['symbol'].replace('USDT', '')
+            direction = marks.rows[i]['direction']
+            
+            # Update account balance
+            self.account_balance += close['realized_pnl']
+            closed_count += 1
+            
+            logger.info(f"📄 PAPER TRADE CLOSED: {crypto} {direction} | {close['close_reason']} | PnL: ${close['realized_pnl']:.2f} | New Balance: ${self.account_balance:.2f}")
+        
         return closed_count
         
+    @staticmethod
+    def _ticker_prices(tickers: Dict) -> Dict:
+        """Market data hub tickers keyed by base asset, in the monitor's price format"""
+        return {symbol.replace('USDT', ''): ticker.to_price_dict() for symbol, ticker in tickers.items()}
+    
+    def get_streamed_prices(self, max_age: Optional[float] = None) -> Dict:
+        """Latest websocket prices that are still fresh (readable from any thread)"""
+        max_age = self.price_stale_after if max_age is None else max_age
+        return self._ticker_prices(self.market_data.snapshot(max_age))
+    
     async def get_real_time_prices(self):
         """Get real-time prices from Bybit (real market prices)"""
         try:
-            # Import Bybit client
-            sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-            from bybit_integration.bybit_client import BybitClient
-            from dotenv import load_dotenv
+            # Borrow the long-lived pooled client (keep-alive connections are reused across cycles)
+            client = self._get_bybit_client()
             
-            # Load API credentials
-            env_path = os.path.join(os.path.dirname(__file__), '../../.env')
-            load_dotenv(env_path)
+            # Streamed prices first; REST only for symbols the websocket has not updated recently
+            prices = self.get_streamed_prices()
             
-            api_key = os.getenv('BYBIT_API_KEY')
-            api_secret = os.getenv('BYBIT_API_SECRET')
-            testnet = os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
+            # Map our symbols to Bybit format
+            symbol_mapping = {
+                'BTC': 'BTCUSDT',
+                'ETH': 'ETHUSDT',
+                'SOL': 'SOLUSDT',
+                'XRP': 'XRPUSDT'
+            }
             
-            # Use async context manager to ensure proper session cleanup
-            async with BybitClient(api_key=api_key, api_secret=api_secret, testnet=testnet) as client:
-                prices = {}
-                
-                # Map our symbols to Bybit format
-                symbol_mapping = {
-                    'BTC': 'BTCUSDT',
-                    'ETH': 'ETHUSDT',
-                    'SOL': 'SOLUSDT',
-                    'XRP': 'XRPUSDT'
-                }
-                
-                for crypto_name, bybit_symbol in symbol_mapping.items():
-                    try:
-                        # Get ticker data from Bybit (real-time market data)
-                        ticker = await client.get_ticker(bybit_symbol)
+            for crypto_name, bybit_symbol in symbol_mapping.items():
+                if crypto_name in prices:
+                    continue
+                try:
+                    # Get ticker data from Bybit (real-time market data)
+                    ticker = await client.get_ticker(bybit_symbol)
+                    
+                    if ticker:
+                        last_price = float(ticker.get('lastPrice', 0))
+                        high_24h = float(ticker.get('highPrice24h', last_price * 1.02))
+                        low_24h = float(ticker.get('lowPrice24h', last_price * 0.98))
+                        volume_24h = float(ticker.get('volume24h', 0))
+                        price_change_24h = float(ticker.get('price24hPcnt', 0)) * 100  # Convert to percentage
                         
-                        if ticker:
-                            last_price = float(ticker.get('lastPrice', 0))
-                            high_24h = float(ticker.get('highPrice24h', last_price * 1.02))
-                            low_24h = float(ticker.get('lowPrice24h', last_price * 0.98))
-                            volume_24h = float(ticker.get('volume24h', 0))
-                            price_change_24h = float(ticker.get('price24hPcnt', 0)) * 100  # Convert to percentage
-                            
-                            prices[crypto_name] = {
-                                'price': last_price,
-                                'change_24h': price_change_24h,
-                                'volume': volume_24h,
-                                'high_24h': high_24h,
-                                'low_24h': low_24h,
-                                'timestamp': datetime.now().isoformat()
-                            }
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch {crypto_name} from Bybit: {e}")
-                        continue
-                
-                # Fetch live Demo Trading balance (if not fetched recently)
-                now = datetime.now(timezone.utc)
-                if self.last_balance_update is None or (now - self.last_balance_update).total_seconds() > 60:
-                    try:
-                        balance_data = await client.get_balance()
-                        if balance_data:
-                            # Calculate total portfolio value in USDT
-                            total_value = 0.0
-                            balances_detail = []
-                            
-                            for coin, amount in balance_data.items():
-                                if amount > 0:
-                                    if coin == 'USDT' or coin == 'USDC':
-                                        # Stablecoins are 1:1 with USD
-                                        coin_value = amount
+                        prices[crypto_name] = {
+                            'price': last_price,
+                            'change_24h': price_change_24h,
+                            'volume': volume_24h,
+                            'high_24h': high_24h,
+                            'low_24h': low_24h,
+                            'timestamp': datetime.now().isoformat()
+                        }
+                except Exception as e:
+                    logger.warning(f"Failed to fetch {crypto_name} from Bybit: {e}")
+                    continue
+            
+            # Fetch live Demo Trading balance (if not fetched recently)
+            now = datetime.now(timezone.utc)
+            if self.last_balance_update is None or (now - self.last_balance_update).total_seconds() > 60:
+                try:
+                    balance_data = await client.get_balance()
+                    if balance_data:
+                        # Calculate total portfolio value in USDT
+                        total_value = 0.0
+                        balances_detail = []
+                        
+                        for coin, amount in balance_data.items():
+                            if amount > 0:
+                                if coin == 'USDT' or coin == 'USDC':
+                                    # Stablecoins are 1:1 with USD
+                                    coin_value = amount
+                                    total_value += coin_value
+                                    balances_detail.append(f"{coin}: ${coin_value:,.2f}")
+                                elif coin in ['BTC', 'ETH', 'SOL', 'XRP']:
+                                    # Use real-time prices we just fetched
+                                    coin_price = prices.get(coin, {}).get('price', 0)
+                                    if coin_price > 0:
+                                        coin_value = amount * coin_price
                                         total_value += coin_value
-                                        balances_detail.append(f"{coin}: ${coin_value:,.2f}")
-                                    elif coin in ['BTC', 'ETH', 'SOL', 'XRP']:
-                                        # Use real-time prices we just fetched
-                                        coin_price = prices.get(coin, {}).get('price', 0)
-                                        if coin_price > 0:
-                                            coin_value = amount * coin_price
-                                            total_value += coin_value
-                                            balances_detail.append(f"{amount:.6f} {coin} @ ${coin_price:,.2f} = ${coin_value:,.2f}")
-                            
-                            self.live_demo_balance = total_value
-                            self.last_balance_update = now
-                            logger.info(f"💰 Live Demo Portfolio Value: ${total_value:,.2f}")
-                            logger.info(f"   Holdings: {', '.join(balances_detail)}")
-                    except Exception as balance_error:
-                        logger.debug(f"Could not fetch Demo balance: {balance_error}")
-                
-                # Session cleanup is automatic with async context manager
-                
-                if prices:
-                    logger.info(f"✅ Real-time prices updated from Bybit: BTC=${prices.get('BTC', {}).get('price', 0):,.2f}")
-                    return prices
-                else:
-                    logger.warning("No prices fetched from Bybit, using fallback")
-                    return await self.get_binance_fallback()
+                                        balances_detail.append(f"{amount:.6f} {coin} @ ${coin_price:,.2f} = ${coin_value:,.2f}")
                         
+                        self.live_demo_balance = total_value
+                        self.last_balance_update = now
+                        logger.info(f"💰 Live Demo Portfolio Value: ${total_value:,.2f}")
+                        logger.info(f"   Holdings: {', '.join(balances_detail)}")
+                except Exception as balance_error:
+                    logger.debug(f"Could not fetch Demo balance: {balance_error}")
+            
+            if prices:
+                logger.info(f"✅ Real-time prices updated from Bybit: BTC=${prices.get('BTC', {}).get('price', 0):,.2f}")
+                return prices
+            else:
+                logger.warning("No prices fetched from Bybit, using fallback")
+                return await self.get_binance_fallback()
+                    
         except Exception as e:
             logger.error(f"Error fetching Bybit prices: {e}")
             return await self.get_binance_fallback()
@@ -976,55 +930,24 @@ class ICTCryptoMonitor:
             Dictionary with '1h' key containing DataFrame for resampling, or None if fetch fails
         """
         try:
-            from bybit_integration.bybit_client import BybitClient
-            from dotenv import load_dotenv
-            
-            # Load API credentials
-            env_path = os.path.join(os.path.dirname(__file__), '../../.env')
-            load_dotenv(env_path)
-            
-            api_key = os.getenv('BYBIT_API_KEY')
-            api_secret = os.getenv('BYBIT_API_SECRET')
-            testnet = os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
+            # Borrow the long-lived pooled client (no per-call session setup/teardown)
+            client = self._get_bybit_client()
             
-            # Use async context manager to ensure proper session cleanup
-            async with BybitClient(api_key=api_key, api_secret=api_secret, testnet=testnet) as client:
-                # Fetch 1H candles (200 periods = ~8 days of data)
-                # The backtest engine will resample this to 4H, 15m, 5m
-                logger.info(f"📊 Fetching 1H klines for {symbol} (200 candles = ~8 days)")
-                klines_1h = await client.get_kline_data(symbol=symbol, interval="60", limit=200)
+            # 1H candles (200 periods = ~8 days of data) from the rolling kline cache.
+            # First call seeds 200 candles; later calls only fetch candles from the last
+            # stored timestamp onwards. The backtest engine will resample this to 4H, 15m, 5m
+            df_1h = await self.kline_cache.refresh(client, symbol, interval="60", window=200)
             
-            if not klines_1h:
+            if df_1h is None or df_1h.empty:
                 logger.warning(f"❌ No kline data returned for {symbol}")
                 return None
             
-            # Convert Bybit klines to pandas DataFrame
-            # Bybit format: [startTime, openPrice, highPrice, lowPrice, closePrice, volume, turnover]
-            df_data = []
-            for candle in klines_1h:
-                try:
-                    df_data.append({
-                        'timestamp': pd.to_datetime(int(candle[0]), unit='ms'),
-                        'open': float(candle[1]),
-                        'high': float(candle[2]),
-                        'low': float(candle[3]),
-                        'close': float(candle[4]),
-                        'volume': float(candle[5])
-                    })
-                except (IndexError, ValueError) as e:
-                    logger.warning(f"Skipping invalid candle data: {e}")
-                    continue
+            if self.market_data.feeds_klines:
+                # The websocket keeps merging candles into the buffer while the
+                # analysis executor works on this frame, so hand it a copy
+                df_1h = df_1h.copy()
             
-            if not df_data:
-                logger.warning(f"❌ No valid candle data parsed for {symbol}")
-                return None
-            
-            # Create DataFrame and set timestamp as index
-            df_1h = pd.DataFrame(df_data)
-            df_1h = df_1h.set_index('timestamp')
-            df_1h = df_1h.sort_index()
-            
-            logger.info(f"✅ Fetched {len(df_1h)} 1H candles for {symbol} (from {df_1h.index[0]} to {df_1h.index[-1]})")
+            logger.info(f"✅ {len(df_1h)} 1H candles ready for {symbol} (from {df_1h.index[0]} to {df_1h.index[-1]})")
             
             return {'1h': df_1h}
             
@@ -1109,6 +1032,21 @@ class ICTWebMonitor:
         self.session_tracker = SessionStatusTracker(self.crypto_monitor.trading_sessions)
         self.statistics = MonitorStatistics()
         
+        # Concurrent scan stage: bounded executor for pandas-heavy signal generation
+        self.max_analysis_workers = int(os.getenv('ICT_ANALYSIS_WORKERS', min(8, os.cpu_count() or 4)))
+        self.max_concurrent_kline_fetches = int(os.getenv('ICT_KLINE_FETCH_CONCURRENCY', 10))
+        self.symbol_scan_timeout = 20  # Seconds per symbol (scan cycle is 30s)
+        self.analysis_executor = ThreadPoolExecutor(
+            max_workers=self.max_analysis_workers,
+            thread_name_prefix='ict-analysis'
+        )
+        # The engine keeps per-call state (analyzers, correlation engine), so each
+        # analysis worker gets its own; all share the per-symbol indicator streams
+        self._worker_engines = threading.local()
+        # Symbols whose analysis is still running (a timed-out future keeps its thread)
+        self._analysis_in_flight = set()
+        self._analysis_in_flight_lock = threading.Lock()
+        
         # Initialize Fundamental Analysis (integrated)
         self.fundamental_analysis = self._init_fundamental_analysis()
         
@@ -1116,6 +1054,13 @@ class ICTWebMonitor:
         self.current_prices = {}
         self.is_running = False
         
+        # Streamed price consumers (conflated: each handles at most one batch per interval)
+        self.price_mark_interval = 0.5  # Seconds between paper trade marks
+        self.price_push_interval = 1.0  # Seconds between SocketIO price pushes
+        # Paper trade marks block on durable DB writes when trades close; one worker
+        # keeps them off the event loop and in order
+        self.paper_trade_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='paper-marks')
+        
         # Setup routes
         self.setup_routes()
         self.setup_socketio_events()
@@ -1491,16 +1436,7 @@ class ICTWebMonitor:
             """Health check endpoint with database error handling"""
             try:
                 # Get count of actual trades executed today
-                from datetime import date
-                today = date.today().isoformat()
-                conn = self.crypto_monitor.db._get_connection()
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT COUNT(*) FROM paper_trades 
-                    WHERE date(entry_time) = ?
-                """, (today,))
-                today_signals = cursor.fetchone()[0]
-                conn.close()
+                today_signals = self.crypto_monitor.db.count_paper_trades_entered()
 
                 return jsonify({
                     'status': 'operational',
@@ -1518,6 +1454,8 @@ class ICTWebMonitor:
                         'loaded': False,
                         'status': 'not_used'
                     },
+                    'bybit_connection_pool': self._get_connection_pool_stats(),
+                    'market_data_hub': self.crypto_monitor.market_data.get_stats(),
                     'database': 'healthy'
                 })
             except Exception as e:
@@ -1686,14 +1624,7 @@ class ICTWebMonitor:
                 logger.info(f"📊 Returning {len(paper_trades)} active paper trades to UI")
 
                 # Calculate actual trades executed today (our definition of "Signals Today")
-                from datetime import date
-                today = date.today().isoformat()
-                cursor = self.crypto_monitor.db._get_connection().cursor()
-                cursor.execute("""
-                    SELECT COUNT(*) FROM paper_trades 
-                    WHERE date(entry_time) = ?
-                """, (today,))
-                active_signals_count = cursor.fetchone()[0]
+                active_signals_count = self.crypto_monitor.db.count_paper_trades_entered()
 
                 # Simplified signal parameters for single-engine architecture
                 signal_params = {
@@ -1951,10 +1882,72 @@ class ICTWebMonitor:
         """Main analysis cycle matching previous monitor functionality"""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(self.async_analysis_cycle())
+        try:
+            loop.run_until_complete(self.async_analysis_cycle())
+        finally:
+            # Release this loop's pooled Bybit session before the loop goes away
+            from bybit_integration.client_pool import get_client_registry
+            loop.run_until_complete(get_client_registry().close_loop_sessions())
+            loop.close()
+    
+    def _get_connection_pool_stats(self) -> Dict:
+        """Connection-reuse counters of the shared Bybit HTTP pool"""
+        try:
+            from bybit_integration.client_pool import get_client_registry
+            return get_client_registry().get_stats()
+        except Exception as e:
+            logger.debug(f"Connection pool stats unavailable: {e}")
+            return {}
+    
+    async def _update_paper_trades(self, prices: Dict) -> int:
+        """Mark paper trades on the paper trade worker so a slow close never stalls the loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.paper_trade_executor, self.crypto_monitor.update_paper_trades, prices)
+    
+    async def _mark_streamed_prices(self, subscription):
+        """Mark paper trades against streamed prices as they arrive"""
+        while self.is_running:
+            prices = self.crypto_monitor._ticker_prices(await subscription.get())
+            self.current_prices = {**self.current_prices, **prices}
+            
+            if not self.crypto_monitor.live_trading_enabled:
+                # update_paper_trades handles its own errors
+                closed_trades = await self._update_paper_trades(prices)
+                if closed_trades > 0:
+                    logger.info(f"📄 Paper Trading: Closed {closed_trades} trades on streamed prices")
+            
+            # Updates arriving meanwhile are conflated to the newest per symbol
+            await asyncio.sleep(self.price_mark_interval)
+    
+    async def _push_streamed_prices(self, subscription):
+        """Push streamed prices to dashboard clients"""
+        while self.is_running:
+            prices = self.crypto_monitor._ticker_prices(await subscription.get())
+            try:
+                self.socketio.emit('price_update', prices)
+            except Exception as e:
+                logger.error(f"❌ Error pushing streamed prices: {e}")
+            await asyncio.sleep(self.price_push_interval)
     
     async def async_analysis_cycle(self):
         """Async analysis cycle"""
+        # Market data hub and its consumers live on this loop alongside the scan
+        market_data = self.crypto_monitor.market_data
+        stream_tasks = [
+            asyncio.create_task(market_data.run()),
+            asyncio.create_task(self._mark_streamed_prices(market_data.subscribe())),
+            asyncio.create_task(self._push_streamed_prices(market_data.subscribe())),
+        ]
+        try:
+            await self._run_analysis_cycles()
+        finally:
+            market_data.stop()
+            for task in stream_tasks:
+                task.cancel()
+            await asyncio.gather(*stream_tasks, return_exceptions=True)
+    
+    async def _run_analysis_cycles(self):
+        """Scan every 30 seconds while the monitor runs"""
         balance_fetch_counter = 0  # Fetch balance every 10 cycles
         
         while self.is_running:
@@ -2067,9 +2060,10 @@ class ICTWebMonitor:
                 except Exception as e:
                     logger.error(f"❌ Error in trade time management: {e}")
                 
-                # Update scan count in database
-                self.crypto_monitor.db.increment_scan_count()
-                self.crypto_monitor.scan_count = self.crypto_monitor.db.get_scan_count()
+                # Update scan count in database (date-keyed counters restart at midnight)
+                self.crypto_monitor.scan_count = self.crypto_monitor.db.increment_scan_count()
+                self.crypto_monitor.signals_today = self.crypto_monitor.db.get_signal_count()
+                self.crypto_monitor.total_signals = self.crypto_monitor.signals_today
                 self.crypto_monitor.last_scan_time = datetime.now()
                 
                 # Save state every 10 scans to prevent data loss
@@ -2077,91 +2071,10 @@ class ICTWebMonitor:
                     self.crypto_monitor._save_trading_state()
                 
                 # 🚀 NEW: Generate trading signals using PROVEN BACKTEST ENGINE
-                # Fetch multi-timeframe klines data for each symbol
+                # Concurrent scan: klines for all symbols are fetched together and
+                # signal generation runs on the bounded analysis executor
                 logger.info("📊 Fetching multi-timeframe klines for ICT analysis...")
-                new_signals = []
-                
-                for symbol in self.crypto_monitor.symbols:
-                    crypto_name = symbol.replace('USDT', '')
-                    
-                    # Fetch historical klines for multi-timeframe analysis
-                    mtf_klines = await self.crypto_monitor.fetch_multi_timeframe_klines(symbol)
-                    
-                    if not mtf_klines or '1h' not in mtf_klines:
-                        logger.warning(f"⚠️ No klines data for {symbol}, skipping signal generation")
-                        continue
-                    
-                    # Prepare multi-timeframe data using ICT strategy engine
-                    try:
-                        df_1h = mtf_klines['1h']
-                        mtf_data = self.ict_strategy_engine.prepare_multitimeframe_data(df_1h)
-                        
-                        # Get current timestamp (use last candle timestamp to avoid pandas compatibility issues)
-                        # Instead of current time, use the last available timestamp in the data
-                        current_time = df_1h.index[-1]
-                        
-                        # Get current account balance for 1% risk calculation
-                        current_balance = self.crypto_monitor.account_balance
-                        
-                        # Generate ICT signal using proven ICT methodology with REAL ACCOUNT BALANCE
-                        logger.info("💰 Using account balance: $%.2f for 1%% risk calculation", current_balance)
-                        ict_signal = self.ict_strategy_engine.generate_ict_signal(symbol, mtf_data, current_time, account_balance=current_balance)
-                        
-                        if ict_signal:
-                            # PRIMARY: Trust the strategy engine to have applied quant enhancements
-                            logger.info(f"✅ ICT Strategy Engine returned a signal for {crypto_name} - single-engine architecture")
-
-                            # DEFENSIVE: Safely extract all attributes from engine signal
-                            # (If engine fails partway, some attributes might be missing)
-                            try:
-                                entry_price = getattr(ict_signal, 'entry_price', 0)
-                                stop_loss = getattr(ict_signal, 'stop_loss', 0)
-                                take_profit = getattr(ict_signal, 'take_profit', 0)
-                                
-                                # Validate critical fields
-                                if not all([entry_price > 0, stop_loss > 0, take_profit > 0]):
-                                    logger.warning(f"⚠️  Signal for {crypto_name} missing critical price fields (entry={entry_price}, SL={stop_loss}, TP={take_profit}) - skipping")
-                                    continue
-                                
-                                # Convert ICTTradingSignal to monitor-friendly dict with safe attribute access
-                                signal = {
-                                    'id': f"{crypto_name}_{int(time.time())}",
-                                    'symbol': symbol,
-                                    'crypto': crypto_name,
-                                    'action': getattr(ict_signal, 'action', 'BUY').upper(),
-                                    'entry_price': entry_price,
-                                    'stop_loss': stop_loss,
-                                    'take_profit': take_profit,
-                                    'timeframe': getattr(ict_signal, 'timeframe', '15m'),
-                                    'timeframes': [getattr(ict_signal, 'timeframe', '15m')],
-                                    'confidence': getattr(ict_signal, 'confluence_score', 0.5),
-                                    'ict_confidence': getattr(ict_signal, 'ict_confidence', getattr(ict_signal, 'confluence_score', 0.5)),
-                                    'ml_boost': getattr(ict_signal, 'ml_boost', 0.0),
-                                    'risk_amount': self.crypto_monitor.paper_balance * 0.01,
-                                    'position_size': getattr(ict_signal, 'position_size', 0),
-                                    'stop_distance': abs(entry_price - stop_loss),
-                                    'risk_reward_ratio': getattr(ict_signal, 'risk_reward_ratio', 3),
-                                    'fixed_risk_percentage': 0.01,
-                                    'confluences': getattr(ict_signal, 'confluence_factors', []),
-                                    'ict_concepts': getattr(ict_signal, 'confluence_factors', []),
-                                    'confluence_score': getattr(ict_signal, 'confluence_score', 0.5),
-                                    'market_regime': getattr(ict_signal, 'market_regime', 'Unknown'),
-                                    'directional_bias': getattr(ict_signal, 'directional_bias', {}),
-                                    'session': 'Unknown',
-                                    'signal_strength': getattr(ict_signal, 'confidence', 0.5),
-                                    'timestamp': datetime.now().isoformat(),
-                                    'status': 'PENDING',
-                                    'pnl': 0.0
-                                }
-                                new_signals.append(signal)
-                                logger.info(f"✅ ENGINE SIGNAL: {crypto_name} {signal['action']} @ ${signal['entry_price']:.2f} | SL: ${signal['stop_loss']:.2f} | TP: ${signal['take_profit']:.2f} | Conf: {signal['confluence_score']:.2%}")
-                            except (AttributeError, TypeError, ValueError) as attr_error:
-                                logger.error(f"❌ Failed to convert engine signal for {crypto_name}: {attr_error} - signal object type: {type(ict_signal)}")
-                                continue
-                    except Exception as e:
-                        logger.error(f"❌ Error generating signal for {symbol} with backtest engine: {e}")
-                        continue
-                
+                new_signals = await self.scan_symbols_concurrently(self.crypto_monitor.symbols)
                 logger.info(f"📊 Backtest engine generated {len(new_signals)} signals")
                 
                 # Process new signals with deduplication and risk management
@@ -2226,10 +2139,9 @@ class ICTWebMonitor:
                     signal['signal_id'] = signal_id
                     # DATABASE-FIRST: Signal already in database, no need to append to list
                     
-                    # Update signals_today from database
-                    daily_stats = self.crypto_monitor.db.get_daily_stats()
-                    self.crypto_monitor.signals_today = daily_stats['signals_generated']
-                    self.crypto_monitor.total_signals = len(self.crypto_monitor.db.get_signals_today())
+                    # add_signal bumps today's in-memory signal count (date-keyed, like the scan count)
+                    self.crypto_monitor.signals_today = self.crypto_monitor.db.get_signal_count()
+                    self.crypto_monitor.total_signals = self.crypto_monitor.signals_today
                     approved_signals += 1
                     
                     logger.info("📈 NEW SIGNAL: %s %s @ $%.4f (%.1f%% confidence)", 
@@ -2242,7 +2154,7 @@ class ICTWebMonitor:
                 # Update trades with current prices (both live and paper)
                 if not self.crypto_monitor.live_trading_enabled:
                     # Only update paper trades if not in live mode
-                    closed_trades = self.crypto_monitor.update_paper_trades(self.current_prices)
+                    closed_trades = await self._update_paper_trades(self.current_prices)
                     if closed_trades > 0:
                         logger.info(f"📄 Paper Trading: Closed {closed_trades} trades")
                 
@@ -2265,6 +2177,167 @@ class ICTWebMonitor:
                 logger.error(f"❌ Error in analysis cycle: {e}")
                 await asyncio.sleep(5)
     
+    async def scan_symbols_concurrently(self, symbols: List[str]) -> List[Dict]:
+        """
+        Run the per-symbol ICT pipeline for all symbols at once.
+        
+        Kline fetches go out together (bounded by a semaphore so we stay inside
+        Bybit's rate limits) and the pandas-heavy signal generation runs on the
+        bounded analysis executor. Each symbol has its own timeout, so one slow
+        symbol no longer holds up the rest of the scan.
+        
+        Args:
+            symbols: Trading symbols to scan (e.g. ['BTCUSDT', 'ETHUSDT'])
+            
+        Returns:
+            List of monitor-friendly signal dicts, in the same order as symbols
+        """
+        fetch_semaphore = asyncio.Semaphore(self.max_concurrent_kline_fetches)
+        # Snapshot balance once so every symbol sizes risk off the same value
+        current_balance = self.crypto_monitor.account_balance
+        logger.info("💰 Using account balance: $%.2f for 1%% risk calculation", current_balance)
+        
+        scan_started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._scan_symbol(symbol, fetch_semaphore, current_balance) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        new_signals = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"⏱️ {symbol} scan exceeded {self.symbol_scan_timeout}s, skipping this cycle")
+            elif isinstance(result, Exception):
+                logger.error(f"❌ Error generating signal for {symbol} with backtest engine: {result}")
+            elif result:
+                new_signals.append(result)
+        
+        logger.info(f"⚡ Scanned {len(symbols)} symbols concurrently in {time.perf_counter() - scan_started:.2f}s")
+        return new_signals
+    
+    async def _scan_symbol(self, symbol: str, fetch_semaphore: asyncio.Semaphore,
+                           current_balance: float) -> Optional[Dict]:
+        """Fetch klines for one symbol and generate its signal on the analysis executor."""
+        if symbol in self._analysis_in_flight:
+            logger.warning(f"⏳ {symbol} analysis from a previous cycle is still running, skipping this cycle")
+            return None
+        
+        async def _pipeline():
+            async with fetch_semaphore:
+                mtf_klines = await self.crypto_monitor.fetch_multi_timeframe_klines(symbol)
+            
+            if not mtf_klines or '1h' not in mtf_klines:
+                logger.warning(f"⚠️ No klines data for {symbol}, skipping signal generation")
+                return None
+            
+            with self._analysis_in_flight_lock:
+                if symbol in self._analysis_in_flight:
+                    return None
+                self._analysis_in_flight.add(symbol)
+            future = self.analysis_executor.submit(
+                self._generate_symbol_signal,
+                symbol,
+                mtf_klines['1h'],
+                current_balance
+            )
+            # Runs on completion or cancellation, also after this coroutine timed out
+            future.add_done_callback(lambda _: self._finish_symbol_analysis(symbol))
+            return await asyncio.wrap_future(future)
+        
+        return await asyncio.wait_for(_pipeline(), timeout=self.symbol_scan_timeout)
+    
+    def _finish_symbol_analysis(self, symbol: str):
+        with self._analysis_in_flight_lock:
+            self._analysis_in_flight.discard(symbol)
+    
+    def _analysis_engine(self) -> ICTStrategyEngine:
+        """ICT strategy engine of the calling analysis worker thread."""
+        engine = getattr(self._worker_engines, 'engine', None)
+        if engine is None:
+            engine = ICTStrategyEngine()
+            engine.streaming_indicators = self.ict_strategy_engine.streaming_indicators
+            self._worker_engines.engine = engine
+        return engine
+    
+    def _generate_symbol_signal(self, symbol: str, df_1h: pd.DataFrame,
+                                current_balance: float) -> Optional[Dict]:
+        """
+        Run the ICT strategy engine for one symbol (executed on the analysis executor).
+        
+        Args:
+            symbol: Trading symbol (e.g. 'BTCUSDT')
+            df_1h: 1H OHLCV DataFrame from fetch_multi_timeframe_klines
+            current_balance: Account balance for 1% risk calculation
+            
+        Returns:
+            Monitor-friendly signal dict, or None if no signal was generated
+        """
+        crypto_name = symbol.replace('USDT', '')
+        engine = self._analysis_engine()
+        
+        # Prepare multi-timeframe data using ICT strategy engine
+        mtf_data = engine.prepare_multitimeframe_data(df_1h)
+        
+        # Use last candle timestamp instead of current time (avoids pandas compatibility issues)
+        current_time = df_1h.index[-1]
+        
+        # Generate ICT signal using proven ICT methodology with REAL ACCOUNT BALANCE
+        ict_signal = engine.generate_ict_signal(symbol, mtf_data, current_time, account_balance=current_balance)
+        
+        if ict_signal:
+            # PRIMARY: Trust the strategy engine to have applied quant enhancements
+            logger.info(f"✅ ICT Strategy Engine returned a signal for {crypto_name} - single-engine architecture")
+
+            # DEFENSIVE: Safely extract all attributes from engine signal
+            # (If engine fails partway, some attributes might be missing)
+            try:
+                entry_price = getattr(ict_signal, 'entry_price', 0)
+                stop_loss = getattr(ict_signal, 'stop_loss', 0)
+                take_profit = getattr(ict_signal, 'take_profit', 0)
+                
+                # Validate critical fields
+                if not all([entry_price > 0, stop_loss > 0, take_profit > 0]):
+                    logger.warning(f"⚠️  Signal for {crypto_name} missing critical price fields (entry={entry_price}, SL={stop_loss}, TP={take_profit}) - skipping")
+                    return None
+                
+                # Convert ICTTradingSignal to monitor-friendly dict with safe attribute access
+                signal = {
+                    'id': f"{crypto_name}_{int(time.time())}",
+                    'symbol': symbol,
+                    'crypto': crypto_name,
+                    'action': getattr(ict_signal, 'action', 'BUY').upper(),
+                    'entry_price': entry_price,
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                    'timeframe': getattr(ict_signal, 'timeframe', '15m'),
+                    'timeframes': [getattr(ict_signal, 'timeframe', '15m')],
+                    'confidence': getattr(ict_signal, 'confluence_score', 0.5),
+                    'ict_confidence': getattr(ict_signal, 'ict_confidence', getattr(ict_signal, 'confluence_score', 0.5)),
+                    'ml_boost': getattr(ict_signal, 'ml_boost', 0.0),
+                    'risk_amount': self.crypto_monitor.paper_balance * 0.01,
+                    'position_size': getattr(ict_signal, 'position_size', 0),
+                    'stop_distance': abs(entry_price - stop_loss),
+                    'risk_reward_ratio': getattr(ict_signal, 'risk_reward_ratio', 3),
+                    'fixed_risk_percentage': 0.01,
+                    'confluences': getattr(ict_signal, 'confluence_factors', []),
+                    'ict_concepts': getattr(ict_signal, 'confluence_factors', []),
+                    'confluence_score': getattr(ict_signal, 'confluence_score', 0.5),
+                    'market_regime': getattr(ict_signal, 'market_regime', 'Unknown'),
+                    'directional_bias': getattr(ict_signal, 'directional_bias', {}),
+                    'session': 'Unknown',
+                    'signal_strength': getattr(ict_signal, 'confidence', 0.5),
+                    'timestamp': datetime.now().isoformat(),
+                    'status': 'PENDING',
+                    'pnl': 0.0
+                }
+                logger.info(f"✅ ENGINE SIGNAL: {crypto_name} {signal['action']} @ ${signal['entry_price']:.2f} | SL: ${signal['stop_loss']:.2f} | TP: ${signal['take_profit']:.2f} | Conf: {signal['confluence_score']:.2%}")
+                return signal
+            except (AttributeError, TypeError, ValueError) as attr_error:
+                logger.error(f"❌ Failed to convert engine signal for {crypto_name}: {attr_error} - signal object type: {type(ict_signal)}")
+                return None
+        
+        return None
+    
     def serialize_datetime_objects(self, obj):
         """Recursively serialize datetime objects to ISO format strings"""
         if isinstance(obj, datetime):
@@ -2379,16 +2452,7 @@ class ICTWebMonitor:
             
             # Count actual trades executed today (our definition of "Signals Today")
             # This includes both trades with signal_ids and without
-            from datetime import date
-            today = date.today().isoformat()
-            conn = self.crypto_monitor.db._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM paper_trades 
-                WHERE date(entry_time) = ?
-            """, (today,))
-            today_signals = cursor.fetchone()[0]
-            conn.close()
+            today_signals = self.crypto_monitor.db.count_paper_trades_entered()
             
             # Format for UI display (newest first, limit 50)
             for signal in db_signals[:50]:
@@ -2425,7 +2489,7 @@ class ICTWebMonitor:
             serialized_live_signals, todays_summary, today_signals = self._get_todays_signals()
 
             update_data = {
-                'prices': self.current_prices,
+                'prices': {**self.current_prices, **self.crypto_monitor.get_streamed_prices()},
                 'scan_count': self.crypto_monitor.scan_count,
                 'signals_today': today_signals,  # DATABASE-FIRST: From get_signals_today()
                 'total_signals': self.crypto_monitor.total_signals,
@@ -3762,6 +3826,10 @@ class ICTWebMonitor:
             updateDashboard(data);
         });
 
+        socket.on('price_update', function(prices) {
+            updatePrices(prices);
+        });
+
         function requestUpdate() {
             socket.emit('request_update');
         }
@@ -4524,6 +4592,19 @@ class ICTWebMonitor:
     def stop(self):
         """Stop the monitor"""
         self.is_running = False
+        self.crypto_monitor.market_data.stop()
+        self.analysis_executor.shutdown(wait=False, cancel_futures=True)
+        # Let an in-flight trade close commit before the database is closed
+        self.paper_trade_executor.shutdown(wait=True, cancel_futures=True)
+        
+        # Close pooled Bybit sessions on their own event loops
+        from bybit_integration.client_pool import get_client_registry
+        registry = get_client_registry()
+        logger.info(f"🔗 Bybit connection pool stats: {registry.get_stats()}")
+        registry.shutdown()
+
+        # Commit queued scan-loop writes before exiting
+        self.crypto_monitor.db.close()
         logger.info("🤖 ICT Enhanced Trading Monitor stopped")
 
 def main():
@@ -0,0 +1,220 @@
+"""
+Dashboard Analysis Cache
+========================
+
+Shared store of serialized ICT analysis results for the dashboard.
+
+Generating dashboard data means a kline fetch, a full hierarchy analysis
+and four detector passes, yet the result only changes when a candle of the
+analysed timeframe closes. Results are therefore keyed by
+(symbol, timeframe, last closed candle timestamp) and kept in an LRU map:
+HTTP routes and socket subscriptions read the cached payload, and a new
+analysis runs only once a newer candle has closed. Consecutive payloads of
+a symbol/timeframe are compared field by field so socket clients receive
+just the fields that changed.
+
+Usage:
+    cache = AnalysisCache(max_entries=64)
+    entry = cache.get("BTC/USDT", "5m")
+    if entry is None or candle_close_due(entry.candle_ts, "5m"):
+        previous = cache.put(AnalysisEntry("BTC/USDT", "5m", candle_ts, payload, market_data))
+        changes = payload_diff(previous.dashboard, payload) if previous else payload
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+_TIMEFRAME_PATTERN = re.compile(r'^(\d+)([mhdw])$')
+_TIMEFRAME_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+
+def timeframe_delta(timeframe: str) -> pd.Timedelta:
+    """Candle length of an exchange timeframe ('1m', '5m', '4h', '1d', ...)."""
+    match = _TIMEFRAME_PATTERN.match(timeframe)
+    if match:
+        return pd.Timedelta(**{_TIMEFRAME_UNITS[match.group(2)]: int(match.group(1))})
+    return pd.to_timedelta(timeframe)
+
+
+def _utc_now(like: pd.Timestamp) -> pd.Timestamp:
+    """Current time, tz-aware or naive UTC to match `like`."""
+    now = pd.Timestamp.now(tz='UTC')
+    return now if like.tzinfo is not None else now.tz_localize(None)
+
+
+def last_closed_candle(df: pd.DataFrame, timeframe: str,
+                       now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """
+    Open time of the most recent fully closed candle.
+
+    Exchanges return the still-forming candle as the last row; it is closed
+    once its open time plus the timeframe length has passed.
+
+    Args:
+        df: OHLCV candles indexed by open time (UTC)
+        timeframe: Candle timeframe
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Timestamp of the last closed candle, None if no candle has closed
+    """
+    if df is None or df.empty:
+        return None
+
+    index = pd.DatetimeIndex(df.index)
+    now = _utc_now(index[-1]) if now is None else now
+    closed = index[index + timeframe_delta(timeframe) <= now]
+    return closed[-1] if len(closed) else None
+
+
+def candle_close_due(candle_ts: pd.Timestamp, timeframe: str,
+                     now: Optional[pd.Timestamp] = None) -> bool:
+    """Whether the candle following `candle_ts` has closed by `now`."""
+    now = _utc_now(candle_ts) if now is None else now
+    return candle_ts + 2 * timeframe_delta(timeframe) <= now
+
+
+def payload_diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Top-level fields of `new` that differ from `old`.
+
+    Fields present only in `old` are reported as None.
+    """
+    changes = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    changes.update({key: None for key in old if key not in new})
+    return changes
+
+
+@dataclass
+class AnalysisEntry:
+    """Serialized analysis of one symbol/timeframe at one closed candle"""
+    symbol: str
+    timeframe: str
+    candle_ts: pd.Timestamp
+    dashboard: Dict[str, Any]              # asdict(DashboardData)
+    market_data: pd.DataFrame              # Candles the analysis ran on
+    chart: Optional[Dict[str, Any]] = None  # Chart payload, built on first request
+    created_at: datetime = None
+
+    def __post_init__(self):
+        if self.created_at is None:
+            self.created_at = datetime.now()
+
+    @property
+    def key(self) -> Tuple[str, str, pd.Timestamp]:
+        return (self.symbol, self.timeframe, self.candle_ts)
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU map (symbol, timeframe, candle_ts) -> AnalysisEntry
+
+    Also tracks the newest candle per symbol/timeframe so readers that do
+    not know the current candle can look up the latest analysis.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Initialize analysis cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, str, pd.Timestamp], AnalysisEntry]' = OrderedDict()
+        self._latest: Dict[Tuple[str, str], pd.Timestamp] = {}
+        self._lock = threading.RLock()
+        self._refresh_locks: Dict[Tuple[str, str], threading.RLock] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple[str, str, pd.Timestamp]) -> bool:
+        return key in self._entries
+
+    def get(self, symbol: str, timeframe: str,
+            candle_ts: Optional[pd.Timestamp] = None) -> Optional[AnalysisEntry]:
+        """
+        Cached analysis for a symbol/timeframe.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Analysis timeframe
+            candle_ts: Closed candle the analysis must belong to (default: newest cached)
+
+        Returns:
+            The entry, marked as most recently used, or None on a miss
+        """
+        with self._lock:
+            if candle_ts is None:
+                candle_ts = self._latest.get((symbol, timeframe))
+            entry = self._entries.get((symbol, timeframe, candle_ts))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry.key)
+            self.hits += 1
+            return entry
+
+    def put(self, entry: AnalysisEntry) -> Optional[AnalysisEntry]:
+        """
+        Store an analysis, evicting the least recently used entries over capacity.
+
+        Returns:
+            The previous newest entry of the same symbol/timeframe, if any
+        """
+        with self._lock:
+            pair = (entry.symbol, entry.timeframe)
+            latest_ts = self._latest.get(pair)
+            previous = self._entries.get((*pair, latest_ts)) if latest_ts is not None else None
+
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            if latest_ts is None or entry.candle_ts >= latest_ts:
+                self._latest[pair] = entry.candle_ts
+
+            while len(self._entries) > self.max_entries:
+                (symbol, timeframe, candle_ts), _ = self._entries.popitem(last=False)
+                if self._latest.get((symbol, timeframe)) == candle_ts:
+                    del self._latest[(symbol, timeframe)]
+
+            return previous
+
+    def refresh_lock(self, symbol: str, timeframe: str) -> threading.RLock:
+        """
+        Lock held while a symbol/timeframe is regenerated.
+
+        The dashboard streams new candles through stateful detectors, so only
+        one thread may refresh a pair at a time. Locks survive clear().
+        """
+        with self._lock:
+            return self._refresh_locks.setdefault((symbol, timeframe), threading.RLock())
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after a config change alters the payloads."""
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -32,11 +32,11 @@ import asyncio
 import json
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from flask import Flask, render_template, jsonify, request, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import plotly.graph_objs as go
 import plotly.utils
 from threading import Thread
@@ -55,6 +55,9 @@ from integrations.tradingview.ict_signal_processor import ICTSignalProcessor, IC
 from utils.data_fetcher import DataFetcher
 from utils.config_loader import ConfigLoader
 
+from dashboard.analysis_cache import AnalysisCache, AnalysisEntry, last_closed_candle, candle_close_due, payload_diff
+from trading.zone_store import zone_store_key
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -64,6 +67,7 @@ class DashboardData:
     symbol: str
     timeframe: str
     current_price: float
+    last_closed_candle: Optional[str] = None
     
     # ICT Analysis Components
     hierarchy_analysis: Optional[Dict] = None
@@ -143,7 +147,7 @@ class ICTTradingDashboard:
         
         # Data storage
         self.current_data: Dict[str, DashboardData] = {}
-        self.chart_data: Dict[str, pd.DataFrame] = {}
+        self.analysis_cache = AnalysisCache(self.dashboard_config['analysis_cache_size'])
         
         # Real-time update control
         self.update_interval = self.dashboard_config.get('update_interval', 30)  # 30 seconds
@@ -172,6 +176,8 @@ class ICTTradingDashboard:
             'max_liquidity_zones': 8,
             'max_fibonacci_zones': 12,
             'chart_candles': 200,
+            'analysis_cache_size': 64,
+            'max_streamed_candles': 5,
             'enable_alerts': True,
             'enable_sound': True,
             'theme': 'dark',
@@ -197,15 +203,8 @@ class ICTTradingDashboard:
         def get_dashboard_data(symbol, timeframe):
             """Get complete dashboard data for symbol/timeframe."""
             try:
-                key = f"{symbol}_{timeframe}"
-                
-                if key in self.current_data:
-                    data = self.current_data[key]
-                    return jsonify(asdict(data))
-                else:
-                    # Generate fresh data
-                    data = self._generate_dashboard_data(symbol, timeframe)
-                    return jsonify(asdict(data)) if data else jsonify({'error': 'No data available'})
+                entry = self._get_analysis(symbol, timeframe)
+                return jsonify(entry.dashboard) if entry else jsonify({'error': 'No data available'})
                 
             except Exception as e:
                 logger.error(f"Dashboard data API error: {e}")
@@ -253,6 +252,8 @@ class ICTTradingDashboard:
                 try:
                     new_config = request.get_json()
                     self.dashboard_config.update(new_config)
+                    # Cached payloads were serialized with the old limits
+                    self.analysis_cache.clear()
                     return jsonify({'status': 'success'})
                 except Exception as e:
                     return jsonify({'error': str(e)}), 500
@@ -284,72 +285,178 @@ class ICTTradingDashboard:
             
             if symbol and timeframe:
                 logger.info(f"Client subscribed to {symbol} {timeframe}")
-                # Send initial data
-                dashboard_data = self._generate_dashboard_data(symbol, timeframe)
-                if dashboard_data:
-                    emit('dashboard_update', asdict(dashboard_data))
+                join_room(f"{symbol}_{timeframe}")
+                # Send the full payload once; later updates arrive as diffs
+                entry = self._get_analysis(symbol, timeframe)
+                if entry:
+                    emit('dashboard_update', entry.dashboard)
         
         @self.socketio.on('unsubscribe')
         def handle_unsubscribe(data):
             """Handle unsubscription."""
             symbol = data.get('symbol')
             timeframe = data.get('timeframe')
+            leave_room(f"{symbol}_{timeframe}")
             logger.info(f"Client unsubscribed from {symbol} {timeframe}")
     
-    def _generate_dashboard_data(self, symbol: str, timeframe: str) -> Optional[DashboardData]:
-        """Generate complete dashboard data for symbol/timeframe."""
-        try:
-            logger.debug(f"Generating dashboard data for {symbol} {timeframe}")
-            
-            # Fetch market data
-            market_data = asyncio.run(self._fetch_market_data_async(symbol, timeframe))
-            if not market_data or market_data.empty:
-                logger.warning(f"No market data for {symbol} {timeframe}")
-                return None
-            
-            current_price = market_data['close'].iloc[-1]
-            
-            # Generate ICT analysis
-            hierarchy_analysis = asyncio.run(self.ict_hierarchy.analyze_symbol_hierarchy(symbol))
-            order_blocks = self.enhanced_order_block_detector.detect_enhanced_order_blocks(market_data, symbol, timeframe)
-            fair_value_gaps = self.fvg_detector.detect_fair_value_gaps(market_data, symbol, timeframe)
-            liquidity_map = self.liquidity_detector.detect_liquidity_zones(market_data, symbol, timeframe)
-            fibonacci_zones = self.fibonacci_analyzer.analyze_fibonacci_confluence(
-                market_data, symbol, timeframe, enhanced_order_blocks, fair_value_gaps, liquidity_map.buy_side_liquidity + liquidity_map.sell_side_liquidity
-            )
-            
-            # Get active signals
-            active_signals = self._get_active_signals(symbol)
-            
-            # Create dashboard data
-            dashboard_data = DashboardData(
-                timestamp=datetime.now(),
-                symbol=symbol,
-                timeframe=timeframe,
-                current_price=current_price,
-                hierarchy_analysis=self._serialize_hierarchy_analysis(hierarchy_analysis),
-                order_blocks=self._serialize_order_blocks(enhanced_order_blocks),
-                fair_value_gaps=self._serialize_fvgs(fair_value_gaps),
-                liquidity_zones=self._serialize_liquidity_zones(liquidity_map),
-                fibonacci_zones=self._serialize_fibonacci_zones(fibonacci_zones),
-                active_signals=active_signals,
-                market_structure=self._generate_market_structure_data(market_data, hierarchy_analysis),
-                session_info=self._generate_session_info(),
-                statistics=self._generate_symbol_statistics(symbol, timeframe)
+    def _get_analysis(self, symbol: str, timeframe: str) -> Optional[AnalysisEntry]:
+        """
+        Cached analysis for symbol/timeframe, regenerated once a newer candle has closed.
+        
+        Readers (HTTP routes, new subscribers) are served straight from the
+        analysis cache while it still covers the last closed candle.
+        """
+        entry = self.analysis_cache.get(symbol, timeframe)
+        if entry is not None and not candle_close_due(entry.candle_ts, timeframe):
+            return entry
+        
+        with self.analysis_cache.refresh_lock(symbol, timeframe):
+            # Another thread may have refreshed the pair while we waited
+            entry = self.analysis_cache.get(symbol, timeframe)
+            if entry is not None and not candle_close_due(entry.candle_ts, timeframe):
+                return entry
+            entry, _ = self._refresh_analysis(symbol, timeframe)
+            return entry
+    
+    def _refresh_analysis(self, symbol: str, timeframe: str) -> Tuple[Optional[AnalysisEntry], Dict]:
+        """
+        Bring the cached analysis of symbol/timeframe up to date.
+        
+        Serialized per symbol/timeframe: Flask request threads and the update
+        loop would otherwise stream candles through the same detector zone
+        stores at once.
+        
+        Returns:
+            The current cache entry and the payload fields that changed
+        """
+        with self.analysis_cache.refresh_lock(symbol, timeframe):
+            try:
+                return asyncio.run(self._refresh_analysis_async(symbol, timeframe))
+            except Exception as e:
+                logger.error(f"Dashboard data generation failed for {symbol} {timeframe}: {e}")
+                return self.analysis_cache.get(symbol, timeframe), {}
+    
+    async def _refresh_analysis_async(self, symbol: str, timeframe: str) -> Tuple[Optional[AnalysisEntry], Dict]:
+        """Fetch candles and, only if a new candle has closed, rerun the ICT analysis."""
+        cached = self.analysis_cache.get(symbol, timeframe)
+        
+        if cached is not None:
+            # The two newest candles tell whether another candle has closed
+            recent = await self._fetch_market_data_async(symbol, timeframe, limit=2)
+            if recent is None or recent.empty:
+                return cached, {}
+            candle_ts = last_closed_candle(recent, timeframe)
+            if candle_ts is None or candle_ts <= cached.candle_ts:
+                return cached, self._update_live_price(cached, recent)
+        
+        market_data = await self._fetch_market_data_async(symbol, timeframe)
+        if market_data is None or market_data.empty:
+            logger.warning(f"No market data for {symbol} {timeframe}")
+            return cached, {}
+        
+        candle_ts = last_closed_candle(market_data, timeframe)
+        if candle_ts is None:
+            logger.warning(f"No closed candle for {symbol} {timeframe}")
+            return cached, {}
+        if cached is not None and candle_ts <= cached.candle_ts:
+            return cached, self._update_live_price(cached, market_data)
+        
+        logger.debug(f"Generating dashboard data for {symbol} {timeframe} at {candle_ts}")
+        hierarchy_analysis = await self.ict_hierarchy.analyze_symbol_hierarchy(symbol)
+        closed_data = market_data.loc[:candle_ts]
+        dashboard_data = self._generate_dashboard_data(
+            symbol, timeframe, closed_data, market_data['close'].iloc[-1], hierarchy_analysis,
+            previous_candle=cached.candle_ts if cached else None
+        )
+        
+        entry = AnalysisEntry(symbol, timeframe, candle_ts, self._dashboard_payload(dashboard_data), closed_data)
+        previous = self.analysis_cache.put(entry)
+        self.current_data[f"{symbol}_{timeframe}"] = dashboard_data
+        
+        changes = payload_diff(previous.dashboard, entry.dashboard) if previous else entry.dashboard
+        return entry, changes
+    
+    def _generate_dashboard_data(self, symbol: str, timeframe: str, market_data: pd.DataFrame,
+                                 current_price: float, hierarchy_analysis: HierarchyAnalysis,
+                                 previous_candle: Optional[pd.Timestamp] = None) -> DashboardData:
+        """Generate complete dashboard data for symbol/timeframe from closed candles."""
+        order_blocks, fair_value_gaps, liquidity_map = self._detect_ict_zones(
+            market_data, symbol, timeframe, previous_candle
+        )
+        fibonacci_zones = self.fibonacci_analyzer.analyze_fibonacci_confluence(
+            market_data, symbol, timeframe, order_blocks, fair_value_gaps, liquidity_map.buy_side_liquidity + liquidity_map.sell_side_liquidity
+        )
+        
+        # Get active signals
+        active_signals = self._get_active_signals(symbol)
+        
+        # Create dashboard data
+        return DashboardData(
+            timestamp=datetime.now(),
+            symbol=symbol,
+            timeframe=timeframe,
+            current_price=float(current_price),
+            last_closed_candle=market_data.index[-1].isoformat(),
+            hierarchy_analysis=self._serialize_hierarchy_analysis(hierarchy_analysis),
+            order_blocks=self._serialize_order_blocks(order_blocks),
+            fair_value_gaps=self._serialize_fvgs(fair_value_gaps),
+            liquidity_zones=self._serialize_liquidity_zones(liquidity_map),
+            fibonacci_zones=self._serialize_fibonacci_zones(fibonacci_zones),
+            active_signals=active_signals,
+            market_structure=self._generate_market_structure_data(market_data, hierarchy_analysis),
+            session_info=self._generate_session_info(),
+            statistics=self._generate_symbol_statistics(symbol, timeframe)
+        )
+    
+    def _detect_ict_zones(self, market_data: pd.DataFrame, symbol: str, timeframe: str,
+                          previous_candle: Optional[pd.Timestamp] = None):
+        """
+        Order Blocks, FVGs and liquidity map for the closed candles.
+        
+        When the detectors already hold zones up to `previous_candle`, only
+        the candles closed since then are streamed through their update()
+        APIs; otherwise (first run, long gap) the full history is rescanned.
+        """
+        detectors = (self.enhanced_order_block_detector, self.fvg_detector, self.liquidity_detector)
+        new_candles = market_data.loc[market_data.index > previous_candle] if previous_candle is not None else market_data
+        streamable = (
+            previous_candle is not None
+            and 0 < len(new_candles) <= self.dashboard_config['max_streamed_candles']
+            and all(zone_store_key(symbol, timeframe) in detector.zone_stores for detector in detectors)
+        )
+        
+        if not streamable:
+            return (
+                self.enhanced_order_block_detector.detect_enhanced_order_blocks(market_data, symbol, timeframe),
+                self.fvg_detector.detect_fair_value_gaps(market_data, symbol, timeframe),
+                self.liquidity_detector.detect_liquidity_zones(market_data, symbol, timeframe)
             )
-            
-            # Cache the data
-            key = f"{symbol}_{timeframe}"
-            self.current_data[key] = dashboard_data
-            self.chart_data[key] = market_data
-            
-            return dashboard_data
-            
-        except Exception as e:
-            logger.error(f"Dashboard data generation failed for {symbol} {timeframe}: {e}")
-            return None
+        
+        for _, candle in new_candles.iterrows():
+            order_blocks = self.enhanced_order_block_detector.update(candle, symbol, timeframe)
+            fair_value_gaps = self.fvg_detector.update(candle, symbol, timeframe)
+            liquidity_map = self.liquidity_detector.update(candle, symbol, timeframe)
+        return order_blocks, fair_value_gaps, liquidity_map
+    
+    def _dashboard_payload(self, dashboard_data: DashboardData) -> Dict:
+        """JSON-ready DashboardData, as cached and sent to clients."""
+        payload = asdict(dashboard_data)
+        payload['timestamp'] = dashboard_data.timestamp.isoformat()
+        return payload
+    
+    def _update_live_price(self, entry: AnalysisEntry, market_data: pd.DataFrame) -> Dict:
+        """Carry the forming candle's close into a cached payload; returns the change."""
+        current_price = float(market_data['close'].iloc[-1])
+        if current_price == entry.dashboard['current_price']:
+            return {}
+        
+        entry.dashboard['current_price'] = current_price
+        if entry.chart is not None:
+            entry.chart['current_price'] = current_price
+        return {'current_price': current_price}
     
-    async def _fetch_market_data_async(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+    async def _fetch_market_data_async(self, symbol: str, timeframe: str,
+                                       limit: Optional[int] = None) -> Optional[pd.DataFrame]:
         """Fetch market data asynchronously."""
         try:
             # Remove slash for API compatibility
@@ -359,7 +466,7 @@ class ICTTradingDashboard:
             data = await self.data_fetcher.fetch_ohlcv_async(
                 symbol=api_symbol,
                 timeframe=timeframe,
-                limit=self.dashboard_config['chart_candles']
+                limit=limit or self.dashboard_config['chart_candles']
             )
             
             return data
@@ -482,19 +589,24 @@ class ICTTradingDashboard:
         return serialized
     
     def _generate_chart_data(self, symbol: str, timeframe: str) -> Dict:
+        """Get chart data for symbol/timeframe, built once per cached analysis."""
+        entry = self._get_analysis(symbol, timeframe)
+        if entry is None:
+            return {'error': 'No chart data available'}
+        
+        if entry.chart is None:
+            chart = self._build_chart_data(entry)
+            if 'error' in chart:
+                return chart
+            entry.chart = chart
+        return entry.chart
+    
+    def _build_chart_data(self, entry: AnalysisEntry) -> Dict:
         """Generate chart data with ICT overlays."""
         try:
-            key = f"{symbol}_{timeframe}"
-            
-            if key not in self.chart_data:
-                # Generate fresh data if not cached
-                self._generate_dashboard_data(symbol, timeframe)
-            
-            if key not in self.chart_data:
-                return {'error': 'No chart data available'}
-            
-            df = self.chart_data[key]
-            dashboard_data = self.current_data.get(key)
+            symbol = entry.symbol
+            df = entry.market_data
+            dashboard_data = entry.dashboard
             
             # Create candlestick chart
             candlestick = {
@@ -512,7 +624,7 @@ class ICTTradingDashboard:
             
             if dashboard_data:
                 # Order Block overlays
-                for ob in dashboard_data.order_blocks:
+                for ob in dashboard_data['order_blocks']:
                     color = 'rgba(0, 255, 0, 0.3)' if ob['type'] == 'BULLISH_OB' else 'rgba(255, 0, 0, 0.3)'
                     overlays.append({
                         'type': 'rect',
@@ -526,7 +638,7 @@ class ICTTradingDashboard:
                     })
                 
                 # Fair Value Gap overlays
-                for fvg in dashboard_data.fair_value_gaps:
+                for fvg in dashboard_data['fair_value_gaps']:
                     color = 'rgba(255, 255, 0, 0.2)' if fvg['type'] == 'BULLISH_FVG' else 'rgba(255, 165, 0, 0.2)'
                     overlays.append({
                         'type': 'rect',
@@ -540,7 +652,7 @@ class ICTTradingDashboard:
                     })
                 
                 # Liquidity level lines
-                for liq in dashboard_data.liquidity_zones:
+                for liq in dashboard_data['liquidity_zones']:
                     color = 'blue' if 'HIGH' in liq['type'] else 'purple'
                     overlays.append({
                         'type': 'line',
@@ -553,7 +665,7 @@ class ICTTradingDashboard:
                     })
                 
                 # Fibonacci levels
-                for fib in dashboard_data.fibonacci_zones:
+                for fib in dashboard_data['fibonacci_zones']:
                     color = 'gold' if abs(fib['level'] - 0.79) < 0.01 else 'silver'
                     overlays.append({
                         'type': 'line',
@@ -568,7 +680,7 @@ class ICTTradingDashboard:
             return {
                 'candlestick': candlestick,
                 'overlays': overlays,
-                'current_price': df['close'].iloc[-1],
+                'current_price': dashboard_data['current_price'],
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -690,6 +802,7 @@ class ICTTradingDashboard:
                 'symbols_tracked': total_symbols,
                 'total_active_signals': total_signals,
                 'dashboard_uptime': self._get_uptime(),
+                'analysis_cache': self.analysis_cache.get_stats(),
                 'last_update': datetime.now().isoformat(),
                 'system_status': 'OPERATIONAL'
             }
@@ -708,15 +821,18 @@ class ICTTradingDashboard:
         def update_loop():
             while self.is_running:
                 try:
-                    # Update all tracked symbols
+                    # Update all tracked symbols; analysis reruns only after a candle close
                     for symbol in self.dashboard_config['default_symbols']:
                         for timeframe in self.dashboard_config['default_timeframes']:
-                            # Generate fresh data
-                            dashboard_data = self._generate_dashboard_data(symbol, timeframe)
+                            entry, changes = self._refresh_analysis(symbol, timeframe)
                             
-                            if dashboard_data:
-                                # Emit update to connected clients
-                                self.socketio.emit('dashboard_update', asdict(dashboard_data))
+                            if entry and changes:
+                                # Emit only the changed fields to subscribed clients
+                                self.socketio.emit('dashboard_diff', {
+                                    'symbol': symbol,
+                                    'timeframe': timeframe,
+                                    'changes': changes
+                                }, to=f"{symbol}_{timeframe}")
                     
                     # Wait for next update
                     time.sleep(self.update_interval)
@@ -992,13 +1108,28 @@ DASHBOARD_HTML_TEMPLATE = """
             document.getElementById('connection-status').className = 'status-offline';
         });
         
+        // Latest full payload per symbol/timeframe, patched by diffs
+        const dashboardState = {};
+        
         // Dashboard data updates
         socket.on('dashboard_update', function(data) {
-            updateDashboard(data);
+            dashboardState[`${data.symbol}_${data.timeframe}`] = data;
+            updateDashboard(data, true);
+            document.getElementById('last-update').textContent = new Date().toLocaleTimeString();
+        });
+        
+        socket.on('dashboard_diff', function(diff) {
+            const data = dashboardState[`${diff.symbol}_${diff.timeframe}`];
+            if (!data) {
+                return;
+            }
+            
+            Object.assign(data, diff.changes);
+            updateDashboard(data, 'last_closed_candle' in diff.changes);
             document.getElementById('last-update').textContent = new Date().toLocaleTimeString();
         });
         
-        function updateDashboard(data) {
+        function updateDashboard(data, refreshChart) {
             // Update market structure
             if (data.market_structure) {
                 document.getElementById('market-trend').textContent = data.market_structure.trend || '-';
@@ -1027,8 +1158,8 @@ DASHBOARD_HTML_TEMPLATE = """
             // Update Active Signals
             updateActiveSignals(data.active_signals || []);
             
-            // Update chart if we have chart data
-            if (data.symbol && data.timeframe) {
+            // Chart overlays only change when a new candle closes
+            if (refreshChart && data.symbol && data.timeframe) {
                 fetchAndUpdateChart(data.symbol, data.timeframe);
             }
         }
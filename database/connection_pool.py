@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Pool
+Per-thread SQLite connections with WAL journaling and tuned pragmas
+"""
+
+import sqlite3
+import logging
+import threading
+import weakref
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection. WAL lets the dashboard threads read
+# while the analysis loop writes; NORMAL sync is durable under WAL except
+# for the last commits on power loss, and avoids an fsync per commit.
+DEFAULT_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -16000,       # 16 MB page cache per connection
+    'mmap_size': 134217728,     # 128 MB memory-mapped reads
+    'busy_timeout': 5000,       # ms to wait on a locked database
+}
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection owned by a pool
+
+    Callers that close the connection they borrowed only hand it back: the
+    pool keeps it open for the next call on the same thread.
+    """
+
+    def close(self):
+        """Return the connection to the pool (no-op)"""
+
+    def _close(self):
+        """Really close the connection"""
+        super().close()
+
+
+class SQLiteConnectionPool:
+    """One SQLite connection per thread for a database file"""
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict] = None, journal_mode: str = 'WAL'):
+        """Initialize connection pool
+
+        Args:
+            db_path: Path to the SQLite database file
+            pragmas: Pragmas applied to each new connection (default: DEFAULT_PRAGMAS)
+            journal_mode: Journal mode set once for the database file
+        """
+        self.db_path = db_path
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self.journal_mode = journal_mode
+        self.connections_opened = 0
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = weakref.WeakSet()
+        # An in-memory database only exists inside its connection, so all threads share one
+        self._shared = db_path == ':memory:'
+        self._shared_conn = None
+
+        # Journal mode is persistent in the database file; set it once up front
+        self.connection().execute(f"PRAGMA journal_mode = {self.journal_mode}")
+
+    def connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread, opened on first use
+
+        Returns:
+            sqlite3.Connection: Open connection with sqlite3.Row rows
+        """
+        if self._shared:
+            if self._shared_conn is None:
+                with self._lock:
+                    if self._shared_conn is None:
+                        self._shared_conn = self._open()
+            return self._shared_conn
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(self.db_path, factory=PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+        with self._lock:
+            self._connections.add(conn)
+            self.connections_opened += 1
+        logger.debug(f"Opened connection #{self.connections_opened} to {self.db_path}")
+        return conn
+
+    def close_all(self):
+        """Close every pooled connection; threads reconnect on their next call"""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections = weakref.WeakSet()
+            self._local = threading.local()
+            self._shared_conn = None
+
+        for conn in connections:
+            try:
+                conn._close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close pooled connection: {e}")
+
+    def get_stats(self) -> Dict:
+        """Pool statistics
+
+        Returns:
+            Dict: Open and total opened connection counts
+        """
+        with self._lock:
+            return {
+                'db_path': self.db_path,
+                'open_connections': len(self._connections),
+                'connections_opened': self.connections_opened,
+                'journal_mode': self.journal_mode,
+            }
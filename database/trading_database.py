@@ -10,28 +10,67 @@ from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional
 import json
 
+from database.connection_pool import SQLiteConnectionPool
+from database.write_behind import WriteBehindQueue
+
 logger = logging.getLogger(__name__)
 
+# Columns added after the original CREATE TABLE statements
+SCHEMA_COLUMNS = {
+    'signals': [
+        ('entry_date', 'DATE'),
+    ],
+    'paper_trades': [
+        ('entry_date', 'DATE'),
+        ('trade_type', "TEXT DEFAULT 'paper'"),
+        ('order_id', 'TEXT'),
+        ('order_link_id', 'TEXT'),
+        ('execution_price', 'REAL'),
+        ('commission', 'REAL'),
+        ('commission_asset', 'TEXT'),
+    ],
+}
+
+# (name, table, columns) for the dashboard and monitor queries
+SCHEMA_INDEXES = [
+    ('idx_signals_status_entry_time', 'signals', 'status, entry_time'),
+    ('idx_signals_created_date', 'signals', 'created_date, entry_time'),
+    ('idx_signals_entry_date', 'signals', 'entry_date'),
+    ('idx_paper_trades_status_entry_time', 'paper_trades', 'status, entry_time'),
+    ('idx_paper_trades_entry_date', 'paper_trades', 'entry_date'),
+    ('idx_paper_trades_signal_id', 'paper_trades', 'signal_id'),
+    ('idx_order_id', 'paper_trades', 'order_id'),
+    ('idx_paper_trades_trade_type', 'paper_trades', 'trade_type, entry_time'),
+    ('idx_scan_history_created_date', 'scan_history', 'created_date'),
+]
+
 
 class TradingDatabase:
     """Trading database wrapper for SQLite operations"""
     
     def __init__(self, db_path: str = "data/trading.db"):
-        """Initialize database connection
+        """Initialize database connection pool
         
         Args:
             db_path: Path to the SQLite database file
         """
         self.db_path = db_path
-        self.conn = None
+        self.pool = None
+        self.write_behind = None
+        self._scan_count = None  # (date, count) once counted in memory
+        self._signal_count = None  # (date, count) once counted in memory
         self._connect()
         self._init_tables()
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread"""
+        return self.pool.connection()
+    
     def _connect(self):
-        """Establish database connection"""
+        """Open the per-thread connection pool (WAL mode)"""
         try:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            self.pool = SQLiteConnectionPool(self.db_path)
             logger.info(f"✅ Connected to database: {self.db_path}")
         except Exception as e:
             logger.error(f"❌ Failed to connect to database: {e}")
@@ -40,20 +79,12 @@ class TradingDatabase:
     def _get_connection(self):
         """Get database connection (for health checks)
         
+        Callers may close the returned connection; that only hands it back
+        to the pool.
+        
         Returns:
             sqlite3.Connection: Active database connection
         """
-        # Check if connection is closed or None
-        try:
-            if self.conn is None:
-                self._connect()
-            else:
-                # Test if connection is alive by executing a simple query
-                self.conn.execute("SELECT 1")
-        except (sqlite3.ProgrammingError, sqlite3.OperationalError):
-            # Connection is closed or invalid, reconnect
-            self._connect()
-        
         return self.conn
     
     def _init_tables(self):
@@ -158,20 +189,92 @@ class TradingDatabase:
             )
         ''')
         
+        self._migrate_schema(cursor)
+        
         self.conn.commit()
         logger.info("✅ Database tables initialized")
     
+    def _migrate_schema(self, cursor):
+        """Add missing columns, the stored entry_date and the query indexes
+        
+        entry_date holds date(entry_time) so day filters can use an index
+        instead of evaluating date() on every row. Triggers keep it in step
+        for every writer, including scripts that only set entry_time.
+        """
+        for table, columns in SCHEMA_COLUMNS.items():
+            existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns:
+                if column not in existing:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                    logger.info(f"✅ Added column {table}.{column}")
+        
+        for table in ('signals', 'paper_trades'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_entry_date_insert
+                AFTER INSERT ON {table} WHEN NEW.entry_date IS NULL
+                BEGIN
+                    UPDATE {table} SET entry_date = date(NEW.entry_time) WHERE id = NEW.id;
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_entry_date_update
+                AFTER UPDATE OF entry_time ON {table}
+                BEGIN
+                    UPDATE {table} SET entry_date = date(NEW.entry_time) WHERE id = NEW.id;
+                END
+            ''')
+            cursor.execute(f"UPDATE {table} SET entry_date = date(entry_time) WHERE entry_date IS NULL")
+        
+        for name, table, columns in SCHEMA_INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+    
     def _ensure_connection(self):
-        """Ensure database connection is active before operations"""
-        try:
-            if self.conn is None:
-                self._connect()
-            else:
-                # Test connection with a simple query
-                self.conn.execute("SELECT 1")
-        except (sqlite3.ProgrammingError, sqlite3.OperationalError, AttributeError):
-            # Connection is closed or invalid, reconnect
-            self._connect()
+        """Ensure database connection is active before operations
+        
+        Pooled connections cannot be closed by callers, so there is nothing
+        to probe: this only opens the calling thread's connection.
+        """
+        return self.conn
+    
+    def start_write_behind(self, flush_interval_ms: int = 200, max_batch: int = 500):
+        """Queue writes for a background writer instead of committing inline
+        
+        Non-critical writes (scan counters, signals, balances, marks) return
+        at once and are committed in grouped transactions. Trade writes wait
+        for a durable commit. Reads see committed rows, so they may trail
+        queued writes by up to one flush interval; the scan counter is kept
+        in memory and is always current. Call flush() for a read barrier.
+        
+        Args:
+            flush_interval_ms: Longest a write waits to share a transaction
+            max_batch: Most writes per transaction
+        """
+        if self.write_behind is None:
+            self.write_behind = WriteBehindQueue(lambda: self.conn, flush_interval_ms, max_batch)
+            logger.info(f"✅ Write-behind enabled ({flush_interval_ms}ms batches)")
+    
+    def flush(self, durable: bool = True):
+        """Barrier: return once every queued write is committed (and synced if durable)"""
+        if self.write_behind is not None:
+            self.write_behind.flush(durable=durable)
+    
+    def _write(self, op, durable: bool = False, wait: bool = False):
+        """Run a write now, or queue it when write-behind is enabled
+        
+        Args:
+            op: Function performing the write on a connection (no commit)
+            durable: Critical write: commit with a full sync
+            wait: Block until committed and return op's result
+            
+        Returns:
+            op's result when run inline or waited for, else None
+        """
+        if self.write_behind is None:
+            with self.conn:
+                return op(self.conn)
+        
+        future = self.write_behind.submit(op, durable=durable)
+        return future.result() if wait or durable else None
     
     def get_daily_stats(self) -> Dict:
         """Get or create today's daily stats"""
@@ -183,7 +286,13 @@ class TradingDatabase:
         row = cursor.fetchone()
         
         if row:
-            return dict(row)
+            stats = dict(row)
+            # The in-memory counter is ahead of the row while increments are queued
+            if self._scan_count is not None and self._scan_count[0] == today:
+                stats['scan_count'] = self._scan_count[1]
+            if self._signal_count is not None and self._signal_count[0] == today:
+                stats['signals_generated'] = self._signal_count[1]
+            return stats
         else:
             # Get yesterday's balance to carry forward
             yesterday = (datetime.now().date() - timedelta(days=1)).isoformat()
@@ -193,9 +302,10 @@ class TradingDatabase:
             # Use yesterday's balance or default to 100.0 if this is the first day
             starting_balance = yesterday_row['paper_balance'] if yesterday_row else 100.0
             
-            # Create today's stats with carried forward balance
+            # Create today's stats with carried forward balance (the background
+            # writer may be creating the row concurrently)
             cursor.execute('''
-                INSERT INTO daily_stats (date, scan_count, signals_generated, paper_balance, total_pnl)
+                INSERT OR IGNORE INTO daily_stats (date, scan_count, signals_generated, paper_balance, total_pnl)
                 VALUES (?, 0, 0, ?, 0.0)
             ''', (today, starting_balance))
             self.conn.commit()
@@ -212,48 +322,73 @@ class TradingDatabase:
         Returns:
             int: Number of scans performed today
         """
+        today = date.today().isoformat()
+        if self._scan_count is not None and self._scan_count[0] == today:
+            return self._scan_count[1]
+        
         self._ensure_connection()
         stats = self.get_daily_stats()
         return stats.get('scan_count', 0)
     
-    def increment_scan_count(self):
-        """Increment today's scan count"""
-        self._ensure_connection()
-        today = date.today().isoformat()
-        cursor = self.conn.cursor()
+    def increment_scan_count(self) -> int:
+        """Increment today's scan count
         
-        cursor.execute('''
-            UPDATE daily_stats 
-            SET scan_count = scan_count + 1, updated_at = CURRENT_TIMESTAMP
-            WHERE date = ?
-        ''', (today,))
+        The count is kept in memory as well, so it is current even while
+        the increment is still queued.
         
-        if cursor.rowcount == 0:
-            # Create if doesn't exist
-            cursor.execute('''
-                INSERT INTO daily_stats (date, scan_count)
-                VALUES (?, 1)
+        Returns:
+            int: Today's scan count including this scan
+        """
+        today = date.today().isoformat()
+        count = self.get_scan_count() + 1
+        self._scan_count = (today, count)
+        
+        def write(conn):
+            cursor = conn.execute('''
+                UPDATE daily_stats 
+                SET scan_count = scan_count + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE date = ?
             ''', (today,))
+            
+            if cursor.rowcount == 0:
+                # Create if doesn't exist
+                conn.execute('''
+                    INSERT INTO daily_stats (date, scan_count)
+                    VALUES (?, 1)
+                ''', (today,))
+        
+        self._write(write)
+        return count
+    
+    def get_signal_count(self) -> int:
+        """Get today's signal count
         
-        self.conn.commit()
+        Returns:
+            int: Number of signals generated today (0 after the date changes)
+        """
+        today = date.today().isoformat()
+        if self._signal_count is not None and self._signal_count[0] == today:
+            return self._signal_count[1]
+        
+        self._ensure_connection()
+        stats = self.get_daily_stats()
+        return stats.get('signals_generated', 0)
     
     def add_signal(self, signal_data: Dict) -> str:
-        """Add a new signal to the database"""
+        """Add a new signal to the database
+        
+        Also increments today's signals_generated, kept in memory like the
+        scan count (see get_signal_count).
+        """
         import uuid
-        self._ensure_connection()
-        cursor = self.conn.cursor()
         
         # Generate signal_id if not provided
         if 'signal_id' not in signal_data:
             signal_data['signal_id'] = f"SIG_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
         
-        cursor.execute('''
-            INSERT INTO signals (
-                signal_id, symbol, direction, entry_price, stop_loss, take_profit,
-                confluence_score, timeframes, ict_concepts, session, market_regime,
-                directional_bias, signal_strength, status, entry_time, created_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        today = date.today().isoformat()
+        self._signal_count = (today, self.get_signal_count() + 1)
+        params = (
             signal_data.get('signal_id'),
             signal_data.get('symbol'),
             signal_data.get('direction'),
@@ -269,10 +404,30 @@ class TradingDatabase:
             signal_data.get('signal_strength', 0),
             signal_data.get('status', 'ACTIVE'),
             signal_data.get('entry_time', datetime.now().isoformat()),
-            date.today().isoformat()
-        ))
-        
-        self.conn.commit()
+            today
+        )
+        
+        def write(conn):
+            conn.execute('''
+                INSERT INTO signals (
+                    signal_id, symbol, direction, entry_price, stop_loss, take_profit,
+                    confluence_score, timeframes, ict_concepts, session, market_regime,
+                    directional_bias, signal_strength, status, entry_time, created_date
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', params)
+            cursor = conn.execute('''
+                UPDATE daily_stats
+                SET signals_generated = signals_generated + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE date = ?
+            ''', (today,))
+
+            if cursor.rowcount == 0:
+                conn.execute('''
+                    INSERT INTO daily_stats (date, signals_generated)
+                    VALUES (?, 1)
+                ''', (today,))
+
+        self._write(write)
         return signal_data['signal_id']
     
     def get_signals_today(self) -> List[Dict]:
@@ -318,55 +473,47 @@ class TradingDatabase:
     
     def update_signal_status(self, signal_id: int, status: str, pnl: float = None, exit_price: float = None):
         """Update signal status and optional PnL"""
-        self._ensure_connection()
-        cursor = self.conn.cursor()
-        
-        if pnl is not None and exit_price is not None:
-            cursor.execute('''
-                UPDATE signals 
-                SET status = ?, pnl = ?, exit_price = ?, exit_time = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (status, pnl, exit_price, signal_id))
-        else:
-            cursor.execute('''
-                UPDATE signals 
-                SET status = ?
-                WHERE id = ?
-            ''', (status, signal_id))
+        def write(conn):
+            if pnl is not None and exit_price is not None:
+                conn.execute('''
+                    UPDATE signals 
+                    SET status = ?, pnl = ?, exit_price = ?, exit_time = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (status, pnl, exit_price, signal_id))
+            else:
+                conn.execute('''
+                    UPDATE signals 
+                    SET status = ?
+                    WHERE id = ?
+                ''', (status, signal_id))
         
-        self.conn.commit()
+        self._write(write)
     
     def update_balance(self, balance: float, account_type: str = 'paper'):
         """Update account balance"""
-        self._ensure_connection()
         today = date.today().isoformat()
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            UPDATE daily_stats 
-            SET paper_balance = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE date = ?
-        ''', (balance, today))
         
-        if cursor.rowcount == 0:
-            cursor.execute('''
-                INSERT INTO daily_stats (date, paper_balance)
-                VALUES (?, ?)
-            ''', (today, balance))
+        def write(conn):
+            cursor = conn.execute('''
+                UPDATE daily_stats 
+                SET paper_balance = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE date = ?
+            ''', (balance, today))
+            
+            if cursor.rowcount == 0:
+                conn.execute('''
+                    INSERT INTO daily_stats (date, paper_balance)
+                    VALUES (?, ?)
+                ''', (today, balance))
         
-        self.conn.commit()
+        self._write(write)
     
     def add_scan_record(self, scan_number: int, symbols: List[str], signals_found: int):
         """Record a scan in scan history"""
-        self._ensure_connection()
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
+        self._write(lambda conn: conn.execute('''
             INSERT INTO scan_history (scan_number, signals_generated)
             VALUES (?, ?)
-        ''', (scan_number, signals_found))
-        
-        self.conn.commit()
+        ''', (scan_number, signals_found)))
     
     def get_journal_entries_today(self) -> List[Dict]:
         """Get journal entries (closed trades) from today"""
@@ -389,6 +536,92 @@ class TradingDatabase:
         
         return [dict(row) for row in cursor.fetchall()]
     
+    def count_paper_trades_entered(self, day: Optional[str] = None) -> int:
+        """Count trades entered on a day (the dashboards' "signals today")
+        
+        Args:
+            day: ISO date matched against date(entry_time) (default: today)
+            
+        Returns:
+            int: Number of trades entered that day
+        """
+        cursor = self.conn.execute(
+            'SELECT COUNT(*) FROM paper_trades WHERE entry_date = ?',
+            (day or date.today().isoformat(),)
+        )
+        return cursor.fetchone()[0]
+    
+    def get_open_paper_trades(self, after_id: int = 0) -> List[Dict]:
+        """Get OPEN paper trades, optionally only those newer than a known id
+
+        Args:
+            after_id: Only return trades with id greater than this
+
+        Returns:
+            List[Dict]: Open trades ordered by id
+        """
+        self._ensure_connection()
+        cursor = self.conn.cursor()
+
+        cursor.execute('''
+            SELECT * FROM paper_trades
+            WHERE status = 'OPEN' AND id > ?
+            ORDER BY id
+        ''', (after_id,))
+
+        return [dict(row) for row in cursor.fetchall()]
+
+    def mark_paper_trades(self, marks: List[tuple], closes: List[Dict]) -> List[int]:
+        """Write one mark-to-market cycle for the open paper trades in a single transaction
+
+        Args:
+            marks: (current_price, unrealized_pnl, trade_id) per open trade
+            closes: Trades that hit TP/SL, each with keys
+                    id, signal_id, exit_price, realized_pnl, close_reason
+
+        Returns:
+            List[int]: IDs of the trades actually closed (trades already closed
+                       elsewhere are skipped so their PnL is not booked twice)
+        
+        With write-behind enabled, a cycle without closes is only queued;
+        closes are trade writes and wait for a durable commit.
+        """
+        def write(conn):
+            conn.executemany('''
+                UPDATE paper_trades
+                SET current_price = ?, unrealized_pnl = ?
+                WHERE id = ? AND status = 'OPEN'
+            ''', marks)
+
+            if not closes:
+                return []
+
+            placeholders = ','.join('?' * len(closes))
+            cursor = conn.execute(f'''
+                SELECT id FROM paper_trades
+                WHERE status = 'OPEN' AND id IN ({placeholders})
+            ''', [close['id'] for close in closes])
+            still_open = {row[0] for row in cursor.fetchall()}
+            closed = [close for close in closes if close['id'] in still_open]
+
+            conn.executemany('''
+                UPDATE paper_trades
+                SET status = ?, exit_price = ?, exit_time = datetime('now'), realized_pnl = ?
+                WHERE id = ?
+            ''', [(c['close_reason'], c['exit_price'], c['realized_pnl'], c['id']) for c in closed])
+
+            # Closed signals double as the trade journal
+            conn.executemany('''
+                UPDATE signals
+                SET status = 'CLOSED', exit_price = ?, pnl = ?, exit_time = CURRENT_TIMESTAMP, notes = ?
+                WHERE signal_id = ? AND status = 'ACTIVE'
+            ''', [(c['exit_price'], c['realized_pnl'], c['close_reason'], c['signal_id'])
+                  for c in closed if c.get('signal_id')])
+
+            return [close['id'] for close in closed]
+
+        return self._write(write, durable=bool(closes)) or []
+
     def add_paper_trade(self, trade_data: Dict) -> int:
         """Add a new trade to the database (supports both paper and live trades)
         
@@ -404,9 +637,6 @@ class TradingDatabase:
             int: ID of the created trade
         """
         try:
-            self._ensure_connection()
-            cursor = self.conn.cursor()
-            
             # Extract required fields
             symbol = trade_data.get('symbol')
             direction = trade_data.get('direction')
@@ -430,33 +660,35 @@ class TradingDatabase:
             commission_asset = trade_data.get('commission_asset')
             
             # Insert the trade with live trading support
-            if created_date:
-                cursor.execute('''
-                    INSERT INTO paper_trades 
-                    (signal_id, symbol, direction, entry_price, position_size, 
-                     stop_loss, take_profit, risk_amount, status, created_date,
-                     trade_type, order_id, order_link_id, execution_price,
-                     commission, commission_asset)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (signal_id, symbol, direction, entry_price, position_size,
-                      stop_loss, take_profit, risk_amount, status, created_date,
-                      trade_type, order_id, order_link_id, execution_price,
-                      commission, commission_asset))
-            else:
-                cursor.execute('''
-                    INSERT INTO paper_trades 
-                    (signal_id, symbol, direction, entry_price, position_size, 
-                     stop_loss, take_profit, risk_amount, status,
-                     trade_type, order_id, order_link_id, execution_price,
-                     commission, commission_asset)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (signal_id, symbol, direction, entry_price, position_size,
-                      stop_loss, take_profit, risk_amount, status,
-                      trade_type, order_id, order_link_id, execution_price,
-                      commission, commission_asset))
+            def write(conn):
+                if created_date:
+                    cursor = conn.execute('''
+                        INSERT INTO paper_trades 
+                        (signal_id, symbol, direction, entry_price, position_size, 
+                         stop_loss, take_profit, risk_amount, status, created_date,
+                         trade_type, order_id, order_link_id, execution_price,
+                         commission, commission_asset)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (signal_id, symbol, direction, entry_price, position_size,
+                          stop_loss, take_profit, risk_amount, status, created_date,
+                          trade_type, order_id, order_link_id, execution_price,
+                          commission, commission_asset))
+                else:
+                    cursor = conn.execute('''
+                        INSERT INTO paper_trades 
+                        (signal_id, symbol, direction, entry_price, position_size, 
+                         stop_loss, take_profit, risk_amount, status,
+                         trade_type, order_id, order_link_id, execution_price,
+                         commission, commission_asset)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (signal_id, symbol, direction, entry_price, position_size,
+                          stop_loss, take_profit, risk_amount, status,
+                          trade_type, order_id, order_link_id, execution_price,
+                          commission, commission_asset))
+                return cursor.lastrowid
             
-            self.conn.commit()
-            trade_id = cursor.lastrowid
+            # Trade rows are critical: wait for a durable commit
+            trade_id = self._write(write, durable=True)
             
             trade_label = "live" if trade_type == "live" else "paper"
             logger.info(f"✅ Added {trade_label} trade: {symbol} {direction} at ${entry_price}")
@@ -483,16 +715,13 @@ class TradingDatabase:
             bool: True if update successful, False otherwise
         """
         try:
-            self._ensure_connection()
-            cursor = self.conn.cursor()
-            
             order_id = order_data.get('order_id')
             order_link_id = order_data.get('order_link_id')
             execution_price = order_data.get('execution_price')
             commission = order_data.get('commission', 0)
             commission_asset = order_data.get('commission_asset', 'USDT')
             
-            cursor.execute('''
+            self._write(lambda conn: conn.execute('''
                 UPDATE paper_trades 
                 SET order_id = ?,
                     order_link_id = ?,
@@ -500,9 +729,7 @@ class TradingDatabase:
                     commission = ?,
                     commission_asset = ?
                 WHERE id = ?
-            ''', (order_id, order_link_id, execution_price, commission, commission_asset, trade_id))
-            
-            self.conn.commit()
+            ''', (order_id, order_link_id, execution_price, commission, commission_asset, trade_id)), durable=True)
             logger.info(f"✅ Updated live trade #{trade_id} with execution details")
             return True
             
@@ -612,7 +839,10 @@ class TradingDatabase:
             return None
     
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        """Flush queued writes and close all pooled database connections"""
+        if self.write_behind is not None:
+            self.write_behind.stop()
+            self.write_behind = None
+        if self.pool:
+            self.pool.close_all()
             logger.info("Database connection closed")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Queue
+Background writer that groups database writes into batched transactions
+"""
+
+import queue
+import sqlite3
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A write is a function run inside the batch transaction with the writer's connection
+WriteOp = Callable[[sqlite3.Connection], Any]
+
+_STOP = object()
+
+
+class _Write:
+    """Queued write and the future its caller may wait on"""
+
+    __slots__ = ('op', 'durable', 'future')
+
+    def __init__(self, op: Optional[WriteOp], durable: bool):
+        self.op = op
+        self.durable = durable
+        self.future = Future()
+
+
+class WriteBehindQueue:
+    """Write-behind stage for one SQLite database
+
+    Callers enqueue writes and return immediately. A single writer thread
+    waits up to `flush_interval_ms` after the first pending write, then
+    commits everything queued so far in one transaction (one WAL sync
+    instead of one per write). Writes are applied in submission order.
+
+    Durable writes are committed with synchronous=FULL and wake the writer
+    at once; waiting on their future (or calling flush(durable=True)) is a
+    barrier after which every earlier write is on disk.
+    """
+
+    def __init__(self, connection_factory: Callable[[], sqlite3.Connection],
+                 flush_interval_ms: int = 200, max_batch: int = 500):
+        """Initialize and start the writer thread
+
+        Args:
+            connection_factory: Returns the connection for the calling (writer) thread
+            flush_interval_ms: Longest a write waits for others to share its transaction
+            max_batch: Most writes committed in one transaction
+        """
+        self.connection_factory = connection_factory
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch = max_batch
+
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._urgent = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.stats = {'writes': 0, 'batches': 0, 'durable_batches': 0, 'failed_writes': 0}
+
+        self._thread = threading.Thread(target=self._run, name='db-write-behind', daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Writes submitted but not yet committed"""
+        return self._pending
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def submit(self, op: WriteOp, durable: bool = False) -> Future:
+        """Queue a write
+
+        Args:
+            op: Function executing the write on the given connection (no commit)
+            durable: Commit with a full sync and wake the writer immediately
+
+        Returns:
+            Future resolved with op's return value once committed
+        """
+        if not self.running:
+            raise RuntimeError("Write-behind queue is stopped")
+
+        write = _Write(op, durable)
+        with self._lock:
+            self._pending += 1
+        self._queue.put(write)
+        if durable:
+            self._urgent.set()
+        return write.future
+
+    def flush(self, durable: bool = False, timeout: Optional[float] = None):
+        """Wait until every write submitted so far is committed
+
+        Args:
+            durable: Also make them durable (full sync of the batch)
+            timeout: Seconds to wait at most
+        """
+        if not self.pending and not durable:
+            return
+        write = _Write(None, durable)
+        with self._lock:
+            self._pending += 1
+        self._queue.put(write)
+        self._urgent.set()
+        write.future.result(timeout)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Commit what is queued durably and stop the writer thread"""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._urgent.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Writer loop: collect a batch, commit it, resolve its futures"""
+        while True:
+            first = self._queue.get()
+            stopping = first is _STOP
+            batch = [] if stopping else [first]
+
+            if not stopping and not first.durable:
+                # Give other writes up to one interval to join this transaction
+                deadline = time.monotonic() + self.flush_interval
+                while not self._urgent.is_set() and time.monotonic() < deadline:
+                    self._urgent.wait(deadline - time.monotonic())
+            self._urgent.clear()
+
+            while len(batch) < self.max_batch:
+                try:
+                    write = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if write is _STOP:
+                    stopping = True
+                    continue
+                batch.append(write)
+
+            if batch:
+                self._commit(batch, durable=stopping or any(write.durable for write in batch))
+            if stopping and self._queue.empty():
+                return
+
+    def _commit(self, batch: List[_Write], durable: bool):
+        """Apply a batch in one transaction, falling back to one transaction per write"""
+        try:
+            conn = self.connection_factory()
+            if durable:
+                conn.execute('PRAGMA synchronous = FULL')
+            try:
+                results = self._apply(conn, batch)
+            except Exception as e:
+                logger.warning(f"⚠️  Batched write of {len(batch)} failed ({e}), retrying one by one")
+                results = [self._apply_single(conn, write) for write in batch]
+            finally:
+                if durable:
+                    conn.execute('PRAGMA synchronous = NORMAL')
+        except Exception as e:
+            logger.error(f"❌ Write-behind batch failed: {e}")
+            results = [e] * len(batch)
+
+        self.stats['batches'] += 1
+        self.stats['durable_batches'] += int(durable)
+        for write, result in zip(batch, results):
+            if isinstance(result, Exception):
+                self.stats['failed_writes'] += 1
+                write.future.set_exception(result)
+            else:
+                self.stats['writes'] += int(write.op is not None)
+                write.future.set_result(result)
+        with self._lock:
+            self._pending -= len(batch)
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, batch: List[_Write]) -> List[Any]:
+        with conn:
+            return [write.op(conn) if write.op else None for write in batch]
+
+    @staticmethod
+    def _apply_single(conn: sqlite3.Connection, write: _Write) -> Any:
+        try:
+            with conn:
+                return write.op(conn) if write.op else None
+        except Exception as e:
+            logger.error(f"❌ Write-behind write failed: {e}")
+            return e
+
+    def get_stats(self) -> Dict:
+        """Writer statistics
+
+        Returns:
+            Dict: Committed writes, batches and current queue depth
+        """
+        return {**self.stats, 'pending': self.pending}
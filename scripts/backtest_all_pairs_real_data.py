@@ -30,6 +30,7 @@ sys.path.append(project_root)
 
 from backtesting.strategy_engine import ICTStrategyEngine
 from backtesting.performance_analyzer import PerformanceAnalyzer
+from backtesting.ohlcv_store import OHLCVStore, fetch_bybit_klines
 
 # Setup logging
 logging.basicConfig(
@@ -66,6 +67,7 @@ class MultiPairRealDataBacktest:
         # Initialize engines
         self.strategy_engine = ICTStrategyEngine()
         self.performance_analyzer = PerformanceAnalyzer()
+        self.ohlcv_store = OHLCVStore(os.path.join(project_root, 'data', 'cache', 'ohlcv'))
         
         logger.info(f"🚀 Multi-Pair Backtest: {start_date} to {end_date}")
         logger.info(f"💰 Initial Capital: ${self.initial_capital:,.2f}")
@@ -86,77 +88,16 @@ class MultiPairRealDataBacktest:
             DataFrame with OHLCV data
         """
         try:
-            import requests
-            
             logger.info(f"📡 Fetching TradingView data for {symbol}...")
             
-            # Use Bybit public API (TradingView data source)
-            url = "https://api.bybit.com/v5/market/kline"
-            
-            # Convert timeframe to Bybit format
-            interval_map = {'1h': '60', '4h': '240', '1d': 'D'}
-            interval = interval_map.get(timeframe, '60')
-            
-            # Calculate timestamps
-            start_ts = int(self.start_date.timestamp() * 1000)
-            end_ts = int(self.end_date.timestamp() * 1000)
-            
-            all_candles = []
-            current_start = start_ts
+            # Read through the local OHLCV store; only missing ranges hit the Bybit API
+            df = self.ohlcv_store.load_or_fetch(symbol, timeframe, self.start_date, self.end_date,
+                                                fetch_bybit_klines)
             
-            # Fetch data in chunks (max 1000 candles per request)
-            while current_start < end_ts:
-                params = {
-                    'category': 'linear',
-                    'symbol': symbol,
-                    'interval': interval,
-                    'start': current_start,
-                    'limit': 1000
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    if data.get('retCode') == 0 and data.get('result', {}).get('list'):
-                        candles = data['result']['list']
-                        all_candles.extend(candles)
-                        
-                        # Update start time for next chunk
-                        last_timestamp = int(candles[-1][0])
-                        current_start = last_timestamp + 1
-                        
-                        logger.info(f"   Fetched {len(candles)} candles (total: {len(all_candles)})")
-                    else:
-                        logger.warning("   No more data available")
-                        break
-                else:
-                    logger.error(f"   API error: {response.status_code}")
-                    break
-            
-            if not all_candles:
+            if df.empty:
                 logger.error(f"❌ No data fetched for {symbol}")
                 return pd.DataFrame()
             
-            # Convert to DataFrame
-            df = pd.DataFrame(all_candles, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'
-            ])
-            
-            # Convert types
-            df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='ms')
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Set index and sort
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
-            df = df[['open', 'high', 'low', 'close', 'volume']]
-            
-            # Filter to exact date range
-            df = df[(df.index >= self.start_date) & (df.index <= self.end_date)]
-            
             logger.info(f"✅ Loaded {len(df)} candles for {symbol}")
             logger.info(f"   Date range: {df.index[0]} to {df.index[-1]}")
             logger.info(f"   Price range: ${df['close'].min():.2f} - ${df['close'].max():.2f}")
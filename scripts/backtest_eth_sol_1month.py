@@ -25,6 +25,7 @@ sys.path.append(project_root)
 
 from backtesting.strategy_engine import ICTStrategyEngine
 from backtesting.performance_analyzer import PerformanceAnalyzer
+from backtesting.ohlcv_store import OHLCVStore, fetch_bybit_klines
 
 # Setup logging
 logging.basicConfig(
@@ -41,6 +42,7 @@ class SimpleMonthBacktest:
         self.initial_capital = 10000
         self.strategy_engine = ICTStrategyEngine()
         self.performance_analyzer = PerformanceAnalyzer()
+        self.ohlcv_store = OHLCVStore(os.path.join(project_root, 'data', 'cache', 'ohlcv'))
         
         # Calculate 1 month date range
         self.end_date = datetime.now()
@@ -59,70 +61,29 @@ class SimpleMonthBacktest:
         FIXED: Properly limits to 720 candles (1 month).
         """
         try:
-            import requests
-            
             logger.info(f"\nFetching 1-month data for {symbol}...")
             
-            url = "https://api.bybit.com/v5/market/kline"
-            
-            # Calculate timestamps for EXACTLY 1 month
-            end_ts = int(self.end_date.timestamp() * 1000)
-            start_ts = int(self.start_date.timestamp() * 1000)
-            
             # Target: ~720 hourly candles (30 days * 24 hours)
             target_candles = 720
             
-            params = {
-                'category': 'linear',
-                'symbol': symbol,
-                'interval': '60',  # 1 hour
-                'start': start_ts,
-                'end': end_ts,
-                'limit': 1000  # Max per request
-            }
-            
             logger.info(f"  Requesting candles from {self.start_date} to {self.end_date}")
             
-            response = requests.get(url, params=params, timeout=30)
+            # Read through the local OHLCV store; only missing ranges hit the Bybit API
+            df = self.ohlcv_store.load_or_fetch(symbol, '1h', self.start_date, self.end_date, fetch_bybit_klines)
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data.get('retCode') == 0 and data.get('result', {}).get('list'):
-                    candles = data['result']['list']
-                    
-                    # Convert to DataFrame
-                    df = pd.DataFrame(candles, columns=[
-                        'timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'
-                    ])
-                    
-                    # Convert types
-                    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='ms')
-                    for col in ['open', 'high', 'low', 'close', 'volume']:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                    
-                    df.set_index('timestamp', inplace=True)
-                    df.sort_index(inplace=True)
-                    df = df[['open', 'high', 'low', 'close', 'volume']]
-                    
-                    # Filter to exact date range
-                    df = df[(df.index >= self.start_date) & (df.index <= self.end_date)]
-                    
-                    # Limit to target candles
-                    if len(df) > target_candles:
-                        df = df.tail(target_candles)
-                    
-                    logger.info(f"  ✅ Loaded {len(df)} candles")
-                    logger.info(f"  Date range: {df.index[0]} to {df.index[-1]}")
-                    logger.info(f"  Price range: ${df['close'].min():.2f} - ${df['close'].max():.2f}")
-                    
-                    return df
-                else:
-                    logger.error("  ❌ API returned no data")
-                    return pd.DataFrame()
-            else:
-                logger.error(f"  ❌ API error: {response.status_code}")
+            if df.empty:
+                logger.error("  ❌ API returned no data")
                 return pd.DataFrame()
+            
+            # Limit to target candles
+            if len(df) > target_candles:
+                df = df.tail(target_candles)
+            
+            logger.info(f"  ✅ Loaded {len(df)} candles")
+            logger.info(f"  Date range: {df.index[0]} to {df.index[-1]}")
+            logger.info(f"  Price range: ${df['close'].min():.2f} - ${df['close'].max():.2f}")
+            
+            return df
                 
         except Exception as e:
             logger.error(f"  ❌ Error: {e}")
@@ -25,6 +25,7 @@ sys.path.append(project_root)
 
 from backtesting.strategy_engine import ICTStrategyEngine
 from backtesting.performance_analyzer import PerformanceAnalyzer
+from backtesting.ohlcv_store import OHLCVStore, fetch_bybit_klines
 
 # Setup logging
 logging.basicConfig(
@@ -41,6 +42,7 @@ class QuickWeekBacktest:
         self.initial_capital = 10000
         self.strategy_engine = ICTStrategyEngine()
         self.performance_analyzer = PerformanceAnalyzer()
+        self.ohlcv_store = OHLCVStore(os.path.join(project_root, 'data', 'cache', 'ohlcv'))
         
         # 3 weeks for better sample size
         self.end_date = datetime.now()
@@ -59,52 +61,22 @@ class QuickWeekBacktest:
         Fetch 3 weeks of hourly data (~504 candles).
         """
         try:
-            import requests
-            
             logger.info(f"\nFetching 3-week data for {symbol}...")
             
-            url = "https://api.bybit.com/v5/market/kline"
+            # Last 600 candles (covers 3 weeks + buffer), read through the local OHLCV store
+            end = pd.Timestamp.now(tz='UTC').tz_localize(None)
+            df = self.ohlcv_store.load_or_fetch(symbol, '1h', end - pd.Timedelta(hours=599), end,
+                                                fetch_bybit_klines)
             
-            # Get last 600 candles (covers 3 weeks + buffer)
-            params = {
-                'category': 'linear',
-                'symbol': symbol,
-                'interval': '60',
-                'limit': 600  # 600 candles for 3 weeks
-            }
+            if df.empty:
+                logger.error("  API returned no data")
+                return pd.DataFrame()
             
-            response = requests.get(url, params=params, timeout=30)
+            logger.info(f"  ✅ Loaded {len(df)} candles")
+            logger.info(f"  Date range: {df.index[0]} to {df.index[-1]}")
+            logger.info(f"  Price: ${df['close'].iloc[-1]:.2f}")
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data.get('retCode') == 0 and data.get('result', {}).get('list'):
-                    candles = data['result']['list']
-                    
-                    # Convert to DataFrame
-                    df = pd.DataFrame(candles, columns=[
-                        'timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'
-                    ])
-                    
-                    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='ms')
-                    for col in ['open', 'high', 'low', 'close', 'volume']:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                    
-                    df.set_index('timestamp', inplace=True)
-                    df.sort_index(inplace=True)
-                    df = df[['open', 'high', 'low', 'close', 'volume']]
-                    
-                    logger.info(f"  ✅ Loaded {len(df)} candles")
-                    logger.info(f"  Date range: {df.index[0]} to {df.index[-1]}")
-                    logger.info(f"  Price: ${df['close'].iloc[-1]:.2f}")
-                    
-                    return df
-                else:
-                    logger.error("  API returned no data")
-                    return pd.DataFrame()
-            else:
-                logger.error(f"  API error: {response.status_code}")
-                return pd.DataFrame()
+            return df
                 
         except Exception as e:
             logger.error(f"  Error: {e}")
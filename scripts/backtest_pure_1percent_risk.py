@@ -34,6 +34,7 @@ sys.path.append(project_root)
 
 from backtesting.strategy_engine import ICTStrategyEngine
 from backtesting.performance_analyzer import PerformanceAnalyzer
+from backtesting.ohlcv_store import OHLCVStore, fetch_bybit_klines
 
 # Setup logging
 logging.basicConfig(
@@ -56,6 +57,7 @@ class Pure1PercentBacktest:
         self.strategy_engine.use_pure_risk = True  # Flag for pure 1% risk
         
         self.performance_analyzer = PerformanceAnalyzer()
+        self.ohlcv_store = OHLCVStore(os.path.join(project_root, 'data', 'cache', 'ohlcv'))
         
         # 6 month period
         self.end_date = datetime.now()
@@ -73,54 +75,12 @@ class Pure1PercentBacktest:
     def fetch_data(self, symbol: str) -> pd.DataFrame:
         """Fetch 6 months of hourly data (~4320 candles)."""
         try:
-            import requests
-            
             logger.info(f"\nFetching 6-month data for {symbol}...")
             
-            url = "https://api.bybit.com/v5/market/kline"
-            
-            # Fetch 6 months in chunks (Bybit limit is 1000 per request)
-            all_candles = []
-            
-            # Get 6 separate batches to cover 6 months
-            for batch in range(6):
-                params = {
-                    'category': 'linear',
-                    'symbol': symbol,
-                    'interval': '60',
-                    'limit': 1000,
-                    'end': int((self.end_date - timedelta(days=batch*30)).timestamp() * 1000)
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('retCode') == 0 and data.get('result', {}).get('list'):
-                        candles = data['result']['list']
-                        all_candles.extend(candles)
-                        logger.info(f"  Batch {batch+1}/6: {len(candles)} candles")
-                else:
-                    logger.error(f"  API error in batch {batch+1}: {response.status_code}")
+            # Read through the local OHLCV store; only missing ranges hit the Bybit API
+            df = self.ohlcv_store.load_or_fetch(symbol, '1h', self.start_date, self.end_date, fetch_bybit_klines)
             
-            if all_candles:
-                # Convert to DataFrame
-                df = pd.DataFrame(all_candles, columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'
-                ])
-                
-                df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='ms')
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-                df.set_index('timestamp', inplace=True)
-                df.sort_index(inplace=True)
-                df = df[['open', 'high', 'low', 'close', 'volume']]
-                
-                # Remove duplicates and keep only 6 months
-                df = df[~df.index.duplicated(keep='first')]
-                df = df[df.index >= self.start_date]
-                
+            if not df.empty:
                 logger.info(f"  ✅ Loaded {len(df)} candles total")
                 logger.info(f"  Date range: {df.index[0]} to {df.index[-1]}")
                 logger.info(f"  Price: ${df['close'].iloc[-1]:.2f}")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Correlation refresh and portfolio heat benchmark
+================================================
+
+Refreshes the correlation matrix on every new 1h candle for universes of
+growing size, once with the former CorrelationAnalyzer path (rebuild the
+aligned price DataFrame and run pct_change().corr() over the whole 30-day
+history) and once with OnlineCorrelationEngine (O(k²) update per bar).
+Then times portfolio heat for growing position counts: the former pairwise
+Python double loop against the quadratic form.
+
+Usage:
+    python scripts/benchmarks/benchmark_correlation.py [--universe 10 50 100] [--candles 48]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from utils.correlation_matrix import CorrelationAnalyzer, OnlineCorrelationEngine  # noqa: E402
+
+WINDOW = 30 * 24  # 30 days of 1h candles
+
+
+def legacy_refresh(price_history):
+    """The former calculate_correlation_matrix body"""
+    df = pd.DataFrame(price_history).ffill().bfill()
+    return df.pct_change().dropna().corr().to_dict()
+
+
+def legacy_heat(matrix, positions):
+    """The former calculate_portfolio_heat loop over get_correlation"""
+    total = 0.0
+    for i, pos1 in enumerate(positions):
+        for j, pos2 in enumerate(positions):
+            if i >= j:
+                continue
+            corr = matrix.get(pos1['symbol'], {}).get(pos2['symbol'], 0.0)
+            total += pos1['risk_amount'] * pos2['risk_amount'] * corr
+    return total
+
+
+def simulate_prices(rng, symbols, bars):
+    market = rng.normal(0, 0.01, bars)
+    betas = rng.uniform(0.3, 1.2, len(symbols))
+    returns = market[:, None] * betas + rng.normal(0, 0.008, (bars, len(symbols)))
+    index = pd.date_range('2025-01-01', periods=bars, freq='h')
+    return pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=index, columns=symbols)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--universe', type=int, nargs='+', default=[10, 50, 100], help='Symbols tracked')
+    parser.add_argument('--candles', type=int, default=48, help='New candles to refresh on')
+    parser.add_argument('--positions', type=int, nargs='+', default=[5, 20, 50])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(42)
+
+    print(f"Per-candle correlation refresh ({WINDOW}-bar window, {args.candles} candles)")
+    print(f"{'symbols':<10}{'full recompute':>16}{'incremental':>13}{'speedup':>9}{'max |diff|':>12}")
+    for k in args.universe:
+        prices = simulate_prices(rng, [f'S{i}' for i in range(k)], WINDOW + args.candles)
+        history, new_bars = prices.iloc[:WINDOW], prices.iloc[WINDOW:]
+
+        legacy_times = []
+        for t in range(args.candles):
+            window = prices.iloc[t + 1:WINDOW + t + 1]
+            start = time.perf_counter()
+            legacy = legacy_refresh({symbol: window[symbol] for symbol in window.columns})
+            legacy_times.append(time.perf_counter() - start)
+
+        engine = OnlineCorrelationEngine(window=WINDOW - 1)
+        engine.seed(history)
+        engine_times = []
+        for _, row in new_bars.iterrows():
+            start = time.perf_counter()
+            engine.update_prices(row.to_dict())
+            matrix = engine.correlation_matrix()
+            engine_times.append(time.perf_counter() - start)
+
+        diff = np.abs(matrix - pd.DataFrame(legacy).to_numpy()).max()
+        before, after = np.median(legacy_times) * 1000, np.median(engine_times) * 1000
+        print(f"{k:<10}{before:>14.3f}ms{after:>11.3f}ms{before / after:>8.1f}x{diff:>12.1e}")
+
+    print("\nPortfolio heat (50-symbol universe)")
+    print(f"{'positions':<10}{'pairwise loop':>15}{'quadratic form':>16}{'speedup':>9}")
+    analyzer = CorrelationAnalyzer()
+    universe = [f'S{i}' for i in range(50)]
+    analyzer.engine.seed(simulate_prices(rng, universe, WINDOW))
+    matrix = analyzer.engine.correlation_frame().to_dict()
+    for count in args.positions:
+        positions = [{'symbol': str(rng.choice(universe)), 'risk_amount': 0.01} for _ in range(count)]
+        symbols = [p['symbol'] for p in positions]
+        risks = [p['risk_amount'] for p in positions]
+        repeats = 200
+        start = time.perf_counter()
+        for _ in range(repeats):
+            before_heat = legacy_heat(matrix, positions)
+        before = (time.perf_counter() - start) / repeats * 1000
+        start = time.perf_counter()
+        for _ in range(repeats):
+            after_heat = analyzer.engine.portfolio_heat(symbols, risks)
+        after = (time.perf_counter() - start) / repeats * 1000
+        assert abs(before_heat - after_heat) < 1e-9
+        print(f"{count:<10}{before:>13.3f}ms{after:>14.3f}ms{before / after:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Streaming indicator benchmark
+=============================
+
+Appends new candles to streams that already hold a history, computing ATR,
+normalized volatility, Bollinger bands and z-score after each candle. This is
+done twice. The frame path calls VolatilityAnalyzer.get_atr_analysis and
+MeanReversionAnalyzer.analyze_price_extension on the whole history. The
+streaming path calls StreamingIndicators.update and then the *_from_values
+analyses. A third measurement times the compute_indicators batch replay
+against the pandas full-frame calls a backtest would make once.
+
+Usage:
+    python scripts/benchmarks/benchmark_indicators.py [--history 500 2000 10000] [--candles 200]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from utils.mean_reversion import MeanReversionAnalyzer  # noqa: E402
+from utils.streaming_indicators import StreamingIndicators, compute_indicators  # noqa: E402
+from utils.volatility_indicators import VolatilityAnalyzer  # noqa: E402
+
+
+def simulate_candles(rng, bars):
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, bars)))
+    index = pd.date_range('2025-01-01', periods=bars, freq='15min')
+    return pd.DataFrame({'high': close * (1 + rng.uniform(0, 0.004, bars)),
+                         'low': close * (1 - rng.uniform(0, 0.004, bars)),
+                         'close': close}, index=index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--history', type=int, nargs='+', default=[500, 2000, 10000], help='Candles already held')
+    parser.add_argument('--candles', type=int, default=200, help='New candles per stream')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(42)
+    volatility_analyzer, mean_reversion_analyzer = VolatilityAnalyzer(), MeanReversionAnalyzer()
+
+    print(f"Per-candle indicator refresh ({args.candles} new candles)")
+    print(f"{'history':<10}{'frame':>12}{'streaming':>12}{'speedup':>9}{'max |dz|':>11}{'same decision':>15}")
+    for history in args.history:
+        df = simulate_candles(rng, history + args.candles)
+        indicators = StreamingIndicators.for_analyzers(volatility_analyzer, mean_reversion_analyzer)
+        indicators.seed('BTCUSDT', '15m', df.iloc[:history])
+
+        frame_times, stream_times, diffs, agree = [], [], [], 0
+        for t in range(history, len(df)):
+            frame = df.iloc[:t + 1]
+            price = frame['close'].iloc[-1]
+            start = time.perf_counter()
+            atr_before = volatility_analyzer.get_atr_analysis(frame, price)
+            mr_before = mean_reversion_analyzer.analyze_price_extension(frame, 'BUY')
+            frame_times.append(time.perf_counter() - start)
+
+            candle = {'high': frame['high'].iloc[-1], 'low': frame['low'].iloc[-1], 'close': price,
+                      'timestamp': frame.index[-1]}
+            start = time.perf_counter()
+            values = indicators.update('BTCUSDT', '15m', candle)
+            atr_after = volatility_analyzer.get_atr_analysis_from_values(values['atr'], values['volatility'], price)
+            mr_after = mean_reversion_analyzer.analyze_price_extension_from_values(
+                price, values['bb_upper'], values['bb_middle'], values['bb_lower'], values['zscore'], 'BUY')
+            stream_times.append(time.perf_counter() - start)
+
+            diffs.append(abs(mr_before['zscore'] - mr_after['zscore']))
+            agree += (mr_before['position_multiplier'] == mr_after['position_multiplier']
+                      and atr_before['regime'] == atr_after['regime'])
+
+        before, after = np.median(frame_times) * 1000, np.median(stream_times) * 1000
+        print(f"{history:<10}{before:>10.3f}ms{after:>10.3f}ms{before / after:>8.0f}x"
+              f"{max(diffs):>11.1e}{agree:>10}/{args.candles}")
+
+    print("\nBatch mode over a full backtest frame")
+    print(f"{'candles':<10}{'pandas':>12}{'replay':>12}")
+    for bars in (10000, 35040):
+        df = simulate_candles(rng, bars)
+        start = time.perf_counter()
+        volatility_analyzer.calculate_atr(df)
+        mean_reversion_analyzer.calculate_bollinger_bands(df)
+        mean_reversion_analyzer.calculate_zscore(df)
+        before = time.perf_counter() - start
+        start = time.perf_counter()
+        compute_indicators(df)
+        after = time.perf_counter() - start
+        print(f"{bars:<10}{before * 1000:>10.1f}ms{after * 1000:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
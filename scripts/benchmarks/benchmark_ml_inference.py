@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+ICT ML inference benchmark
+==========================
+
+Scores the signals of simulated scan cycles with the same trained models,
+once with the former per-signal path (feature dict, hand-rolled one-hot
+encoding, one-row DataFrame, one model call per signal) and once with
+ICTMLTrainer.predict_batch (one float32 feature matrix and a single
+classifier/regressor call per cycle). Also times loading the model file
+with and without the memoized loader.
+
+Usage:
+    python scripts/benchmarks/benchmark_ml_inference.py [--cycles 50] [--signals 1 4 16 64]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.engines.ict_ml_trainer import ICTMLTrainer, load_model_bundle, joblib  # noqa: E402
+
+
+class LegacyICTMLTrainer(ICTMLTrainer):
+    """ICTMLTrainer with the per-signal feature extraction and inference it had before predict_batch"""
+
+    def extract_features_from_signal(self, signal: Dict, market_data: Dict = None) -> Dict:
+        """Extract ML features from an ICT signal."""
+        features = {}
+        
+        # Basic signal features
+        features['confidence'] = signal.get('confidence', 0.0)
+        features['risk_amount'] = signal.get('risk_amount', 100.0)
+        features['entry_price'] = signal.get('entry_price', 0.0)
+        features['stop_loss'] = signal.get('stop_loss', 0.0)
+        features['take_profit'] = signal.get('take_profit', 0.0)
+        
+        # Calculate risk/reward ratio
+        entry = features['entry_price']
+        sl = features['stop_loss']
+        tp = features['take_profit']
+        
+        if entry > 0 and sl > 0 and tp > 0:
+            risk = abs(entry - sl)
+            reward = abs(tp - entry)
+            features['risk_reward_ratio'] = reward / risk if risk > 0 else 0
+        else:
+            features['risk_reward_ratio'] = 0
+        
+        # Action encoding
+        features['action_buy'] = 1 if signal.get('action') == 'BUY' else 0
+        features['action_sell'] = 1 if signal.get('action') == 'SELL' else 0
+        
+        # Crypto encoding
+        crypto = signal.get('crypto', 'BTC')
+        features['crypto_btc'] = 1 if crypto == 'BTC' else 0
+        features['crypto_eth'] = 1 if crypto == 'ETH' else 0
+        features['crypto_sol'] = 1 if crypto == 'SOL' else 0
+        features['crypto_xrp'] = 1 if crypto == 'XRP' else 0
+        
+        # Timeframe encoding
+        timeframe = signal.get('timeframe', '5m')
+        features['tf_1m'] = 1 if timeframe == '1m' else 0
+        features['tf_5m'] = 1 if timeframe == '5m' else 0
+        features['tf_15m'] = 1 if timeframe == '15m' else 0
+        features['tf_1h'] = 1 if timeframe == '1h' else 0
+        features['tf_4h'] = 1 if timeframe == '4h' else 0
+        
+        # ICT-specific features
+        features['ml_boost'] = signal.get('ml_boost', 0.0)
+        features['ict_confidence'] = signal.get('ict_confidence', 0.0)
+        
+        # Time-based features
+        timestamp = signal.get('timestamp')
+        if timestamp:
+            try:
+                if isinstance(timestamp, str):
+                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                else:
+                    dt = timestamp
+                
+                features['hour'] = dt.hour
+                features['day_of_week'] = dt.weekday()
+                features['is_market_hours'] = 1 if 8 <= dt.hour <= 22 else 0
+                
+                # Session encoding
+                features['session_asia'] = 1 if (dt.hour >= 23 or dt.hour <= 8) else 0
+                features['session_london'] = 1 if (8 <= dt.hour <= 16) else 0
+                features['session_ny'] = 1 if (13 <= dt.hour <= 22) else 0
+            except Exception:
+                features['hour'] = 12
+                features['day_of_week'] = 1
+                features['is_market_hours'] = 1
+                features['session_asia'] = 0
+                features['session_london'] = 1
+                features['session_ny'] = 0
+        
+        # Market data features (if available)
+        if market_data and crypto in market_data:
+            market = market_data[crypto]
+            features['price'] = market.get('price', entry)
+            features['change_24h'] = market.get('change_24h', 0.0)
+            features['volume'] = market.get('volume', 0.0)
+            features['high_24h'] = market.get('high_24h', entry)
+            features['low_24h'] = market.get('low_24h', entry)
+            
+            # Price position features
+            if features['high_24h'] > features['low_24h']:
+                price_range = features['high_24h'] - features['low_24h']
+                features['price_position'] = (features['price'] - features['low_24h']) / price_range
+            else:
+                features['price_position'] = 0.5
+        else:
+            features['price'] = entry
+            features['change_24h'] = 0.0
+            features['volume'] = 0.0
+            features['high_24h'] = entry
+            features['low_24h'] = entry
+            features['price_position'] = 0.5
+        
+        return features
+
+    def predict_signal_enhancement(self, signal, market_data=None):
+        features = self.extract_features_from_signal(signal, market_data)
+        features_df = pd.DataFrame([features])
+        X = self.scaler.transform(features_df.fillna(0))
+        success_prob = self.signal_classifier.predict_proba(X)[0][1]
+        expected_pnl = self.pnl_regressor.predict(X)[0]
+        if success_prob > 0.7 and expected_pnl > 50:
+            ml_boost = min(0.15, (success_prob - 0.7) * 0.5)
+        elif success_prob > 0.6 and expected_pnl > 0:
+            ml_boost = min(0.1, (success_prob - 0.6) * 0.3)
+        else:
+            ml_boost = 0.0
+        return {
+            'ml_boost': ml_boost,
+            'success_probability': success_prob,
+            'expected_pnl': expected_pnl,
+            'confidence_multiplier': min(1.5, max(0.5, success_prob * 2))
+        }
+
+
+def make_signals(rng, count):
+    cryptos, timeframes = ['BTC', 'ETH', 'SOL', 'XRP'], ['1m', '5m', '15m', '1h', '4h']
+    now = datetime.now()
+    signals = []
+    for _ in range(count):
+        entry = float(rng.uniform(90, 110))
+        signals.append({
+            'crypto': str(rng.choice(cryptos)), 'action': str(rng.choice(['BUY', 'SELL'])),
+            'timeframe': str(rng.choice(timeframes)), 'confidence': float(rng.uniform(0.5, 0.95)),
+            'entry_price': entry, 'stop_loss': entry * 0.98, 'take_profit': entry * 1.04,
+            'timestamp': (now - timedelta(minutes=int(rng.integers(0, 10_000)))).isoformat()
+        })
+    return signals
+
+
+def time_cycles(score, cycles):
+    latencies = []
+    for signals in cycles:
+        start = time.perf_counter()
+        score(signals)
+        latencies.append((time.perf_counter() - start) / len(signals))
+    return np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cycles', type=int, default=50)
+    parser.add_argument('--signals', type=int, nargs='+', default=[1, 4, 16, 64], help='Signals per scan cycle')
+    parser.add_argument('--training-trades', type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    warnings.filterwarnings('ignore')
+
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        trainer = ICTMLTrainer(models_dir=tmp)
+        journal = make_signals(rng, args.training_trades)
+        for trade in journal:
+            trade['entry_time'] = trade.pop('timestamp')
+            trade['pnl'] = float(rng.normal(20, 100))
+        trainer.train_models(*trainer.prepare_training_data(journal))
+        trainer.save_models()
+        model_path = os.path.join(tmp, 'crypto_ml_model.pkl')
+
+        start = time.perf_counter()
+        joblib.load(model_path)
+        unpickle_ms = (time.perf_counter() - start) * 1000
+        load_model_bundle(model_path)
+        start = time.perf_counter()
+        ICTMLTrainer(models_dir=tmp).load_models()
+        memo_ms = (time.perf_counter() - start) * 1000
+        print(f"Model load: {unpickle_ms:.1f}ms unpickling, {memo_ms:.3f}ms memoized")
+
+        legacy = LegacyICTMLTrainer(models_dir=tmp)
+        legacy.signal_classifier, legacy.pnl_regressor = trainer.signal_classifier, trainer.pnl_regressor
+        legacy.scaler = trainer.scaler
+
+        print(f"{'signals/cycle':<15}{'per-signal p50':>16}{'batched p50':>13}{'speedup':>9}")
+        for count in args.signals:
+            cycles = [make_signals(rng, count) for _ in range(args.cycles)]
+            before = time_cycles(lambda signals: [legacy.predict_signal_enhancement(s) for s in signals], cycles)
+            after = time_cycles(trainer.predict_batch, cycles)
+            print(f"{count:<15}{np.median(before):>14.3f}ms{np.median(after):>11.3f}ms"
+                  f"{np.median(before) / np.median(after):>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Notification delivery benchmark
+===============================
+
+Replays bursts of trade alerts, like several symbols signalling in one
+scan cycle, against local fake Discord/Telegram/SMTP endpoints. It runs
+once with the former inline path (a blocking POST per alert and a new
+SMTP connection per email, all on the caller's thread) and once through
+NotificationDispatcher (queued, coalesced, persistent connections).
+
+Reported per mode:
+- blocked p50/p99: time the scan loop spends handing off one cycle's alerts
+- delivered: wall time until every alert has reached the sinks
+- messages / SMTP connections: what the endpoints actually received
+
+Usage:
+    python scripts/benchmarks/benchmark_notifications.py [--cycles 20] [--symbols 4] [--smtp-handshake 0.2]
+"""
+
+import argparse
+import os
+import smtplib
+import sys
+import time
+from email.mime.text import MIMEText
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from scripts.benchmarks.notification_sinks import FakeHTTPSink, FakeSMTPServer  # noqa: E402
+from utils.notification_dispatcher import (  # noqa: E402
+    DiscordChannel, Notification, NotificationDispatcher, SMTPChannel, TelegramChannel
+)
+
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT', 'BNBUSDT', 'ADAUSDT', 'DOGEUSDT', 'AVAXUSDT']
+
+
+def alert(symbol, cycle):
+    return f"🚨 **TRADING ALERT** 🚨\nType: BUY\nSymbol: {symbol}\nPrice: $100.0000\nCycle: {cycle}"
+
+
+def inline_sender(http, smtp):
+    """The former NotificationManager path: every call blocks on the network"""
+    def send(text, subject):
+        requests.post(f"{http.url}/webhook", json={"content": text, "username": "Crypto Trading Bot"}, timeout=10)
+        requests.post(f"{http.url}/botTOKEN/sendMessage", json={"chat_id": "1", "text": text}, timeout=10)
+        msg = MIMEText(text)
+        msg['From'] = msg['To'] = 'bot@example.com'
+        msg['Subject'] = subject
+        server = smtplib.SMTP('127.0.0.1', smtp.port)
+        server.sendmail('bot@example.com', 'bot@example.com', msg.as_string())
+        server.quit()
+    return send, lambda timeout: True, None
+
+
+def dispatcher_sender(http, smtp, coalesce_window):
+    """NotificationDispatcher path (rate limits raised so the sinks, not the limiter, are measured)"""
+    dispatcher = NotificationDispatcher([
+        DiscordChannel(f"{http.url}/webhook", rate=1000),
+        TelegramChannel('TOKEN', '1', api_url=http.url, rate=1000),
+        SMTPChannel('127.0.0.1', smtp.port, from_addr='bot@example.com', starttls=False, rate=1000)
+    ], coalesce_window=coalesce_window)
+    dispatcher.start()
+
+    def send(text, subject):
+        dispatcher.submit(Notification(text, subject=subject, category='trade_alert'))
+    return send, dispatcher.flush, dispatcher
+
+
+def replay(mode, args):
+    with FakeHTTPSink(latency=args.http_latency) as http, \
+            FakeSMTPServer(handshake_delay=args.smtp_handshake, latency=args.http_latency) as smtp:
+        if mode == 'inline':
+            send, flush, dispatcher = inline_sender(http, smtp)
+        else:
+            send, flush, dispatcher = dispatcher_sender(http, smtp, args.coalesce_window)
+
+        blocked = []
+        start = time.perf_counter()
+        for cycle in range(args.cycles):
+            cycle_start = time.perf_counter()
+            for symbol in SYMBOLS[:args.symbols]:
+                send(alert(symbol, cycle), f"URGENT: BUY Alert for {symbol}")
+            blocked.append(time.perf_counter() - cycle_start)
+            time.sleep(max(0.0, args.cycle_interval - blocked[-1]))
+        flush(60)
+        delivered = time.perf_counter() - start
+
+        if dispatcher is not None:
+            dispatcher.stop()
+        return np.array(blocked) * 1000, delivered, len(http.requests) + len(smtp.messages), smtp.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--symbols', type=int, default=4, help='Alerts per cycle')
+    parser.add_argument('--cycle-interval', type=float, default=0.25, help='Seconds between cycles')
+    parser.add_argument('--coalesce-window', type=float, default=0.1)
+    parser.add_argument('--http-latency', type=float, default=0.02, help='Seconds per HTTP response / SMTP DATA')
+    parser.add_argument('--smtp-handshake', type=float, default=0.2, help='Seconds before the SMTP greeting')
+    args = parser.parse_args()
+    args.symbols = min(args.symbols, len(SYMBOLS))
+
+    print(f"{args.cycles} cycles x {args.symbols} alerts to Discord + Telegram + email, "
+          f"{args.http_latency * 1000:.0f}ms per request, {args.smtp_handshake * 1000:.0f}ms SMTP handshake")
+    print(f"{'mode':<12}{'blocked p50':>13}{'blocked p99':>13}{'delivered':>11}{'messages':>10}{'SMTP conns':>12}")
+    for mode in ('inline', 'dispatcher'):
+        blocked, delivered, messages, connections = replay(mode, args)
+        print(f"{mode:<12}{np.percentile(blocked, 50):>11.2f}ms{np.percentile(blocked, 99):>11.2f}ms"
+              f"{delivered:>10.2f}s{messages:>10}{connections:>12}")
+
+
+if __name__ == '__main__':
+    main()
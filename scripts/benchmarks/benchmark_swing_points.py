@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Swing point detection micro-benchmark
+=====================================
+
+Times the shared NumPy swing kernel (trading/swing_points.py) against the
+per-candle Python loops it replaced in LiquidityDetector and
+ICTFibonacciAnalyzer, on a synthetic 50k-candle series.
+
+Usage:
+    python scripts/benchmarks/benchmark_swing_points.py [--candles 50000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from trading.swing_points import find_swing_highs, find_swing_lows, window_extreme  # noqa: E402
+
+
+def loop_local_peaks(data, prominence=0.002):
+    """Former LiquidityDetector._find_local_peaks"""
+    peaks = []
+    for i in range(1, len(data) - 1):
+        if data[i] > data[i-1] and data[i] > data[i+1]:
+            if data[i] / max(data[i-1], data[i+1]) - 1 >= prominence:
+                peaks.append(i)
+    return peaks
+
+
+def loop_significant_swing_highs(highs, lows, width=3, min_swing_size=0.02):
+    """Former ICTFibonacciAnalyzer._identify_significant_swings (swing highs half)"""
+    swings = []
+    for i in range(width, len(highs) - width):
+        if all(highs[i] > highs[i-j] and highs[i] > highs[i+j] for j in range(1, width + 1)):
+            nearby_low = min(lows[max(0, i-10):min(len(lows), i+10)])
+            if (highs[i] - nearby_low) / nearby_low >= min_swing_size:
+                swings.append(i)
+    return swings
+
+
+def kernel_local_peaks(data, prominence=0.002):
+    return find_swing_highs(data, width=1, min_prominence=prominence).index
+
+
+def kernel_significant_swing_highs(highs, lows, width=3, min_swing_size=0.02):
+    points = find_swing_highs(highs, width=width)
+    nearby_low = window_extreme(lows, 10, 10, 'min', at=points.index)
+    return points.index[(points.price - nearby_low) / nearby_low >= min_swing_size]
+
+
+def best_time(fn, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candles', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.004, args.candles)))
+    highs = close * (1 + rng.uniform(0, 0.004, args.candles))
+    lows = close * (1 - rng.uniform(0, 0.004, args.candles))
+    find_swing_lows(lows)  # Warm-up
+
+    print(f"Swing detection on {args.candles:,} candles (best of {args.repeat})")
+    print(f"{'case':<32}{'loop':>10}{'kernel':>10}{'speedup':>10}")
+    for name, loop_fn, kernel_fn, fn_args in (
+        ('liquidity peaks (w=1, 0.2%)', loop_local_peaks, kernel_local_peaks, (highs,)),
+        ('fibonacci swing highs (w=3)', loop_significant_swing_highs, kernel_significant_swing_highs, (highs, lows)),
+    ):
+        loop_time, expected = best_time(loop_fn, args.repeat, *fn_args)
+        kernel_time, result = best_time(kernel_fn, args.repeat, *fn_args)
+        assert list(result) == list(expected), f"{name}: kernel and loop disagree"
+        print(f"{name:<32}{loop_time * 1000:>8.1f}ms{kernel_time * 1000:>8.1f}ms{loop_time / kernel_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
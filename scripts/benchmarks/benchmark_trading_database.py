@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+TradingDatabase traffic replay benchmark
+========================================
+
+Replays one day of monitor + dashboard traffic against a database that
+already holds months of signal and trade history, once with the former
+storage layer (one shared connection, rollback journal, SELECT 1 before
+every call, no secondary indexes, date(entry_time) day filters) and once
+with the current one (per-thread WAL connections, indexes, stored
+entry_date), and with the write-behind stage on top.
+
+Traffic per simulated day:
+- monitor thread: a scan every 30s (scan counter, open trades, one
+  batched mark-to-market write) and a new signal + trade every hour
+- dashboard threads: an /api/data-style read every 10s (daily stats,
+  today's / active / closed signals, active trades, trades entered today)
+
+Usage:
+    python scripts/benchmarks/benchmark_trading_database.py [--history-days 120] [--readers 4]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from database.trading_database import TradingDatabase, SCHEMA_COLUMNS  # noqa: E402
+
+SCANS_PER_DAY = 24 * 60 * 2       # Every 30 seconds
+DASHBOARD_REQUESTS_PER_DAY = 24 * 60 * 6  # Every 10 seconds
+SCANS_PER_SIGNAL = 120            # One signal per hour
+
+
+class LegacyTradingDatabase(TradingDatabase):
+    """TradingDatabase with the storage layer it had before the pool/WAL/index upgrade"""
+
+    def _connect(self):
+        self._shared_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._shared_conn.row_factory = sqlite3.Row
+
+    @property
+    def conn(self):
+        return self._shared_conn
+
+    def _ensure_connection(self):
+        self.conn.execute("SELECT 1")
+
+    def _migrate_schema(self, cursor):
+        # Only the live-trading columns the write path needs; no entry_date, triggers or indexes
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(paper_trades)")}
+        for column, column_type in SCHEMA_COLUMNS['paper_trades']:
+            if column != 'entry_date' and column not in existing:
+                cursor.execute(f"ALTER TABLE paper_trades ADD COLUMN {column} {column_type}")
+
+    def count_paper_trades_entered(self, day=None):
+        self._ensure_connection()
+        cursor = self.conn.execute('SELECT COUNT(*) FROM paper_trades WHERE date(entry_time) = ?',
+                                   (day or date.today().isoformat(),))
+        return cursor.fetchone()[0]
+
+    def close(self):
+        self._shared_conn.close()
+
+
+class WriteBehindTradingDatabase(TradingDatabase):
+    """Current storage layer with scan-loop writes batched by the background writer"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.start_write_behind()
+
+
+def seed_history(db, days, signals_per_day):
+    """Closed signals and trades for the days before today"""
+    rng = random.Random(7)
+    start = datetime.now() - timedelta(days=days)
+    signals, trades = [], []
+    for day in range(days):
+        for n in range(signals_per_day):
+            entry_time = start + timedelta(days=day, minutes=rng.randrange(24 * 60))
+            signal_id = f"SIG_HIST_{day}_{n}"
+            signals.append((signal_id, entry_time.isoformat(), entry_time.date().isoformat()))
+            trades.append((signal_id, entry_time.strftime('%Y-%m-%d %H:%M:%S'), entry_time.date().isoformat()))
+
+    with db.conn:
+        db.conn.executemany('''
+            INSERT INTO signals (signal_id, symbol, direction, entry_price, stop_loss, take_profit,
+                                 confluence_score, timeframes, ict_concepts, session, market_regime,
+                                 directional_bias, signal_strength, status, entry_time, created_date)
+            VALUES (?, 'BTCUSDT', 'BUY', 100, 98, 104, 0.7, '1h', '[]', 'LONDON', 'TRENDING',
+                    'BULLISH', 'HIGH', 'CLOSED', ?, ?)
+        ''', signals)
+        db.conn.executemany('''
+            INSERT INTO paper_trades (signal_id, symbol, direction, entry_price, position_size,
+                                      stop_loss, take_profit, risk_amount, status, entry_time,
+                                      created_date, realized_pnl)
+            VALUES (?, 'BTCUSDT', 'BUY', 100, 1, 98, 104, 1, 'TAKE_PROFIT', ?, ?, 4.0)
+        ''', trades)
+
+
+def monitor_traffic(db, latencies):
+    """Scan loop of the monitor: counters, open trades, batched marks, hourly signals"""
+    last_id = 0
+    for scan in range(SCANS_PER_DAY):
+        start = time.perf_counter()
+        db.increment_scan_count()
+        db.get_scan_count()
+        if scan % SCANS_PER_SIGNAL == 0:
+            signal_id = db.add_signal({'symbol': 'ETHUSDT', 'direction': 'BUY', 'entry_price': 3000.0,
+                                       'stop_loss': 2950.0, 'take_profit': 3100.0})
+            db.add_paper_trade({'signal_id': signal_id, 'symbol': 'ETHUSDT', 'direction': 'BUY',
+                                'entry_price': 3000.0, 'position_size': 0.1, 'stop_loss': 2950.0,
+                                'take_profit': 3100.0, 'risk_amount': 5.0})
+        open_trades = db.get_open_paper_trades(after_id=last_id)
+        last_id = max([last_id] + [t['id'] for t in open_trades])
+        db.mark_paper_trades([(3001.0, 0.1, t['id']) for t in db.get_active_paper_trades()], [])
+        latencies.append(time.perf_counter() - start)
+
+
+def dashboard_traffic(db, requests, latencies):
+    """/api/data-style reads"""
+    for _ in range(requests):
+        start = time.perf_counter()
+        db.get_daily_stats()
+        db.get_signals_today()
+        db.get_active_signals()
+        db.get_active_paper_trades()
+        db.get_closed_signals_today()
+        db.count_paper_trades_entered()
+        latencies.append(time.perf_counter() - start)
+
+
+def replay(db_class, path, history_days, signals_per_day, readers):
+    db = db_class(path)
+    seed_history(db, history_days, signals_per_day)
+
+    monitor_latencies, dashboard_latencies = [], []
+    threads = [threading.Thread(target=monitor_traffic, args=(db, monitor_latencies))]
+    threads += [threading.Thread(target=dashboard_traffic,
+                                 args=(db, DASHBOARD_REQUESTS_PER_DAY // readers, dashboard_latencies))
+                for _ in range(readers)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    db.close()
+    return elapsed, np.array(monitor_latencies) * 1000, np.array(dashboard_latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--history-days', type=int, default=120)
+    parser.add_argument('--signals-per-day', type=int, default=40)
+    parser.add_argument('--readers', type=int, default=4, help='Dashboard reader threads')
+    args = parser.parse_args()
+
+    print(f"One day of traffic ({SCANS_PER_DAY:,} scans, {DASHBOARD_REQUESTS_PER_DAY:,} dashboard reads, "
+          f"{args.readers} reader threads) on {args.history_days * args.signals_per_day:,} historical trades")
+    print(f"{'storage layer':<16}{'wall':>9}{'scan p50':>11}{'scan p99':>11}{'read p50':>11}{'read p99':>11}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, db_class in (('legacy', LegacyTradingDatabase), ('pooled WAL', TradingDatabase),
+                               ('write-behind', WriteBehindTradingDatabase)):
+            elapsed, scans, reads = replay(db_class, os.path.join(tmp, f"{name.replace(' ', '_')}.db"),
+                                           args.history_days, args.signals_per_day, args.readers)
+            print(f"{name:<16}{elapsed:>8.2f}s"
+                  f"{np.percentile(scans, 50):>9.2f}ms{np.percentile(scans, 99):>9.2f}ms"
+                  f"{np.percentile(reads, 50):>9.2f}ms{np.percentile(reads, 99):>9.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
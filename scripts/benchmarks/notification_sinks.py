@@ -0,0 +1,193 @@
+"""
+Local fake SMTP and HTTP endpoints for offline notification benchmarks.
+
+Both servers run on their own event loop thread so blocking and async
+clients can use them alike, and both can add latency to imitate a slow
+network or a slow SMTP handshake:
+
+    with FakeSMTPServer(handshake_delay=0.2) as smtp, FakeHTTPSink(latency=0.05) as http:
+        SMTPChannel('127.0.0.1', smtp.port, starttls=False)
+        DiscordChannel(f'{http.url}/webhook')
+"""
+
+import asyncio
+import threading
+import time
+
+from aiohttp import web
+
+
+class _LoopThreadServer:
+    """Server running on a private event loop thread"""
+
+    def __init__(self):
+        self.port = None
+        self._loop = None
+        self._thread = None
+
+    async def _start(self):
+        raise NotImplementedError
+
+    async def _stop(self):
+        raise NotImplementedError
+
+    def start(self):
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._start())
+            self._loop.call_soon(started.set)
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FakeSMTPServer(_LoopThreadServer):
+    """Minimal SMTP server (no TLS, no auth) that keeps every message it receives"""
+
+    def __init__(self, handshake_delay: float = 0.0, latency: float = 0.0):
+        """
+        Args:
+            handshake_delay: Seconds before the greeting on each new connection
+            latency: Seconds to accept each message
+        """
+        super().__init__()
+        self.handshake_delay = handshake_delay
+        self.latency = latency
+        self.connections = 0
+        self.messages = []
+        self._server = None
+        self._sessions = set()
+
+    async def _start(self):
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _stop(self):
+        self._server.close()
+        for session in self._sessions:
+            session.cancel()
+        await asyncio.gather(*self._sessions, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def drop_connections(self):
+        """Close every client connection, like a server-side idle timeout"""
+        async def drop():
+            for session in list(self._sessions):
+                session.cancel()
+            await asyncio.gather(*self._sessions, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(drop(), self._loop).result()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._sessions.add(asyncio.current_task())
+        await asyncio.sleep(self.handshake_delay)
+        writer.write(b"220 fake ESMTP\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors='replace').strip().upper()
+                if command.startswith('EHLO'):
+                    writer.write(b"250-fake\r\n250 8BITMIME\r\n")
+                elif command.startswith(('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP')):
+                    writer.write(b"250 OK\r\n")
+                elif command == 'DATA':
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    await asyncio.sleep(self.latency)
+                    self.messages.append(data[:-5])
+                    writer.write(b"250 OK queued\r\n")
+                elif command == 'QUIT':
+                    writer.write(b"221 Bye\r\n")
+                    break
+                else:
+                    writer.write(b"502 Command not implemented\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            self._sessions.discard(asyncio.current_task())
+
+
+class FakeHTTPSink(_LoopThreadServer):
+    """
+    HTTP endpoint answering like the notification APIs.
+
+    Paths containing 'webhook' answer 204 (Discord), paths ending in
+    'Messages.json' answer 201 (Twilio) and everything else 200 (Telegram).
+    """
+
+    def __init__(self, latency: float = 0.0, status: int = None):
+        """
+        Args:
+            latency: Seconds before each response
+            status: Force this status on every response
+        """
+        super().__init__()
+        self.latency = latency
+        self.status = status
+        self.requests = []
+        self._connections = set()
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def connections(self) -> int:
+        return len(self._connections)
+
+    async def _handle(self, request):
+        self._connections.add(id(request.transport))
+        if request.content_type == 'application/json':
+            body = await request.json()
+        else:
+            body = dict(await request.post())
+        await asyncio.sleep(self.latency)
+        self.requests.append((request.path, body, time.monotonic()))
+
+        if self.status is not None:
+            status = self.status
+        elif 'webhook' in request.path:
+            status = 204
+        elif request.path.endswith('Messages.json'):
+            status = 201
+        else:
+            status = 200
+        return web.Response(status=status)
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_route('POST', '/{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def _stop(self):
+        await self._runner.cleanup()
@@ -7,17 +7,21 @@ import os
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 import requests
 from dotenv import load_dotenv
 
+from utils.notification_dispatcher import (
+    Notification, NotificationDispatcher, SMTPChannel, TwilioSMSChannel, aiohttp
+)
+
 load_dotenv()
 
 class NotificationService:
     """Multi-channel notification service"""
     
-    def __init__(self):
+    def __init__(self, dispatcher: Optional[NotificationDispatcher] = None):
         # Email configuration
         self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
         self.smtp_port = int(os.getenv('SMTP_PORT', 587))
@@ -35,6 +39,49 @@ class NotificationService:
         
         # User notification preferences (load from database)
         self.user_preferences = {}
+        
+        # Trading event notifications are queued here instead of sent inline
+        self.dispatcher = dispatcher if dispatcher is not None else self._build_dispatcher()
+    
+    def _build_dispatcher(self) -> Optional[NotificationDispatcher]:
+        """Dispatcher with a persistent SMTP connection and Twilio session"""
+        channels = []
+        if self.smtp_user and self.smtp_password:
+            channels.append(SMTPChannel(self.smtp_server, self.smtp_port, self.smtp_user,
+                                        self.smtp_password, from_addr=self.from_email))
+        if self.twilio_sid and self.twilio_token and aiohttp is not None:
+            channels.append(TwilioSMSChannel(self.twilio_sid, self.twilio_token, self.twilio_from))
+        return NotificationDispatcher(channels) if channels else None
+    
+    def _has_channel(self, name: str) -> bool:
+        return self.dispatcher is not None and name in self.dispatcher.channels
+    
+    def queue_email(self, recipients: List[str], subject: str, body: str,
+                    html_body: str = None, category: str = 'general'):
+        """Queue an email per recipient (sent inline if there is no dispatcher)"""
+        if not self._has_channel('email'):
+            for recipient in recipients:
+                self.send_email(recipient, subject, body, html_body)
+            return
+        
+        for recipient in recipients:
+            self.dispatcher.submit(Notification(body, subject=subject, html=html_body,
+                                                category=category, recipient=recipient), ['email'])
+    
+    def queue_sms(self, to_number: str, message: str, category: str = 'general'):
+        """Queue an SMS (sent inline if there is no dispatcher)"""
+        if not self._has_channel('sms'):
+            return self.send_sms(to_number, message)
+        return self.dispatcher.submit(Notification(message, category=category, recipient=to_number), ['sms']) > 0
+    
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Queue depth, delivery counters and latencies per channel"""
+        return self.dispatcher.get_metrics() if self.dispatcher is not None else {}
+    
+    def close(self, timeout: float = 10.0):
+        """Deliver queued notifications and close the connections"""
+        if self.dispatcher is not None:
+            self.dispatcher.stop(timeout)
     
     def send_email(self, to_email: str, subject: str, body: str, html_body: str = None):
         """Send email notification"""
@@ -152,9 +199,8 @@ Check your dashboard for more details.
 </html>
         """
         
-        # Send to all recipients
-        for recipient in recipients:
-            self.send_email(recipient, subject, body, html_body)
+        # Signals from the same scan cycle reach each recipient as one digest
+        self.queue_email(recipients, subject, body, html_body, category='signal')
     
     def notify_trade_closed(self, trade: Dict, recipients: List[str]):
         """Notify about closed trade"""
@@ -205,9 +251,7 @@ Check your dashboard for updated performance metrics.
 </html>
         """
         
-        # Send to all recipients
-        for recipient in recipients:
-            self.send_email(recipient, subject, body, html_body)
+        self.queue_email(recipients, subject, body, html_body, category='trade_closed')
     
     def notify_daily_summary(self, stats: Dict, recipients: List[str]):
         """Send daily performance summary"""
@@ -231,9 +275,7 @@ Worst Trade: ${stats.get('worst_trade', 0):,.2f}
 Keep up the great work!
         """
         
-        # Send to all recipients
-        for recipient in recipients:
-            self.send_email(recipient, subject, body)
+        self.queue_email(recipients, subject, body, category='daily_summary')
 
 # Global instance
 notification_service = NotificationService()
@@ -254,5 +296,6 @@ if __name__ == '__main__':
     
     test_email = os.getenv('TEST_EMAIL', 'trader@example.com')
     notification_service.notify_new_signal(test_signal, [test_email])
+    notification_service.close()
     
     print("✅ Notification service test complete")
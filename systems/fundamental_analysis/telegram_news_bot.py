@@ -8,9 +8,10 @@ import asyncio
 import aiohttp
 import json
 import logging
+import re
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, Iterable, List, Optional, Set
 import sqlite3
 import os
 import sys
@@ -22,12 +23,88 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('TelegramNewsBot')
 
+PRICE_REGEX = re.compile(r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+
+
+class KeywordMatcher:
+    """
+    Keyword lists compiled into one regex so a message is scanned in a single pass.
+
+    The keywords are folded into a trie-shaped pattern inside a lookahead:
+    each text position is tried once, and overlapping keywords ('fall' inside
+    'falls below', 'sol' inside 'consolidates') are all reported, exactly as
+    separate substring checks would report them. Cost grows with the text,
+    not with the number of keywords.
+    """
+
+    def __init__(self, keyword_lists: Dict[Hashable, Iterable[str]]):
+        """
+        Args:
+            keyword_lists: Label -> keywords; a keyword may belong to several labels
+        """
+        self.labels: Dict[str, List[Hashable]] = {}
+        for label, keywords in keyword_lists.items():
+            for keyword in keywords:
+                if keyword:
+                    self.labels.setdefault(keyword, []).append(label)
+
+        # The regex reports the longest keyword starting at each position;
+        # the other keywords starting there are its prefixes
+        self._implied = {
+            keyword: [other for other in self.labels if keyword.startswith(other)]
+            for keyword in self.labels
+        }
+        self.pattern = re.compile(f"(?=({self._trie_pattern(self.labels)}))") if self.labels else None
+
+    @staticmethod
+    def _trie_pattern(keywords: Iterable[str]) -> str:
+        """Regex alternation shaped like a trie ('b(?:itcoin|tc)'), longest match first"""
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # A keyword ends here: the rest is optional, tried greedily
+            return f'(?:{body})?' if '' in node else body
+
+        return build(trie)
+
+    def scan(self, text: str) -> Dict[Hashable, Set[str]]:
+        """
+        Find every keyword in text.
+
+        Returns:
+            Label -> keywords of that label found in text
+        """
+        hits: Dict[Hashable, Set[str]] = {}
+        if self.pattern is None:
+            return hits
+        for longest in {match.group(1) for match in self.pattern.finditer(text)}:
+            for keyword in self._implied[longest]:
+                for label in self.labels[keyword]:
+                    hits.setdefault(label, set()).add(keyword)
+        return hits
+
+
 class WatcherGuruTelegramBot:
     """
     Real-time news monitoring from WatcherGuru Telegram channel
     """
     
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None, poll_timeout: int = 30, batch_size: int = 50):
+        """
+        Args:
+            db_path: SQLite news store
+            poll_timeout: Seconds Telegram may hold a getUpdates long poll open
+            batch_size: Queued news/alert rows that trigger a write before the poll ends
+        """
         self.telegram_api_url = "https://api.telegram.org/bot"
         self.bot_token = None  # Will be configured
         self.watcher_guru_channel = "@watcherguru"  # WatcherGuru main channel
@@ -36,9 +113,14 @@ class WatcherGuruTelegramBot:
         self.news_cache = []
         self.last_cache_time = 0
         self.running = False
+        self.poll_timeout = poll_timeout
+        self.session: Optional[aiohttp.ClientSession] = None
         
         # Database for storing telegram news
-        self.db_path = "/Users/kirstonkwasi-kumah/Desktop/Trading Algoithm/databases/telegram_news.db"
+        self.db_path = db_path or "/Users/kirstonkwasi-kumah/Desktop/Trading Algoithm/databases/telegram_news.db"
+        self.batch_size = batch_size
+        self._pending_news = []
+        self._pending_alerts = []
         self.init_database()
         
         # News analysis patterns
@@ -62,6 +144,18 @@ class WatcherGuruTelegramBot:
             'BEARISH': ['crash', 'dump', 'bearish', 'drop', 'fall', 'plunge', 'decline', 'correction'],
             'NEUTRAL': ['consolidates', 'sideways', 'range', 'stable', 'holds']
         }
+        
+        self.urgent_keywords = ['alert', 'breaking', 'urgent', 'important', 'major']
+        
+        self.compile_patterns()
+
+    def compile_patterns(self):
+        """Compile all keyword lists into one matcher (call again after editing them)"""
+        keyword_lists = {('crypto', crypto): patterns for crypto, patterns in self.crypto_patterns.items()}
+        keyword_lists.update({('sentiment', sent): keywords for sent, keywords in self.sentiment_keywords.items()})
+        keyword_lists.update({('price', pattern): [pattern] for pattern in self.price_patterns})
+        keyword_lists['urgent'] = self.urgent_keywords
+        self.matcher = KeywordMatcher(keyword_lists)
 
     def init_database(self):
         """Initialize SQLite database for telegram news"""
@@ -115,38 +209,65 @@ class WatcherGuruTelegramBot:
         self.running = True
         logger.info("🚀 Starting WatcherGuru Telegram monitoring...")
         
-        while self.running:
-            try:
-                await self.fetch_channel_updates()
-                await asyncio.sleep(5)  # Check every 5 seconds
-            except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(30)  # Wait 30 seconds on error
-
-    async def fetch_channel_updates(self):
-        """Fetch latest updates from WatcherGuru channel"""
+        try:
+            while self.running:
+                try:
+                    # Long poll: returns as soon as news arrives, or empty after poll_timeout
+                    if await self.fetch_channel_updates() is None:
+                        await asyncio.sleep(5)  # API error: back off before polling again
+                except Exception as e:
+                    logger.error(f"Error in monitoring loop: {e}")
+                    await asyncio.sleep(30)  # Wait 30 seconds on error
+        finally:
+            await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Polling session, kept open so every poll reuses one connection"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.poll_timeout + 15)
+            )
+        return self.session
+
+    async def fetch_channel_updates(self) -> Optional[int]:
+        """
+        Long-poll the latest updates from WatcherGuru channel.
+        
+        Telegram holds the request open for up to poll_timeout seconds and
+        answers as soon as an update arrives, so an idle channel costs one
+        request per poll_timeout. Updates of one response are stored in one
+        batched write.
+        
+        Returns:
+            Number of updates processed, None on error
+        """
         try:
             url = f"{self.telegram_api_url}{self.bot_token}/getUpdates"
             params = {
                 'offset': self.last_update_id + 1,
-                'limit': 10,
-                'timeout': 10
+                'limit': 100,
+                'timeout': self.poll_timeout,
+                'allowed_updates': json.dumps(['channel_post', 'message'])
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data.get('ok') and data.get('result'):
-                            for update in data['result']:
-                                await self.process_update(update)
-                                self.last_update_id = update['update_id']
-                    else:
-                        logger.warning(f"Telegram API error: {response.status}")
+            session = await self._get_session()
+            async with session.get(url, params=params) as response:
+                if response.status != 200:
+                    logger.warning(f"Telegram API error: {response.status}")
+                    return None
+                data = await response.json()
+            
+            updates = (data.get('result') or []) if data.get('ok') else []
+            for update in updates:
+                await self.process_update(update)
+                self.last_update_id = update['update_id']
+            
+            self.flush_news()
+            return len(updates)
                         
         except Exception as e:
             logger.error(f"Error fetching channel updates: {e}")
+            return None
 
     async def process_update(self, update: dict):
         """Process a single Telegram update"""
@@ -202,7 +323,7 @@ class WatcherGuruTelegramBot:
                 )
                 
                 # Check for price alerts
-                await self.check_price_alerts(text, analysis, timestamp)
+                self.check_price_alerts(text, analysis, timestamp)
                 
                 logger.info(f"📰 Processed important crypto news: {analysis['crypto_mentioned']} - {analysis['sentiment']}")
                 
@@ -211,20 +332,18 @@ class WatcherGuruTelegramBot:
 
     def analyze_message(self, text: str) -> dict:
         """Analyze message content for crypto relevance and sentiment"""
-        text_lower = text.lower()
+        # One pass over the text finds every keyword of every list
+        hits = self.matcher.scan(text.lower())
         
         # Detect mentioned cryptocurrencies
-        crypto_mentioned = []
-        for crypto, patterns in self.crypto_patterns.items():
-            if any(pattern in text_lower for pattern in patterns):
-                crypto_mentioned.append(crypto)
+        crypto_mentioned = [crypto for crypto in self.crypto_patterns if ('crypto', crypto) in hits]
         
         # Analyze sentiment
         sentiment = 'NEUTRAL'
         sentiment_score = 0
         
-        for sent, keywords in self.sentiment_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in text_lower)
+        for sent in self.sentiment_keywords:
+            matches = len(hits.get(('sentiment', sent), ()))
             if matches > sentiment_score:
                 sentiment_score = matches
                 sentiment = sent
@@ -232,13 +351,13 @@ class WatcherGuruTelegramBot:
         # Check for price alerts
         price_alert = None
         for pattern in self.price_patterns:
-            if pattern in text_lower:
+            if ('price', pattern) in hits:
                 price_alert = self.extract_price_info(text, pattern)
                 break
         
         # Calculate importance score
         importance_score = self.calculate_importance_score(
-            crypto_mentioned, sentiment, price_alert, text
+            crypto_mentioned, sentiment, price_alert, text, urgent='urgent' in hits
         )
         
         return {
@@ -250,18 +369,13 @@ class WatcherGuruTelegramBot:
 
     def extract_price_info(self, text: str, pattern: str) -> Optional[dict]:
         """Extract price information from message"""
-        import re
-        
-        # Look for price patterns
-        price_regex = r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        
         pattern_index = text.lower().find(pattern)
         if pattern_index == -1:
             return None
         
         # Look for price near the pattern
         search_area = text[max(0, pattern_index-50):pattern_index+50]
-        price_matches = re.findall(price_regex, search_area)
+        price_matches = PRICE_REGEX.findall(search_area)
         
         if price_matches:
             price_str = price_matches[0].replace(',', '')
@@ -279,8 +393,9 @@ class WatcherGuruTelegramBot:
         
         return None
 
-    def calculate_importance_score(self, crypto_mentioned: List[str], sentiment: str, price_alert: dict, text: str) -> int:
-        """Calculate importance score (1-10)"""
+    def calculate_importance_score(self, crypto_mentioned: List[str], sentiment: str, price_alert: dict, text: str,
+                                   urgent: Optional[bool] = None) -> int:
+        """Calculate importance score (1-10); `urgent` skips the keyword check when already known"""
         score = 0
         
         # Base score for crypto mention
@@ -301,71 +416,82 @@ class WatcherGuruTelegramBot:
             score += 2
         
         # Urgent keywords
-        urgent_keywords = ['alert', 'breaking', 'urgent', 'important', 'major']
-        if any(keyword in text.lower() for keyword in urgent_keywords):
+        if urgent is None:
+            urgent = any(keyword in text.lower() for keyword in self.urgent_keywords)
+        if urgent:
             score += 2
         
         return min(score, 10)
 
     def store_telegram_news(self, message_id: int, channel: str, timestamp: str, content: str, analysis: dict):
-        """Store processed news in database"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        """Queue processed news for the next batched insert"""
+        self._pending_news.append((
+            message_id,
+            channel,
+            timestamp,
+            content,
+            ','.join(analysis['crypto_mentioned']),
+            analysis['sentiment'],
+            json.dumps(analysis['price_alert']) if analysis['price_alert'] else None,
+            analysis['importance_score'],
+            datetime.now().isoformat()
+        ))
+        if len(self._pending_news) >= self.batch_size:
+            self.flush_news()
+
+    def check_price_alerts(self, text: str, analysis: dict, timestamp: str):
+        """Check for price alerts and queue them for the next batched insert"""
+        if analysis['price_alert'] and analysis['crypto_mentioned']:
+            for crypto in analysis['crypto_mentioned']:
+                self._pending_alerts.append((
+                    crypto,
+                    analysis['price_alert']['price'],
+                    analysis['price_alert']['direction'],
+                    timestamp,
+                    text[:200],  # First 200 chars
+                    False
+                ))
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO telegram_news 
-                (message_id, channel, timestamp, content, crypto_mentioned, sentiment, price_alert, importance_score, processed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                message_id,
-                channel,
-                timestamp,
-                content,
-                ','.join(analysis['crypto_mentioned']),
-                analysis['sentiment'],
-                json.dumps(analysis['price_alert']) if analysis['price_alert'] else None,
-                analysis['importance_score'],
-                datetime.now().isoformat()
-            ))
+            logger.info(f"🚨 Price alert stored: {analysis['crypto_mentioned']} {analysis['price_alert']['direction']} ${analysis['price_alert']['price']}")
             
-            conn.commit()
+            if len(self._pending_alerts) >= self.batch_size:
+                self.flush_news()
+
+    def flush_news(self) -> int:
+        """
+        Write queued news and price alerts in one transaction.
+        
+        Returns:
+            Number of rows written
+        """
+        news, alerts = self._pending_news, self._pending_alerts
+        if not news and not alerts:
+            return 0
+        self._pending_news, self._pending_alerts = [], []
+        
+        try:
+            conn = sqlite3.connect(self.db_path)
+            with conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO telegram_news 
+                    (message_id, channel, timestamp, content, crypto_mentioned, sentiment, price_alert, importance_score, processed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', news)
+                conn.executemany('''
+                    INSERT INTO price_alerts 
+                    (crypto, price, direction, timestamp, source_message, processed)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', alerts)
             conn.close()
+            return len(news) + len(alerts)
             
         except Exception as e:
             logger.error(f"Error storing telegram news: {e}")
-
-    def check_price_alerts(self, text: str, analysis: dict, timestamp: str):
-        """Check for price alerts and store them"""
-        if analysis['price_alert'] and analysis['crypto_mentioned']:
-            try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                for crypto in analysis['crypto_mentioned']:
-                    cursor.execute('''
-                        INSERT INTO price_alerts 
-                        (crypto, price, direction, timestamp, source_message, processed)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        crypto,
-                        analysis['price_alert']['price'],
-                        analysis['price_alert']['direction'],
-                        timestamp,
-                        text[:200],  # First 200 chars
-                        False
-                    ))
-                
-                conn.commit()
-                conn.close()
-                
-                logger.info(f"🚨 Price alert stored: {analysis['crypto_mentioned']} {analysis['price_alert']['direction']} ${analysis['price_alert']['price']}")
-                
-            except Exception as e:
-                logger.error(f"Error storing price alert: {e}")
+            return 0
 
     def get_recent_news(self, hours: int = 1) -> List[dict]:
         """Get recent news from the last N hours"""
+        self.flush_news()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -404,6 +530,7 @@ class WatcherGuruTelegramBot:
 
     def get_price_alerts(self, processed: bool = False) -> List[dict]:
         """Get price alerts"""
+        self.flush_news()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -439,10 +566,17 @@ class WatcherGuruTelegramBot:
             logger.error(f"Error marking alert processed: {e}")
 
     def stop_monitoring(self):
-        """Stop the monitoring loop"""
+        """Stop the monitoring loop (after the poll in flight returns)"""
         self.running = False
         logger.info("🛑 Stopping WatcherGuru Telegram monitoring")
 
+    async def close(self):
+        """Write queued news and close the polling session"""
+        self.flush_news()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
 # Example usage and testing
 def test_telegram_bot():
     """Test the telegram bot functionality"""
@@ -0,0 +1,139 @@
+"""
+Unit tests for dashboard.analysis_cache.
+Tests candle-close keys, LRU eviction and payload diffs.
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+try:
+    from dashboard.analysis_cache import (
+        AnalysisCache, AnalysisEntry, timeframe_delta, last_closed_candle, candle_close_due, payload_diff
+    )
+except ImportError as e:
+    pytest.skip(f"Skipping analysis_cache tests due to import error: {e}", allow_module_level=True)
+
+
+def make_candles(start, n, freq='5min'):
+    index = pd.date_range(start, periods=n, freq=freq)
+    return pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0}, index=index)
+
+
+def make_entry(symbol, timeframe, candle_ts, **payload):
+    return AnalysisEntry(symbol, timeframe, pd.Timestamp(candle_ts), dict(payload), make_candles(candle_ts, 1))
+
+
+class TestCandleClose:
+    """Closed-candle detection"""
+
+    def test_timeframe_delta(self):
+        """Test exchange timeframe strings"""
+        assert timeframe_delta('1m') == pd.Timedelta(minutes=1)
+        assert timeframe_delta('4h') == pd.Timedelta(hours=4)
+        assert timeframe_delta('1d') == pd.Timedelta(days=1)
+        assert timeframe_delta('15min') == pd.Timedelta(minutes=15)
+
+    def test_forming_candle_is_not_closed(self):
+        """Test the last row only counts once its period has ended"""
+        df = make_candles('2024-01-01 00:00', 3)
+
+        assert last_closed_candle(df, '5m', now=pd.Timestamp('2024-01-01 00:14')) == df.index[1]
+        assert last_closed_candle(df, '5m', now=pd.Timestamp('2024-01-01 00:15')) == df.index[2]
+        assert last_closed_candle(df, '5m', now=pd.Timestamp('2024-01-01 00:04')) is None
+
+    def test_close_due(self):
+        """Test a refresh is due only once the following candle has closed"""
+        candle_ts = pd.Timestamp('2024-01-01 00:00')
+
+        assert not candle_close_due(candle_ts, '1h', now=pd.Timestamp('2024-01-01 01:59'))
+        assert candle_close_due(candle_ts, '1h', now=pd.Timestamp('2024-01-01 02:00'))
+
+
+class TestAnalysisCache:
+    """Keyed LRU cache"""
+
+    def test_latest_entry_per_pair(self):
+        """Test lookups default to the newest candle and put returns the entry it supersedes"""
+        cache = AnalysisCache()
+        first = make_entry('BTC/USDT', '5m', '2024-01-01 00:00', current_price=1.0)
+        second = make_entry('BTC/USDT', '5m', '2024-01-01 00:05', current_price=2.0)
+
+        assert cache.put(first) is None
+        assert cache.put(second) is first
+        assert cache.get('BTC/USDT', '5m') is second
+        assert cache.get('BTC/USDT', '5m', pd.Timestamp('2024-01-01 00:00')) is first
+        assert cache.get('BTC/USDT', '1h') is None
+
+        # A late result for an older candle does not replace the newest
+        assert cache.put(make_entry('BTC/USDT', '5m', '2023-12-31 23:55')) is second
+        assert cache.get('BTC/USDT', '5m') is second
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry goes first, and with it the pair's latest pointer"""
+        cache = AnalysisCache(max_entries=2)
+        btc = make_entry('BTC/USDT', '5m', '2024-01-01')
+        eth = make_entry('ETH/USDT', '5m', '2024-01-01')
+        cache.put(btc)
+        cache.put(eth)
+        cache.get('BTC/USDT', '5m')
+
+        cache.put(make_entry('ADA/USDT', '5m', '2024-01-01'))
+
+        assert len(cache) == 2
+        assert eth.key not in cache
+        assert cache.get('ETH/USDT', '5m') is None
+        assert cache.get('BTC/USDT', '5m') is btc
+
+    def test_stats_and_clear(self):
+        """Test hit counting and clearing"""
+        cache = AnalysisCache()
+        cache.put(make_entry('BTC/USDT', '5m', '2024-01-01'))
+        cache.get('BTC/USDT', '5m')
+        cache.get('ETH/USDT', '5m')
+
+        assert cache.get_stats()['hit_rate'] == 0.5
+        cache.clear()
+        assert len(cache) == 0 and cache.get('BTC/USDT', '5m') is None
+
+    def test_refresh_lock_per_pair(self):
+        """Test one lock per symbol/timeframe, kept across clear(), serializing refreshes"""
+        cache = AnalysisCache()
+        lock = cache.refresh_lock('BTC/USDT', '5m')
+        assert cache.refresh_lock('BTC/USDT', '5m') is lock
+        assert cache.refresh_lock('BTC/USDT', '1h') is not lock
+        cache.clear()
+        assert cache.refresh_lock('BTC/USDT', '5m') is lock
+
+        refreshes = []
+
+        def refresh():
+            with cache.refresh_lock('ETH/USDT', '5m'):
+                if cache.get('ETH/USDT', '5m') is None:
+                    refreshes.append(threading.get_ident())
+                    time.sleep(0.01)
+                    cache.put(make_entry('ETH/USDT', '5m', '2024-01-01'))
+
+        threads = [threading.Thread(target=refresh) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(refreshes) == 1
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            AnalysisCache(max_entries=0)
+
+
+class TestPayloadDiff:
+    """Field-level payload diffs"""
+
+    def test_changed_added_and_removed_fields(self):
+        old = {'current_price': 1.0, 'order_blocks': [{'id': 'a'}], 'statistics': {}}
+        new = {'current_price': 1.5, 'order_blocks': [{'id': 'a'}], 'fibonacci_zones': []}
+
+        assert payload_diff(old, new) == {'current_price': 1.5, 'fibonacci_zones': [], 'statistics': None}
+        assert payload_diff(new, dict(new)) == {}
@@ -0,0 +1,93 @@
+"""
+Unit tests for backtesting.backtest_runner.
+Tests process-pool execution of symbol/window tasks against in-process runs.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    import backtesting.backtest_runner as backtest_runner
+    from backtesting.backtest_runner import BacktestRunner
+except ImportError as e:
+    pytest.skip(f"Skipping backtest runner tests due to import error: {e}", allow_module_level=True)
+
+
+class FakeDataLoader:
+    """Serves a deterministic 1H random walk per symbol and counts downloads"""
+
+    def __init__(self, config_path=None):
+        self.downloads = []
+
+    def download_ohlcv(self, symbol, timeframe, start_date, end_date, use_cache=True):
+        self.downloads.append((symbol, start_date, end_date))
+        index = pd.date_range(start_date, end_date, freq="1h")
+        rng = np.random.default_rng(sum(map(ord, symbol)))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(index))))
+        spread = close * rng.uniform(0.002, 0.03, len(index))
+        return pd.DataFrame({
+            'open': close, 'high': close + spread, 'low': close - spread,
+            'close': close, 'volume': rng.lognormal(3, 0.5, len(index))
+        }, index=index)
+
+    def validate_data_quality(self, df, symbol):
+        return {'symbol': symbol, 'total_records': len(df), 'status': 'GOOD'}
+
+
+@pytest.fixture
+def make_runner(monkeypatch, tmp_path):
+    monkeypatch.setattr(backtest_runner, 'DataLoader', FakeDataLoader)
+
+    def make(max_workers):
+        runner = BacktestRunner(max_workers=max_workers, random_seed=2024)
+        runner.results_directory = str(tmp_path)
+        return runner
+
+    return make
+
+
+def _window_summaries(results):
+    return {
+        symbol: [(w['start_date'], w['end_date'], w['results']['signals']['total_signals'],
+                  w['results']['summary']['total_trades']) for w in result['window_results']]
+        for symbol, result in results.items()
+    }
+
+
+class TestBacktestRunnerExecution:
+    """Parallel walk-forward and multi-symbol execution"""
+
+    def test_walk_forward_loads_each_symbol_once(self, make_runner):
+        """Test that windows are sliced from one download per symbol"""
+        runner = make_runner(max_workers=1)
+        results = runner.run_multi_symbol_walk_forward(
+            ['BTC/USDT', 'ETH/USDT'], '1h', '2024-01-01', '2024-04-01', window_months=1, step_months=1
+        )
+
+        assert len(runner.data_loader.downloads) == 2
+        assert [w['start_date'] for w in results['BTC/USDT']['window_results']] == \
+            ['2024-01-01', '2024-02-01', '2024-03-01']
+        execution = results['ETH/USDT']['execution']
+        assert execution['backend'] == 'in_process'
+        assert len(execution['tasks']) == 3
+        assert all(t['elapsed_seconds'] >= 0 for t in execution['tasks'])
+
+    def test_process_pool_matches_sequential(self, make_runner):
+        """Test that pooled execution reproduces the in-process results"""
+        args = (['BTC/USDT', 'SOL/USDT'], '1h', '2024-01-01', '2024-03-01')
+        sequential = make_runner(max_workers=1).run_multi_symbol_walk_forward(*args, window_months=1)
+        parallel = make_runner(max_workers=2).run_multi_symbol_walk_forward(*args, window_months=1)
+
+        assert _window_summaries(parallel) == _window_summaries(sequential)
+        assert parallel['BTC/USDT']['execution']['backend'] == 'process_pool'
+        assert parallel['BTC/USDT']['analysis_info']['random_seed'] == 2024
+
+    def test_multi_symbol_results_keep_symbol_order(self, make_runner):
+        """Test that completion-order streaming still returns results per symbol"""
+        runner = make_runner(max_workers=2)
+        symbols = ['ETH/USDT', 'BTC/USDT', 'SOL/USDT']
+        results = runner.run_multi_symbol_backtest(symbols, '1h', '2024-01-01', '2024-02-15')
+
+        assert list(results) == symbols
+        assert all(results[s]['backtest_info']['symbol'] == s for s in symbols)
@@ -0,0 +1,159 @@
+"""
+Unit tests for bybit_integration.client_pool.
+Tests client sharing, per-loop pooled sessions and connection-reuse counters.
+"""
+
+import asyncio
+import gc
+import warnings
+
+import pytest
+
+try:
+    from aiohttp import web
+    from bybit_integration.client_pool import BybitClientRegistry
+    from scripts.benchmarks.notification_sinks import FakeHTTPSink
+except ImportError as e:
+    pytest.skip(f"Skipping client_pool tests due to import error: {e}", allow_module_level=True)
+
+
+async def _ticker_handler(request):
+    return web.json_response({'retCode': 0, 'result': {'list': [{'lastPrice': '100.0'}]}})
+
+
+class TestBybitClientRegistry:
+    """Test suite for the pooled Bybit client registry"""
+
+    def test_same_credentials_share_client(self):
+        """Test that one client is reused per credential set"""
+        registry = BybitClientRegistry()
+
+        first = registry.get_client('key', 'secret', testnet=True)
+        second = registry.get_client('key', 'secret', testnet=True)
+        other = registry.get_client('other_key', 'secret', testnet=True)
+
+        assert first is second
+        assert first is not other
+        assert registry.get_stats()['clients'] == 2
+
+    def test_session_is_per_event_loop(self):
+        """Test that each event loop gets its own pooled session"""
+        registry = BybitClientRegistry()
+
+        async def grab_twice():
+            session = registry.get_session()
+            assert registry.get_session() is session
+            await registry.close_loop_sessions()
+            return session
+
+        first = asyncio.run(grab_twice())
+        second = asyncio.run(grab_twice())
+
+        assert first is not second
+        assert first.closed and second.closed
+        assert registry.stats.sessions_created == 2
+
+    def test_connections_are_reused(self):
+        """Test that sequential requests reuse pooled keep-alive connections"""
+        registry = BybitClientRegistry()
+
+        async def run():
+            app = web.Application()
+            app.router.add_get('/v5/market/tickers', _ticker_handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            client = registry.get_client('key', 'secret', testnet=True)
+            client.base_url = f"http://127.0.0.1:{port}"
+            client.rate_limit_delay = 0
+
+            for _ in range(5):
+                ticker = await client.get_ticker('BTCUSDT')
+                assert ticker['lastPrice'] == '100.0'
+
+            # The borrowed session is used per request, never stored on the shared client
+            assert client.session is None
+            # Closing a borrowed client must not close the shared session, only its own
+            client._get_sync_session()
+            await client.close()
+            assert client.sync_session is None
+            assert not registry.get_session().closed
+
+            await registry.aclose()
+            await runner.cleanup()
+
+        asyncio.run(run())
+
+        stats = registry.get_stats()
+        assert stats['requests_started'] == 5
+        assert stats['connections_created'] == 1
+        assert stats['connections_reused'] == 4
+        assert stats['reuse_ratio'] == pytest.approx(0.8)
+        assert stats['open_sessions'] == 0
+
+    def test_per_call_asyncio_run_closes_session(self):
+        """Test that a session is closed with its loop when asyncio.run returns"""
+        registry = BybitClientRegistry()
+
+        async def post(url):
+            session = registry.get_session()
+            async with session.post(f'{url}/ping', json={}) as response:
+                assert response.status == 200
+            return session
+
+        with FakeHTTPSink() as sink, warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            first = asyncio.run(post(sink.url))
+            assert first.closed
+            second = asyncio.run(post(sink.url))
+            del first, second
+            gc.collect()
+
+        assert registry.stats.sessions_created == 2
+        assert registry.get_stats()['open_sessions'] == 0
+        assert not [w for w in caught if 'Unclosed' in str(w.message)]
+
+    def test_session_of_closed_loop_is_released(self):
+        """Test that a session left open by a manually closed loop frees its sockets"""
+        registry = BybitClientRegistry()
+
+        async def post(url):
+            session = registry.get_session()
+            async with session.post(f'{url}/ping', json={}) as response:
+                assert response.status == 200
+            return session
+
+        with FakeHTTPSink() as sink, warnings.catch_warnings():
+            warnings.simplefilter('ignore', ResourceWarning)
+            loop = asyncio.new_event_loop()
+            first = loop.run_until_complete(post(sink.url))
+            (proto, _), = next(iter(first.connector._conns.values()))
+            sock = proto.transport.get_extra_info('socket')
+            del proto
+            loop.close()
+            assert not first.closed
+
+            second = asyncio.run(post(sink.url))
+            gc.collect()
+
+        assert second is not first
+        assert first.closed
+        assert sock.fileno() == -1
+
+    def test_close_loop_sessions_cancels_shutdown_task(self):
+        """Test that closing a loop's session also retires its shutdown waiter"""
+        registry = BybitClientRegistry()
+
+        async def run():
+            session = registry.get_session()
+            task = registry._shutdown_tasks[id(asyncio.get_running_loop())]
+            await registry.close_loop_sessions()
+            await asyncio.sleep(0)
+            return session, task
+
+        session, task = asyncio.run(run())
+        assert session.closed and task.cancelled()
+        assert not registry._shutdown_tasks
@@ -0,0 +1,154 @@
+"""
+Unit tests for utils.correlation_matrix.
+Tests the incremental correlation engine against DataFrame.corr(), the
+quadratic-form portfolio heat and the CorrelationAnalyzer API on top of it.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from utils.correlation_matrix import CorrelationAnalyzer, OnlineCorrelationEngine
+except ImportError as e:
+    pytest.skip(f"Skipping correlation_matrix tests due to import error: {e}", allow_module_level=True)
+
+
+def correlated_returns(bars, symbols, seed=0, missing=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, bars)
+    returns = pd.DataFrame({symbol: market * rng.uniform(0, 1.5) + rng.normal(0, 0.01, bars)
+                            for symbol in symbols})
+    for _ in range(missing):
+        returns.iat[rng.integers(bars), rng.integers(len(symbols))] = np.nan
+    return returns
+
+
+def feed(engine, returns):
+    for _, row in returns.iterrows():
+        engine.update_returns(row.dropna().to_dict())
+
+
+def pairwise_heat(engine, symbols, risks):
+    return sum(risks[i] * risks[j] * engine.correlation(symbols[i], symbols[j])
+               for i in range(len(symbols)) for j in range(i + 1, len(symbols)))
+
+
+class TestOnlineCorrelationEngine:
+    """Running-sum and EWMA correlations"""
+
+    def test_window_matches_dataframe_corr(self):
+        """Test the rolling window equals pandas after wrap-around, rebuilds and missing bars"""
+        symbols = [f'S{i}' for i in range(5)]
+        returns = correlated_returns(250, symbols, missing=30)
+        engine = OnlineCorrelationEngine(window=60)
+        feed(engine, returns)
+
+        expected = returns.iloc[-60:].corr().to_numpy()
+        np.testing.assert_allclose(engine.correlation_matrix(symbols), expected, atol=1e-12)
+
+    def test_grows_past_initial_capacity(self):
+        symbols = [f'S{i}' for i in range(20)]
+        returns = correlated_returns(80, symbols, seed=1)
+        engine = OnlineCorrelationEngine(window=100)
+        feed(engine, returns[symbols[:3]].iloc[:40])
+        feed(engine, returns.iloc[40:])
+
+        seen = returns.copy()
+        seen.iloc[:40, 3:] = np.nan
+        frame = engine.correlation_frame()
+        assert list(frame.columns) == symbols
+        np.testing.assert_allclose(frame.to_numpy(), seen.corr().to_numpy(), atol=1e-12)
+
+    def test_update_prices_uses_returns_between_bars(self):
+        prices = 100 * (1 + correlated_returns(40, ['BTC', 'ETH'], seed=2)).cumprod()
+        engine = OnlineCorrelationEngine(window=100)
+        for _, row in prices.iterrows():
+            engine.update_prices(row.to_dict())
+        engine.update_prices({'BTC': 0.0, 'ETH': float('nan')})  # Invalid prices are skipped
+
+        expected = prices.pct_change().corr().loc['BTC', 'ETH']
+        assert engine.correlation('BTC', 'ETH') == pytest.approx(expected)
+
+    def test_ewma_tracks_regime_change_faster(self):
+        rng = np.random.default_rng(3)
+        x = rng.normal(0, 0.01, 400)
+        engine = OnlineCorrelationEngine(window=400, halflife=10)
+        feed(engine, pd.DataFrame({'A': x, 'B': np.where(np.arange(400) < 300, x, -x)}))
+
+        assert engine.correlation('A', 'B', method='ewma') < -0.9
+        assert engine.correlation('A', 'B') > 0
+        with pytest.raises(ValueError):
+            engine.correlation('A', 'B', method='pearson')
+
+    def test_undefined_and_unknown_pairs_are_zero(self):
+        engine = OnlineCorrelationEngine(window=10)
+        engine.update_returns({'A': 0.01, 'B': 0.02})
+        assert engine.correlation('A', 'B') == 0.0  # One shared bar
+        assert engine.correlation('A', 'ZZZ') == 0.0
+        assert engine.correlation_matrix(['ZZZ', 'ZZZ']).tolist() == [[1.0, 0.0], [0.0, 1.0]]
+
+    def test_heat_quadratic_form_matches_pairwise_sum(self):
+        symbols = [f'S{i}' for i in range(6)]
+        engine = OnlineCorrelationEngine(window=50)
+        feed(engine, correlated_returns(60, symbols, seed=4))
+
+        positions = ['S0', 'S3', 'S3', 'UNKNOWN', 'S5']
+        risks = [0.01, 0.02, 0.015, 0.01, 0.005]
+        assert engine.portfolio_heat(positions, risks) == pytest.approx(pairwise_heat(engine, positions, risks))
+        assert engine.portfolio_heat(['S0'], [0.01]) == 0.0
+
+
+class TestCorrelationAnalyzer:
+    """Analyzer API on the incremental engine"""
+
+    @pytest.fixture
+    def analyzer(self):
+        analyzer = CorrelationAnalyzer(max_portfolio_heat=0.0002)
+        index = pd.date_range(end=pd.Timestamp.now().floor('h'), periods=200, freq='h')
+        prices = 100 * (1 + correlated_returns(200, ['BTC', 'ETH', 'SOL'], seed=5)).cumprod()
+        prices.index = index
+        for symbol in prices.columns:
+            analyzer.update_price_history(symbol, prices[symbol])
+        analyzer.prices = prices
+        return analyzer
+
+    def test_history_matches_former_full_recompute(self, analyzer):
+        expected = analyzer.prices.pct_change().dropna().corr()
+        result = analyzer.calculate_correlation_matrix()
+
+        pd.testing.assert_frame_equal(result, expected, atol=1e-12)
+        assert analyzer.get_correlation('BTC', 'ETH') == pytest.approx(expected.loc['BTC', 'ETH'])
+        assert analyzer.get_correlation_report()['high_correlations'] is not None
+
+    def test_every_candle_refreshes(self, analyzer):
+        before = analyzer.calculate_correlation_matrix()
+        last = analyzer.prices.iloc[-1]
+        analyzer.update_bar({'BTC': last['BTC'] * 1.05, 'ETH': last['ETH'] * 0.95, 'SOL': last['SOL']})
+
+        after = analyzer.calculate_correlation_matrix()
+        assert after.loc['BTC', 'ETH'] < before.loc['BTC', 'ETH']
+        assert analyzer.correlation_matrix['BTC']['ETH'] == after.loc['BTC', 'ETH']
+
+    def test_heat_breakdown_and_position_check(self, analyzer):
+        positions = [{'symbol': 'BTC', 'risk_amount': 0.01}, {'symbol': 'ETH', 'risk_amount': 0.01}]
+        heat, breakdown = analyzer.calculate_portfolio_heat(positions)
+
+        corr = analyzer.get_correlation('BTC', 'ETH')
+        assert heat == pytest.approx(0.0001 * corr)
+        assert breakdown['BTC/ETH']['heat_contribution'] == pytest.approx(heat)
+
+        allowed, _, projected = analyzer.check_new_position_allowed('SOL', 0.01, positions)
+        expected = pairwise_heat(analyzer.engine, ['BTC', 'ETH', 'SOL'], [0.01] * 3)
+        assert projected == pytest.approx(expected)
+        assert allowed == (expected <= analyzer.max_portfolio_heat)
+
+    def test_diversification_score(self, analyzer):
+        positions = [{'symbol': s} for s in ('BTC', 'ETH', 'SOL')]
+        pairs = [abs(analyzer.get_correlation(a, b)) for a, b in (('BTC', 'ETH'), ('BTC', 'SOL'), ('ETH', 'SOL'))]
+        assert analyzer.get_portfolio_diversification_score(positions) == pytest.approx(1 - np.mean(pairs))
+        assert analyzer.get_portfolio_diversification_score(positions[:1]) == 1.0
+
+    def test_needs_two_symbols(self):
+        assert CorrelationAnalyzer().calculate_correlation_matrix().empty
+        assert CorrelationAnalyzer().get_correlation('BTC', 'ETH') == 0.0
@@ -0,0 +1,146 @@
+"""
+Unit tests for backtesting.exit_simulator.
+Tests the vectorized first-touch search against a per-bar loop, same-bar
+SL/TP ordering and the SL/TP exits of ICTStrategyEngine.backtest_ict_signals.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from backtesting.exit_simulator import ExitSimulator, first_touch
+    from backtesting.strategy_engine import ICTStrategyEngine, ICTTradingSignal
+except ImportError as e:
+    pytest.skip(f"Skipping exit simulator tests due to import error: {e}", allow_module_level=True)
+
+
+def _bars(close, spread=0.004, start="2024-01-01", freq="1h"):
+    close = np.asarray(close, dtype=np.float64)
+    return pd.DataFrame({
+        'open': np.concatenate([[close[0]], close[:-1]]),
+        'high': close * (1 + spread),
+        'low': close * (1 - spread),
+        'close': close,
+        'volume': np.ones(len(close))
+    }, index=pd.date_range(start, periods=len(close), freq=freq))
+
+
+def _signal(timestamp, action, entry, stop, target, size=1.0, symbol='BTCUSDT'):
+    return ICTTradingSignal(
+        timestamp=timestamp, symbol=symbol, action=action, confidence=0.7, ict_confidence=0.7,
+        ml_boost=0.0, entry_price=entry, stop_loss=stop, take_profit=target, position_size=size,
+        risk_amount=abs(entry - stop) * size, risk_reward_ratio=3, market_regime='trending',
+        timeframe='1h', confluence_factors=[], confluence_score=0.5, session_multiplier=1.0,
+        directional_bias={}, dynamic_rr_calculation={}, indicators={}, reasoning=''
+    )
+
+
+class TestFirstTouch:
+    """Vectorized first-crossing search"""
+
+    def test_matches_per_bar_loop(self):
+        """Test long/short positions with short and very long holds against a plain loop"""
+        rng = np.random.default_rng(5)
+        n = 5000
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+        high, low = close * 1.002, close * 0.998
+
+        m = 300
+        start = rng.integers(0, n, m)
+        end = np.minimum(start + rng.integers(0, 3000, m), n - 1)
+        is_long = rng.random(m) < 0.5
+        width = rng.uniform(0.005, 0.2, m)
+        sign = np.where(is_long, 1, -1)
+        stop = close[start] * (1 - sign * width)
+        target = close[start] * (1 + sign * width * 2)
+
+        expected = np.full(m, -1)
+        for k in range(m):
+            for j in range(start[k], end[k] + 1):
+                if is_long[k] and (low[j] <= stop[k] or high[j] >= target[k]):
+                    expected[k] = j
+                    break
+                if not is_long[k] and (high[j] >= stop[k] or low[j] <= target[k]):
+                    expected[k] = j
+                    break
+
+        hits = first_touch(high, low, start, end, is_long, stop, target, initial_window=4)
+        assert (hits == expected).all()
+        assert (hits == -1).any() and (hits > start + 64).any()
+
+
+class TestExitSimulator:
+    """Exit prices, reasons and same-bar ordering"""
+
+    def test_gap_fill_time_limit_and_end(self):
+        """Test fills at the level, at the open on gaps, and the non-touch exits"""
+        ohlc = np.array([
+            [100, 100.5, 99.5, 100],
+            [100, 100.5, 99.5, 100],
+            [100, 100.5, 99.5, 100],
+            [100, 100.2, 95.5, 96],
+            [94, 101.0, 93.8, 100],   # Gaps down through 95
+            [100, 100.5, 99.5, 100],
+            [100, 100.5, 99.5, 100],
+            [100, 100.5, 99.5, 100],
+        ])
+        df = pd.DataFrame(ohlc, columns=['open', 'high', 'low', 'close'],
+                          index=pd.date_range("2024-01-01", periods=len(ohlc), freq="1h"))
+
+        exits = ExitSimulator(df, max_hold_bars=3).simulate(
+            entry_pos=[0, 0, 3, 5],
+            is_long=[True, False, True, True],
+            stop=[98.0, 101.0, 95.0, 90.0],
+            target=[110.0, 97.0, 120.0, 110.0]
+        )
+        assert list(exits.exit_reason) == ['STOP_LOSS', 'TAKE_PROFIT', 'STOP_LOSS', 'BACKTEST_END']
+        assert list(exits.exit_pos) == [3, 3, 4, 7]
+        assert list(exits.exit_price) == [98.0, 97.0, 94.0, 100.0]
+
+        limited = ExitSimulator(df, max_hold_bars=2).simulate([4], [True], [50.0], [200.0])
+        assert limited.exit_reason[0] == 'TIME_LIMIT'
+        assert limited.exit_pos[0] == 6 and limited.exit_price[0] == 100.0
+
+    def test_same_bar_touch_uses_lower_timeframe(self):
+        """Test that finer candles order a bar touching both stop and target"""
+        df = _bars([100, 100, 100], spread=0.05)  # Bar 1 spans 95..105
+        ltf_close = np.full(12, 100.0)
+        ltf_close[3], ltf_close[8] = 104.5, 95.5  # Target first, then stop
+        ltf = _bars(ltf_close, spread=0.002, start=df.index[1], freq="5min")
+
+        args = ([0], [True], [96.0], [104.0])
+        assert ExitSimulator(df).simulate(*args).exit_reason[0] == 'STOP_LOSS'
+
+        exits = ExitSimulator(df, lower_tf_data=ltf).simulate(*args)
+        assert exits.ambiguous[0]
+        assert exits.exit_reason[0] == 'TAKE_PROFIT' and exits.exit_price[0] == 104.0
+
+
+class TestBacktestExits:
+    """SL/TP exits in ICTStrategyEngine.backtest_ict_signals"""
+
+    def test_longs_shorts_and_concurrent_positions(self):
+        """Test that positions exit on their own levels and the position cap holds"""
+        engine = ICTStrategyEngine()
+        engine.ict_params['max_positions'] = 2
+        close = np.concatenate([np.linspace(100, 110, 20), np.linspace(110, 95, 30)])
+        df = _bars(close, spread=0.001)
+        t = df.index
+
+        signals = [
+            _signal(t[1], 'BUY', 100.5, 99.0, 104.0),     # Long: target on the way up
+            _signal(t[2], 'BUY', 101.0, 95.0, 130.0),     # Concurrent long: stopped on the way down
+            _signal(t[3], 'SELL', 101.5, 120.0, 90.0),    # Rejected: two positions already open
+            _signal(t[22], 'SELL', 109.0, 112.0, 100.0),  # Short after the first long closed
+        ]
+        results = engine.backtest_ict_signals(signals, df, starting_balance=1000)
+
+        trades = sorted(results['trades'], key=lambda trade: trade['entry_time'])
+        assert [(trade['side'], trade['exit_reason']) for trade in trades] == [
+            ('LONG', 'TAKE_PROFIT'), ('LONG', 'STOP_LOSS'), ('SHORT', 'TAKE_PROFIT')
+        ]
+        assert trades[0]['exit_price'] == 104.0
+        assert trades[2]['pnl'] == pytest.approx(trades[2]['entry_price'] - 100.0)
+        assert results['final_balance'] == pytest.approx(1000 + sum(trade['pnl'] for trade in trades))
+        assert results['exit_reasons'] == {'TAKE_PROFIT': 2, 'STOP_LOSS': 1}
@@ -0,0 +1,162 @@
+"""
+Unit tests for trading.fvg_detector.
+Tests that the array-based pattern scan matches the per-candle rule checks.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from trading.fvg_detector import FVGDetector, FVGType
+except ImportError as e:
+    pytest.skip(f"Skipping fvg_detector tests due to import error: {e}", allow_module_level=True)
+
+
+@pytest.fixture(scope="module")
+def df_5m():
+    """Gappy 5m random walk so both FVG directions and overlaps occur"""
+    rng = np.random.default_rng(11)
+    n = 1500
+    close = 2000 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    spread = close * rng.uniform(0.0005, 0.003, n)
+    volume = rng.lognormal(3, 0.7, n)
+    volume[::50] = np.nan  # Missing volume must not break the masks
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.002, n)),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': volume
+    }, index=pd.date_range("2024-01-01", periods=n, freq="5min"))
+
+
+def _reference_check(detector, fvg_type, candle1, candle2, candle3):
+    """Original scalar rule check for one candle triple"""
+    config = detector.config
+    if fvg_type == FVGType.BULLISH_FVG:
+        gap_high, gap_low, overlap_base = candle3['low'], candle1['high'], candle1['high']
+    else:
+        gap_high, gap_low, overlap_base = candle1['low'], candle3['high'], candle1['low']
+
+    # Rule 1: clear gap, or a minor overlap if allowed
+    if gap_low >= gap_high:
+        if not config['allow_minor_overlap'] or (gap_low - gap_high) / overlap_base > config['overlap_tolerance']:
+            return None
+
+    # Rule 2: gap size relative to price
+    gap_size = gap_high - gap_low
+    gap_percentage = gap_size / candle2['close']
+    if gap_percentage < config['min_gap_percentage'] / 100 or gap_percentage > config['max_gap_percentage'] / 100:
+        return None
+
+    # Rule 3: gap size relative to ATR (if available)
+    if 'atr' in candle2 and not pd.isna(candle2['atr']):
+        atr_ratio = gap_size / candle2['atr']
+        if atr_ratio < config['min_gap_atr_ratio'] or atr_ratio > config['max_gap_atr_ratio']:
+            return None
+
+    # Rule 4: volume confirmation
+    volume_ratio = candle2.get('volume_ratio', 1.0)
+    if config['require_volume_confirmation'] and volume_ratio < config['min_volume_ratio']:
+        return None
+
+    return {
+        'gap_high': gap_high,
+        'gap_low': gap_low,
+        'gap_size': gap_size,
+        'gap_percentage': gap_percentage,
+        'volume_ratio': volume_ratio,
+        'gap_efficiency': detector._calculate_gap_efficiency(candle1, candle2, candle3),
+        'institutional_signature': volume_ratio >= config['institutional_volume_ratio']
+    }
+
+
+def _reference_scan(detector, df, symbol, timeframe):
+    """Original per-candle loop over the scalar rule checks"""
+    zones = []
+    for i in range(1, len(df) - 1):
+        candle1, candle2, candle3 = df.iloc[i - 1], df.iloc[i], df.iloc[i + 1]
+        for fvg_type in (FVGType.BULLISH_FVG, FVGType.BEARISH_FVG):
+            gap_data = _reference_check(detector, fvg_type, candle1, candle2, candle3)
+            if gap_data:
+                zones.append(detector._create_fvg_zone(candle1, candle2, candle3, fvg_type,
+                                                       gap_data, symbol, timeframe))
+    return zones
+
+
+def _zone_key(zone):
+    values = (zone.gap_high, zone.gap_low, zone.gap_percentage,
+              zone.fvg_candles.gap_volume_ratio, zone.optimal_entry)
+    return (zone.creation_time, zone.fvg_type) + tuple(None if pd.isna(v) else v for v in values)
+
+
+class TestFVGPatternScan:
+    """Parity between the vectorized scan and the scalar rule checks"""
+
+    @pytest.mark.parametrize("overrides", [
+        {},
+        {'require_volume_confirmation': False, 'min_gap_atr_ratio': 0.0},
+        {'allow_minor_overlap': False, 'min_gap_percentage': 0.0, 'min_gap_atr_ratio': -1.0},
+    ])
+    def test_scan_matches_per_candle_checks(self, df_5m, overrides):
+        """Test that every config variant yields the same zones in the same order"""
+        detector = FVGDetector(overrides)
+        data = detector._prepare_data(df_5m)
+
+        zones = detector._scan_for_fvg_patterns(data, 'ETHUSDT', '5T')
+        reference = _reference_scan(detector, data, 'ETHUSDT', '5T')
+
+        assert len(zones) > 0
+        assert [_zone_key(z) for z in zones] == [_zone_key(z) for z in reference]
+
+    def test_scan_handles_short_frames(self):
+        """Test that frames without a full candle triple return no zones"""
+        detector = FVGDetector()
+        df = pd.DataFrame({'open': [1.0, 2.0], 'high': [1.5, 2.5], 'low': [0.5, 1.5],
+                           'close': [1.2, 2.2], 'volume': [10.0, 12.0]},
+                          index=pd.date_range("2024-01-01", periods=2, freq="5min"))
+        assert detector._scan_for_fvg_patterns(detector._prepare_data(df), 'BTCUSDT', '5T') == []
+
+
+class TestFVGStreaming:
+    """Incremental update() against a full rescan"""
+
+    def test_streamed_zones_match_full_scan(self, df_5m):
+        """Test candle-by-candle updates create the same FVGs as scanning the whole history"""
+        detector = FVGDetector()
+        end = pd.Timestamp.now().floor('5min')
+        df = df_5m.set_axis(pd.date_range(end=end, periods=len(df_5m), freq="5min"))
+
+        for _, candle in df.iterrows():
+            detector.update(candle, 'ETHUSDT', '5T')
+
+        data = detector._prepare_data(df)
+        expected = detector._validate_fvg_patterns(detector._scan_for_fvg_patterns(data, 'ETHUSDT', '5T'), data)
+        streamed = detector.zone_stores['ETHUSDT_5T'].zones
+
+        def key(zone):
+            return (zone.creation_time, zone.gap_high, zone.gap_low)
+
+        assert len(expected) > 0
+        assert sorted(map(key, streamed)) == sorted(map(key, expected))
+
+    def test_fill_state_persists_across_candles(self, df_5m):
+        """Test a filled FVG stays filled when price moves back out of the gap"""
+        detector = FVGDetector()
+        end = pd.Timestamp.now().floor('5min')
+        df = df_5m.set_axis(pd.date_range(end=end, periods=len(df_5m), freq="5min"))
+        detector.detect_fair_value_gaps(df.iloc[:-2], 'ETHUSDT', '5T')
+        store = detector.zone_stores['ETHUSDT_5T']
+        fvg = next(z for z in store.zones if z.fvg_type == FVGType.BULLISH_FVG)
+
+        step = pd.Timedelta(minutes=5)
+        below = fvg.gap_low * 0.999
+        detector.update({'timestamp': df.index[-2], 'open': below, 'high': below, 'low': below,
+                         'close': below, 'volume': 1.0}, 'ETHUSDT', '5T')
+        above = fvg.gap_high * 1.001
+        detector.update({'timestamp': df.index[-2] + step, 'open': above, 'high': above, 'low': above,
+                         'close': above, 'volume': 1.0}, 'ETHUSDT', '5T')
+
+        assert fvg.fill_percentage == 100.0
+        assert fvg.state.value in ('FILLED', 'BREAKER')
@@ -0,0 +1,149 @@
+"""
+Unit tests for core.engines.ict_ml_trainer.
+Tests the columnar feature matrix, batched inference and memoized model loading.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+try:
+    from core.engines.ict_ml_trainer import (
+        ICTMLTrainer, FEATURE_COLUMNS, FEATURE_SCHEMA_VERSION, NEUTRAL_PREDICTION, ML_AVAILABLE, joblib
+    )
+except ImportError as e:
+    pytest.skip(f"Skipping ict_ml_trainer tests due to import error: {e}", allow_module_level=True)
+
+
+def column(X, name):
+    return X[:, FEATURE_COLUMNS.index(name)]
+
+
+def journal(count=80, seed=3):
+    rng = np.random.default_rng(seed)
+    trades = []
+    for i in range(count):
+        entry = float(rng.uniform(90, 110))
+        trades.append({
+            'crypto': ['BTC', 'ETH', 'SOL', 'XRP'][i % 4], 'action': ['BUY', 'SELL'][i % 2],
+            'timeframe': ['5m', '1h'][i % 2], 'confidence': float(rng.uniform(0.5, 0.95)),
+            'entry_price': entry, 'stop_loss': entry * 0.98, 'take_profit': entry * 1.04,
+            'entry_time': f'2025-09-{1 + i % 28:02d}T{i % 24:02d}:00:00', 'pnl': float(rng.normal(20, 100))
+        })
+    return trades
+
+
+@pytest.fixture
+def trainer(tmp_path):
+    return ICTMLTrainer(models_dir=str(tmp_path))
+
+
+@pytest.fixture
+def trained(trainer):
+    if not ML_AVAILABLE:
+        pytest.skip("scikit-learn not available")
+    trainer.train_models(*trainer.prepare_training_data(journal()))
+    trainer.save_models()
+    return trainer
+
+
+class TestFeatureMatrix:
+    """Columnar feature builder"""
+
+    def test_schema_and_encodings(self, trainer):
+        signals = [
+            {'crypto': 'ETH', 'action': 'SELL', 'timeframe': '4h', 'entry_price': 100.0,
+             'stop_loss': 102.0, 'take_profit': 94.0, 'timestamp': '2025-09-30T14:00:00Z'},
+            {'crypto': 'DOGE', 'timeframe': '3m'}
+        ]
+        X = trainer.build_feature_matrix(signals)
+
+        assert X.dtype == np.float32 and X.shape == (2, len(FEATURE_COLUMNS))
+        assert column(X, 'crypto_eth').tolist() == [1, 0]
+        assert X[1, FEATURE_COLUMNS.index('crypto_btc'):FEATURE_COLUMNS.index('tf_1m')].sum() == 0
+        assert column(X, 'tf_4h').tolist() == [1, 0]
+        assert column(X, 'action_sell').tolist() == [1, 0]
+        assert column(X, 'risk_reward_ratio').tolist() == [3.0, 0.0]
+        assert column(X, 'risk_amount').tolist() == [100.0, 100.0]
+        # 14:00 Tuesday: market hours, London and New York
+        assert [column(X, name)[0] for name in ('hour', 'day_of_week', 'session_asia', 'session_london',
+                                                'session_ny', 'is_market_hours')] == [14, 1, 0, 1, 1, 1]
+
+    def test_time_features_without_or_with_bad_timestamp(self, trainer):
+        X = trainer.build_feature_matrix([{}, {'timestamp': 'not a date'}])
+        time_columns = ['hour', 'day_of_week', 'is_market_hours', 'session_asia', 'session_london', 'session_ny']
+        assert [column(X, name)[0] for name in time_columns] == [0] * 6
+        assert [column(X, name)[1] for name in time_columns] == [12, 1, 1, 0, 1, 0]
+
+    def test_market_features(self, trainer):
+        market = {'BTC': {'price': 105.0, 'high_24h': 110.0, 'low_24h': 100.0, 'volume': 5.0}}
+        X = trainer.build_feature_matrix([{'crypto': 'BTC', 'entry_price': 104.0},
+                                          {'crypto': 'ETH', 'entry_price': 50.0}], market)
+
+        assert column(X, 'price_position').tolist() == [0.5, 0.5]
+        assert column(X, 'price').tolist() == [105.0, 50.0]
+        assert column(X, 'high_24h').tolist() == [110.0, 50.0]
+        assert column(X, 'volume').tolist() == [5.0, 0.0]
+
+    def test_single_signal_dict_and_empty_batch(self, trainer):
+        assert list(trainer.extract_features_from_signal({'crypto': 'SOL'})) == list(FEATURE_COLUMNS)
+        assert trainer.build_feature_matrix([]).shape == (0, len(FEATURE_COLUMNS))
+
+    def test_training_data_uses_schema(self, trainer):
+        features_df, success, pnl = trainer.prepare_training_data(journal(10))
+        assert list(features_df.columns) == list(FEATURE_COLUMNS)
+        assert len(features_df) == len(success) == len(pnl) == 10
+
+
+class TestBatchedInference:
+    """predict_batch and memoized model loading"""
+
+    def test_batch_matches_single_predictions(self, trained):
+        signals = [{**trade, 'timestamp': trade.pop('entry_time')} for trade in journal(12, seed=9)]
+        batch = trained.predict_batch(signals)
+
+        assert len(batch) == 12
+        for signal, prediction in zip(signals, batch):
+            single = trained.predict_signal_enhancement(signal)
+            assert prediction == pytest.approx(single)
+            assert 0.5 <= prediction['confidence_multiplier'] <= 1.5
+            assert 0.0 <= prediction['ml_boost'] <= 0.15
+
+    def test_none_field_does_not_neutralize_batch(self, trained):
+        good = {**journal(1, seed=11)[0], 'timestamp': '2025-09-02T10:00:00'}
+        bad = dict(good, confidence=None, risk_amount=None)
+        batch = trained.predict_batch([good, bad])
+
+        assert batch[0] == pytest.approx(trained.predict_signal_enhancement(good))
+        assert batch[0] != NEUTRAL_PREDICTION
+        # Missing values count as 0, like the former fillna(0)
+        assert batch[1] == pytest.approx(trained.predict_signal_enhancement(dict(good, confidence=0.0, risk_amount=0.0)))
+        assert not np.isnan(trained.build_feature_matrix([bad])).any()
+
+    def test_untrained_predictions_are_neutral(self, trainer):
+        assert trainer.predict_batch([{}, {}]) == [NEUTRAL_PREDICTION, NEUTRAL_PREDICTION]
+        assert trainer.predict_batch([]) == []
+
+    def test_models_are_loaded_once(self, trained, tmp_path):
+        first, second = ICTMLTrainer(models_dir=str(tmp_path)), ICTMLTrainer(models_dir=str(tmp_path))
+        assert first.load_models() and second.load_models()
+        assert first.signal_classifier is second.signal_classifier
+
+        # Rewriting the file invalidates the cached bundle
+        path = tmp_path / 'crypto_ml_model.pkl'
+        trained.save_models()
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+        third = ICTMLTrainer(models_dir=str(tmp_path))
+        assert third.load_models()
+        assert third.signal_classifier is not first.signal_classifier
+
+    def test_rejects_other_feature_schema(self, trained, tmp_path):
+        bundle = joblib.load(tmp_path / 'crypto_ml_model.pkl')
+        bundle['feature_schema_version'] = FEATURE_SCHEMA_VERSION + 1
+        joblib.dump(bundle, tmp_path / 'old.pkl')
+
+        fresh = ICTMLTrainer(models_dir=str(tmp_path))
+        assert not fresh.load_models(tmp_path / 'old.pkl')
+        assert not fresh.load_models(tmp_path / 'missing.pkl')
+        assert fresh.signal_classifier is None
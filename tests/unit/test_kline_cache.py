@@ -0,0 +1,132 @@
+"""
+Unit tests for bybit_integration.kline_cache.
+Tests ring-buffer upserts, zero-copy views and incremental REST refreshes.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from bybit_integration.kline_cache import KlineCache, KlineRingBuffer, INTERVAL_MS
+except ImportError as e:
+    pytest.skip(f"Skipping kline_cache tests due to import error: {e}", allow_module_level=True)
+
+
+HOUR_MS = INTERVAL_MS['60']
+
+
+def _ohlcv(n, base=100.0):
+    closes = base + np.arange(n, dtype=np.float64)
+    return np.column_stack([closes, closes + 1, closes - 1, closes, np.full(n, 10.0)])
+
+
+def _rest_klines(start_ms, n, base=100.0):
+    """Bybit REST format, newest first, values as strings"""
+    rows = []
+    for i in range(n):
+        price = base + i
+        rows.append([str(start_ms + i * HOUR_MS), str(price), str(price + 1),
+                     str(price - 1), str(price), "10", "1000"])
+    return rows[::-1]
+
+
+class FakeKlineClient:
+    """Records kline requests and serves candles up to the current hour"""
+
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+        self.calls = []
+
+    async def get_kline_data(self, symbol, interval="60", limit=200, start=None):
+        self.calls.append({'limit': limit, 'start': start})
+        last_open = self.now_ms - self.now_ms % HOUR_MS
+        first_open = start if start is not None else last_open - (limit - 1) * HOUR_MS
+        count = min(limit, (last_open - first_open) // HOUR_MS + 1)
+        return _rest_klines(first_open, count)
+
+
+class TestKlineRingBuffer:
+    """Test suite for the NumPy candle store"""
+
+    def test_upsert_appends_and_replaces_forming_candle(self):
+        """Test that newer candles append and the same open time replaces"""
+        buffer = KlineRingBuffer(capacity=10)
+        timestamps = np.arange(5) * HOUR_MS
+
+        assert buffer.upsert(timestamps, _ohlcv(5)) == 5
+        assert buffer.last_timestamp_ms == 4 * HOUR_MS
+
+        # Same last candle with a new close, plus one new candle, plus a stale one
+        update = np.array([2 * HOUR_MS, 4 * HOUR_MS, 5 * HOUR_MS])
+        assert buffer.upsert(update, _ohlcv(3, base=500.0)) == 1
+
+        df = buffer.view()
+        assert len(df) == 6
+        assert df['close'].iloc[-2] == 501.0
+        assert df['close'].iloc[-1] == 502.0
+        assert df['close'].iloc[2] == 102.0  # Stale update ignored
+
+    def test_capacity_and_compaction(self):
+        """Test that the store keeps only the newest candles across compactions"""
+        buffer = KlineRingBuffer(capacity=4)
+        for i in range(25):
+            buffer.upsert(np.array([i * HOUR_MS]), _ohlcv(1, base=float(i)))
+
+        df = buffer.view()
+        assert len(buffer) == 4
+        assert list(df['close']) == [21.0, 22.0, 23.0, 24.0]
+        assert df.index.is_monotonic_increasing
+
+    def test_view_is_zero_copy(self):
+        """Test that the DataFrame view shares memory with the buffer"""
+        buffer = KlineRingBuffer(capacity=10)
+        buffer.upsert(np.arange(8) * HOUR_MS, _ohlcv(8))
+
+        df = buffer.view(window=5)
+        assert len(df) == 5
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert np.shares_memory(df['close'].to_numpy(), buffer._ohlcv)
+
+
+class TestKlineCache:
+    """Test suite for seeded + incremental kline refreshes"""
+
+    def test_seed_then_incremental_fetch(self):
+        """Test that only the first refresh downloads the full window"""
+        now_ms = int(time.time() * 1000)
+        client = FakeKlineClient(now_ms)
+        cache = KlineCache(capacity=500)
+
+        df = asyncio.run(cache.refresh(client, 'BTCUSDT', interval='60', window=200))
+        assert len(df) == 200
+        assert client.calls[0] == {'limit': 200, 'start': None}
+
+        # One hour later: only the last stored candle and the new one are requested
+        client.now_ms += HOUR_MS
+        df = asyncio.run(cache.refresh(client, 'BTCUSDT', interval='60', window=200))
+        assert len(df) == 200
+        assert client.calls[1]['start'] == cache.get_buffer('BTCUSDT', '60').last_timestamp_ms - HOUR_MS
+        assert client.calls[1]['limit'] <= 3
+        assert cache.get_stats()['rest_seeds'] == 1
+        assert cache.get_stats()['rest_incremental'] == 1
+
+    def test_websocket_updates_skip_rest(self):
+        """Test that fresh websocket klines replace REST polling"""
+        now_ms = int(time.time() * 1000)
+        client = FakeKlineClient(now_ms)
+        cache = KlineCache(capacity=500)
+        asyncio.run(cache.refresh(client, 'ETHUSDT', interval='60', window=200))
+
+        last_ms = cache.get_buffer('ETHUSDT', '60').last_timestamp_ms
+        cache.apply_ws_klines('ETHUSDT', '60', [{
+            'start': last_ms + HOUR_MS, 'open': '1', 'high': '2', 'low': '0.5',
+            'close': '1.5', 'volume': '3', 'confirm': False
+        }])
+
+        df = asyncio.run(cache.refresh(client, 'ETHUSDT', interval='60', window=200))
+        assert len(client.calls) == 1
+        assert df['close'].iloc[-1] == 1.5
+        assert cache.get_stats()['rest_skipped'] == 1
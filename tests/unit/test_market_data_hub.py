@@ -0,0 +1,194 @@
+"""
+Unit tests for bybit_integration.market_data_hub.
+Tests snapshot/delta merging, the latest-ticker table, conflating fan-out
+and the kline feed into KlineCache.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+try:
+    import websockets
+    from bybit_integration.market_data_hub import MarketDataHub, Ticker, merge_ticker
+    from bybit_integration.kline_cache import KlineCache
+except ImportError as e:
+    pytest.skip(f"Skipping market_data_hub tests due to import error: {e}", allow_module_level=True)
+
+
+def ticker_message(symbol, kind='delta', ts=1, **fields):
+    return json.dumps({'topic': f'tickers.{symbol}', 'type': kind, 'ts': ts, 'data': {'symbol': symbol, **fields}})
+
+
+def kline(start_ms, close):
+    return {'start': start_ms, 'open': close, 'high': close, 'low': close, 'close': close,
+            'volume': 1.0, 'confirm': False}
+
+
+class TestMergeTicker:
+    """Snapshot/delta merging"""
+
+    def test_snapshot_then_delta(self):
+        """Test deltas only change the fields they carry"""
+        snapshot = merge_ticker(None, 'BTCUSDT', {'lastPrice': '65000', 'bid1Price': '64999.5',
+                                                  'price24hPcnt': '0.0125', 'volume24h': '1000'})
+        assert snapshot.price == 65000.0 and snapshot.change_24h == pytest.approx(1.25)
+
+        delta = merge_ticker(snapshot, 'BTCUSDT', {'bid1Price': '65001', 'lastPrice': ''}, exchange_ts=5)
+        assert delta.price == 65000.0
+        assert delta.bid == 65001.0
+        assert delta.volume_24h == 1000.0
+        assert delta.exchange_ts == 5
+        assert snapshot.bid == 64999.5  # Snapshots are immutable
+
+    def test_delta_without_baseline_is_dropped(self):
+        assert merge_ticker(None, 'BTCUSDT', {'bid1Price': '1'}) is None
+        assert merge_ticker(None, 'BTCUSDT', {'lastPrice': '0'}) is None
+
+    def test_price_dict_format(self):
+        ticker = Ticker('ETHUSDT', 3000.0, volume_24h=5.0, change_24h=-1.5, received_at=0.0)
+        assert set(ticker.to_price_dict()) == {'price', 'change_24h', 'volume', 'high_24h', 'low_24h', 'timestamp'}
+
+
+class TestLatestTickerTable:
+    """Latest-ticker table"""
+
+    def test_messages_update_table(self):
+        hub = MarketDataHub(['BTCUSDT', 'ETHUSDT'])
+        hub.handle_message(ticker_message('BTCUSDT', 'delta', bidPrice='1'))
+        assert hub.get_ticker('BTCUSDT') is None
+        assert hub.stats['deltas_skipped'] == 1
+
+        assert hub.handle_message(ticker_message('BTCUSDT', 'snapshot', lastPrice='65000')) == 1
+        hub.handle_message(ticker_message('BTCUSDT', lastPrice='65100'))
+        hub.handle_message(json.dumps({'op': 'pong', 'success': True}))
+
+        assert hub.get_ticker('BTCUSDT').price == 65100.0
+        assert list(hub.snapshot()) == ['BTCUSDT']
+
+    def test_snapshot_filters_stale(self):
+        hub = MarketDataHub(['BTCUSDT'])
+        hub.handle_message(ticker_message('BTCUSDT', 'snapshot', lastPrice='65000'))
+        hub._latest['BTCUSDT'] = Ticker('BTCUSDT', 65000.0, received_at=0.0)
+
+        assert hub.snapshot(max_age=10) == {}
+        assert 'BTCUSDT' in hub.snapshot()
+
+    def test_readers_never_see_partial_table(self):
+        """Test new symbols swap in a new table so a held snapshot never changes"""
+        hub = MarketDataHub(['BTCUSDT', 'ETHUSDT'])
+        hub.handle_message(ticker_message('BTCUSDT', 'snapshot', lastPrice='1'))
+        table = hub._latest
+        hub.handle_message(ticker_message('ETHUSDT', 'snapshot', lastPrice='2'))
+
+        assert list(table) == ['BTCUSDT']
+        assert set(hub.snapshot()) == {'BTCUSDT', 'ETHUSDT'}
+
+
+class TestFanOut:
+    """Conflating subscriber mailboxes"""
+
+    def test_slow_subscriber_gets_newest_only(self):
+        async def scenario():
+            hub = MarketDataHub(['BTCUSDT', 'ETHUSDT'])
+            fast = hub.subscribe()
+            btc_only = hub.subscribe(symbols=['BTCUSDT'])
+
+            hub.handle_message(ticker_message('BTCUSDT', 'snapshot', lastPrice='100'))
+            first = await fast.get(timeout=1)
+            for price in ('101', '102', '103'):
+                hub.handle_message(ticker_message('BTCUSDT', lastPrice=price))
+            hub.handle_message(ticker_message('ETHUSDT', 'snapshot', lastPrice='10'))
+
+            return first, await fast.get(timeout=1), await btc_only.get(timeout=1), fast, btc_only
+
+        first, latest, btc, fast, btc_only = asyncio.run(scenario())
+
+        assert first['BTCUSDT'].price == 100.0
+        assert latest['BTCUSDT'].price == 103.0 and latest['ETHUSDT'].price == 10.0
+        assert fast.dropped == 2
+        assert list(btc) == ['BTCUSDT'] and btc['BTCUSDT'].price == 103.0
+        assert btc_only.dropped == 3
+
+    def test_offer_from_another_thread(self):
+        """Test a hub on another thread wakes a consumer waiting on this loop"""
+        async def scenario():
+            hub = MarketDataHub(['BTCUSDT'])
+            subscription = hub.subscribe()
+            feeder = threading.Thread(
+                target=hub.handle_message, args=(ticker_message('BTCUSDT', 'snapshot', lastPrice='5'),))
+            feeder.start()
+            tickers = await subscription.get(timeout=2)
+            feeder.join()
+            return tickers
+
+        assert asyncio.run(scenario())['BTCUSDT'].price == 5.0
+
+    def test_get_times_out_and_unsubscribe(self):
+        async def scenario():
+            hub = MarketDataHub(['BTCUSDT'])
+            subscription = hub.subscribe()
+            empty = await subscription.get(timeout=0.01)
+            subscription.close()
+            hub.handle_message(ticker_message('BTCUSDT', 'snapshot', lastPrice='5'))
+            return empty, subscription.take(), hub.get_stats()['subscribers']
+
+        assert asyncio.run(scenario()) == ({}, {}, [])
+
+
+class TestKlineFeed:
+    """Kline topics into KlineCache"""
+
+    def test_klines_feed_seeded_cache(self):
+        cache = KlineCache(capacity=10)
+        hub = MarketDataHub(['BTCUSDT'], kline_cache=cache, kline_intervals=['60'])
+        assert hub.topics() == ['tickers.BTCUSDT', 'kline.60.BTCUSDT']
+
+        cache.apply_rest_klines('BTCUSDT', '60', [[3_600_000, 1, 1, 1, 1, 1, 1]])
+        hub.handle_message({'topic': 'kline.60.BTCUSDT', 'data': [kline(3_600_000, 2.0), kline(7_200_000, 3.0)]})
+
+        assert cache.get_buffer('BTCUSDT', '60').view()['close'].tolist() == [2.0, 3.0]
+        assert hub.stats['kline_updates'] == 1
+        assert cache._ws_is_fresh('BTCUSDT', '60')
+
+    def test_klines_ignored_without_cache(self):
+        hub = MarketDataHub(['BTCUSDT'], kline_intervals=['60'])
+        assert not hub.feeds_klines
+        assert hub.topics() == ['tickers.BTCUSDT']
+
+
+class TestConnection:
+    """Streaming loop against a local websocket server"""
+
+    def test_subscribes_streams_and_stops(self):
+        async def scenario():
+            received = []
+
+            async def exchange(websocket):
+                async for message in websocket:
+                    received.append(json.loads(message))
+                    if received[-1]['op'] == 'subscribe':
+                        await websocket.send(ticker_message('BTCUSDT', 'snapshot', lastPrice='65000'))
+
+            async with websockets.serve(exchange, '127.0.0.1', 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                hub = MarketDataHub([f'SYM{i}USDT' for i in range(11)], ws_url=f'ws://127.0.0.1:{port}',
+                                    ping_interval=0.05)
+                subscription = hub.subscribe()
+                task = asyncio.create_task(hub.run())
+
+                tickers = await subscription.get(timeout=2)
+                await asyncio.sleep(0.1)
+                hub.stop()
+                await asyncio.wait_for(task, timeout=2)
+                return tickers, received, hub
+
+        tickers, received, hub = asyncio.run(scenario())
+
+        assert tickers['BTCUSDT'].price == 65000.0
+        subscribes = [m['args'] for m in received if m['op'] == 'subscribe']
+        assert [len(args) for args in subscribes] == [10, 1]
+        assert any(m['op'] == 'ping' for m in received)
+        assert not hub.connected and hub.stats['connects'] == 1
@@ -0,0 +1,236 @@
+"""
+Unit tests for utils.notification_dispatcher.
+Tests coalescing, bounded queues, rate limiting, metrics and the
+Discord/Telegram/SMTP channels against local fake endpoints.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+try:
+    from utils.notification_dispatcher import (
+        DiscordChannel, Notification, NotificationChannel, NotificationDispatcher, RateLimiter,
+        SMTPChannel, TelegramChannel, coalesce, truncate
+    )
+    from utils.notifications import NotificationManager
+    from scripts.benchmarks.notification_sinks import FakeHTTPSink, FakeSMTPServer
+except ImportError as e:
+    pytest.skip(f"Skipping notification_dispatcher tests due to import error: {e}", allow_module_level=True)
+
+
+class RecordingChannel(NotificationChannel):
+    """Channel that keeps what it sends, optionally blocking or failing"""
+
+    def __init__(self, name='recording', gate=None, fail=False, **kwargs):
+        kwargs.setdefault('rate', 1000)
+        super().__init__(name=name, **kwargs)
+        self.sent = []
+        self.gate = gate
+        self.fail = fail
+
+    async def send(self, notification):
+        if self.gate is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.gate.wait)
+        if self.fail:
+            raise RuntimeError("endpoint down")
+        self.sent.append(notification)
+
+
+@pytest.fixture
+def make_dispatcher():
+    dispatchers = []
+
+    def make(*channels, **kwargs):
+        kwargs.setdefault('coalesce_window', 0.05)
+        dispatcher = NotificationDispatcher(channels, **kwargs)
+        dispatchers.append(dispatcher)
+        return dispatcher
+
+    yield make
+    for dispatcher in dispatchers:
+        dispatcher.stop(timeout=5)
+
+
+class TestCoalescing:
+    """Digest building"""
+
+    def test_groups_by_category_and_recipient(self):
+        batch = [Notification('BTC', subject='BTC signal', category='signal'),
+                 Notification('down', category='system'),
+                 Notification('ETH', category='signal'),
+                 Notification('SOL', category='signal', recipient='a@example.com')]
+        messages = coalesce(batch)
+
+        assert [m.category for m in messages] == ['signal', 'system', 'signal']
+        digest = messages[0]
+        assert digest.text.startswith('📬 2 notifications') and 'BTC' in digest.text and 'ETH' in digest.text
+        assert digest.subject == 'BTC signal (+1 more)'
+        assert messages[1] is batch[1]
+        assert messages[2].recipient == 'a@example.com'
+
+    def test_html_kept_only_when_every_member_has_it(self):
+        with_html = [Notification('a', html='<p>a</p>'), Notification('b', html='<p>b</p>')]
+        assert Notification.digest(with_html).html == '<p>a</p><hr><p>b</p>'
+        assert Notification.digest([with_html[0], Notification('c')]).html is None
+
+    def test_truncate(self):
+        assert truncate('abc', 5) == 'abc'
+        assert truncate('abcdef', 4) == 'abc…'
+        assert truncate('abcdef', None) == 'abcdef'
+
+
+class TestRateLimiter:
+    """Token bucket"""
+
+    def test_burst_then_throttle(self):
+        async def scenario():
+            limiter = RateLimiter(rate=2, per=0.2)
+            start = time.monotonic()
+            for _ in range(2):
+                await limiter.acquire()
+            burst = time.monotonic() - start
+            for _ in range(2):
+                await limiter.acquire()
+            return burst, time.monotonic() - start
+
+        burst, total = asyncio.run(scenario())
+        assert burst < 0.05
+        assert total >= 0.18
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+
+class TestDispatcher:
+    """Queueing, delivery and metrics"""
+
+    def test_burst_becomes_one_digest(self, make_dispatcher):
+        """Test four symbols firing in one cycle arrive as one message"""
+        channel = RecordingChannel()
+        dispatcher = make_dispatcher(channel, coalesce_window=0.2)
+        for symbol in ('BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT'):
+            assert dispatcher.submit(Notification(f'{symbol} BUY', category='signal')) == 1
+        assert dispatcher.flush(timeout=2)
+
+        assert len(channel.sent) == 1
+        assert 'XRPUSDT BUY' in channel.sent[0].text
+        metrics = dispatcher.get_metrics()['recording']
+        assert metrics['delivered'] == 4 and metrics['messages_sent'] == 1 and metrics['coalesced'] == 3
+        assert metrics['queue_depth'] == 0
+        assert metrics['latency']['p50_ms'] >= 0
+
+    def test_urgent_skips_coalescing_window(self, make_dispatcher):
+        channel = RecordingChannel()
+        dispatcher = make_dispatcher(channel, coalesce_window=30)
+        dispatcher.submit(Notification('stop loss hit', urgent=True))
+        assert dispatcher.flush(timeout=2)
+        assert [n.text for n in channel.sent] == ['stop loss hit']
+
+    def test_full_queue_drops_without_blocking(self, make_dispatcher):
+        gate = threading.Event()
+        channel = RecordingChannel(gate=gate)
+        dispatcher = make_dispatcher(channel, max_queue=2)
+
+        start = time.monotonic()
+        accepted = [dispatcher.submit(Notification(str(i), category=str(i))) for i in range(3)]
+        assert time.monotonic() - start < 0.5
+        assert accepted == [1, 1, 0]
+        assert dispatcher.get_metrics()['recording']['dropped'] == 1
+        assert not dispatcher.flush(timeout=0.1)
+
+        gate.set()
+        assert dispatcher.flush(timeout=2)
+        assert [n.text for n in channel.sent] == ['0', '1']
+
+    def test_failures_are_counted_and_channels_independent(self, make_dispatcher):
+        broken, healthy = RecordingChannel('broken', fail=True), RecordingChannel('healthy')
+        dispatcher = make_dispatcher(broken, healthy)
+        assert dispatcher.submit(Notification('hello')) == 2
+        assert dispatcher.submit(Notification('only healthy'), ['healthy', 'unknown']) == 1
+        assert dispatcher.flush(timeout=2)
+
+        metrics = dispatcher.get_metrics()
+        assert metrics['broken']['failed'] == 1 and metrics['broken']['delivered'] == 0
+        assert metrics['healthy']['delivered'] == 2
+
+    def test_channel_registration(self, make_dispatcher):
+        dispatcher = make_dispatcher(RecordingChannel('a'))
+        with pytest.raises(ValueError):
+            dispatcher.add_channel(RecordingChannel('a'))
+        dispatcher.start()
+        with pytest.raises(RuntimeError):
+            dispatcher.add_channel(RecordingChannel('b'))
+
+
+class TestChannels:
+    """Channels against local fake endpoints"""
+
+    def test_http_channels_reuse_one_connection(self, make_dispatcher):
+        with FakeHTTPSink() as sink:
+            dispatcher = make_dispatcher(DiscordChannel(f'{sink.url}/webhook', rate=1000),
+                                         TelegramChannel('TOKEN', '42', api_url=sink.url, rate=1000),
+                                         coalesce_window=0)
+            for i in range(3):
+                dispatcher.submit(Notification(f'alert {i}', category=str(i)))
+                assert dispatcher.flush(timeout=5)
+            dispatcher.stop(timeout=5)
+
+            paths = [path for path, _, _ in sink.requests]
+            assert paths.count('/webhook') == 3 and paths.count('/botTOKEN/sendMessage') == 3
+            telegram = next(body for path, body, _ in sink.requests if path.startswith('/bot'))
+            assert telegram['chat_id'] == '42' and telegram['parse_mode'] == 'Markdown'
+            assert sink.connections == 2
+            assert dispatcher.get_metrics()['discord']['delivered'] == 3
+
+    def test_http_error_status_fails(self, make_dispatcher):
+        with FakeHTTPSink(status=500) as sink:
+            dispatcher = make_dispatcher(DiscordChannel(f'{sink.url}/webhook'))
+            dispatcher.submit(Notification('alert'))
+            assert dispatcher.flush(timeout=5)
+            assert dispatcher.get_metrics()['discord']['failed'] == 1
+
+    def test_smtp_keeps_connection_and_reconnects(self, make_dispatcher):
+        with FakeSMTPServer() as server:
+            channel = SMTPChannel('127.0.0.1', server.port, from_addr='bot@example.com',
+                                  starttls=False, rate=1000)
+            dispatcher = make_dispatcher(channel, coalesce_window=0)
+            for i in range(3):
+                dispatcher.submit(Notification(f'body {i}', subject=f'subject {i}', category=str(i)))
+                assert dispatcher.flush(timeout=5)
+            assert len(server.messages) == 3
+            assert server.connections == 1
+
+            server.drop_connections()
+            dispatcher.submit(Notification('after drop', recipient='trader@example.com'))
+            assert dispatcher.flush(timeout=5)
+
+            assert len(server.messages) == 4
+            assert b'To: trader@example.com' in server.messages[-1]
+            assert channel.connections_opened == 2 and server.connections == 2
+
+
+class TestNotificationManager:
+    """NotificationManager queueing through the dispatcher"""
+
+    def test_alerts_are_queued_and_coalesced(self, make_dispatcher):
+        channel = RecordingChannel('discord')
+        dispatcher = make_dispatcher(channel, coalesce_window=0.2)
+        manager = NotificationManager(dispatcher=dispatcher)
+        manager.enable_discord, manager.enable_telegram, manager.enable_email = True, False, False
+
+        for symbol in ('BTCUSDT', 'ETHUSDT', 'SOLUSDT'):
+            assert manager.send_trade_alert('BUY', symbol, 100.0, 'ICT setup')
+        assert dispatcher.flush(timeout=2)
+
+        assert len(channel.sent) == 1
+        assert all(symbol in channel.sent[0].text for symbol in ('BTCUSDT', 'ETHUSDT', 'SOLUSDT'))
+        assert manager.get_metrics()['discord']['coalesced'] == 2
+
+    def test_inline_mode_without_dispatcher(self):
+        manager = NotificationManager(use_dispatcher=False)
+        assert manager.dispatcher is None
+        assert manager.get_metrics() == {}
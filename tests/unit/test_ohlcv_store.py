@@ -0,0 +1,182 @@
+"""
+Unit tests for backtesting.ohlcv_store.
+Tests range reads, append/back-fill merges and fetching only missing intervals.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from backtesting import ohlcv_store
+    from backtesting.ohlcv_store import OHLCVStore
+except ImportError as e:
+    pytest.skip(f"Skipping ohlcv_store tests due to import error: {e}", allow_module_level=True)
+
+
+def _candles(start, periods, base=100.0):
+    index = pd.date_range(start, periods=periods, freq="1h", name="timestamp")
+    close = base + np.arange(periods, dtype=np.float64)
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.full(periods, 5.0)
+    }, index=index)
+
+
+class RecordingFetcher:
+    """Serves synthetic candles and records requested ranges"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, timeframe, start_ms, end_ms):
+        self.calls.append((pd.Timestamp(start_ms, unit='ms'), pd.Timestamp(end_ms, unit='ms')))
+        index = pd.date_range(pd.Timestamp(start_ms, unit='ms').ceil('1h'),
+                              pd.Timestamp(end_ms, unit='ms'), freq='1h')
+        hours = ((index - pd.Timestamp('2024-01-01')) / pd.Timedelta(hours=1)).to_numpy()
+        return pd.DataFrame({
+            'open': hours, 'high': hours + 1, 'low': hours - 1, 'close': hours, 'volume': np.ones(len(index))
+        }, index=index)
+
+
+class TestOHLCVStore:
+    """Test suite for the columnar candle store"""
+
+    def test_append_and_range_read_is_memory_mapped(self, tmp_path):
+        """Test that appended candles are read back by range as file-backed views"""
+        store = OHLCVStore(str(tmp_path))
+        store.write('BTC/USDT', '1h', _candles('2024-01-01', 24))
+        store.write('BTC/USDT', '1h', _candles('2024-01-02', 24, base=200.0))
+
+        df = store.read('BTC/USDT', '1h', '2024-01-01 20:00', '2024-01-02 03:00')
+        assert len(df) == 8
+        assert df.index[0] == pd.Timestamp('2024-01-01 20:00')
+        assert df['close'].iloc[-1] == 203.0
+        assert isinstance(df['close'].to_numpy().base, np.memmap) or not df['close'].to_numpy().flags.owndata
+        assert not df['close'].to_numpy().flags.writeable
+
+    def test_backfill_and_overlap_merge(self, tmp_path):
+        """Test that older and overlapping candles merge in order, newest values winning"""
+        store = OHLCVStore(str(tmp_path))
+        store.write('ETH/USDT', '1h', _candles('2024-01-02', 10, base=500.0))
+        store.write('ETH/USDT', '1h', _candles('2024-01-01 20:00', 6, base=900.0))
+
+        df = store.read('ETH/USDT', '1h')
+        assert df.index.is_monotonic_increasing and df.index.is_unique
+        assert len(df) == 14
+        assert df.loc['2024-01-02 01:00', 'close'] == 905.0
+        assert df.loc['2024-01-02 02:00', 'close'] == 502.0
+
+    def test_refreshes_last_candle_in_place(self, tmp_path):
+        """Test that re-writing the newest candle replaces it without a rewrite"""
+        store = OHLCVStore(str(tmp_path))
+        store.write('SOL/USDT', '1h', _candles('2024-01-01', 5))
+        store.write('SOL/USDT', '1h', _candles('2024-01-01 04:00', 2, base=50.0))
+
+        df = store.read('SOL/USDT', '1h')
+        assert len(df) == 6
+        assert list(df['close'].iloc[-2:]) == [50.0, 51.0]
+
+    def test_only_missing_ranges_are_fetched(self, tmp_path):
+        """Test that overlapping queries share the partition and fetch only gaps"""
+        store = OHLCVStore(str(tmp_path))
+        fetcher = RecordingFetcher()
+
+        first = store.load_or_fetch('BTC/USDT', '1h', '2024-01-10', '2024-01-20', fetcher)
+        assert len(first) == 10 * 24 + 1
+        assert len(fetcher.calls) == 1
+
+        # Overlapping wider range: only the two uncovered sides are requested
+        wider = store.load_or_fetch('BTC/USDT', '1h', '2024-01-05', '2024-01-25', fetcher)
+        assert len(fetcher.calls) == 3
+        assert fetcher.calls[1][1] < pd.Timestamp('2024-01-10')
+        assert fetcher.calls[2][0] > pd.Timestamp('2024-01-20')
+        assert len(wider) == 20 * 24 + 1
+        assert wider.index.is_unique and wider.index.is_monotonic_increasing
+        assert (np.diff(wider['close'].to_numpy()) == 1).all()
+
+        # Fully covered sub-range: no request at all
+        store.load_or_fetch('BTC/USDT', '1h', '2024-01-12', '2024-01-18', fetcher)
+        assert len(fetcher.calls) == 3
+        assert store.missing_ranges('BTC/USDT', '1h', '2024-01-05', '2024-01-25') == []
+
+    @pytest.mark.parametrize('timeframe', ['1h', '4h'])
+    def test_forming_candle_is_not_stored(self, tmp_path, monkeypatch, timeframe):
+        """Test that a candle whose period has not ended is dropped and refetched later"""
+        store = OHLCVStore(str(tmp_path))
+        fetcher = RecordingFetcher()
+        # At 10:30 the 1h candle opened at 09:00 is final, a 4h one opened after 06:30 is not
+        first_now = pd.Timestamp('2024-01-20 10:30')
+        now = first_now
+        monkeypatch.setattr(ohlcv_store.time, 'time', lambda: now.value / 1e9)
+
+        first = store.load_or_fetch('BTC/USDT', timeframe, '2024-01-20 00:00', '2024-01-20 12:00', fetcher)
+        assert first.index[-1] == pd.Timestamp('2024-01-20 09:00' if timeframe == '1h' else '2024-01-20 06:00')
+
+        # Later reads fetch again from where the last closed candle ended
+        now = pd.Timestamp('2024-01-20 14:30')
+        second = store.load_or_fetch('BTC/USDT', timeframe, '2024-01-20 00:00', '2024-01-20 12:00', fetcher)
+        assert len(fetcher.calls) == 2
+        assert fetcher.calls[1][0] == first.index[-1] + pd.Timedelta(timeframe)
+        assert second.index[-1] == pd.Timestamp('2024-01-20 12:00' if timeframe == '1h' else '2024-01-20 10:00')
+
+    def test_empty_response_does_not_mark_range_fetched(self, tmp_path):
+        """Test that a range returning no candles is requested again"""
+        store = OHLCVStore(str(tmp_path))
+        empty = RecordingFetcher()
+        empty_frame = lambda *args: empty(*args).iloc[:0]  # noqa: E731
+
+        assert store.load_or_fetch('BTC/USDT', '1h', '2024-01-10', '2024-01-11', empty_frame).empty
+        assert store.missing_ranges('BTC/USDT', '1h', '2024-01-10', '2024-01-11') != []
+
+        fetcher = RecordingFetcher()
+        assert len(store.load_or_fetch('BTC/USDT', '1h', '2024-01-10', '2024-01-11', fetcher)) == 25
+        assert store.missing_ranges('BTC/USDT', '1h', '2024-01-10', '2024-01-11') == []
+
+    def test_truncated_fetch_leaves_tail_uncovered(self, tmp_path):
+        """Test that a fetch ending before the range does not mark the rest as fetched"""
+        store = OHLCVStore(str(tmp_path))
+        fetcher = RecordingFetcher()
+        truncated = lambda *args: fetcher(*args).loc[:'2024-01-10 11:00']  # noqa: E731
+
+        assert len(store.load_or_fetch('BTC/USDT', '1h', '2024-01-10', '2024-01-11', truncated)) == 12
+        assert store.missing_ranges('BTC/USDT', '1h', '2024-01-10', '2024-01-11') == [
+            (pd.Timestamp('2024-01-10 12:00').value // 1_000_000, pd.Timestamp('2024-01-11').value // 1_000_000)]
+
+        assert len(store.load_or_fetch('BTC/USDT', '1h', '2024-01-10', '2024-01-11', fetcher)) == 25
+        assert fetcher.calls[-1][0] == pd.Timestamp('2024-01-10 12:00')
+
+    def test_append_after_interrupted_write(self, tmp_path):
+        """Test that bytes past the committed row count do not shift appended rows"""
+        store = OHLCVStore(str(tmp_path))
+        store.write('BTC/USDT', '1h', _candles('2024-01-01', 10))
+        partition = store._partition_dir('BTC/USDT', '1h')
+        # A crash after writing some column files but before meta.json
+        for column in ('timestamp', 'open', 'close'):
+            with open(store._column_path(partition, column), 'ab') as f:
+                f.write(b'\x01' * 20)
+
+        store.write('BTC/USDT', '1h', _candles('2024-01-01 10:00', 5, base=110.0))
+        df = store.read('BTC/USDT', '1h')
+        pd.testing.assert_frame_equal(df, _candles('2024-01-01', 15), check_freq=False, check_names=False)
+
+    def test_backfill_switches_generation_atomically(self, tmp_path, monkeypatch):
+        """Test that a rewrite interrupted before the meta switch leaves the partition intact"""
+        store = OHLCVStore(str(tmp_path))
+        store.write('ETH/USDT', '1h', _candles('2024-01-02', 10, base=500.0))
+        before = store.read('ETH/USDT', '1h').copy()
+
+        def crash(*args):
+            raise OSError("disk full")
+        with monkeypatch.context() as patch:
+            patch.setattr(store, '_save_meta', crash)
+            with pytest.raises(OSError):
+                store.write('ETH/USDT', '1h', _candles('2024-01-01', 30, base=100.0))
+        pd.testing.assert_frame_equal(store.read('ETH/USDT', '1h'), before)
+
+        # The retried back-fill replaces the leftovers and drops the old generation
+        store.write('ETH/USDT', '1h', _candles('2024-01-01', 30, base=100.0))
+        assert len(store.read('ETH/USDT', '1h')) == 34
+        partition = store._partition_dir('ETH/USDT', '1h')
+        assert sorted(os.listdir(partition)) == ['gen-1', 'meta.json']
@@ -0,0 +1,130 @@
+"""
+Unit tests for trading.paper_trade_book and the batched paper-trade writes.
+Tests vectorized mark-to-market against the per-trade rules and the
+single-transaction TP/SL close path in TradingDatabase.
+"""
+
+import numpy as np
+import pytest
+
+try:
+    from trading.paper_trade_book import PaperTradeBook
+    from database.trading_database import TradingDatabase
+except ImportError as e:
+    pytest.skip(f"Skipping paper_trade_book tests due to import error: {e}", allow_module_level=True)
+
+
+def _reference_mark(trade, price):
+    """Per-trade rules of the original row-by-row update loop"""
+    entry = trade['entry_price']
+    if price <= 0 or price > entry * 1.5 or price < entry * 0.5:
+        return None
+    if trade['direction'] == 'BUY':
+        pnl = (price - entry) * trade['position_size']
+        reason = 'STOP_LOSS' if price <= trade['stop_loss'] else 'TAKE_PROFIT' if price >= trade['take_profit'] else ''
+    else:
+        pnl = (entry - price) * trade['position_size']
+        reason = 'STOP_LOSS' if price >= trade['stop_loss'] else 'TAKE_PROFIT' if price <= trade['take_profit'] else ''
+    return pnl, reason
+
+
+def _random_trades(n, seed=3):
+    rng = np.random.default_rng(seed)
+    trades = []
+    for i in range(n):
+        symbol = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT'][i % 4]
+        entry = {'BTCUSDT': 60000, 'ETHUSDT': 3000, 'SOLUSDT': 150, 'XRPUSDT': 0.6}[symbol] * rng.uniform(0.4, 1.6)
+        direction = 'BUY' if rng.random() < 0.5 else 'SELL'
+        sign = 1 if direction == 'BUY' else -1
+        trades.append({
+            'id': i + 1, 'signal_id': f'SIG-{i + 1}', 'symbol': symbol, 'direction': direction,
+            'entry_price': entry, 'position_size': rng.uniform(0.01, 2.0),
+            'stop_loss': entry * (1 - sign * 0.02), 'take_profit': entry * (1 + sign * 0.04),
+            'risk_amount': 1.0
+        })
+    return trades
+
+
+class TestPaperTradeBook:
+    """Vectorized mark-to-market"""
+
+    def test_mark_matches_per_trade_rules(self):
+        """Test PnL, TP/SL reasons and price validation for a mixed book"""
+        trades = _random_trades(400)
+        book = PaperTradeBook()
+        book.load(trades)
+        prices = {'BTC': 60000.0, 'ETH': 3000.0, 'SOL': 150.0}  # No XRP price
+
+        marks = book.mark(prices)
+        marked = {int(t): (p, r) for t, p, r in zip(marks.trade_ids, marks.unrealized_pnl, marks.close_reason)}
+
+        for trade in trades:
+            crypto = trade['symbol'].replace('USDT', '')
+            expected = _reference_mark(trade, prices[crypto]) if crypto in prices else None
+            if expected is None:
+                assert trade['id'] not in marked
+            else:
+                assert marked[trade['id']][0] == pytest.approx(expected[0])
+                assert marked[trade['id']][1] == expected[1]
+        assert {'STOP_LOSS', 'TAKE_PROFIT', ''} <= set(marks.close_reason)
+
+    def test_incremental_add_and_remove(self):
+        """Test that only unseen trades are added and closed ones removed"""
+        trades = _random_trades(6)
+        book = PaperTradeBook()
+        book.load(trades[:4])
+
+        assert book.add(trades[2:]) == 2
+        assert book.last_trade_id == 6
+        book.remove([1, 5])
+        assert sorted(book.trade_ids) == [2, 3, 4, 6]
+        assert len(PaperTradeBook().mark({'BTC': 1.0}).trade_ids) == 0
+
+
+class TestBatchedPaperTradeWrites:
+    """Single-transaction mark-to-market writes"""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        database = TradingDatabase(str(tmp_path / "trading.db"))
+        for trade in _random_trades(8):
+            database.conn.execute('''
+                INSERT INTO paper_trades (id, signal_id, symbol, direction, entry_price, position_size,
+                                          stop_loss, take_profit, risk_amount)
+                VALUES (:id, :signal_id, :symbol, :direction, :entry_price, :position_size,
+                        :stop_loss, :take_profit, :risk_amount)
+            ''', trade)
+            database.conn.execute('''
+                INSERT INTO signals (signal_id, symbol, direction, entry_price, stop_loss, take_profit,
+                                     confluence_score, timeframes, ict_concepts, session, market_regime,
+                                     directional_bias, signal_strength)
+                VALUES (?, ?, ?, ?, ?, ?, 0.7, '1h', '[]', 'London', 'trending', 'BULLISH', 'HIGH')
+            ''', (trade['signal_id'], trade['symbol'], trade['direction'], trade['entry_price'],
+                  trade['stop_loss'], trade['take_profit']))
+        database.conn.commit()
+        yield database
+        database.close()
+
+    def test_marks_and_closes_in_one_transaction(self, db):
+        """Test that PnL, trade closes and signal closes land together"""
+        assert [t['id'] for t in db.get_open_paper_trades(after_id=5)] == [6, 7, 8]
+
+        # Trade 2 was closed elsewhere: it must not be closed (or booked) twice
+        db.conn.execute("UPDATE paper_trades SET status = 'TIME_LIMIT' WHERE id = 2")
+        db.conn.commit()
+
+        marks = [(101.0, float(i), i) for i in range(1, 9)]
+        closes = [{'id': i, 'signal_id': f'SIG-{i}', 'exit_price': 101.0,
+                   'realized_pnl': 5.0, 'close_reason': 'TAKE_PROFIT'} for i in (1, 2)]
+
+        assert db.mark_paper_trades(marks, closes) == [1]
+        assert not db.conn.in_transaction
+
+        rows = {row['id']: dict(row) for row in db.conn.execute('SELECT * FROM paper_trades')}
+        assert rows[1]['status'] == 'TAKE_PROFIT' and rows[1]['realized_pnl'] == 5.0
+        assert rows[2]['status'] == 'TIME_LIMIT' and rows[2]['current_price'] is None
+        assert rows[3]['current_price'] == 101.0 and rows[3]['unrealized_pnl'] == 3.0
+
+        signal = dict(db.conn.execute("SELECT * FROM signals WHERE signal_id = 'SIG-1'").fetchone())
+        assert signal['status'] == 'CLOSED' and signal['pnl'] == 5.0 and signal['notes'] == 'TAKE_PROFIT'
+        assert [t['id'] for t in db.get_open_paper_trades()] == [3, 4, 5, 6, 7, 8]
@@ -0,0 +1,107 @@
+"""
+Unit tests for the tick history in bybit_integration.real_time_prices.
+Tests the NumPy ring buffer and the windowed change/volatility/VWAP queries.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from bybit_integration.real_time_prices import BybitRealTimePrices, TickRingBuffer, NS_PER_MINUTE
+except ImportError as e:
+    pytest.skip(f"Skipping real_time_prices tests due to import error: {e}", allow_module_level=True)
+
+
+def feed(prices, symbol, ticks):
+    """Append (minutes_ago, price, volume) ticks to a symbol's history"""
+    now = time.time_ns()
+    history = prices.price_history[symbol] = TickRingBuffer(prices.history_depth)
+    for minutes_ago, price, volume in ticks:
+        history.append(now - int(minutes_ago * NS_PER_MINUTE), price, volume)
+    return history
+
+
+class TestTickRingBuffer:
+    """Fixed-capacity tick store"""
+
+    def test_keeps_newest_ticks_without_reallocating(self):
+        """Test wrap-around keeps the last `capacity` ticks in order, in the same arrays"""
+        buffer = TickRingBuffer(capacity=5)
+        storage = buffer._prices
+        for i in range(23):
+            buffer.append(i, float(i), 1.0)
+
+        assert len(buffer) == 5
+        assert buffer.timestamps().tolist() == [18, 19, 20, 21, 22]
+        assert buffer.prices().tolist() == [18.0, 19.0, 20.0, 21.0, 22.0]
+        assert buffer._prices is storage
+        assert buffer.last_price == 22.0
+
+    def test_window_and_price_at(self):
+        buffer = TickRingBuffer(capacity=10)
+        for ts, price in [(10, 1.0), (20, 2.0), (30, 3.0), (40, 4.0)]:
+            buffer.append(ts, price)
+
+        assert buffer.window(25)[1].tolist() == [3.0, 4.0]
+        assert buffer.window(20)[1].tolist() == [2.0, 3.0, 4.0]
+        assert buffer.price_at(35) == 3.0
+        assert buffer.price_at(5) == 1.0  # Older than the history: oldest tick
+        assert TickRingBuffer(3).price_at(1) is None
+
+    def test_timestamps_stay_ordered(self):
+        """Test a clock step backwards does not break searchsorted"""
+        buffer = TickRingBuffer(capacity=4)
+        for ts in (100, 90, 110):
+            buffer.append(ts, 1.0)
+        assert buffer.timestamps().tolist() == [100, 100, 110]
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            TickRingBuffer(0)
+
+
+class TestWindowedQueries:
+    """Price change, volatility and VWAP over the tick history"""
+
+    @pytest.fixture
+    def prices(self):
+        return BybitRealTimePrices(['BTC'], history_depth=50)
+
+    def test_history_depth_and_tick_volume(self, prices):
+        """Test ticks land in a ring buffer with volume taken from the rolling 24h volume"""
+        for price, volume_24h in [(100.0, 1000.0), (101.0, 1002.5), (102.0, 1001.0)]:
+            prices._update_price_history('BTCUSDT', {'price': price, 'volume_24h': volume_24h})
+
+        history = prices.price_history['BTCUSDT']
+        assert history.capacity == 50
+        assert history.prices().tolist() == [100.0, 101.0, 102.0]
+        assert history.volumes().tolist() == [0.0, 2.5, 0.0]
+
+    def test_price_change(self, prices):
+        feed(prices, 'BTCUSDT', [(10, 90.0, 0), (6, 100.0, 0), (4, 104.0, 0), (0, 110.0, 0)])
+
+        assert prices.get_price_change('BTC', minutes=5) == pytest.approx(10.0)
+        assert prices.get_price_change('BTC', minutes=60) == pytest.approx(100 * (110 - 90) / 90)
+
+    def test_volatility(self, prices):
+        """Test volatility is computed over the window (it used to fail on datetime.timedelta)"""
+        window = [100.0, 102.0, 98.0, 101.0, 99.0]
+        ticks = [(30, 50.0, 0)] * 6 + [(10 - i, p, 0) for i, p in enumerate(window)]
+        feed(prices, 'BTCUSDT', ticks)
+
+        expected = np.std(window) / np.mean(window) * 100
+        assert prices.get_volatility('BTC', minutes=15) == pytest.approx(expected)
+        assert prices.get_volatility('BTC', minutes=1) == 0.0  # Fewer than 3 ticks
+
+    def test_vwap(self, prices):
+        feed(prices, 'BTCUSDT', [(30, 1000.0, 50), (3, 100.0, 1), (2, 110.0, 3), (1, 120.0, 0)])
+
+        assert prices.get_vwap('BTC', minutes=5) == pytest.approx((100 * 1 + 110 * 3) / 4)
+        assert prices.get_vwap('BTC', minutes=0.5) == 0.0
+        assert prices.get_vwap('ETH') == 0.0
+
+    def test_vwap_without_volume_is_mean_price(self, prices):
+        feed(prices, 'BTCUSDT', [(2, 100.0, 0), (1, 110.0, 0)])
+        assert prices.get_vwap('BTC', minutes=5) == pytest.approx(105.0)
@@ -0,0 +1,213 @@
+"""
+Unit tests for backtesting.strategy_engine batch (precomputed feature) mode.
+Tests that vectorized confluence inputs reproduce the per-bar analyzers
+and that seeded runs are reproducible regardless of evaluation order.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from backtesting.strategy_engine import ICTStrategyEngine, nearest_positions
+except ImportError as e:
+    pytest.skip(f"Skipping strategy engine tests due to import error: {e}", allow_module_level=True)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return ICTStrategyEngine()
+
+
+@pytest.fixture(scope="module")
+def df_1h():
+    """Random-walk 1H OHLCV history with enough swings to trigger every analyzer"""
+    rng = np.random.default_rng(7)
+    n = 400
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.012, n)))
+    spread = close * rng.uniform(0.002, 0.03, n)
+    index = pd.date_range("2024-01-01", periods=n, freq="1h")
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.003, n)),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.lognormal(3, 0.6, n)
+    }, index=index)
+
+
+def _assert_same(batch, reference):
+    assert batch['factors'] == reference['factors']
+    assert batch['score'] == pytest.approx(reference['score'])
+
+
+class TestTimeframeAlignment:
+    """Precomputed base-bar to 4H/15m/5m alignment tables"""
+
+    def test_nearest_positions_matches_get_indexer(self):
+        """Test that searchsorted alignment matches pandas nearest, ties to the later candle"""
+        index = pd.date_range("2024-01-01", periods=50, freq="4h")
+        targets = pd.DatetimeIndex([
+            index[0] - pd.Timedelta(hours=9),   # before the first candle
+            index[3],                           # exact match
+            index[3] + pd.Timedelta(hours=2),   # equidistant
+            index[7] + pd.Timedelta(minutes=61),
+            index[-1] + pd.Timedelta(days=3)    # after the last candle
+        ])
+
+        expected = index.get_indexer(targets, method='nearest')
+        assert list(nearest_positions(index, targets)) == list(expected)
+        assert nearest_positions(index, targets[2])[0] == 4
+        assert list(nearest_positions(index[:0], targets)) == [0] * len(targets)
+
+    def test_tables_cover_base_bars_and_off_grid_times(self, engine, df_1h):
+        """Test that base bars use the tables and other timestamps fall back to a search"""
+        mtf_data = engine.prepare_multitimeframe_data(df_1h)
+
+        assert len(mtf_data.base_to_4h) == len(df_1h)
+        assert mtf_data.base_position(df_1h.index[123]) == 123
+        assert mtf_data.base_position(df_1h.index[123] + pd.Timedelta(minutes=30)) is None
+
+        for timestamp in (df_1h.index[200], df_1h.index[200] + pd.Timedelta(minutes=20)):
+            assert mtf_data.position_4h(timestamp) == mtf_data.tf_4h.index.get_indexer([timestamp], method='nearest')[0]
+            assert mtf_data.position_15m(timestamp) == mtf_data.tf_15m.index.get_indexer([timestamp], method='nearest')[0]
+            assert mtf_data.position_5m(timestamp) == mtf_data.tf_5m.index.get_indexer([timestamp], method='nearest')[0]
+
+
+class TestConfluenceFeatures:
+    """Parity between precomputed features and per-bar slicing"""
+
+    def test_alignment_matches_nearest_index(self, engine, df_1h):
+        """Test that batch alignment resolves the same 4H/15m candles"""
+        mtf_data = engine.prepare_multitimeframe_data(df_1h)
+        features = engine.precompute_confluence_features(mtf_data, df_1h.index)
+
+        assert list(features.idx_4h) == list(mtf_data.tf_4h.index.get_indexer(df_1h.index, method='nearest'))
+        assert list(features.idx_15m) == list(mtf_data.tf_15m.index.get_indexer(df_1h.index, method='nearest'))
+
+    def test_analyzers_match_per_bar_computation(self, engine, df_1h):
+        """Test that every analyzer scores identically in both modes"""
+        mtf_data = engine.prepare_multitimeframe_data(df_1h)
+        features = engine.precompute_confluence_features(mtf_data, df_1h.index)
+
+        for bar, t in enumerate(df_1h.index):
+            assert engine.detect_market_regime(mtf_data, t, features, bar) == engine.detect_market_regime(mtf_data, t)
+            batch_bias = engine.calculate_directional_bias(mtf_data, t, features, bar)
+            reference_bias = engine.calculate_directional_bias(mtf_data, t)
+            assert batch_bias['direction'] == reference_bias['direction']
+            assert batch_bias['strength'] == pytest.approx(reference_bias['strength'])
+
+            _assert_same(engine.analyze_supply_demand_zones(mtf_data, t, features, bar),
+                         engine.analyze_supply_demand_zones(mtf_data, t))
+            _assert_same(engine.analyze_liquidity_levels(mtf_data, t, features, bar),
+                         engine.analyze_liquidity_levels(mtf_data, t))
+            _assert_same(engine._analyze_premium_discount(mtf_data, t, features, bar),
+                         engine._analyze_premium_discount(mtf_data, t))
+
+            # Probabilistic analyzers get identically seeded generators
+            _assert_same(engine._analyze_fair_value_gaps(mtf_data, t, np.random.default_rng(bar), features, bar),
+                         engine._analyze_fair_value_gaps(mtf_data, t, np.random.default_rng(bar)))
+            _assert_same(engine._analyze_order_blocks(mtf_data, t, np.random.default_rng(bar), features, bar),
+                         engine._analyze_order_blocks(mtf_data, t, np.random.default_rng(bar)))
+            for regime in ('trending', 'sideways'):
+                _assert_same(
+                    engine._analyze_market_structure(mtf_data, t, regime, np.random.default_rng(bar), features, bar),
+                    engine._analyze_market_structure(mtf_data, t, regime, np.random.default_rng(bar))
+                )
+
+    def test_atr_matches_history_slice(self, engine, df_1h):
+        """Test that precomputed ATR/volatility equal the per-signal history computation"""
+        if engine.volatility_analyzer is None:
+            pytest.skip("volatility analyzer unavailable")
+        mtf_data = engine.prepare_multitimeframe_data(df_1h)
+        features = engine.precompute_confluence_features(mtf_data, df_1h.index)
+
+        for bar in range(50, len(df_1h), 37):
+            t = df_1h.index[bar]
+            price = features.close_15m[bar]
+            reference = engine.volatility_analyzer.get_atr_analysis(mtf_data.tf_15m.loc[:t], price)
+            batch = engine.volatility_analyzer.get_atr_analysis_from_values(
+                features.atr_15m[bar], features.volatility_15m[bar], price
+            )
+            assert batch['atr'] == pytest.approx(reference['atr'])
+            assert batch['volatility'] == pytest.approx(reference['volatility'])
+            assert batch['regime'] == reference['regime']
+
+    def test_streaming_indicators_match_frame_analysis(self, df_1h):
+        """Test that the per-signal stream equals the analyzers on re-fetched frames with a forming candle"""
+        engine = ICTStrategyEngine()
+        if engine.streaming_indicators is None:
+            pytest.skip("streaming indicators unavailable")
+
+        for end in range(200, 230):
+            for progress in (0.3, 1.0):
+                # Rolling 150-candle window whose last 1H candle is still forming
+                frame = df_1h.iloc[end - 149:end + 1].copy()
+                frame.iloc[-1, frame.columns.get_loc('close')] = (
+                    frame['open'].iloc[-1] + progress * (frame['close'].iloc[-1] - frame['open'].iloc[-1]))
+                mtf_data = engine.prepare_multitimeframe_data(frame)
+                t = frame.index[-1]
+
+                values, close = engine._streaming_15m_values('BTCUSDT', mtf_data, t)
+                history = mtf_data.tf_15m.loc[:t]
+                reference = engine.volatility_analyzer.get_atr_analysis(history, close)
+                streamed = engine.volatility_analyzer.get_atr_analysis_from_values(
+                    values['atr'], values['volatility'], close)
+                assert streamed == pytest.approx(reference, rel=1e-9)
+                for action in ('BUY', 'SELL'):
+                    reference = engine.mean_reversion_analyzer.analyze_price_extension(history, action)
+                    streamed = engine.mean_reversion_analyzer.analyze_price_extension_from_values(
+                        close, values['bb_upper'], values['bb_middle'], values['bb_lower'], values['zscore'], action)
+                    assert streamed['condition'] == reference['condition']
+                    assert streamed['zscore'] == pytest.approx(reference['zscore'], abs=1e-8)
+
+        # Only the committed (final) candles advanced the stream: seeded once, then 4 per new hour
+        state = engine.streaming_indicators.state('BTCUSDT', '15m')
+        first_history = engine.prepare_multitimeframe_data(df_1h.iloc[51:201]).tf_15m
+        assert state.bars == len(first_history) - 4 + 29 * 4
+
+
+def _signal_key(signal):
+    return (signal.timestamp, signal.action, round(signal.entry_price, 6),
+            round(signal.stop_loss, 6), round(signal.take_profit, 6), tuple(signal.confluence_factors))
+
+
+class TestSeededSimulation:
+    """Reproducible random draws for backtests"""
+
+    def test_same_seed_reproduces_run(self, df_1h):
+        """Test that a seeded run is reproducible and records its seed"""
+        first = ICTStrategyEngine(random_seed=1234).simulate_ict_strategy('BTCUSDT', df_1h)
+        second = ICTStrategyEngine().simulate_ict_strategy('BTCUSDT', df_1h, random_seed=1234)
+
+        assert first and [_signal_key(s) for s in first] == [_signal_key(s) for s in second]
+        assert all(signal.rng_seed == 1234 for signal in first)
+
+    def test_batch_and_per_bar_modes_agree(self, df_1h):
+        """Test that vectorized and per-bar simulation produce the same signals"""
+        engine = ICTStrategyEngine(random_seed=99)
+        batch = engine.simulate_ict_strategy('ETHUSDT', df_1h, vectorized=True)
+        per_bar = engine.simulate_ict_strategy('ETHUSDT', df_1h, vectorized=False)
+
+        assert [_signal_key(s) for s in batch] == [_signal_key(s) for s in per_bar]
+
+    def test_bar_draws_do_not_depend_on_run_order(self, df_1h):
+        """Test that a single bar evaluated alone matches the full run (shardable)"""
+        engine = ICTStrategyEngine(random_seed=7)
+        signals = engine.simulate_ict_strategy('SOLUSDT', df_1h)
+        assert signals
+
+        mtf_data = engine.prepare_multitimeframe_data(df_1h)
+        last = signals[-1]
+        replayed = engine.generate_ict_signal('SOLUSDT', mtf_data, last.timestamp, random_seed=7)
+        assert replayed is not None and _signal_key(replayed) == _signal_key(last)
+
+    def test_unseeded_run_draws_and_records_seed(self, df_1h):
+        """Test that an unseeded backtest still records a replayable seed"""
+        engine = ICTStrategyEngine()
+        signals = engine.simulate_ict_strategy('BTCUSDT', df_1h)
+        seed = engine.last_simulation_seed
+
+        assert seed is not None
+        replay = engine.simulate_ict_strategy('BTCUSDT', df_1h, random_seed=seed)
+        assert [_signal_key(s) for s in signals] == [_signal_key(s) for s in replay]
@@ -0,0 +1,210 @@
+"""
+Unit tests for utils.streaming_indicators.
+Parity harness: every kernel and the composed indicator state are checked
+against the pandas computations in VolatilityAnalyzer and MeanReversionAnalyzer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from utils.streaming_indicators import (
+        ATR, COLUMNS, EMA, IndicatorState, RollingExtrema, RollingStats, StreamingIndicators, compute_indicators
+    )
+    from utils.volatility_indicators import VolatilityAnalyzer
+    from utils.mean_reversion import MeanReversionAnalyzer
+except ImportError as e:
+    pytest.skip(f"Skipping streaming_indicators tests due to import error: {e}", allow_module_level=True)
+
+
+def candles(bars=1500, seed=0, start_price=30000.0):
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    index = pd.date_range('2025-01-01', periods=bars, freq='15min')
+    return pd.DataFrame({'high': close * (1 + rng.uniform(0, 0.01, bars)),
+                         'low': close * (1 - rng.uniform(0, 0.01, bars)),
+                         'close': close}, index=index)
+
+
+def with_gaps(values, seed=1, every=7):
+    values = np.array(values, dtype=float)
+    values[np.random.default_rng(seed).integers(0, len(values), len(values) // every)] = np.nan
+    return values
+
+
+def stream(kernel, values):
+    return np.array([kernel.update(v) for v in values], dtype=float)
+
+
+class TestKernels:
+    """Individual kernels against pandas"""
+
+    def test_ema_matches_ewm_with_missing_values(self):
+        values = with_gaps(candles()['close'])
+        values[:3] = np.nan
+        expected = pd.Series(values).ewm(span=14, adjust=False).mean().to_numpy()
+        np.testing.assert_array_equal(stream(EMA(span=14), values), expected)
+
+        with pytest.raises(ValueError):
+            EMA()
+        with pytest.raises(ValueError):
+            EMA(alpha=1.5)
+
+    def test_wilder_atr(self):
+        df = candles()
+        prev_close = df['close'].shift(1)
+        tr = pd.concat([df['high'] - df['low'], (df['high'] - prev_close).abs(),
+                        (df['low'] - prev_close).abs()], axis=1).max(axis=1)
+        expected = tr.ewm(alpha=1 / 14, adjust=False).mean().to_numpy()
+
+        atr = ATR(14, wilder=True)
+        result = [atr.update(h, l, c) for h, l, c in df[['high', 'low', 'close']].to_numpy()]
+        np.testing.assert_array_equal(result, expected)
+
+    @pytest.mark.parametrize('window,min_periods', [(20, None), (50, None), (20, 2)])
+    def test_rolling_stats_match_rolling(self, window, min_periods):
+        values = with_gaps(candles(3000)['close'])
+        kernel = RollingStats(window, min_periods)
+        result = np.array([kernel.update(v) for v in values])
+
+        rolling = pd.Series(values).rolling(window, min_periods=min_periods)
+        np.testing.assert_allclose(result[:, 0], rolling.mean(), rtol=1e-12)
+        np.testing.assert_allclose(result[:, 1], rolling.std(), rtol=1e-8)
+
+    def test_flat_window_has_exactly_zero_std(self):
+        values = [1.0, 2.0] + [0.1] * 5 + [0.3]
+        kernel = RollingStats(3)
+        result = [kernel.update(v) for v in values]
+        assert result[6] == (0.1, 0.0)
+        assert result[7][1] > 0
+
+    def test_rolling_extrema_match_rolling(self):
+        values = with_gaps(candles(2000)['high'], every=5)
+        kernel = RollingExtrema(20)
+        result = np.array([kernel.update(v) for v in values])
+
+        series = pd.Series(values)
+        np.testing.assert_array_equal(result[:, 0], series.rolling(20).min())
+        np.testing.assert_array_equal(result[:, 1], series.rolling(20).max())
+
+
+class TestParityHarness:
+    """Composed indicators against the pandas analyzers"""
+
+    @pytest.fixture(params=[0, 1, 2])
+    def df(self, request):
+        return candles(seed=request.param, start_price=[30000.0, 1.5, 0.0002][request.param])
+
+    def test_batch_matches_analyzers(self, df):
+        volatility_analyzer, mean_reversion_analyzer = VolatilityAnalyzer(), MeanReversionAnalyzer()
+        result = compute_indicators(df)
+        assert list(result.columns) == list(COLUMNS)
+
+        np.testing.assert_array_equal(result['atr'], volatility_analyzer.calculate_atr(df))
+        upper, middle, lower = mean_reversion_analyzer.calculate_bollinger_bands(df)
+        np.testing.assert_allclose(result['bb_middle'], middle, rtol=1e-12)
+        np.testing.assert_allclose(result['bb_upper'], upper, rtol=1e-10)
+        np.testing.assert_allclose(result['bb_lower'], lower, rtol=1e-10)
+        np.testing.assert_allclose(result['zscore'], mean_reversion_analyzer.calculate_zscore(df), atol=1e-8)
+        np.testing.assert_array_equal(result['range_high'], df['high'].rolling(20).max())
+        np.testing.assert_array_equal(result['range_low'], df['low'].rolling(20).min())
+
+        for bar in (0, 18, 19, 20, 400, len(df) - 1):
+            expected = volatility_analyzer.calculate_normalized_volatility(df.iloc[:bar + 1])
+            assert result['volatility'].iloc[bar] == pytest.approx(expected, rel=1e-9, nan_ok=True)
+
+    def test_analysis_from_stream_matches_frame_analysis(self, df):
+        volatility_analyzer, mean_reversion_analyzer = VolatilityAnalyzer(), MeanReversionAnalyzer()
+        indicators = StreamingIndicators.for_analyzers(volatility_analyzer, mean_reversion_analyzer)
+        indicators.seed('BTCUSDT', '15m', df.iloc[:-1])
+        values = indicators.update('BTCUSDT', '15m', {**df.iloc[-1], 'timestamp': df.index[-1]})
+        price = df['close'].iloc[-1]
+
+        for direction in ('BUY', 'SELL'):
+            expected = mean_reversion_analyzer.analyze_price_extension(df, direction)
+            result = mean_reversion_analyzer.analyze_price_extension_from_values(
+                price, values['bb_upper'], values['bb_middle'], values['bb_lower'], values['zscore'], direction)
+            assert result['condition'] == expected['condition']
+            assert result['position_multiplier'] == expected['position_multiplier']
+            assert result['zscore'] == pytest.approx(expected['zscore'], abs=1e-8)
+
+        expected = volatility_analyzer.get_atr_analysis(df, price)
+        result = volatility_analyzer.get_atr_analysis_from_values(values['atr'], values['volatility'], price)
+        assert result == pytest.approx(expected, rel=1e-9)
+
+
+class TestStreamingIndicators:
+    """Per symbol/timeframe state"""
+
+    def test_stream_equals_batch(self):
+        df = candles(300)
+        indicators = StreamingIndicators()
+        rows = [indicators.update('ETHUSDT', '15m', {'high': h, 'low': l, 'close': c})
+                for h, l, c in df[['high', 'low', 'close']].to_numpy()]
+        pd.testing.assert_frame_equal(pd.DataFrame(rows, index=df.index)[list(COLUMNS)], compute_indicators(df))
+
+    def test_streams_are_independent_and_duplicates_ignored(self):
+        df = candles(100)
+        indicators = StreamingIndicators()
+        indicators.seed('BTCUSDT', '15m', df)
+        indicators.seed('BTCUSDT', '1h', df.iloc[:30])
+        before = indicators.latest('BTCUSDT', '15m')
+
+        # Re-polled candle at the same timestamp does not advance the state
+        assert indicators.update('BTCUSDT', '15m', {**df.iloc[-1], 'timestamp': df.index[-1]}) == before
+        assert indicators.state('BTCUSDT', '15m').bars == 100
+        assert indicators.state('BTCUSDT', '1h').bars == 30
+        assert indicators.latest('SOLUSDT', '15m') is None
+
+        indicators.reset(timeframe='1h')
+        assert len(indicators) == 1 and indicators.latest('BTCUSDT', '1h') is None
+
+    def test_sync_replays_only_new_candles(self):
+        full = candles(300)
+        indicators = StreamingIndicators()
+
+        def last_row(df):
+            return compute_indicators(df).iloc[-1].to_dict()
+
+        # First sync seeds from the frame; the last candle is evaluated, not committed
+        frame = full.iloc[:200]
+        assert indicators.sync('BTCUSDT', '15m', frame) == last_row(frame)
+        assert indicators.state('BTCUSDT', '15m').bars == 199
+
+        # The forming candle is revised in place
+        revised = frame.copy()
+        revised.iloc[-1, revised.columns.get_loc('close')] *= 1.01
+        assert indicators.sync('BTCUSDT', '15m', revised) == last_row(revised)
+        assert indicators.state('BTCUSDT', '15m').bars == 199
+
+        # Rolling re-fetch: older candles dropped, new ones appended
+        assert indicators.sync('BTCUSDT', '15m', full.iloc[100:]) == last_row(full)
+        assert indicators.state('BTCUSDT', '15m').bars == 299
+
+        # A frame that no longer contains the stream's last candle reseeds it
+        assert indicators.sync('BTCUSDT', '15m', full.iloc[:50], final_until=full.index[49]) == last_row(full.iloc[:50])
+        assert indicators.state('BTCUSDT', '15m').bars == 50
+        assert indicators.sync('BTCUSDT', '15m', full.iloc[:0]) is None
+
+    def test_copy_is_independent(self):
+        df = candles(80)
+        state = IndicatorState()
+        for high, low, close in df[['high', 'low', 'close']].to_numpy()[:60]:
+            state.update(high, low, close)
+        clone = state.copy()
+        rows = df[['high', 'low', 'close']].to_numpy()[60:]
+        for high, low, close in rows:
+            expected = clone.update(high, low, close)
+        assert state.bars == 60
+        for high, low, close in rows:
+            values = state.update(high, low, close)
+        assert values == expected
+
+    def test_analyzer_periods_and_wilder(self):
+        analyzer = MeanReversionAnalyzer(bb_period=10, zscore_period=30)
+        indicators = StreamingIndicators.for_analyzers(mean_reversion_analyzer=analyzer, wilder=True)
+        assert indicators.params == {'bb_period': 10, 'bb_std': 2.0, 'zscore_period': 30, 'wilder': True}
+        state = indicators.state('BTCUSDT', '5m')
+        assert isinstance(state, IndicatorState) and state.bands.window == 10
+        assert state.atr._ema.alpha == pytest.approx(1 / 14)
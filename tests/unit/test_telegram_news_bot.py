@@ -0,0 +1,151 @@
+"""
+Unit tests for systems.fundamental_analysis.telegram_news_bot.
+Tests the compiled keyword matcher against the per-keyword substring
+checks it replaced, batched news inserts and long polling on one session.
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+
+import pytest
+
+try:
+    from aiohttp import web
+    from systems.fundamental_analysis.telegram_news_bot import KeywordMatcher, WatcherGuruTelegramBot
+except ImportError as e:
+    pytest.skip(f"Skipping telegram_news_bot tests due to import error: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def bot(tmp_path):
+    return WatcherGuruTelegramBot(db_path=str(tmp_path / 'telegram_news.db'), poll_timeout=1, batch_size=3)
+
+
+def legacy_analysis(bot, text):
+    """The substring-loop analysis the matcher replaced"""
+    text_lower = text.lower()
+    crypto_mentioned = [crypto for crypto, patterns in bot.crypto_patterns.items()
+                        if any(pattern in text_lower for pattern in patterns)]
+    sentiment, sentiment_score = 'NEUTRAL', 0
+    for sent, keywords in bot.sentiment_keywords.items():
+        matches = sum(1 for keyword in keywords if keyword in text_lower)
+        if matches > sentiment_score:
+            sentiment, sentiment_score = sent, matches
+    price_alert = None
+    for pattern in bot.price_patterns:
+        if pattern in text_lower:
+            price_alert = bot.extract_price_info(text, pattern)
+            break
+    return {
+        'crypto_mentioned': crypto_mentioned,
+        'sentiment': sentiment,
+        'price_alert': price_alert,
+        'importance_score': bot.calculate_importance_score(crypto_mentioned, sentiment, price_alert, text)
+    }
+
+
+def channel_post(update_id, text):
+    return {'update_id': update_id, 'channel_post': {
+        'message_id': update_id, 'date': 1_700_000_000 + update_id, 'text': text,
+        'chat': {'username': 'watcherguru'}}}
+
+
+class TestKeywordMatcher:
+    """Single-pass keyword scanning"""
+
+    def test_reports_overlapping_keywords(self):
+        matcher = KeywordMatcher({'bear': ['fall'], 'price': ['falls below'], 'sol': ['sol'],
+                                  'neutral': ['consolidates']})
+        hits = matcher.scan('btc consolidates, then falls below 100')
+
+        assert hits == {'bear': {'fall'}, 'price': {'falls below'}, 'sol': {'sol'}, 'neutral': {'consolidates'}}
+
+    def test_keyword_in_several_lists_and_special_characters(self):
+        matcher = KeywordMatcher({'a': ['$btc', 'x.y'], 'b': ['$btc']})
+        assert matcher.scan('buy $btc now') == {'a': {'$btc'}, 'b': {'$btc'}}
+        assert matcher.scan('xzy') == {}
+        assert KeywordMatcher({}).scan('anything') == {}
+
+    def test_analysis_matches_substring_checks(self, bot):
+        """Test compiled analysis equals the old per-keyword loops on a random corpus"""
+        rng = random.Random(7)
+        vocabulary = [kw for kws in bot.crypto_patterns.values() for kw in kws]
+        vocabulary += bot.price_patterns + bot.urgent_keywords
+        vocabulary += [kw for kws in bot.sentiment_keywords.values() for kw in kws]
+        vocabulary += ['market', 'traders', '$105,000', '3,700.50', 'consolidation', 'together', 'Breaking:']
+
+        for _ in range(500):
+            words = rng.choices(vocabulary, k=rng.randint(1, 12))
+            text = ' '.join(word.upper() if rng.random() < 0.2 else word for word in words)
+            assert bot.analyze_message(text) == legacy_analysis(bot, text), text
+
+
+class TestBatchedStore:
+    """Batched news and price alert inserts"""
+
+    def test_messages_are_written_in_batches(self, bot):
+        async def process():
+            await bot.process_channel_message(channel_post(1, "🚨 ALERT: Bitcoin falls below $105,000")['channel_post'])
+            await bot.process_channel_message(channel_post(2, "Breaking: Ethereum rallies above $3,700")['channel_post'])
+
+        asyncio.run(process())
+        conn = sqlite3.connect(bot.db_path)
+        assert conn.execute('SELECT COUNT(*) FROM telegram_news').fetchone()[0] == 0
+
+        # Third queued row reaches batch_size
+        bot.store_telegram_news(3, 'watcherguru', '2024-01-01T00:00:00', 'text', bot.analyze_message('BTC pump'))
+        assert conn.execute('SELECT COUNT(*) FROM telegram_news').fetchone()[0] == 3
+        conn.close()
+
+        alerts = bot.get_price_alerts()
+        assert sorted((a['crypto'], a['direction'], a['price']) for a in alerts) == [
+            ('BTC', 'DOWN', 105000.0), ('ETH', 'UP', 3700.0)]
+
+    def test_reads_see_queued_rows(self, bot):
+        bot.store_telegram_news(1, 'watcherguru', '2999-01-01T00:00:00', 'BTC news', bot.analyze_message('BTC'))
+        assert [n['message_id'] for n in bot.get_recent_news(hours=1)] == [1]
+        assert bot.flush_news() == 0
+
+
+class TestLongPolling:
+    """getUpdates long polling on one persistent session"""
+
+    def test_polls_on_one_connection_and_advances_offset(self, bot):
+        async def scenario():
+            polls, connections = [], set()
+            pending = [[channel_post(10, "🚨 ALERT: Bitcoin falls below $105,000"),
+                        channel_post(11, "Breaking: SOL drops to $210 amid correction")]]
+
+            async def get_updates(request):
+                polls.append(dict(request.query))
+                connections.add(id(request.transport))
+                if pending:
+                    return web.json_response({'ok': True, 'result': pending.pop()})
+                await asyncio.sleep(float(request.query['timeout']))  # Idle: hold the poll open
+                bot.stop_monitoring()
+                return web.json_response({'ok': True, 'result': []})
+
+            app = web.Application()
+            app.router.add_get('/botTOKEN/getUpdates', get_updates)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            try:
+                bot.telegram_api_url = f"http://127.0.0.1:{runner.addresses[0][1]}/bot"
+                bot.configure_bot_token('TOKEN')
+                await asyncio.wait_for(bot.start_monitoring(), timeout=5)
+            finally:
+                await runner.cleanup()
+            return polls, connections
+
+        polls, connections = asyncio.run(scenario())
+
+        assert [poll['offset'] for poll in polls] == ['1', '12']
+        assert polls[0]['timeout'] == '1'
+        assert json.loads(polls[0]['allowed_updates']) == ['channel_post', 'message']
+        assert len(connections) == 1
+        assert bot.session is None
+        assert {n['message_id'] for n in bot.get_recent_news(hours=24 * 365 * 100)} == {10, 11}
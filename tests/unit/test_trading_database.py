@@ -0,0 +1,146 @@
+"""
+Unit tests for database.trading_database storage layer.
+Tests WAL pooling, the stored entry_date column, schema migration and
+that the hot dashboard/monitor queries are answered from indexes.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+try:
+    from database.trading_database import TradingDatabase, SCHEMA_INDEXES
+except ImportError as e:
+    pytest.skip(f"Skipping trading_database tests due to import error: {e}", allow_module_level=True)
+
+
+def _signal(i, entry_time):
+    return {
+        'signal_id': f'SIG-{i}', 'symbol': 'BTCUSDT', 'direction': 'BUY', 'entry_price': 100.0,
+        'stop_loss': 98.0, 'take_profit': 104.0, 'confluence_score': 0.7, 'entry_time': entry_time
+    }
+
+
+def _trade(signal_id):
+    return {
+        'signal_id': signal_id, 'symbol': 'BTCUSDT', 'direction': 'BUY', 'entry_price': 100.0,
+        'position_size': 1.0, 'stop_loss': 98.0, 'take_profit': 104.0, 'risk_amount': 1.0
+    }
+
+
+def _query_plan(db, sql, params=()):
+    return ' '.join(row[3] for row in db.conn.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = TradingDatabase(str(tmp_path / "trading.db"))
+    yield database
+    database.close()
+
+
+class TestConnectionPool:
+    """Per-thread WAL connections"""
+
+    def test_wal_and_pragmas(self, db):
+        assert db.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert db.conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+        assert db.conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+
+    def test_connection_per_thread(self, db):
+        """Test each thread gets its own connection and reuses it"""
+        main = db.conn
+        seen = []
+        worker = threading.Thread(target=lambda: seen.extend([db.conn, db.conn, db.count_paper_trades_entered()]))
+        worker.start()
+        worker.join()
+
+        assert db.conn is main
+        assert seen[0] is seen[1] and seen[0] is not main
+        assert db.pool.get_stats()['connections_opened'] == 2
+
+    def test_borrower_close_keeps_connection(self, db):
+        """Test closing a borrowed connection only hands it back"""
+        conn = db._get_connection()
+        conn.close()
+
+        assert db.conn is conn
+        assert db.get_active_signals() == []
+
+    def test_close_and_reopen(self, db):
+        """Test close() shuts the pool and later calls reconnect"""
+        old = db.conn
+        db.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            old.execute('SELECT 1')
+        assert db.get_active_signals() == []
+        assert db.conn is not old
+
+
+class TestEntryDate:
+    """Stored entry_date column"""
+
+    def test_entry_date_follows_entry_time(self, db):
+        db.add_signal(_signal(1, '2024-03-05T23:10:00.123456'))
+        trade_id = db.add_paper_trade(_trade('SIG-1'))
+
+        signal = dict(db.conn.execute("SELECT * FROM signals WHERE signal_id = 'SIG-1'").fetchone())
+        assert signal['entry_date'] == '2024-03-05'
+
+        db.conn.execute("UPDATE paper_trades SET entry_time = '2024-03-04 10:00:00' WHERE id = ?", (trade_id,))
+        db.conn.commit()
+        assert db.count_paper_trades_entered('2024-03-04') == 1
+        assert db.count_paper_trades_entered() == 0
+
+    def test_migrates_existing_database(self, tmp_path):
+        """Test an old schema gains the new columns with entry_date backfilled"""
+        path = str(tmp_path / "old.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute('''
+                CREATE TABLE paper_trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, signal_id TEXT, symbol TEXT NOT NULL,
+                    direction TEXT NOT NULL, entry_price REAL NOT NULL, position_size REAL NOT NULL,
+                    stop_loss REAL NOT NULL, take_profit REAL NOT NULL,
+                    entry_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP, exit_time TIMESTAMP NULL,
+                    exit_price REAL NULL, status TEXT DEFAULT 'OPEN', realized_pnl REAL NULL,
+                    unrealized_pnl REAL NULL, current_price REAL NULL, risk_amount REAL NOT NULL,
+                    created_date DATE DEFAULT (date('now'))
+                )
+            ''')
+            conn.execute('''
+                INSERT INTO paper_trades (symbol, direction, entry_price, position_size, stop_loss,
+                                          take_profit, risk_amount, entry_time)
+                VALUES ('ETHUSDT', 'SELL', 1.0, 1.0, 1.1, 0.9, 1.0, '2024-01-02 08:00:00')
+            ''')
+        conn.close()
+
+        db = TradingDatabase(path)
+        try:
+            assert db.count_paper_trades_entered('2024-01-02') == 1
+            assert db.add_paper_trade({**_trade(None), 'trade_type': 'live', 'order_id': 'ORD-1'})
+            assert db.get_trade_by_order_id('ORD-1')['trade_type'] == 'live'
+        finally:
+            db.close()
+
+
+class TestQueryPlans:
+    """Hot queries use the new indexes"""
+
+    def test_indexes_created(self, db):
+        names = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {name for name, _, _ in SCHEMA_INDEXES} <= names
+
+    @pytest.mark.parametrize('sql, params, index', [
+        ("SELECT * FROM signals WHERE status = 'ACTIVE' ORDER BY entry_time DESC", (),
+         'idx_signals_status_entry_time'),
+        ("SELECT * FROM signals WHERE created_date = ? ORDER BY entry_time DESC", ('2024-01-01',),
+         'idx_signals_created_date'),
+        ("SELECT COUNT(*) FROM paper_trades WHERE entry_date = ?", ('2024-01-01',),
+         'COVERING INDEX idx_paper_trades_entry_date'),
+        ("SELECT * FROM paper_trades WHERE order_id = ?", ('ORD-1',), 'idx_order_id'),
+        ("SELECT 1 FROM paper_trades WHERE signal_id = ?", ('SIG-1',), 'idx_paper_trades_signal_id'),
+    ])
+    def test_query_uses_index(self, db, sql, params, index):
+        assert index in _query_plan(db, sql, params)
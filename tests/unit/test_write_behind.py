@@ -0,0 +1,164 @@
+"""
+Unit tests for database.write_behind and TradingDatabase's write-behind mode.
+Tests batching, ordering, durable barriers, failure isolation and the
+in-memory scan and signal counters.
+"""
+
+import sqlite3
+import threading
+from datetime import timedelta
+
+import pytest
+
+try:
+    from database.write_behind import WriteBehindQueue
+    from database import trading_database
+    from database.trading_database import TradingDatabase
+except ImportError as e:
+    pytest.skip(f"Skipping write_behind tests due to import error: {e}", allow_module_level=True)
+
+
+def _insert(value):
+    return lambda conn: conn.execute('INSERT INTO log (value) VALUES (?)', (value,)).lastrowid
+
+
+@pytest.fixture
+def conn(tmp_path):
+    connection = sqlite3.connect(str(tmp_path / "queue.db"), check_same_thread=False)
+    connection.execute('CREATE TABLE log (id INTEGER PRIMARY KEY, value TEXT UNIQUE)')
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = TradingDatabase(str(tmp_path / "trading.db"))
+    database.start_write_behind(flush_interval_ms=50)
+    yield database
+    database.close()
+
+
+class TestWriteBehindQueue:
+    """Background writer"""
+
+    def test_writes_share_one_transaction_in_order(self, conn):
+        """Test queued writes are committed together in submission order"""
+        queue = WriteBehindQueue(lambda: conn, flush_interval_ms=100)
+        futures = [queue.submit(_insert(str(i))) for i in range(20)]
+        queue.flush()
+
+        assert [f.result() for f in futures] == list(range(1, 21))
+        assert [row[0] for row in conn.execute('SELECT value FROM log ORDER BY id')] == [str(i) for i in range(20)]
+        assert queue.get_stats()['batches'] == 1
+        assert queue.pending == 0
+        queue.stop()
+
+    def test_durable_write_is_a_barrier(self, conn):
+        """Test a durable write commits at once together with everything queued before it"""
+        queue = WriteBehindQueue(lambda: conn, flush_interval_ms=10_000)
+        queue.submit(_insert('mark'))
+        queue.submit(_insert('trade'), durable=True).result(timeout=2)
+
+        assert conn.execute('SELECT COUNT(*) FROM log').fetchone()[0] == 2
+        assert queue.get_stats()['durable_batches'] == 1
+        queue.stop()
+
+    def test_failed_write_does_not_lose_others(self, conn):
+        """Test a failing write only fails its own future"""
+        queue = WriteBehindQueue(lambda: conn, flush_interval_ms=50)
+        first = queue.submit(_insert('a'))
+        duplicate = queue.submit(_insert('a'))
+        last = queue.submit(_insert('b'))
+        queue.flush()
+
+        assert first.result() and last.result()
+        with pytest.raises(sqlite3.IntegrityError):
+            duplicate.result()
+        assert conn.execute('SELECT COUNT(*) FROM log').fetchone()[0] == 2
+        assert queue.get_stats()['failed_writes'] == 1
+        queue.stop()
+
+    def test_stop_commits_pending_writes(self, conn):
+        queue = WriteBehindQueue(lambda: conn, flush_interval_ms=10_000)
+        queue.submit(_insert('x'))
+        queue.stop(timeout=2)
+
+        assert not queue.running
+        assert conn.execute('SELECT COUNT(*) FROM log').fetchone()[0] == 1
+        with pytest.raises(RuntimeError):
+            queue.submit(_insert('y'))
+
+
+class TestTradingDatabaseWriteBehind:
+    """TradingDatabase with write-behind enabled"""
+
+    def test_scan_count_kept_in_memory(self, db):
+        """Test the scan counter is current without waiting for the writer"""
+        db.write_behind.flush_interval = 10.0
+        assert [db.increment_scan_count() for _ in range(3)] == [1, 2, 3]
+        assert db.get_scan_count() == 3
+        assert db.write_behind.pending == 3
+        assert db.get_daily_stats()['scan_count'] == 3
+
+        db.flush()
+        assert db.conn.execute('SELECT scan_count FROM daily_stats').fetchone()[0] == 3
+
+    def test_counters_restart_when_the_date_changes(self, db, monkeypatch):
+        """Test the in-memory scan and signal counts are keyed by date"""
+        db.write_behind.flush_interval = 10.0
+        db.increment_scan_count()
+        for i in range(2):
+            db.add_signal({'signal_id': f'SIG-{i}', 'symbol': 'BTCUSDT', 'direction': 'BUY',
+                           'entry_price': 100.0, 'stop_loss': 98.0, 'take_profit': 104.0})
+        assert (db.get_scan_count(), db.get_signal_count()) == (1, 2)
+        assert db.get_daily_stats()['signals_generated'] == 2
+
+        tomorrow = trading_database.date.today() + timedelta(days=1)
+        monkeypatch.setattr(trading_database, 'date', type('date', (trading_database.date,), {
+            'today': classmethod(lambda cls: tomorrow)}))
+        assert (db.get_scan_count(), db.get_signal_count()) == (0, 0)
+        db.add_signal({'signal_id': 'SIG-2', 'symbol': 'ETHUSDT', 'direction': 'SELL',
+                       'entry_price': 100.0, 'stop_loss': 102.0, 'take_profit': 96.0})
+        assert db.get_signal_count() == 1
+
+        db.flush()
+        assert db.conn.execute('SELECT signals_generated FROM daily_stats WHERE date = ?',
+                               (tomorrow.isoformat(),)).fetchone()[0] == 1
+
+    def test_flush_is_a_read_barrier(self, db):
+        """Test other threads read queued writes once flushed"""
+        db.add_signal({'signal_id': 'SIG-1', 'symbol': 'BTCUSDT', 'direction': 'BUY',
+                       'entry_price': 100.0, 'stop_loss': 98.0, 'take_profit': 104.0})
+        db.flush(durable=False)
+
+        seen = []
+        reader = threading.Thread(target=lambda: seen.append((
+            [s['signal_id'] for s in db.get_active_signals()], db.get_daily_stats()['signals_generated'])))
+        reader.start()
+        reader.join()
+        assert seen == [(['SIG-1'], 1)]
+
+    def test_trade_writes_are_durable(self, db):
+        """Test trade inserts and closes wait for their commit"""
+        trade_id = db.add_paper_trade({'signal_id': None, 'symbol': 'BTCUSDT', 'direction': 'BUY',
+                                       'entry_price': 100.0, 'position_size': 1.0, 'stop_loss': 98.0,
+                                       'take_profit': 104.0, 'risk_amount': 1.0})
+        assert trade_id == 1
+        assert db.write_behind.pending == 0
+
+        assert db.mark_paper_trades([(101.0, 1.0, trade_id)], []) == []
+        closed = db.mark_paper_trades([], [{'id': trade_id, 'signal_id': None, 'exit_price': 104.0,
+                                            'realized_pnl': 4.0, 'close_reason': 'TAKE_PROFIT'}])
+        assert closed == [trade_id]
+        assert db.write_behind.get_stats()['durable_batches'] == 2
+
+    def test_close_flushes_queue(self, tmp_path):
+        path = str(tmp_path / "trading.db")
+        database = TradingDatabase(path)
+        database.start_write_behind(flush_interval_ms=10_000)
+        database.update_balance(123.0)
+        database.close()
+
+        with sqlite3.connect(path) as conn:
+            assert conn.execute('SELECT paper_balance FROM daily_stats').fetchone()[0] == 123.0
@@ -0,0 +1,45 @@
+"""
+Unit tests for trading.zone_store.
+Tests the bounded candle tail behind the detectors' streaming updates.
+"""
+
+import pandas as pd
+import pytest
+
+try:
+    from trading.zone_store import ZoneStore, candle_frame
+except ImportError as e:
+    pytest.skip(f"Skipping zone_store tests due to import error: {e}", allow_module_level=True)
+
+
+def bar(timestamp, price):
+    return {'timestamp': timestamp, 'open': price, 'high': price + 1, 'low': price - 1, 'close': price, 'volume': 10}
+
+
+class TestZoneStore:
+    """Candle tail and seeding"""
+
+    def test_append_keeps_bounded_ordered_tail(self):
+        """Test only newer candles are appended and the tail is capped"""
+        store = ZoneStore(max_candles=3)
+        times = pd.date_range("2024-01-01", periods=5, freq="1h")
+
+        assert all(store.append(bar(t, 100 + i)) for i, t in enumerate(times))
+        assert not store.append(bar(times[-1], 999))
+        assert not store.append(bar(times[0], 999))
+
+        assert store.candle_count == 5
+        assert list(store.candles.index) == list(times[-3:])
+        assert store.candles['close'].tolist() == [102.0, 103.0, 104.0]
+
+    def test_seed_and_series_candles(self):
+        """Test seeding from a frame and appending a row Series without open/volume"""
+        index = pd.date_range("2024-01-01", periods=4, freq="5min")
+        df = pd.DataFrame({'high': [2.0] * 4, 'low': [1.0] * 4, 'close': [1.5] * 4}, index=index)
+        store = ZoneStore(max_candles=10)
+        store.seed(df, ['zone'])
+
+        row = pd.Series({'high': 3.0, 'low': 2.0, 'close': 2.5}, name=index[-1] + pd.Timedelta(minutes=5))
+        assert store.append(row)
+        assert store.candle_count == 5 and store.zones == ['zone']
+        assert candle_frame(row).iloc[0].to_dict() == {'open': 2.5, 'high': 3.0, 'low': 2.0, 'close': 2.5, 'volume': 0.0}
@@ -35,6 +35,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 import json
 
+from trading.swing_points import find_swing_highs, find_swing_lows, window_extreme
+
 logger = logging.getLogger(__name__)
 
 class FibonacciType(Enum):
@@ -340,56 +342,33 @@ class ICTFibonacciAnalyzer:
         """Identify significant swing highs and lows for Fibonacci analysis."""
         try:
             swings = []
-            highs = df['high'].values
-            lows = df['low'].values
+            highs = df['high'].to_numpy(dtype=np.float64)
+            lows = df['low'].to_numpy(dtype=np.float64)
             timestamps = pd.to_datetime(df.index).to_pydatetime()
             
             min_swing_points = int(self.config['swing_confirmation_periods'])
             min_swing_size = self.config['min_swing_size']
             
-            # Find swing highs
-            for i in range(min_swing_points, len(highs) - min_swing_points):
-                is_swing_high = True
-                current_high = highs[i]
-                
-                # Check if it's higher than surrounding candles
-                for j in range(1, min_swing_points + 1):
-                    if (current_high <= highs[i-j] or current_high <= highs[i+j]):
-                        is_swing_high = False
-                        break
-                
-                if is_swing_high:
-                    # Check if swing is significant enough
-                    nearby_low = min(lows[max(0, i-10):min(len(lows), i+10)])
-                    if (current_high - nearby_low) / nearby_low >= min_swing_size:
-                        swings.append({
-                            'type': 'HIGH',
-                            'price': current_high,
-                            'index': i,
-                            'timestamp': timestamps[i]
-                        })
-            
-            # Find swing lows
-            for i in range(min_swing_points, len(lows) - min_swing_points):
-                is_swing_low = True
-                current_low = lows[i]
-                
-                # Check if it's lower than surrounding candles
-                for j in range(1, min_swing_points + 1):
-                    if (current_low >= lows[i-j] or current_low >= lows[i+j]):
-                        is_swing_low = False
-                        break
-                
-                if is_swing_low:
-                    # Check if swing is significant enough
-                    nearby_high = max(highs[max(0, i-10):min(len(highs), i+10)])
-                    if (nearby_high - current_low) / current_low >= min_swing_size:
-                        swings.append({
-                            'type': 'LOW',
-                            'price': current_low,
-                            'index': i,
-                            'timestamp': timestamps[i]
-                        })
+            # Swing size is measured against the opposite extreme of the
+            # surrounding 20 candles
+            swing_highs = find_swing_highs(highs, width=min_swing_points)
+            swing_lows = find_swing_lows(lows, width=min_swing_points)
+            nearby_low = window_extreme(lows, 10, 10, 'min', at=swing_highs.index)
+            nearby_high = window_extreme(highs, 10, 10, 'max', at=swing_lows.index)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                significant_highs = (swing_highs.price - nearby_low) / nearby_low >= min_swing_size
+                significant_lows = (nearby_high - swing_lows.price) / swing_lows.price >= min_swing_size
+            
+            for swing_type, points, significant in (('HIGH', swing_highs, significant_highs),
+                                                    ('LOW', swing_lows, significant_lows)):
+                for i, price in zip(points.index[significant].tolist(), points.price[significant].tolist()):
+                    swings.append({
+                        'type': swing_type,
+                        'price': price,
+                        'index': i,
+                        'timestamp': timestamps[i]
+                    })
             
             # Sort swings by timestamp
             swings.sort(key=lambda x: x['timestamp'])
@@ -31,6 +31,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 
+from trading.zone_store import ZoneStore, zone_store_key
+
 logger = logging.getLogger(__name__)
 
 class FVGType(Enum):
@@ -176,6 +178,9 @@ class FVGDetector:
             'last_scan_time': None
         }
         
+        # Streaming state per symbol/timeframe (see update)
+        self.zone_stores: Dict[str, ZoneStore] = {}
+        
         logger.info("Fair Value Gap Detector initialized with ICT methodology")
     
     def _load_default_config(self) -> Dict:
@@ -222,6 +227,9 @@ class FVGDetector:
             # Crypto-specific adaptations
             'crypto_volatility_multiplier': 1.3, # Adjust for crypto volatility
             'weekend_gap_adjustment': 0.8,    # Reduce weekend gap significance
+            
+            # Streaming updates
+            'stream_history_candles': 200,    # Recent candles kept per symbol/timeframe
         }
     
     def detect_fair_value_gaps(self, df: pd.DataFrame, symbol: str, 
@@ -262,6 +270,9 @@ class FVGDetector:
             # Update FVG states and fill levels
             current_fvgs = self._update_fvg_states(enhanced_fvgs, df)
             
+            # Seed the streaming store so update() continues from here
+            self._zone_store(symbol, timeframe).seed(df, current_fvgs)
+            
             # Filter by relevance and quality
             final_fvgs = self._filter_fair_value_gaps(current_fvgs)
             
@@ -275,6 +286,61 @@ class FVGDetector:
             logger.error(f"Fair Value Gap detection failed for {symbol}: {e}")
             return []
     
+    def update(self, new_candle, symbol: str, timeframe: str = "5T") -> List[FVGZone]:
+        """
+        Advance the Fair Value Gaps of a symbol/timeframe by one closed candle.
+        
+        Only the three-candle pattern completed by the new candle is scanned,
+        and the stored FVGs have their fill state advanced with its close, so
+        the cost per candle does not grow with the history. The store is
+        seeded by detect_fair_value_gaps, or built up from the first candle.
+        
+        Args:
+            new_candle: Closed OHLCV candle (dict or Series with a timestamp)
+            symbol: Trading pair symbol
+            timeframe: Analysis timeframe
+            
+        Returns:
+            Filtered FVGs, as returned by detect_fair_value_gaps
+        """
+        try:
+            store = self._zone_store(symbol, timeframe)
+            if not store.append(new_candle):
+                return self._filter_fair_value_gaps(store.zones)
+            
+            # Enough candles for the volume and ATR lookbacks of the middle candle
+            window = self._prepare_data(store.candles.tail(max(self.config['volume_lookback_periods'], 15) + 1))
+            
+            new_fvgs = []
+            if len(window) >= 3:
+                potential_fvgs = self._scan_for_fvg_patterns(window.tail(3), symbol, timeframe)
+                validated_fvgs = self._validate_fvg_patterns(potential_fvgs, window)
+                classified_fvgs = self._classify_fvg_quality(validated_fvgs, window)
+                new_fvgs = self._calculate_fvg_confluence(classified_fvgs, window)
+            
+            # Drop FVGs past their relevance window, then advance the rest
+            max_age_hours = self.config['max_fvg_age_hours']
+            store.zones = [
+                fvg for fvg in store.zones
+                if (datetime.now() - fvg.creation_time).total_seconds() / 3600 <= max_age_hours
+            ] + new_fvgs
+            store.zones = self._update_fvg_states(store.zones, window)
+            
+            final_fvgs = self._filter_fair_value_gaps(store.zones)
+            self._update_detection_stats(final_fvgs)
+            return final_fvgs
+            
+        except Exception as e:
+            logger.error(f"Incremental FVG update failed for {symbol}: {e}")
+            return []
+    
+    def _zone_store(self, symbol: str, timeframe: str) -> ZoneStore:
+        """Streaming store for a symbol/timeframe, created on first use."""
+        key = zone_store_key(symbol, timeframe)
+        if key not in self.zone_stores:
+            self.zone_stores[key] = ZoneStore(max_candles=self.config['stream_history_candles'])
+        return self.zone_stores[key]
+    
     def _prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare OHLCV data for FVG analysis."""
         try:
@@ -319,36 +385,47 @@ class FVGDetector:
     
     def _scan_for_fvg_patterns(self, df: pd.DataFrame, symbol: str, 
                              timeframe: str) -> List[FVGZone]:
-        """Scan for three-candle Fair Value Gap patterns."""
+        """
+        Scan for three-candle Fair Value Gap patterns.
+
+        The gap, overlap, ATR and volume rules are evaluated for every
+        candle triple at once on shifted arrays; FVGZone objects are only
+        built for the triples that pass. Results are in candle order,
+        bullish before bearish for the same candle.
+        """
         try:
             potential_fvgs = []
+            if len(df) < 3:
+                return potential_fvgs
+            
+            candidates = self._fvg_pattern_candidates(df)
+            hits = sorted(
+                (middle, order, fvg_type, gap)
+                for order, (fvg_type, (valid, gap)) in enumerate(candidates.items())
+                for middle in np.flatnonzero(valid) + 1
+            )
             
-            # Need at least 3 candles for pattern
-            for i in range(1, len(df) - 1):
-                # Get three consecutive candles
-                candle1 = df.iloc[i-1]  # Before candle
-                candle2 = df.iloc[i]    # Gap creation candle (middle)
-                candle3 = df.iloc[i+1]  # After candle
+            for middle, _, fvg_type, gap in hits:
+                candle1 = df.iloc[middle - 1]  # Before candle
+                candle2 = df.iloc[middle]      # Gap creation candle (middle)
+                candle3 = df.iloc[middle + 1]  # After candle
+                k = middle - 1
                 
-                # Check for bullish FVG pattern
-                bullish_fvg = self._check_bullish_fvg_pattern(candle1, candle2, candle3)
-                if bullish_fvg:
-                    fvg_zone = self._create_fvg_zone(
-                        candle1, candle2, candle3, FVGType.BULLISH_FVG, 
-                        bullish_fvg, symbol, timeframe
-                    )
-                    if fvg_zone:
-                        potential_fvgs.append(fvg_zone)
-                
-                # Check for bearish FVG pattern
-                bearish_fvg = self._check_bearish_fvg_pattern(candle1, candle2, candle3)
-                if bearish_fvg:
-                    fvg_zone = self._create_fvg_zone(
-                        candle1, candle2, candle3, FVGType.BEARISH_FVG,
-                        bearish_fvg, symbol, timeframe
-                    )
-                    if fvg_zone:
-                        potential_fvgs.append(fvg_zone)
+                volume_ratio = gap['volume_ratio'][k]
+                gap_data = {
+                    'gap_high': gap['gap_high'][k],
+                    'gap_low': gap['gap_low'][k],
+                    'gap_size': gap['gap_size'][k],
+                    'gap_percentage': gap['gap_percentage'][k],
+                    'volume_ratio': volume_ratio,
+                    'gap_efficiency': self._calculate_gap_efficiency(candle1, candle2, candle3),
+                    'institutional_signature': volume_ratio >= self.config['institutional_volume_ratio']
+                }
+                fvg_zone = self._create_fvg_zone(
+                    candle1, candle2, candle3, fvg_type, gap_data, symbol, timeframe
+                )
+                if fvg_zone:
+                    potential_fvgs.append(fvg_zone)
             
             logger.debug(f"Found {len(potential_fvgs)} potential Fair Value Gaps")
             return potential_fvgs
@@ -357,129 +434,81 @@ class FVGDetector:
             logger.error(f"FVG pattern scanning failed: {e}")
             return []
     
-    def _check_bullish_fvg_pattern(self, candle1: pd.Series, candle2: pd.Series, 
-                                 candle3: pd.Series) -> Optional[Dict]:
+    def _fvg_pattern_candidates(self, df: pd.DataFrame) -> Dict[FVGType, Tuple[np.ndarray, Dict]]:
         """
-        Check for bullish Fair Value Gap pattern.
+        Evaluate the FVG pattern rules for every candle triple.
         
-        Bullish FVG Rules:
-        1. candle1.high < candle3.low (clear gap between them)
-        2. candle2 is the gap creation candle (usually bullish)
-        3. Gap size meets minimum requirements
-        4. Volume confirmation on candle2
-        """
-        try:
-            # Rule 1: Check for clear gap
-            if candle1['high'] >= candle3['low']:
-                # Check for minor overlap if allowed
-                if self.config['allow_minor_overlap']:
-                    overlap = candle1['high'] - candle3['low']
-                    overlap_percentage = overlap / candle1['high']
-                    if overlap_percentage > self.config['overlap_tolerance']:
-                        return None
-                else:
-                    return None
-            
-            # Calculate gap characteristics
-            gap_high = candle3['low']
-            gap_low = candle1['high']
-            gap_size = gap_high - gap_low
-            gap_percentage = gap_size / candle2['close']
-            
-            # Rule 2: Gap size validation
-            if gap_percentage < self.config['min_gap_percentage'] / 100:
-                return None
-            if gap_percentage > self.config['max_gap_percentage'] / 100:
-                return None
-            
-            # Rule 3: ATR ratio validation (if ATR available)
-            if 'atr' in candle2 and not pd.isna(candle2['atr']):
-                atr_ratio = gap_size / candle2['atr']
-                if (atr_ratio < self.config['min_gap_atr_ratio'] or 
-                    atr_ratio > self.config['max_gap_atr_ratio']):
-                    return None
-            
-            # Rule 4: Volume confirmation
-            if self.config['require_volume_confirmation']:
-                volume_ratio = candle2.get('volume_ratio', 1.0)
-                if volume_ratio < self.config['min_volume_ratio']:
-                    return None
-            
-            return {
-                'gap_high': gap_high,
-                'gap_low': gap_low,
-                'gap_size': gap_size,
-                'gap_percentage': gap_percentage,
-                'volume_ratio': candle2.get('volume_ratio', 1.0),
-                'gap_efficiency': self._calculate_gap_efficiency(candle1, candle2, candle3),
-                'institutional_signature': candle2.get('volume_ratio', 1.0) >= self.config['institutional_volume_ratio']
-            }
-            
-        except Exception as e:
-            logger.error(f"Bullish FVG pattern check failed: {e}")
-            return None
-    
-    def _check_bearish_fvg_pattern(self, candle1: pd.Series, candle2: pd.Series,
-                                 candle3: pd.Series) -> Optional[Dict]:
-        """
-        Check for bearish Fair Value Gap pattern.
+        Element k of each array describes the triple whose middle candle
+        is row k + 1 (candle1 = k, candle2 = k + 1, candle3 = k + 2).
         
-        Bearish FVG Rules:
-        1. candle1.low > candle3.high (clear gap between them)
-        2. candle2 is the gap creation candle (usually bearish)
-        3. Gap size meets minimum requirements
-        4. Volume confirmation on candle2
+        Rules per direction (bullish: candle1.high < candle3.low, bearish:
+        candle1.low > candle3.high):
+        1. Clear gap, or an overlap within overlap_tolerance if allowed
+        2. Gap size relative to candle2's close within the configured range
+        3. Gap size relative to candle2's ATR within range; missing ATR skips this rule
+        4. Volume confirmation on candle2; a NaN volume ratio does not reject
+        
+        Returns:
+            Mapping of FVG type to (valid mask, gap arrays)
         """
-        try:
-            # Rule 1: Check for clear gap
-            if candle1['low'] <= candle3['high']:
-                # Check for minor overlap if allowed
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        
+        high1, low1 = high[:-2], low[:-2]
+        high3, low3 = high[2:], low[2:]
+        close2 = close[1:-1]
+        
+        if 'atr' in df.columns:
+            atr2 = df['atr'].to_numpy(dtype=np.float64)[1:-1]
+        else:
+            atr2 = np.full(len(close2), np.nan)
+        if 'volume_ratio' in df.columns:
+            volume_ratio2 = df['volume_ratio'].to_numpy(dtype=np.float64)[1:-1]
+        else:
+            volume_ratio2 = np.ones(len(close2))
+        
+        min_pct = self.config['min_gap_percentage'] / 100
+        max_pct = self.config['max_gap_percentage'] / 100
+        
+        candidates = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for fvg_type, gap_high, gap_low, overlapping, overlap_base in (
+                (FVGType.BULLISH_FVG, low3, high1, high1 >= low3, high1),
+                (FVGType.BEARISH_FVG, low1, high3, low1 <= high3, low1),
+            ):
+                # Rule 1: clear gap, or an overlap within tolerance
                 if self.config['allow_minor_overlap']:
-                    overlap = candle3['high'] - candle1['low']
-                    overlap_percentage = overlap / candle1['low']
-                    if overlap_percentage > self.config['overlap_tolerance']:
-                        return None
+                    overlap_percentage = np.abs(gap_high - gap_low) / overlap_base
+                    rejected = overlapping & (overlap_percentage > self.config['overlap_tolerance'])
                 else:
-                    return None
-            
-            # Calculate gap characteristics
-            gap_high = candle1['low']
-            gap_low = candle3['high']
-            gap_size = gap_high - gap_low
-            gap_percentage = gap_size / candle2['close']
-            
-            # Rule 2: Gap size validation
-            if gap_percentage < self.config['min_gap_percentage'] / 100:
-                return None
-            if gap_percentage > self.config['max_gap_percentage'] / 100:
-                return None
-            
-            # Rule 3: ATR ratio validation (if ATR available)
-            if 'atr' in candle2 and not pd.isna(candle2['atr']):
-                atr_ratio = gap_size / candle2['atr']
-                if (atr_ratio < self.config['min_gap_atr_ratio'] or 
-                    atr_ratio > self.config['max_gap_atr_ratio']):
-                    return None
-            
-            # Rule 4: Volume confirmation
-            if self.config['require_volume_confirmation']:
-                volume_ratio = candle2.get('volume_ratio', 1.0)
-                if volume_ratio < self.config['min_volume_ratio']:
-                    return None
-            
-            return {
-                'gap_high': gap_high,
-                'gap_low': gap_low,
-                'gap_size': gap_size,
-                'gap_percentage': gap_percentage,
-                'volume_ratio': candle2.get('volume_ratio', 1.0),
-                'gap_efficiency': self._calculate_gap_efficiency(candle1, candle2, candle3),
-                'institutional_signature': candle2.get('volume_ratio', 1.0) >= self.config['institutional_volume_ratio']
-            }
-            
-        except Exception as e:
-            logger.error(f"Bearish FVG pattern check failed: {e}")
-            return None
+                    rejected = overlapping.copy()
+                
+                # Rule 2: gap size relative to price
+                gap_size = gap_high - gap_low
+                gap_percentage = gap_size / close2
+                rejected |= (gap_percentage < min_pct) | (gap_percentage > max_pct)
+                
+                # Rule 3: gap size relative to ATR (where ATR is available)
+                atr_ratio = gap_size / atr2
+                rejected |= ~np.isnan(atr2) & (
+                    (atr_ratio < self.config['min_gap_atr_ratio']) |
+                    (atr_ratio > self.config['max_gap_atr_ratio'])
+                )
+                
+                # Rule 4: volume confirmation on the gap candle
+                if self.config['require_volume_confirmation']:
+                    rejected |= volume_ratio2 < self.config['min_volume_ratio']
+                
+                candidates[fvg_type] = (~rejected, {
+                    'gap_high': gap_high,
+                    'gap_low': gap_low,
+                    'gap_size': gap_size,
+                    'gap_percentage': gap_percentage,
+                    'volume_ratio': volume_ratio2,
+                })
+        
+        return candidates
     
     def _calculate_gap_efficiency(self, candle1: pd.Series, candle2: pd.Series, 
                                 candle3: pd.Series) -> float:
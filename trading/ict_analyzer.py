@@ -27,6 +27,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
+from trading.swing_points import find_swing_highs, find_swing_lows
+
 logger = logging.getLogger(__name__)
 
 class TrendDirection(Enum):
@@ -212,6 +214,7 @@ class ICTAnalyzer:
             # Structure settings
             'min_structure_break_size': 0.005,  # 0.5% minimum break
             'structure_confirmation_bars': 2,    # Bars to confirm break
+            'swing_confirmation_bars': 3,        # Bars on each side confirming a swing point
             'min_bos_volume_multiplier': 2.0,   # 2x volume for BoS
             
             # Liquidity settings
@@ -915,8 +918,18 @@ class ICTAnalyzer:
     
     def _identify_swing_points(self, df: pd.DataFrame, price_type: str) -> List[Dict]:
         """Identify swing highs or lows in price data."""
-        # Simplified implementation - would use proper swing point detection
-        return []
+        if len(df) == 0:
+            return []
+        
+        width = self.config['swing_confirmation_bars']
+        if price_type == 'high':
+            points = find_swing_highs(df['high'].to_numpy(dtype=np.float64), width=width)
+        else:
+            points = find_swing_lows(df['low'].to_numpy(dtype=np.float64), width=width)
+        
+        timestamps = df.index
+        return [{'index': i, 'price': price, 'timestamp': timestamps[i]}
+                for i, price in zip(points.index.tolist(), points.price.tolist())]
     
     def _determine_trend_direction(self, swing_highs: List, swing_lows: List) -> TrendDirection:
         """Determine overall trend direction from swing points."""
@@ -30,6 +30,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 import json
 
+from trading.swing_points import find_swing_highs, find_swing_lows
+from trading.zone_store import ZoneStore, zone_store_key
+
 logger = logging.getLogger(__name__)
 
 class LiquidityType(Enum):
@@ -128,6 +131,9 @@ class LiquidityZone:
     # Historical tracking
     all_touches: List[LiquidityTouch] = field(default_factory=list)
     daily_tests: Dict[str, int] = field(default_factory=dict)
+    # Approaches recorded in bulk by the state update (timestamps, prices,
+    # volumes, distances); touches() turns them into LiquidityTouch objects
+    pending_touches: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = field(default=None, repr=False)
     
     # ICT context
     market_session: str = ""       # 'ASIA', 'LONDON', 'NY'
@@ -153,6 +159,25 @@ class LiquidityZone:
             # Default tolerance based on zone size
             zone_size = abs(self.zone_high - self.zone_low)
             self.tolerance = max(zone_size * 0.1, self.exact_level * 0.001)  # 10% of zone or 0.1%
+    
+    def touches(self) -> List[LiquidityTouch]:
+        """All recorded touches, materializing any pending approaches first."""
+        if self.pending_touches is not None:
+            timestamps, prices, volumes, distances = self.pending_touches
+            self.all_touches.extend(
+                LiquidityTouch(
+                    timestamp=timestamp,
+                    price=price,
+                    volume=volume,
+                    touch_type='APPROACH',
+                    rejection_strength=0.5,  # Default
+                    distance_to_level=distance,
+                    follow_through=False
+                )
+                for timestamp, price, volume, distance in zip(timestamps, prices, volumes, distances)
+            )
+            self.pending_touches = None
+        return self.all_touches
 
 @dataclass
 class LiquidityMap:
@@ -231,6 +256,9 @@ class LiquidityDetector:
         self.detected_zones: Dict[str, List[LiquidityZone]] = {}
         self.sweep_history: List[LiquidityZone] = []
         
+        # Streaming state per symbol/timeframe (see update)
+        self.zone_stores: Dict[str, ZoneStore] = {}
+        
         logger.info("ICT Liquidity Detector initialized with institutional parameters")
     
     def _load_default_config(self) -> Dict:
@@ -267,6 +295,9 @@ class LiquidityDetector:
             'primary_timeframes': ['1h', '4h'],  # Primary timeframes for liquidity
             'execution_timeframes': ['1m', '5m'], # Execution timeframes
             'confirmation_timeframes': ['15m', '1h'], # Confirmation timeframes
+            
+            # Streaming updates
+            'stream_history_candles': 500,       # Recent candles kept (covers a 480-candle session)
         }
     
     def detect_liquidity_zones(self, df: pd.DataFrame, symbol: str, timeframe: str) -> LiquidityMap:
@@ -296,46 +327,21 @@ class LiquidityDetector:
             psychological_levels = self._detect_psychological_levels(df, symbol, timeframe, current_price)
             session_extremes = self._detect_session_extremes(df, symbol, timeframe)
             
-            # Classify zones by position relative to current price
-            buy_side_liquidity = []
-            sell_side_liquidity = []
-            
             all_zones = equal_highs + equal_lows + session_extremes
             
-            for zone in all_zones:
-                if zone.exact_level > current_price:
-                    buy_side_liquidity.append(zone)
-                else:
-                    sell_side_liquidity.append(zone)
-            
             # Update zone states and sweep analysis
             self._update_zone_states(all_zones + psychological_levels, df)
             self._analyze_recent_sweeps(all_zones + psychological_levels, df)
             
-            # Determine market bias and next targets
-            liquidity_bias = self._determine_liquidity_bias(buy_side_liquidity, sell_side_liquidity, current_price)
-            next_target = self._identify_next_liquidity_target(buy_side_liquidity + sell_side_liquidity, current_price)
-            
-            # Create liquidity map
-            liquidity_map = LiquidityMap(
-                symbol=symbol,
-                timeframe=timeframe,
-                analysis_timestamp=datetime.now(),
-                buy_side_liquidity=sorted(buy_side_liquidity, key=lambda x: x.exact_level),
-                sell_side_liquidity=sorted(sell_side_liquidity, key=lambda x: x.exact_level, reverse=True),
-                psychological_levels=psychological_levels,
-                session_extremes=session_extremes,
-                recent_sweeps=[z for z in all_zones if z.is_swept and self._is_recent_sweep(z)],
-                pending_sweeps=self._identify_pending_sweeps(all_zones + psychological_levels),
-                current_price=current_price,
-                primary_trend=self._determine_primary_trend(df),
-                liquidity_bias=liquidity_bias,
-                next_target=next_target
+            liquidity_map = self._assemble_liquidity_map(
+                df, symbol, timeframe, all_zones, psychological_levels, session_extremes
             )
             
-            # Cache results
-            cache_key = f"{symbol}_{timeframe}"
-            self.detected_zones[cache_key] = all_zones + psychological_levels
+            # Seed the streaming store so update() continues from here
+            store = self._zone_store(symbol, timeframe)
+            store.seed(df, all_zones + psychological_levels)
+            store.extra['psychological_key'] = self._psychological_key(current_price)
+            self._seed_pending_swings(store)
             
             logger.debug(f"Detected {liquidity_map.total_zones} liquidity zones for {symbol}")
             return liquidity_map
@@ -344,6 +350,256 @@ class LiquidityDetector:
             logger.error(f"Liquidity zone detection failed for {symbol} {timeframe}: {e}")
             return self._create_empty_liquidity_map(symbol, timeframe, current_price if 'current_price' in locals() else 0)
     
+    def _assemble_liquidity_map(self, df: pd.DataFrame, symbol: str, timeframe: str,
+                                all_zones: List[LiquidityZone], psychological_levels: List[LiquidityZone],
+                                session_extremes: List[LiquidityZone]) -> LiquidityMap:
+        """Build the LiquidityMap from zones whose state is up to date, and cache the zones."""
+        current_price = df['close'].iloc[-1]
+        
+        # Classify zones by position relative to current price
+        buy_side_liquidity = []
+        sell_side_liquidity = []
+        
+        for zone in all_zones:
+            if zone.exact_level > current_price:
+                buy_side_liquidity.append(zone)
+            else:
+                sell_side_liquidity.append(zone)
+        
+        # Determine market bias and next targets
+        liquidity_bias = self._determine_liquidity_bias(buy_side_liquidity, sell_side_liquidity, current_price)
+        next_target = self._identify_next_liquidity_target(buy_side_liquidity + sell_side_liquidity, current_price)
+        
+        # Create liquidity map
+        liquidity_map = LiquidityMap(
+            symbol=symbol,
+            timeframe=timeframe,
+            analysis_timestamp=datetime.now(),
+            buy_side_liquidity=sorted(buy_side_liquidity, key=lambda x: x.exact_level),
+            sell_side_liquidity=sorted(sell_side_liquidity, key=lambda x: x.exact_level, reverse=True),
+            psychological_levels=psychological_levels,
+            session_extremes=session_extremes,
+            recent_sweeps=[z for z in all_zones if z.is_swept and self._is_recent_sweep(z)],
+            pending_sweeps=self._identify_pending_sweeps(all_zones + psychological_levels),
+            current_price=current_price,
+            primary_trend=self._determine_primary_trend(df),
+            liquidity_bias=liquidity_bias,
+            next_target=next_target
+        )
+        
+        # Cache results
+        cache_key = f"{symbol}_{timeframe}"
+        self.detected_zones[cache_key] = all_zones + psychological_levels
+        
+        return liquidity_map
+    
+    def update(self, new_candle, symbol: str, timeframe: str) -> LiquidityMap:
+        """
+        Advance the liquidity map of a symbol/timeframe by one closed candle.
+        
+        Per candle only the patterns the new candle completes are evaluated:
+        the swing point it confirms (which extends an equal highs/lows zone at
+        its level or pairs up with earlier unmatched swings), the session it
+        closes and, when price moves to other round numbers, the
+        psychological levels. Stored zones are advanced by the new candle
+        alone; expired zones and sweeps older than 24h leave the store. The
+        store is seeded by detect_liquidity_zones, or built up from the first
+        candle.
+        
+        Args:
+            new_candle: Closed OHLCV candle (dict or Series with a timestamp)
+            symbol: Trading symbol
+            timeframe: Chart timeframe
+            
+        Returns:
+            LiquidityMap over the stored zones
+        """
+        try:
+            store = self._zone_store(symbol, timeframe)
+            candles = store.candles
+            if store.append(new_candle):
+                candles = store.candles
+                new_zones = self._stream_equal_levels(store, symbol, timeframe, 'high') + \
+                    self._stream_equal_levels(store, symbol, timeframe, 'low')
+                
+                session_size = self._session_size(timeframe)
+                if self.config['session_extreme_tracking'] and store.candle_count % session_size == 0:
+                    new_zones += self._detect_session_extremes(
+                        candles.tail(session_size), symbol, timeframe, first_index=store.candle_count - session_size
+                    )
+                
+                # Existing zones only see the new candle; new ones get the full lookback
+                self._update_zone_states(store.zones, candles, lookback=1)
+                self._update_zone_states(new_zones, candles)
+                store.zones += new_zones
+                self._refresh_psychological_levels(store, symbol, timeframe)
+                
+                # Post-sweep reaction only changes while the sweep is within the last 10 candles
+                recent_start = candles.index[max(0, len(candles) - 11)].to_pydatetime()
+                self._analyze_recent_sweeps(
+                    [z for z in store.zones if z.is_swept and z.sweep_timestamp and z.sweep_timestamp >= recent_start],
+                    candles
+                )
+                
+                store.zones = [zone for zone in store.zones if self._is_live_zone(zone)]
+            
+            if candles.empty:
+                return self._create_empty_liquidity_map(symbol, timeframe, 0)
+            
+            psychological_levels = [z for z in store.zones if z.zone_type == LiquidityType.PSYCHOLOGICAL_LEVEL]
+            session_extremes = [z for z in store.zones
+                                if z.zone_type in [LiquidityType.SESSION_HIGH, LiquidityType.SESSION_LOW]]
+            equal_levels = [z for z in store.zones
+                            if z.zone_type in [LiquidityType.EQUAL_HIGHS, LiquidityType.EQUAL_LOWS]]
+            return self._assemble_liquidity_map(
+                candles, symbol, timeframe, equal_levels + session_extremes, psychological_levels, session_extremes
+            )
+            
+        except Exception as e:
+            logger.error(f"Incremental liquidity update failed for {symbol} {timeframe}: {e}")
+            return self._create_empty_liquidity_map(symbol, timeframe, 0)
+    
+    def _zone_store(self, symbol: str, timeframe: str) -> ZoneStore:
+        """Streaming store for a symbol/timeframe, created on first use."""
+        key = zone_store_key(symbol, timeframe)
+        if key not in self.zone_stores:
+            self.zone_stores[key] = ZoneStore(max_candles=self.config['stream_history_candles'])
+        return self.zone_stores[key]
+    
+    def _stream_equal_levels(self, store: ZoneStore, symbol: str, timeframe: str, side: str) -> List[LiquidityZone]:
+        """
+        Handle the swing high/low confirmed by the newest candle.
+        
+        A swing within tolerance of an existing equal highs/lows zone's
+        anchor (its lowest swing, as in _group_similar_levels) joins that
+        zone; otherwise it groups with earlier unmatched swings at its level,
+        or waits for one.
+        
+        Returns:
+            Newly formed zones
+        """
+        candles = store.candles
+        if len(candles) < 3:
+            return []
+        
+        values = candles[side].to_numpy(dtype=np.float64)[-3:]
+        if side == 'high':
+            zone_type, prefix = LiquidityType.EQUAL_HIGHS, 'EH'
+            confirmed = len(find_swing_highs(values, width=1, min_prominence=0.002)) > 0
+        else:
+            zone_type, prefix = LiquidityType.EQUAL_LOWS, 'EL'
+            confirmed = len(find_swing_lows(values, width=1, min_prominence=0.002)) > 0
+        if not confirmed:
+            return []
+        
+        swing = self._swing_record(candles, len(candles) - 2)
+        price = swing[side]
+        
+        for zone in store.zones:
+            if zone.zone_type == zone_type and abs(price - zone.zone_low) / zone.zone_low <= self.equal_level_tolerance:
+                extended = self._equal_level_zone_from_candles(
+                    zone.zone_id, zone_type, timeframe, zone.formation_candles + [swing], candles, side
+                )
+                for name in ('exact_level', 'zone_high', 'zone_low', 'zone_mid', 'tolerance', 'formation_candles',
+                             'touch_count', 'formation_volume', 'formation_strength', 'estimated_stops',
+                             'institutional_interest', 'retail_concentration', 'liquidity_depth', 'quality',
+                             'strength_score'):
+                    setattr(zone, name, getattr(extended, name))
+                zone.times_tested += 1
+                return []
+        
+        # Unmatched swings are kept while a zone formed from them would still be in date
+        oldest = swing['timestamp'] - timedelta(hours=self.max_age_hours)
+        pending = [c for c in store.extra.get(f'pending_{side}s', []) if c['timestamp'] >= oldest]
+        matched = [c for c in pending if abs(c[side] - price) / min(c[side], price) <= self.equal_level_tolerance]
+        
+        if len(matched) + 1 < self.min_touches_for_liquidity:
+            store.extra[f'pending_{side}s'] = pending + [swing]
+            return []
+        
+        store.extra[f'pending_{side}s'] = [c for c in pending if c not in matched]
+        zone_id = f"{prefix}_{symbol}_{timeframe}_{store.candle_count - 2}"
+        return [self._equal_level_zone_from_candles(zone_id, zone_type, timeframe, matched + [swing], candles, side)]
+    
+    @staticmethod
+    def _swing_record(candles: pd.DataFrame, position: int) -> Dict:
+        """Swing candle in the formation_candles record format."""
+        return {
+            'timestamp': candles.index[position].to_pydatetime(),
+            'high': candles['high'].iloc[position],
+            'low': candles['low'].iloc[position],
+            'volume': candles['volume'].iloc[position]
+        }
+    
+    def _seed_pending_swings(self, store: ZoneStore) -> None:
+        """Record the stored tail's swings that did not form an equal highs/lows zone."""
+        candles = store.candles
+        for side, zone_type, find_swings in (('high', LiquidityType.EQUAL_HIGHS, find_swing_highs),
+                                             ('low', LiquidityType.EQUAL_LOWS, find_swing_lows)):
+            swings = find_swings(candles[side].to_numpy(dtype=np.float64), width=1, min_prominence=0.002)
+            grouped = {c['timestamp'] for z in store.zones if z.zone_type == zone_type for c in z.formation_candles}
+            records = [self._swing_record(candles, i) for i in swings.index]
+            store.extra[f'pending_{side}s'] = [c for c in records if c['timestamp'] not in grouped]
+    
+    def _equal_level_zone_from_candles(self, zone_id: str, zone_type: LiquidityType, timeframe: str,
+                                       swing_candles: List[Dict], candles: pd.DataFrame, side: str) -> LiquidityZone:
+        """
+        Equal highs/lows zone from swing candle records (formation_candles format).
+        
+        Volume averages are taken over the stored candle tail plus any swing
+        candles that have already dropped out of it.
+        """
+        volumes = candles['volume'].to_numpy(dtype=np.float64)
+        highs = candles['high'].to_numpy(dtype=np.float64)
+        lows = candles['low'].to_numpy(dtype=np.float64)
+        timestamps = pd.to_datetime(candles.index).to_pydatetime()
+        
+        positions = candles.index.get_indexer(pd.to_datetime([c['timestamp'] for c in swing_candles]))
+        outside = [c for c, position in zip(swing_candles, positions) if position < 0]
+        if outside:
+            positions[positions < 0] = np.arange(len(candles), len(candles) + len(outside))
+            volumes = np.append(volumes, [c['volume'] for c in outside])
+            highs = np.append(highs, [c['high'] for c in outside])
+            lows = np.append(lows, [c['low'] for c in outside])
+            timestamps = np.append(timestamps, [c['timestamp'] for c in outside])
+        
+        prices = highs if side == 'high' else lows
+        group = sorted(((int(i), prices[i]) for i in positions), key=lambda point: point[1])
+        return self._create_equal_level_zone(zone_id, zone_type, timeframe, group, highs, lows, volumes, timestamps)
+    
+    def _psychological_key(self, current_price: float) -> Tuple:
+        """Round-number levels around a price; psychological levels are refreshed when it changes."""
+        return tuple(round(current_price / precision) for precision in self.round_number_precision)
+    
+    def _refresh_psychological_levels(self, store: ZoneStore, symbol: str, timeframe: str) -> None:
+        """Re-detect psychological levels when price has moved to other round numbers."""
+        current_price = store.candles['close'].iloc[-1]
+        key = self._psychological_key(current_price)
+        if store.extra.get('psychological_key') == key:
+            return
+        store.extra['psychological_key'] = key
+        
+        # Levels that are still detected keep their zone (and its state)
+        existing = {z.exact_level: z for z in store.zones if z.zone_type == LiquidityType.PSYCHOLOGICAL_LEVEL}
+        detected = self._detect_psychological_levels(store.candles, symbol, timeframe, current_price)
+        new_levels = [zone for zone in detected if zone.exact_level not in existing]
+        self._update_zone_states(new_levels, store.candles)
+        
+        kept = {zone.exact_level for zone in detected}
+        store.zones = [z for z in store.zones
+                       if z.zone_type != LiquidityType.PSYCHOLOGICAL_LEVEL or z.exact_level in kept] + new_levels
+    
+    def _is_live_zone(self, zone: LiquidityZone) -> bool:
+        """Whether a stored zone can still matter to the liquidity map."""
+        if zone.state == LiquidityState.EXPIRED:
+            return False
+        if zone.is_swept and not self._is_recent_sweep(zone):
+            return False
+        if zone.zone_type in [LiquidityType.SESSION_HIGH, LiquidityType.SESSION_LOW]:
+            # Same window as _detect_session_extremes
+            return zone.formation_timestamp > datetime.now() - timedelta(days=7)
+        return True
+    
     def _detect_equal_highs(self, df: pd.DataFrame, symbol: str, timeframe: str) -> List[LiquidityZone]:
         """Detect equal highs (resistance levels where retail stops cluster)."""
         try:
@@ -367,41 +623,10 @@ class LiquidityDetector:
             for group in peak_groups:
                 if len(group) >= self.min_touches_for_liquidity:
                     # Create liquidity zone for equal highs
-                    indices, prices = zip(*group)
-                    
-                    zone = LiquidityZone(
-                        zone_id=f"EH_{symbol}_{timeframe}_{len(equal_highs)}",
-                        zone_type=LiquidityType.EQUAL_HIGHS,
-                        formation_timestamp=timestamps[indices[0]],
-                        timeframe=timeframe,
-                        exact_level=np.mean(prices),
-                        zone_high=max(prices),
-                        zone_low=min(prices),
-                        zone_mid=np.mean(prices),
-                        tolerance=self.equal_level_tolerance * np.mean(prices),
-                        formation_candles=[{
-                            'timestamp': timestamps[i],
-                            'high': highs[i],
-                            'low': df['low'].iloc[i],
-                            'volume': volumes[i]
-                        } for i in indices],
-                        touch_count=len(group),
-                        formation_volume=np.mean([volumes[i] for i in indices]),
-                        formation_strength=self._calculate_formation_strength(group, volumes, indices),
-                        estimated_stops=self._estimate_stop_concentration(prices, 'above'),
-                        institutional_interest=self._calculate_institutional_interest(volumes, indices),
-                        retail_concentration=self._calculate_retail_concentration(group),
-                        liquidity_depth=self._calculate_liquidity_depth(group, volumes, indices),
-                        state=LiquidityState.UNTESTED,
-                        quality=self._classify_zone_quality(len(group), volumes, indices),
-                        times_tested=len(group) - 1,  # Formation doesn't count as test
-                        market_session=self._get_market_session(timestamps[indices[0]]),
-                        accuracy_score=0.8,  # Default, will be updated with testing
-                        reliability_score=0.7,  # Default, will be updated
-                        strength_score=self._calculate_formation_strength(group, volumes, indices)
-                    )
-                    
-                    equal_highs.append(zone)
+                    equal_highs.append(self._create_equal_level_zone(
+                        f"EH_{symbol}_{timeframe}_{len(equal_highs)}", LiquidityType.EQUAL_HIGHS, timeframe,
+                        group, highs, df['low'].values, volumes, timestamps
+                    ))
             
             logger.debug(f"Detected {len(equal_highs)} equal high zones")
             return equal_highs
@@ -433,41 +658,10 @@ class LiquidityDetector:
             for group in trough_groups:
                 if len(group) >= self.min_touches_for_liquidity:
                     # Create liquidity zone for equal lows
-                    indices, prices = zip(*group)
-                    
-                    zone = LiquidityZone(
-                        zone_id=f"EL_{symbol}_{timeframe}_{len(equal_lows)}",
-                        zone_type=LiquidityType.EQUAL_LOWS,
-                        formation_timestamp=timestamps[indices[0]],
-                        timeframe=timeframe,
-                        exact_level=np.mean(prices),
-                        zone_high=max(prices),
-                        zone_low=min(prices),
-                        zone_mid=np.mean(prices),
-                        tolerance=self.equal_level_tolerance * np.mean(prices),
-                        formation_candles=[{
-                            'timestamp': timestamps[i],
-                            'high': df['high'].iloc[i],
-                            'low': lows[i],
-                            'volume': volumes[i]
-                        } for i in indices],
-                        touch_count=len(group),
-                        formation_volume=np.mean([volumes[i] for i in indices]),
-                        formation_strength=self._calculate_formation_strength(group, volumes, indices),
-                        estimated_stops=self._estimate_stop_concentration(prices, 'below'),
-                        institutional_interest=self._calculate_institutional_interest(volumes, indices),
-                        retail_concentration=self._calculate_retail_concentration(group),
-                        liquidity_depth=self._calculate_liquidity_depth(group, volumes, indices),
-                        state=LiquidityState.UNTESTED,
-                        quality=self._classify_zone_quality(len(group), volumes, indices),
-                        times_tested=len(group) - 1,
-                        market_session=self._get_market_session(timestamps[indices[0]]),
-                        accuracy_score=0.8,
-                        reliability_score=0.7,
-                        strength_score=self._calculate_formation_strength(group, volumes, indices)
-                    )
-                    
-                    equal_lows.append(zone)
+                    equal_lows.append(self._create_equal_level_zone(
+                        f"EL_{symbol}_{timeframe}_{len(equal_lows)}", LiquidityType.EQUAL_LOWS, timeframe,
+                        group, df['high'].values, lows, volumes, timestamps
+                    ))
             
             logger.debug(f"Detected {len(equal_lows)} equal low zones")
             return equal_lows
@@ -476,6 +670,51 @@ class LiquidityDetector:
             logger.error(f"Equal lows detection failed: {e}")
             return []
     
+    def _create_equal_level_zone(self, zone_id: str, zone_type: LiquidityType, timeframe: str,
+                                 group: List[Tuple[int, float]], highs: np.ndarray, lows: np.ndarray,
+                                 volumes: np.ndarray, timestamps: np.ndarray) -> LiquidityZone:
+        """
+        Build an equal highs/lows zone from a group of swing points.
+        
+        Args:
+            group: (candle position, price) per swing, sorted by price
+            highs, lows, volumes, timestamps: Candle arrays the positions index
+        """
+        indices, prices = zip(*group)
+        direction = 'above' if zone_type == LiquidityType.EQUAL_HIGHS else 'below'
+        
+        return LiquidityZone(
+            zone_id=zone_id,
+            zone_type=zone_type,
+            formation_timestamp=timestamps[indices[0]],
+            timeframe=timeframe,
+            exact_level=np.mean(prices),
+            zone_high=max(prices),
+            zone_low=min(prices),
+            zone_mid=np.mean(prices),
+            tolerance=self.equal_level_tolerance * np.mean(prices),
+            formation_candles=[{
+                'timestamp': timestamps[i],
+                'high': highs[i],
+                'low': lows[i],
+                'volume': volumes[i]
+            } for i in indices],
+            touch_count=len(group),
+            formation_volume=np.mean([volumes[i] for i in indices]),
+            formation_strength=self._calculate_formation_strength(group, volumes, indices),
+            estimated_stops=self._estimate_stop_concentration(prices, direction),
+            institutional_interest=self._calculate_institutional_interest(volumes, indices),
+            retail_concentration=self._calculate_retail_concentration(group),
+            liquidity_depth=self._calculate_liquidity_depth(group, volumes, indices),
+            state=LiquidityState.UNTESTED,
+            quality=self._classify_zone_quality(len(group), volumes, indices),
+            times_tested=len(group) - 1,  # Formation doesn't count as test
+            market_session=self._get_market_session(timestamps[indices[0]]),
+            accuracy_score=0.8,  # Default, will be updated with testing
+            reliability_score=0.7,  # Default, will be updated
+            strength_score=self._calculate_formation_strength(group, volumes, indices)
+        )
+    
     def _detect_psychological_levels(self, df: pd.DataFrame, symbol: str, timeframe: str, current_price: float) -> List[LiquidityZone]:
         """Detect psychological levels (round numbers that attract retail orders)."""
         try:
@@ -538,8 +777,14 @@ class LiquidityDetector:
             logger.error(f"Psychological levels detection failed: {e}")
             return []
     
-    def _detect_session_extremes(self, df: pd.DataFrame, symbol: str, timeframe: str) -> List[LiquidityZone]:
-        """Detect session high/low levels that often act as liquidity zones."""
+    def _detect_session_extremes(self, df: pd.DataFrame, symbol: str, timeframe: str,
+                                 first_index: int = 0) -> List[LiquidityZone]:
+        """
+        Detect session high/low levels that often act as liquidity zones.
+        
+        first_index is the position of df's first candle in the full history
+        (used in zone ids when df is a streamed tail).
+        """
         try:
             if not self.config['session_extreme_tracking']:
                 return []
@@ -548,7 +793,7 @@ class LiquidityDetector:
             
             # Group data by trading sessions (simplified)
             # In real implementation, you'd use proper session times
-            session_size = 24 if timeframe in ['1h', '4h'] else 480  # Hours or minutes
+            session_size = self._session_size(timeframe)
             
             for i in range(0, len(df), session_size):
                 session_data = df.iloc[i:i+session_size]
@@ -562,7 +807,7 @@ class LiquidityDetector:
                 
                 # Create session high zone
                 high_zone = LiquidityZone(
-                    zone_id=f"SH_{symbol}_{timeframe}_{i}",
+                    zone_id=f"SH_{symbol}_{timeframe}_{first_index + i}",
                     zone_type=LiquidityType.SESSION_HIGH,
                     formation_timestamp=pd.to_datetime(session_data.index[0]).to_pydatetime(),
                     timeframe=timeframe,
@@ -590,7 +835,7 @@ class LiquidityDetector:
                 
                 # Create session low zone
                 low_zone = LiquidityZone(
-                    zone_id=f"SL_{symbol}_{timeframe}_{i}",
+                    zone_id=f"SL_{symbol}_{timeframe}_{first_index + i}",
                     zone_type=LiquidityType.SESSION_LOW,
                     formation_timestamp=pd.to_datetime(session_data.index[0]).to_pydatetime(),
                     timeframe=timeframe,
@@ -629,18 +874,15 @@ class LiquidityDetector:
             logger.error(f"Session extremes detection failed: {e}")
             return []
     
+    @staticmethod
+    def _session_size(timeframe: str) -> int:
+        """Candles per session block (simplified fixed-size sessions)."""
+        return 24 if timeframe in ['1h', '4h'] else 480  # Hours or minutes
+    
     def _find_local_peaks(self, data: np.ndarray, prominence: float = 0.002) -> List[int]:
         """Find local peaks in price data."""
         try:
-            peaks = []
-            
-            for i in range(1, len(data) - 1):
-                if data[i] > data[i-1] and data[i] > data[i+1]:
-                    # Check prominence
-                    if data[i] / max(data[i-1], data[i+1]) - 1 >= prominence:
-                        peaks.append(i)
-            
-            return peaks
+            return find_swing_highs(data, width=1, min_prominence=prominence).index.tolist()
             
         except Exception as e:
             logger.error(f"Peak finding failed: {e}")
@@ -649,15 +891,7 @@ class LiquidityDetector:
     def _find_local_troughs(self, data: np.ndarray, prominence: float = 0.002) -> List[int]:
         """Find local troughs in price data."""
         try:
-            troughs = []
-            
-            for i in range(1, len(data) - 1):
-                if data[i] < data[i-1] and data[i] < data[i+1]:
-                    # Check prominence
-                    if 1 - data[i] / min(data[i-1], data[i+1]) >= prominence:
-                        troughs.append(i)
-            
-            return troughs
+            return find_swing_lows(data, width=1, min_prominence=prominence).index.tolist()
             
         except Exception as e:
             logger.error(f"Trough finding failed: {e}")
@@ -821,29 +1055,21 @@ class LiquidityDetector:
     def _check_psychological_level_significance(self, df: pd.DataFrame, level: float) -> float:
         """Check how significant a psychological level has been historically."""
         try:
-            tolerance = level * 0.002  # 0.2% tolerance
+            high = df['high'].to_numpy(dtype=np.float64)
+            low = df['low'].to_numpy(dtype=np.float64)
+            close = df['close'].to_numpy(dtype=np.float64)
+            prev_close = np.concatenate([close[:1], close[:-1]])  # First candle compares with itself
             
             # Count how many times price touched this level
-            touches = 0
-            reactions = 0
-            
-            for i, row in df.iterrows():
-                high = row['high']
-                low = row['low']
-                close = row['close']
-                prev_close = df['close'].iloc[max(0, df.index.get_loc(i) - 1)]
-                
-                # Check if candle touched the level
-                if low <= level <= high:
-                    touches += 1
-                    
-                    # Check for reaction (reversal after touch)
-                    if abs(close - level) > abs(prev_close - level):
-                        reactions += 1
+            touched = (low <= level) & (level <= high)
+            touches = int(touched.sum())
             
             if touches == 0:
                 return 0.0
             
+            # Check for reaction (reversal after touch)
+            reactions = int((touched & (np.abs(close - level) > np.abs(prev_close - level))).sum())
+            
             # Significance based on touches and reaction rate
             reaction_rate = reactions / touches
             touch_significance = min(touches / 10.0, 1.0)  # Max significance at 10 touches
@@ -898,85 +1124,86 @@ class LiquidityDetector:
         else:
             return 'TRANSITION'
     
-    def _update_zone_states(self, zones: List[LiquidityZone], df: pd.DataFrame) -> None:
-        """Update the state of all liquidity zones based on recent price action."""
-        try:
-            for zone in zones:
-                self._update_single_zone_state(zone, df)
-                
-        except Exception as e:
-            logger.error(f"Zone state update failed: {e}")
-    
-    def _update_single_zone_state(self, zone: LiquidityZone, df: pd.DataFrame) -> None:
-        """Update state of a single liquidity zone."""
+    def _update_zone_states(self, zones: List[LiquidityZone], df: pd.DataFrame, lookback: int = 50) -> None:
+        """
+        Update the state of all liquidity zones based on recent price action.
+        
+        Levels and tolerances of all zones are stacked into arrays and tested
+        against the last `lookback` candles in one (zones x candles) broadcast
+        (update() passes 1 to advance stored zones by the new candle), so the
+        cost is linear in zones + candles. Each unswept equal/session high
+        (low) is swept by the first candle whose high (low) clears the level
+        by more than its tolerance; every close within 0.5% of the level is
+        an approach. Approaches are kept as arrays on the zone until
+        LiquidityZone.touches() is called.
+        """
         try:
-            current_price = df['close'].iloc[-1]
-            
-            # Check for sweeps in recent data
-            recent_data = df.tail(50)  # Last 50 candles
+            if not zones:
+                return
             
-            for i, row in recent_data.iterrows():
-                high = row['high']
-                low = row['low']
-                close = row['close']
-                timestamp = pd.to_datetime(i).to_pydatetime()
-                
-                # Check if zone was swept
-                if zone.zone_type in [LiquidityType.EQUAL_HIGHS, LiquidityType.SESSION_HIGH]:
-                    # Buy side liquidity sweep (price above level)
-                    if high > zone.exact_level + zone.tolerance:
-                        if not zone.is_swept:
-                            zone.is_swept = True
-                            zone.sweep_timestamp = timestamp
-                            zone.state = LiquidityState.SWEPT
-                            zone.sweep_pattern = self._classify_sweep_pattern(row, zone)
-                            zone.sweep_volume = row.get('volume', 0)
-                            
-                            # Check post-sweep reaction
-                            if i < len(df) - 1:
-                                next_close = df['close'].iloc[df.index.get_loc(i) + 1]
-                                zone.post_sweep_reaction = abs(next_close - close) / close
-                
-                elif zone.zone_type in [LiquidityType.EQUAL_LOWS, LiquidityType.SESSION_LOW]:
-                    # Sell side liquidity sweep (price below level)
-                    if low < zone.exact_level - zone.tolerance:
-                        if not zone.is_swept:
-                            zone.is_swept = True
-                            zone.sweep_timestamp = timestamp
-                            zone.state = LiquidityState.SWEPT
-                            zone.sweep_pattern = self._classify_sweep_pattern(row, zone)
-                            zone.sweep_volume = row.get('volume', 0)
-                            
-                            # Check post-sweep reaction
-                            if i < len(df) - 1:
-                                next_close = df['close'].iloc[df.index.get_loc(i) + 1]
-                                zone.post_sweep_reaction = abs(next_close - close) / close
+            recent_data = df.tail(lookback)
+            high = recent_data['high'].to_numpy(dtype=np.float64)
+            low = recent_data['low'].to_numpy(dtype=np.float64)
+            close = recent_data['close'].to_numpy(dtype=np.float64)
+            volume = (recent_data['volume'].to_numpy(dtype=np.float64) if 'volume' in recent_data.columns
+                      else np.zeros(len(recent_data)))
+            timestamps = np.array(pd.to_datetime(recent_data.index).to_pydatetime(), dtype=object)
+            
+            level = np.array([zone.exact_level for zone in zones], dtype=np.float64)[:, None]
+            tolerance = np.array([zone.tolerance for zone in zones], dtype=np.float64)[:, None]
+            high_side = np.array([zone.zone_type in [LiquidityType.EQUAL_HIGHS, LiquidityType.SESSION_HIGH]
+                                  for zone in zones])
+            low_side = np.array([zone.zone_type in [LiquidityType.EQUAL_LOWS, LiquidityType.SESSION_LOW]
+                                 for zone in zones])
+            sweepable = (high_side | low_side) & ~np.array([zone.is_swept for zone in zones])
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Buy side swept by a high above the level, sell side by a low below it
+                swept = sweepable[:, None] & np.where(
+                    high_side[:, None], high > level + tolerance, low < level - tolerance
+                )
+                distance = np.abs(close - level) / level
+                approached = distance < 0.005  # Within 0.5%
                 
-                # Check for approaches and tests
-                zone_distance = abs(close - zone.exact_level) / zone.exact_level
-                if zone_distance < 0.005:  # Within 0.5%
-                    zone.last_test_timestamp = timestamp
-                    zone.times_tested += 1
-                    
-                    # Record the touch
-                    touch = LiquidityTouch(
-                        timestamp=timestamp,
-                        price=close,
-                        volume=row.get('volume', 0),
-                        touch_type='APPROACH',
-                        rejection_strength=0.5,  # Default
-                        distance_to_level=zone_distance,
-                        follow_through=False
-                    )
-                    zone.all_touches.append(touch)
+                # Reaction of the candle after the sweep (none for the latest candle)
+                next_close = np.append(close[1:], np.nan)
+                reaction = np.abs(next_close - close) / close
+            
+            first_sweep = swept.argmax(axis=1)
+            has_sweep = swept[np.arange(len(zones)), first_sweep]
+            approach_counts = approached.sum(axis=1)
+            
+            sweep_patterns: Dict[int, SweepPattern] = {}
+            for z in np.flatnonzero(has_sweep):
+                zone, position = zones[z], int(first_sweep[z])
+                if position not in sweep_patterns:
+                    sweep_patterns[position] = self._classify_sweep_pattern(recent_data.iloc[position], zone)
+                zone.is_swept = True
+                zone.sweep_timestamp = timestamps[position]
+                zone.state = LiquidityState.SWEPT
+                zone.sweep_pattern = sweep_patterns[position]
+                zone.sweep_volume = volume[position]
+                if position < len(close) - 1:
+                    zone.post_sweep_reaction = reaction[position]
+            
+            for z in np.flatnonzero(approach_counts):
+                zone = zones[z]
+                positions = np.flatnonzero(approached[z])
+                zone.last_test_timestamp = timestamps[positions[-1]]
+                zone.times_tested += int(approach_counts[z])
+                zone.touches()  # Flush approaches from an earlier update
+                zone.pending_touches = (timestamps[positions], close[positions],
+                                        volume[positions], distance[z, positions])
             
             # Update zone state based on age
-            age_hours = (datetime.now() - zone.formation_timestamp).total_seconds() / 3600
-            if age_hours > self.max_age_hours and not zone.is_swept:
-                zone.state = LiquidityState.EXPIRED
+            now = datetime.now()
+            for zone in zones:
+                age_hours = (now - zone.formation_timestamp).total_seconds() / 3600
+                if age_hours > self.max_age_hours and not zone.is_swept:
+                    zone.state = LiquidityState.EXPIRED
                 
         except Exception as e:
-            logger.error(f"Single zone state update failed: {e}")
+            logger.error(f"Zone state update failed: {e}")
     
     def _classify_sweep_pattern(self, candle_row: pd.Series, zone: LiquidityZone) -> SweepPattern:
         """Classify the type of sweep pattern."""
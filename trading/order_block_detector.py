@@ -30,14 +30,18 @@ Date: September 2025
 """
 
 import logging
+import warnings
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Optional, Tuple, NamedTuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import ta
 
+from trading.zone_store import ZoneStore, zone_store_key
+
 logger = logging.getLogger(__name__)
 
 class OrderBlockQuality(Enum):
@@ -208,6 +212,17 @@ class EnhancedOrderBlockDetector:
         self.eob_history = {}
         self.institutional_metrics = {}
         
+        # Detection statistics
+        self.detection_stats = {
+            'total_scanned': 0,
+            'order_blocks_found': 0,
+            'quality_distribution': {q.value: 0 for q in OrderBlockQuality},
+            'last_scan_time': None
+        }
+        
+        # Streaming state per symbol/timeframe (see update)
+        self.zone_stores: Dict[str, ZoneStore] = {}
+        
         logger.info("Enhanced Order Block Detector initialized with ICT methodology")
     
     def _load_default_config(self) -> Dict:
@@ -247,6 +262,9 @@ class EnhancedOrderBlockDetector:
             # Crypto-specific adaptations
             'crypto_volatility_multiplier': 1.5,  # Adjust for crypto volatility
             'btc_correlation_factor': 0.8,        # BTC correlation importance
+            
+            # Streaming updates
+            'stream_history_candles': 200,        # Recent candles kept per symbol/timeframe
         }
     
     def detect_enhanced_order_blocks(self, df: pd.DataFrame, symbol: str, 
@@ -290,6 +308,9 @@ class EnhancedOrderBlockDetector:
             # Update Order Block states
             current_obs = self._update_order_block_states(enhanced_obs, df)
             
+            # Seed the streaming store so update() continues from here
+            self._zone_store(symbol, timeframe).seed(df, self._live_order_blocks(current_obs))
+            
             # Filter by quality and relevance
             final_obs = self._filter_order_blocks(current_obs)
             
@@ -303,6 +324,67 @@ class EnhancedOrderBlockDetector:
             logger.error(f"Order Block detection failed for {symbol}: {e}")
             return []
     
+    def update(self, new_candle, symbol: str, timeframe: str = "5T") -> List[OrderBlockZone]:
+        """
+        Advance the Order Blocks of a symbol/timeframe by one closed candle.
+        
+        The new candle completes the 20-candle displacement window of the
+        candle 20 bars back, so that is the only formation evaluated; stored
+        Order Blocks are tested/broken against the new close, and broken or
+        expired ones leave the store. The store is seeded by
+        detect_enhanced_order_blocks, or built up from the first candle.
+        
+        Args:
+            new_candle: Closed OHLCV candle (dict or Series with a timestamp)
+            symbol: Trading pair symbol
+            timeframe: Analysis timeframe
+            
+        Returns:
+            Filtered Order Blocks, as returned by detect_enhanced_order_blocks
+        """
+        try:
+            store = self._zone_store(symbol, timeframe)
+            if not store.append(new_candle):
+                return self._filter_order_blocks(store.zones)
+            
+            # Volume lookback before the candidate plus its 20-candle displacement window
+            window = self._prepare_data(store.candles.tail(self.config['volume_lookback_periods'] + 21))
+            
+            new_obs = []
+            for index, ob_type, formation_data in self._ob_formation_candidates(window):
+                if index == len(window) - 21:
+                    ob_zone = self._create_order_block_zone(window, index, ob_type, formation_data, symbol, timeframe)
+                    if ob_zone:
+                        new_obs.append(ob_zone)
+            
+            if new_obs:
+                validated_obs = self._validate_order_blocks(new_obs, window)
+                classified_obs = self._classify_order_block_quality(validated_obs, window)
+                new_obs = self._calculate_confluence_factors(classified_obs, window)
+            
+            current_obs = self._update_order_block_states(store.zones + new_obs, window)
+            store.zones = self._live_order_blocks(current_obs)
+            
+            final_obs = self._filter_order_blocks(store.zones)
+            self._update_detection_stats(final_obs)
+            return final_obs
+            
+        except Exception as e:
+            logger.error(f"Incremental Order Block update failed for {symbol}: {e}")
+            return []
+    
+    def _zone_store(self, symbol: str, timeframe: str) -> ZoneStore:
+        """Streaming store for a symbol/timeframe, created on first use."""
+        key = zone_store_key(symbol, timeframe)
+        if key not in self.zone_stores:
+            self.zone_stores[key] = ZoneStore(max_candles=self.config['stream_history_candles'])
+        return self.zone_stores[key]
+    
+    @staticmethod
+    def _live_order_blocks(order_blocks: List[OrderBlockZone]) -> List[OrderBlockZone]:
+        """Order Blocks that can still be traded (broken and expired ones never come back)."""
+        return [ob for ob in order_blocks if ob.state not in [OrderBlockState.BROKEN, OrderBlockState.EXPIRED]]
+    
     def _prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare OHLCV data for Order Block analysis."""
         try:
@@ -349,25 +431,29 @@ class EnhancedOrderBlockDetector:
             raise
     
     def _calculate_displacement_strength(self, df: pd.DataFrame, direction: str) -> pd.Series:
-        """Calculate price displacement strength in given direction."""
+        """
+        Calculate price displacement strength in given direction.
+        
+        Forward-looking max/min of the next 10 closes over a sliding-window
+        view; the last 10 candles (no full look-ahead) are 0.
+        """
         try:
             lookback = 10  # Look at next 10 candles for displacement
-            displacement_strength = pd.Series(index=df.index, dtype=float)
-            
-            for i in range(len(df) - lookback):
-                current_price = df['close'].iloc[i]
-                future_prices = df['close'].iloc[i+1:i+lookback+1]
-                
-                if direction == 'up':
-                    max_future = future_prices.max()
-                    displacement = (max_future - current_price) / current_price
-                else:  # down
-                    min_future = future_prices.min()
-                    displacement = (current_price - min_future) / current_price
-                
-                displacement_strength.iloc[i] = max(0, displacement)
-            
-            return displacement_strength.fillna(0)
+            close = df['close'].to_numpy(dtype=np.float64)
+            displacement_strength = np.zeros(len(close))
+            
+            if len(close) > lookback:
+                # Row i of the view holds closes i+1 .. i+lookback
+                future_prices = sliding_window_view(close, lookback)[1:len(close) - lookback + 1]
+                current_price = close[:len(close) - lookback]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    if direction == 'up':
+                        displacement = (np.fmax.reduce(future_prices, axis=1) - current_price) / current_price
+                    else:  # down
+                        displacement = (current_price - np.fmin.reduce(future_prices, axis=1)) / current_price
+                displacement_strength[:len(current_price)] = np.fmax(0, displacement)
+            
+            return pd.Series(displacement_strength, index=df.index)
             
         except Exception as e:
             logger.error(f"Displacement calculation failed: {e}")
@@ -375,30 +461,25 @@ class EnhancedOrderBlockDetector:
     
     def _scan_for_ob_formations(self, df: pd.DataFrame, symbol: str, 
                               timeframe: str) -> List[OrderBlockZone]:
-        """Scan for potential Order Block formations in price data."""
+        """
+        Scan for potential Order Block formations in price data.
+        
+        The candle-colour, displacement, volume and displacement-quality
+        rules are evaluated for every candidate candle at once over
+        sliding-window views of the next 20 candles; only passing candles
+        are turned into OrderBlockZone objects.
+        """
         try:
             potential_obs = []
             
-            # Scan through price data looking for OB patterns
-            for i in range(20, len(df) - 20):  # Leave buffer for displacement analysis
-                
-                # Check for bullish Order Block formation
-                bullish_ob = self._check_bullish_ob_formation(df, i)
-                if bullish_ob:
-                    ob_zone = self._create_order_block_zone(
-                        df, i, 'BULLISH_OB', bullish_ob, symbol, timeframe
-                    )
-                    if ob_zone:
-                        potential_obs.append(ob_zone)
-                
-                # Check for bearish Order Block formation
-                bearish_ob = self._check_bearish_ob_formation(df, i)
-                if bearish_ob:
-                    ob_zone = self._create_order_block_zone(
-                        df, i, 'BEARISH_OB', bearish_ob, symbol, timeframe
-                    )
-                    if ob_zone:
-                        potential_obs.append(ob_zone)
+            # Stable sort keeps bullish before bearish on the same candle
+            formations = sorted(self._ob_formation_candidates(df), key=lambda formation: formation[0])
+            for index, ob_type, formation_data in formations:
+                ob_zone = self._create_order_block_zone(
+                    df, index, ob_type, formation_data, symbol, timeframe
+                )
+                if ob_zone:
+                    potential_obs.append(ob_zone)
             
             logger.debug(f"Found {len(potential_obs)} potential Order Blocks")
             return potential_obs
@@ -407,187 +488,108 @@ class EnhancedOrderBlockDetector:
             logger.error(f"Order Block formation scan failed: {e}")
             return []
     
-    def _check_bullish_ob_formation(self, df: pd.DataFrame, index: int) -> Optional[Dict]:
+    def _ob_formation_candidates(self, df: pd.DataFrame) -> List[Tuple[int, str, Dict]]:
         """
-        Check for bullish Order Block formation at given index.
+        Evaluate the bullish and bearish Order Block rules for every candle.
         
-        Bullish OB Rules:
-        1. Current candle is bearish (red)
-        2. Strong upward displacement follows
-        3. Volume confirmation on OB candle
-        4. Minimal retracement during displacement
-        """
-        try:
-            current_candle = df.iloc[index]
-            
-            # Rule 1: Must be bearish candle
-            if current_candle['close'] >= current_candle['open']:
-                return None
-            
-            # Rule 2: Check for upward displacement
-            future_data = df.iloc[index+1:index+21]  # Next 20 candles
-            if len(future_data) < self.config['min_displacement_candles']:
-                return None
-            
-            # Calculate displacement metrics
-            displacement_start = current_candle['close']
-            displacement_high = future_data['high'].max()
-            displacement_percentage = (displacement_high - displacement_start) / displacement_start
-            
-            # Must meet minimum displacement
-            if displacement_percentage < self.config['min_displacement_percentage'] / 100:
-                return None
-            
-            # Rule 3: Volume confirmation
-            volume_ratio = current_candle['volume_ratio']
-            if volume_ratio < self.config['min_volume_ratio']:
-                return None
-            
-            # Rule 4: Check displacement quality
-            displacement_quality = self._analyze_displacement_quality(
-                future_data, displacement_start, 'up'
-            )
-            
-            if not displacement_quality['is_valid']:
-                return None
-            
-            return {
-                'displacement_start': displacement_start,
-                'displacement_high': displacement_high,
-                'displacement_percentage': displacement_percentage,
-                'volume_ratio': volume_ratio,
-                'displacement_quality': displacement_quality
-            }
-            
-        except Exception as e:
-            logger.error(f"Bullish OB formation check failed: {e}")
-            return None
-    
-    def _check_bearish_ob_formation(self, df: pd.DataFrame, index: int) -> Optional[Dict]:
-        """
-        Check for bearish Order Block formation at given index.
+        Scans candles 20 .. len-21, each followed by a full 20-candle window.
+        Bullish (bearish) OB rules:
+        1. The candle is bearish (bullish)
+        2. The next 20 highs (lows) displace price by min_displacement_percentage
+        3. The candle's volume ratio is at least min_volume_ratio
+        4. The displacement is impulsive (retracements from the running
+           extreme stay under 30%) with an average volume ratio above 1.2
         
-        Bearish OB Rules:
-        1. Current candle is bullish (green)
-        2. Strong downward displacement follows
-        3. Volume confirmation on OB candle
-        4. Minimal retracement during displacement
+        Returns:
+            (candle position, ob_type, formation data) per passing candle
         """
-        try:
-            current_candle = df.iloc[index]
-            
-            # Rule 1: Must be bullish candle
-            if current_candle['close'] <= current_candle['open']:
-                return None
-            
-            # Rule 2: Check for downward displacement
-            future_data = df.iloc[index+1:index+21]  # Next 20 candles
-            if len(future_data) < self.config['min_displacement_candles']:
-                return None
-            
-            # Calculate displacement metrics
-            displacement_start = current_candle['close']
-            displacement_low = future_data['low'].min()
-            displacement_percentage = (displacement_start - displacement_low) / displacement_start
-            
-            # Must meet minimum displacement
-            if displacement_percentage < self.config['min_displacement_percentage'] / 100:
-                return None
-            
-            # Rule 3: Volume confirmation
-            volume_ratio = current_candle['volume_ratio']
-            if volume_ratio < self.config['min_volume_ratio']:
-                return None
-            
-            # Rule 4: Check displacement quality
-            displacement_quality = self._analyze_displacement_quality(
-                future_data, displacement_start, 'down'
-            )
-            
-            if not displacement_quality['is_valid']:
-                return None
-            
-            return {
-                'displacement_start': displacement_start,
-                'displacement_low': displacement_low,
-                'displacement_percentage': displacement_percentage,
-                'volume_ratio': volume_ratio,
-                'displacement_quality': displacement_quality
-            }
+        window = 20  # Next 20 candles
+        n = len(df)
+        first, stop = 20, n - 20  # Leave buffer for displacement analysis
+        if stop <= first or window < self.config['min_displacement_candles']:
+            return []
+        
+        open_ = df['open'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume_ratio = df['volume_ratio'].to_numpy(dtype=np.float64)
+        
+        # Row k of each view holds candles (first + k + 1) .. (first + k + window)
+        rows = slice(first + 1, stop + 1)
+        future_high = sliding_window_view(high, window)[rows]
+        future_low = sliding_window_view(low, window)[rows]
+        future_volume_ratio = sliding_window_view(volume_ratio, window)[rows]
+        
+        start_price = close[first:stop]
+        candle_open = open_[first:stop]
+        candle_volume_ratio = volume_ratio[first:stop]
+        
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN volume windows
+            avg_volume_ratio = np.nanmean(future_volume_ratio, axis=1)
             
-        except Exception as e:
-            logger.error(f"Bearish OB formation check failed: {e}")
-            return None
-    
-    def _analyze_displacement_quality(self, future_data: pd.DataFrame, 
-                                    start_price: float, direction: str) -> Dict:
-        """Analyze the quality of price displacement following Order Block."""
-        try:
-            if direction == 'up':
-                end_price = future_data['high'].max()
-                displacement_size = end_price - start_price
+            candidates = []
+            for ob_type, direction in (('BULLISH_OB', 'up'), ('BEARISH_OB', 'down')):
+                if direction == 'up':
+                    # Rule 1: bearish candle; Rule 2: upward displacement
+                    rejected = start_price >= candle_open
+                    end_price = np.fmax.reduce(future_high, axis=1)
+                    displacement_size = end_price - start_price
+                    
+                    # Running high before each future candle; candles that fail to
+                    # make a new high count as retracements from it
+                    running = np.fmax.accumulate(np.column_stack([start_price, future_high]), axis=1)[:, :-1]
+                    retracing = ~(future_high > running)
+                    retracement = (running - future_low) / running
+                else:
+                    # Rule 1: bullish candle; Rule 2: downward displacement
+                    rejected = start_price <= candle_open
+                    end_price = np.fmin.reduce(future_low, axis=1)
+                    displacement_size = start_price - end_price
+                    
+                    running = np.fmin.accumulate(np.column_stack([start_price, future_low]), axis=1)[:, :-1]
+                    retracing = ~(future_low < running)
+                    retracement = (future_high - running) / running
                 
-                # Check for clean, impulsive movement
-                retracements = []
-                current_high = start_price
+                displacement_percentage = displacement_size / start_price
+                rejected |= displacement_percentage < self.config['min_displacement_percentage'] / 100
                 
-                for _, candle in future_data.iterrows():
-                    if candle['high'] > current_high:
-                        current_high = candle['high']
-                    else:
-                        retracement = (current_high - candle['low']) / current_high
-                        retracements.append(retracement)
-                        
-            else:  # down
-                end_price = future_data['low'].min()
-                displacement_size = start_price - end_price
+                # Rule 3: Volume confirmation
+                rejected |= candle_volume_ratio < self.config['min_volume_ratio']
                 
-                # Check for clean, impulsive movement
-                retracements = []
-                current_low = start_price
+                # Rule 4: Displacement quality (mostly impulsive, volume during the move)
+                retracement_count = retracing.sum(axis=1)
+                max_retracement = np.where(retracing, retracement, -np.inf).max(axis=1)
+                max_retracement = np.where(retracement_count > 0, max_retracement, 0)
+                avg_retracement = np.where(
+                    retracement_count > 0,
+                    np.where(retracing, retracement, 0).sum(axis=1) / np.maximum(retracement_count, 1),
+                    0
+                )
+                is_impulsive = max_retracement < 0.3  # Max 30% retracement
+                volume_confirmation = avg_volume_ratio > 1.2
+                rejected |= ~(is_impulsive & volume_confirmation)
                 
-                for _, candle in future_data.iterrows():
-                    if candle['low'] < current_low:
-                        current_low = candle['low']
-                    else:
-                        retracement = (candle['high'] - current_low) / current_low
-                        retracements.append(retracement)
-            
-            # Calculate displacement quality metrics
-            max_retracement = max(retracements) if retracements else 0
-            avg_retracement = np.mean(retracements) if retracements else 0
-            
-            # Displacement is valid if it's mostly impulsive
-            is_impulsive = max_retracement < 0.3  # Max 30% retracement
-            
-            # Volume confirmation during displacement
-            avg_volume_ratio = future_data['volume_ratio'].mean()
-            volume_confirmation = avg_volume_ratio > 1.2
-            
-            # Time efficiency (price movement per candle)
-            time_efficiency = displacement_size / len(future_data)
-            
-            return {
-                'is_valid': is_impulsive and volume_confirmation,
-                'is_impulsive': is_impulsive,
-                'max_retracement': max_retracement,
-                'avg_retracement': avg_retracement,
-                'volume_confirmation': volume_confirmation,
-                'time_efficiency': time_efficiency,
-                'displacement_size': displacement_size
-            }
-            
-        except Exception as e:
-            logger.error(f"Displacement quality analysis failed: {e}")
-            return {
-                'is_valid': False,
-                'is_impulsive': False,
-                'max_retracement': 1.0,
-                'avg_retracement': 1.0,
-                'volume_confirmation': False,
-                'time_efficiency': 0.0,
-                'displacement_size': 0.0
-            }
+                end_key = 'displacement_high' if direction == 'up' else 'displacement_low'
+                for k in np.flatnonzero(~rejected):
+                    candidates.append((first + k, ob_type, {
+                        'displacement_start': start_price[k],
+                        end_key: end_price[k],
+                        'displacement_percentage': displacement_percentage[k],
+                        'volume_ratio': candle_volume_ratio[k],
+                        'displacement_quality': {
+                            'is_valid': True,
+                            'is_impulsive': bool(is_impulsive[k]),
+                            'max_retracement': max_retracement[k],
+                            'avg_retracement': avg_retracement[k],
+                            'volume_confirmation': bool(volume_confirmation[k]),
+                            'time_efficiency': displacement_size[k] / window,
+                            'displacement_size': displacement_size[k]
+                        }
+                    }))
+        
+        return candidates
     
     def _create_order_block_zone(self, df: pd.DataFrame, index: int, ob_type: str,
                                formation_data: Dict, symbol: str, timeframe: str) -> Optional[OrderBlockZone]:
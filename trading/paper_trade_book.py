@@ -0,0 +1,151 @@
+"""
+Paper Trade Book
+================
+
+Columnar in-memory index of OPEN paper trades for mark-to-market.
+
+The monitor used to re-read ``SELECT * FROM paper_trades`` every price
+cycle and walk the rows one by one, issuing and committing an UPDATE per
+trade. The book keeps the open trades as NumPy columns, so unrealized PnL
+and TP/SL hits for every trade come out of a handful of array operations
+and the database only sees one batched write per cycle.
+
+Usage:
+    book = PaperTradeBook()
+    book.load(db.get_open_paper_trades())
+    marks = book.mark({'BTC': 65000.0, 'ETH': 3200.0})
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Prices further than this from entry are treated as corrupted feed data
+MAX_PRICE_DEVIATION = 0.5
+
+
+@dataclass
+class PaperTradeMarks:
+    """Mark-to-market result for the priced open trades"""
+    trade_ids: np.ndarray
+    current_price: np.ndarray
+    unrealized_pnl: np.ndarray
+    close_reason: np.ndarray          # '' for trades that stay open
+    rows: List[Dict]                  # Original trade rows, aligned with the arrays
+
+    @property
+    def closing(self) -> np.ndarray:
+        """Positions (into the arrays) of trades that hit TP or SL"""
+        return np.flatnonzero(self.close_reason != '')
+
+
+class PaperTradeBook:
+    """
+    Open paper trades as parallel NumPy columns
+
+    Trades are added as new rows appear in the database (tracked by the
+    highest trade id seen) and removed when they close, so the columns
+    are only rebuilt on those rare changes, never on a price update.
+    """
+
+    def __init__(self):
+        self._rows: Dict[int, Dict] = {}
+        self.last_trade_id = 0
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, trade_id: int) -> bool:
+        return trade_id in self._rows
+
+    @property
+    def trade_ids(self) -> List[int]:
+        return self._ids.tolist()
+
+    def load(self, rows: Iterable[Dict]) -> None:
+        """Replace the book with a full set of open trade rows"""
+        self._rows = {}
+        self.last_trade_id = 0
+        self.add(rows)
+
+    def add(self, rows: Iterable[Dict]) -> int:
+        """Add open trade rows; returns how many were new"""
+        added = 0
+        for row in rows:
+            trade_id = int(row['id'])
+            self.last_trade_id = max(self.last_trade_id, trade_id)
+            if trade_id not in self._rows:
+                self._rows[trade_id] = dict(row)
+                added += 1
+        if added:
+            self._rebuild()
+        return added
+
+    def remove(self, trade_ids: Iterable[int]) -> None:
+        """Drop closed trades from the book"""
+        removed = [self._rows.pop(int(trade_id), None) for trade_id in trade_ids]
+        if any(row is not None for row in removed):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Rebuild the columns from the row index"""
+        rows = list(self._rows.values())
+        self._ids = np.array([row['id'] for row in rows], dtype=np.int64)
+        self._entry = np.array([row['entry_price'] for row in rows], dtype=np.float64)
+        self._stop = np.array([row['stop_loss'] for row in rows], dtype=np.float64)
+        self._target = np.array([row['take_profit'] for row in rows], dtype=np.float64)
+        self._size = np.array([row['position_size'] for row in rows], dtype=np.float64)
+        self._is_buy = np.array([row['direction'] == 'BUY' for row in rows], dtype=bool)
+        self._row_list = rows
+
+        # Trades reference prices by base asset ('BTCUSDT' -> 'BTC')
+        cryptos = [row['symbol'].replace('USDT', '') for row in rows]
+        self._cryptos, self._crypto_codes = np.unique(np.array(cryptos, dtype=object), return_inverse=True)
+
+    def mark(self, prices: Dict[str, float]) -> PaperTradeMarks:
+        """
+        Compute unrealized PnL and TP/SL hits for every open trade
+
+        Args:
+            prices: Latest price per base asset, e.g. {'BTC': 65000.0}
+
+        Returns:
+            PaperTradeMarks for the trades with a valid price. Trades whose
+            asset has no price, or whose price is more than 50% away from
+            entry (corrupted feed), are left out.
+        """
+        asset_prices = np.array([prices.get(crypto, np.nan) for crypto in self._cryptos], dtype=np.float64)
+        price = asset_prices[self._crypto_codes] if len(self._ids) else np.empty(0)
+
+        priced = ~np.isnan(price)
+        valid = priced & (price > 0) & \
+            (price <= self._entry * (1 + MAX_PRICE_DEVIATION)) & \
+            (price >= self._entry * (1 - MAX_PRICE_DEVIATION))
+        if (priced & ~valid).any():
+            for crypto in np.unique(self._cryptos[self._crypto_codes[priced & ~valid]]):
+                logger.warning(f"⚠️ Invalid price detected for {crypto}: ${prices[crypto]:.2f} - skipping its trades")
+
+        positions = np.flatnonzero(valid)
+        price = price[positions]
+        entry, stop, target = self._entry[positions], self._stop[positions], self._target[positions]
+        is_buy = self._is_buy[positions]
+
+        unrealized_pnl = np.where(is_buy, price - entry, entry - price) * self._size[positions]
+
+        # Stop loss takes precedence when both levels are crossed
+        stop_hit = np.where(is_buy, price <= stop, price >= stop)
+        target_hit = np.where(is_buy, price >= target, price <= target)
+        close_reason = np.where(stop_hit, 'STOP_LOSS', np.where(target_hit, 'TAKE_PROFIT', ''))
+
+        return PaperTradeMarks(
+            trade_ids=self._ids[positions],
+            current_price=price,
+            unrealized_pnl=unrealized_pnl,
+            close_reason=close_reason,
+            rows=[self._row_list[i] for i in positions]
+        )
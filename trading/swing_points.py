@@ -0,0 +1,123 @@
+"""
+Swing Point Detection
+=====================
+
+Shared NumPy kernel for swing high / swing low detection used by the
+liquidity, Fibonacci and ICT analyzers.
+
+A swing high at candle i is a high strictly above every high within
+``width`` candles on both sides; its prominence is how far (relative) it
+stands above the highest of those neighbours. Swing lows mirror this.
+Neighbour extremes come from sliding-window max/min over strided views,
+so the whole series is scanned in a few array operations.
+
+Usage:
+    highs = find_swing_highs(df['high'].values, width=3)
+    for i, price in zip(highs.index, highs.price): ...
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@dataclass(frozen=True)
+class SwingPoints:
+    """Positions and prices of detected swing points, in candle order"""
+    index: np.ndarray  # int64 candle positions
+    price: np.ndarray  # float64 prices at those positions
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def window_extreme(values: np.ndarray, before: int, after: int, kind: str = 'max',
+                   at: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Max or min of values[i - before : i + after] for every i.
+
+    Windows are clipped at the array edges and NaNs are ignored (an
+    all-NaN window yields NaN).
+
+    Args:
+        values: 1-D price array
+        before: Candles before i included in the window
+        after: Candles from i onwards included (i itself when after >= 1)
+        kind: 'max' or 'min'
+        at: Only evaluate these positions (default: every position)
+
+    Returns:
+        float64 array aligned with values (or with `at`)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    size = before + after
+    count = len(values) if at is None else len(at)
+    if size <= 0 or not len(values) or not count:
+        return np.full(count, np.nan)
+
+    fill = -np.inf if kind == 'max' else np.inf
+    padded = np.concatenate([np.full(before, fill), values, np.full(after, fill)])
+    windows = sliding_window_view(padded, size)[:len(values)]
+    if at is not None:
+        windows = windows[at]
+    reduce = np.fmax.reduce if kind == 'max' else np.fmin.reduce
+    extreme = reduce(windows, axis=1)
+    return np.where(np.isinf(extreme), np.nan, extreme)
+
+
+def _neighbour_extremes(values: np.ndarray, width: int, kind: str) -> np.ndarray:
+    """Extreme of the `width` candles on each side of i (i itself excluded)."""
+    reduce = np.fmax if kind == 'max' else np.fmin
+    left = window_extreme(values, width, 0, kind)
+    right = window_extreme(values[1:], 0, width, kind)
+    return reduce(left, np.append(right, np.nan))
+
+
+def find_swing_highs(highs: np.ndarray, width: int = 1, min_prominence: float = 0.0) -> SwingPoints:
+    """
+    Swing highs confirmed by `width` candles on both sides.
+
+    Args:
+        highs: High prices
+        width: Candles on each side the swing must exceed
+        min_prominence: Minimum relative height above the highest neighbour
+                        (0.002 = 0.2%)
+
+    Returns:
+        SwingPoints for candles width .. len-width-1 that qualify
+    """
+    highs = np.asarray(highs, dtype=np.float64)
+    neighbours = _neighbour_extremes(highs, width, 'max')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        is_swing = (highs > neighbours) & (highs / neighbours - 1 >= min_prominence)
+    return _confirmed(highs, is_swing, width)
+
+
+def find_swing_lows(lows: np.ndarray, width: int = 1, min_prominence: float = 0.0) -> SwingPoints:
+    """
+    Swing lows confirmed by `width` candles on both sides.
+
+    Args:
+        lows: Low prices
+        width: Candles on each side the swing must undercut
+        min_prominence: Minimum relative depth below the lowest neighbour
+
+    Returns:
+        SwingPoints for candles width .. len-width-1 that qualify
+    """
+    lows = np.asarray(lows, dtype=np.float64)
+    neighbours = _neighbour_extremes(lows, width, 'min')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        is_swing = (lows < neighbours) & (1 - lows / neighbours >= min_prominence)
+    return _confirmed(lows, is_swing, width)
+
+
+def _confirmed(values: np.ndarray, is_swing: np.ndarray, width: int) -> SwingPoints:
+    """Keep swings with a full confirmation window on both sides."""
+    is_swing[:width] = False
+    if width:
+        is_swing[len(values) - width:] = False
+    index = np.flatnonzero(is_swing)
+    return SwingPoints(index=index.astype(np.int64), price=values[index])
@@ -0,0 +1,93 @@
+"""
+Incremental Zone Store
+======================
+
+Per symbol/timeframe state behind the streaming ``update(new_candle)``
+APIs of the FVG, Order Block and liquidity detectors.
+
+A full ``detect_*`` call rescans the whole history and rebuilds every
+zone. The store keeps what the next candle needs instead: a bounded tail
+of raw OHLCV candles (long enough for the indicator lookbacks and pattern
+windows) and the detector's live zones. Each closed candle is appended to
+the tail, only the patterns it completes are evaluated, and the existing
+zones are advanced with it, so the per-candle cost depends on the tail
+length and the number of active zones, not on the history length.
+
+Usage:
+    store = ZoneStore(max_candles=200)
+    if store.append({'timestamp': ts, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}):
+        ...  # evaluate patterns completed by store.candles.iloc[-1]
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def zone_store_key(symbol: str, timeframe: str) -> str:
+    """Store key, matching the detectors' existing cache keys."""
+    return f"{symbol}_{timeframe}"
+
+
+def candle_frame(candles: Union[pd.DataFrame, pd.Series, Dict]) -> pd.DataFrame:
+    """
+    Normalise one candle (dict / Series) or a candle DataFrame to OHLCV rows.
+
+    The timestamp comes from a 'timestamp' field, or from the Series name /
+    DataFrame index. A missing open falls back to the close and a missing
+    volume to 0.
+    """
+    if isinstance(candles, pd.DataFrame):
+        data = candles.copy()
+    elif isinstance(candles, pd.Series):
+        data = candles.to_frame().T
+    else:
+        data = pd.DataFrame([candles])
+
+    if 'timestamp' in data.columns:
+        data.index = pd.to_datetime(data['timestamp'])
+    elif not isinstance(data.index, pd.DatetimeIndex):
+        data.index = pd.to_datetime(data.index)
+    if 'open' not in data.columns:
+        data['open'] = data['close']
+    if 'volume' not in data.columns:
+        data['volume'] = 0.0
+
+    return data[OHLCV_COLUMNS].astype(float)
+
+
+@dataclass
+class ZoneStore:
+    """Recent candles and live zones for one symbol/timeframe"""
+    candles: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=OHLCV_COLUMNS, dtype=float))
+    zones: List[Any] = field(default_factory=list)
+    max_candles: int = 200
+    candle_count: int = 0                              # Candles seen, including those dropped from the tail
+    extra: Dict[str, Any] = field(default_factory=dict)  # Detector-specific streaming state
+
+    def seed(self, candles: pd.DataFrame, zones: List[Any]) -> None:
+        """Start from a full detection over `candles`"""
+        self.candles = candle_frame(candles).tail(self.max_candles)
+        self.candle_count = len(candles)
+        self.zones = list(zones)
+        self.extra = {}
+
+    def append(self, new_candle: Union[pd.Series, Dict]) -> bool:
+        """
+        Append a closed candle to the tail.
+
+        Returns:
+            False (and leaves the store untouched) when the candle is not
+            newer than the last one stored
+        """
+        row = candle_frame(new_candle)
+        if len(self.candles) and row.index[-1] <= self.candles.index[-1]:
+            return False
+
+        candles = pd.concat([self.candles, row]) if len(self.candles) else row
+        self.candles = candles.iloc[-self.max_candles:]
+        self.candle_count += 1
+        return True
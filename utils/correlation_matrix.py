@@ -5,19 +5,264 @@ Correlation Matrix and Portfolio Heat Calculator
 Calculates real-time correlations between crypto assets and monitors
 portfolio heat to prevent over-exposure to correlated positions.
 
+Correlations are maintained incrementally by OnlineCorrelationEngine:
+each new bar updates running sums and an EWMA covariance in O(k²) for
+k symbols, so the matrix can be refreshed every candle.
+
 Author: GitHub Copilot
 Date: October 25, 2025
 """
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Mapping, Tuple, Optional
 from datetime import datetime, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class OnlineCorrelationEngine:
+    """
+    Incremental correlation of bar returns across a symbol universe.
+    
+    Two estimators are kept side by side:
+    - 'window': sample correlation over the last `window` bars, from running
+      sums (Σx, Σx², Σxy and pairwise counts) updated by adding the new bar
+      and subtracting the one leaving the window. Pairs use the bars where
+      both symbols have a return, like DataFrame.corr().
+    - 'ewma': exponentially weighted covariance with the given half-life
+      (bars), for a faster-reacting view.
+    
+    Each bar costs O(k²); matrices grow by doubling as symbols are added.
+    Undefined correlations (fewer than 2 shared bars, zero variance) are 0.
+    """
+    
+    def __init__(self, window: int = 720, halflife: float = 60, symbols: Iterable[str] = ()):
+        """
+        Initialize correlation engine.
+        
+        Args:
+            window: Bars in the rolling sample correlation (720 = 30 days of 1h bars)
+            halflife: Half-life in bars of the EWMA covariance
+            symbols: Symbols to register up front
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2 bars")
+        self.window = window
+        self.decay = 0.5 ** (1.0 / halflife)
+        
+        self.index: Dict[str, int] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.bars = 0
+        
+        # Per-pair state, sized for `_capacity` symbols (grown by doubling)
+        self._n = None          # Bars in the window where both symbols have a return
+        self._sx = None         # Σ x_i over those bars
+        self._sxx = None        # Σ x_i² over those bars
+        self._sxy = None        # Σ x_i x_j
+        self._ewma_mean = None
+        self._ewma_cov = None
+        self._ring_x = None     # Window of returns (0 where missing)
+        self._ring_m = None     # Window of presence masks
+        self._capacity = 0
+        self._matrices: Dict[str, np.ndarray] = {}  # Normalized matrices until the next bar
+        
+        symbols = list(symbols)
+        self._allocate(max(8, len(symbols)))
+        for symbol in symbols:
+            self.add_symbol(symbol)
+    
+    def _allocate(self, capacity: int):
+        """Size the state for `capacity` symbols, keeping current values"""
+        shapes = {
+            '_n': (capacity, capacity), '_sx': (capacity, capacity), '_sxx': (capacity, capacity),
+            '_sxy': (capacity, capacity), '_ewma_mean': (capacity,), '_ewma_cov': (capacity, capacity),
+            '_ring_x': (self.window, capacity), '_ring_m': (self.window, capacity)
+        }
+        for name, shape in shapes.items():
+            grown = np.zeros(shape)
+            current = getattr(self, name)
+            if current is not None:
+                grown[tuple(slice(0, n) for n in current.shape)] = current
+            setattr(self, name, grown)
+        self._capacity = capacity
+    
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.index)
+    
+    def add_symbol(self, symbol: str) -> int:
+        """Register a symbol; returns its matrix index"""
+        if symbol not in self.index:
+            if len(self.index) == self._capacity:
+                self._allocate(self._capacity * 2)
+            self.index[symbol] = len(self.index)
+            self._matrices.clear()
+        return self.index[symbol]
+    
+    def update_prices(self, prices: Mapping[str, float]) -> None:
+        """
+        Add one bar of closing prices (returns are taken against the previous bar).
+        
+        Args:
+            prices: Symbol -> close; symbols missing from a bar are skipped for it
+        """
+        returns = {}
+        for symbol, price in prices.items():
+            if price is None or not np.isfinite(price) or price <= 0:
+                continue
+            previous = self.last_prices.get(symbol)
+            self.last_prices[symbol] = price
+            if previous is not None:
+                returns[symbol] = price / previous - 1.0
+            else:
+                self.add_symbol(symbol)
+        self.update_returns(returns)
+    
+    def update_returns(self, returns: Mapping[str, float]) -> None:
+        """Add one bar of returns in O(k²)."""
+        for symbol in returns:
+            self.add_symbol(symbol)
+        k = len(self.index)
+        x = np.zeros(k)
+        m = np.zeros(k)
+        for symbol, value in returns.items():
+            if value is not None and np.isfinite(value):
+                i = self.index[symbol]
+                x[i] = value
+                m[i] = 1.0
+        
+        slot = self.bars % self.window
+        if self.bars >= self.window:
+            # Remove the bar leaving the window
+            self._accumulate(self._ring_x[slot, :k], self._ring_m[slot, :k], -1.0)
+        self._ring_x[slot, :k] = x
+        self._ring_m[slot, :k] = m
+        self._accumulate(x, m, 1.0)
+        self.bars += 1
+        self._matrices.clear()
+        
+        # EWMA covariance (missing returns count as flat)
+        mean = self._ewma_mean[:k]
+        mean *= self.decay
+        mean += (1.0 - self.decay) * x
+        deviation = x - mean
+        cov = self._ewma_cov[:k, :k]
+        cov *= self.decay
+        cov += (1.0 - self.decay) * np.outer(deviation, deviation)
+        
+        # Rebuild the running sums from the window now and then so float error cannot drift
+        if self.bars % self.window == 0:
+            self._rebuild_sums()
+    
+    def _accumulate(self, x: np.ndarray, m: np.ndarray, sign: float):
+        k = len(x)
+        self._n[:k, :k] += sign * np.outer(m, m)
+        self._sx[:k, :k] += sign * np.outer(x, m)
+        self._sxx[:k, :k] += sign * np.outer(x * x, m)
+        self._sxy[:k, :k] += sign * np.outer(x, x)
+    
+    def _rebuild_sums(self):
+        k = len(self.index)
+        X = self._ring_x[:min(self.bars, self.window), :k]
+        M = self._ring_m[:min(self.bars, self.window), :k]
+        self._n[:k, :k] = M.T @ M
+        self._sx[:k, :k] = X.T @ M
+        self._sxx[:k, :k] = (X * X).T @ M
+        self._sxy[:k, :k] = X.T @ X
+    
+    def seed(self, prices: pd.DataFrame) -> None:
+        """
+        Replace the state with a price history (rows = bars, columns = symbols).
+        
+        Only the last `window` bars are replayed: older ones would have left
+        the rolling window, and their EWMA weight is negligible.
+        """
+        self.reset()
+        for symbol in prices.columns:
+            self.add_symbol(symbol)
+        tail = prices.iloc[-(self.window + 1):]
+        for row in tail.itertuples(index=False):
+            self.update_prices(dict(zip(tail.columns, row)))
+    
+    def reset(self) -> None:
+        """Forget all bars (symbols stay registered)."""
+        for array in (self._n, self._sx, self._sxx, self._sxy, self._ewma_mean, self._ewma_cov,
+                      self._ring_x, self._ring_m):
+            array.fill(0.0)
+        self.last_prices = {}
+        self.bars = 0
+        self._matrices.clear()
+    
+    def _indices(self, symbols: Optional[Iterable[str]]) -> np.ndarray:
+        """Matrix indices of symbols; -1 for unknown ones"""
+        if symbols is None:
+            return np.arange(len(self.index))
+        return np.array([self.index.get(symbol, -1) for symbol in symbols], dtype=int)
+    
+    def _full_matrix(self, method: str) -> np.ndarray:
+        if method in self._matrices:
+            return self._matrices[method]
+        k = len(self.index)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if method == 'ewma':
+                cov = self._ewma_cov[:k, :k]
+                std = np.sqrt(np.diag(cov))
+                corr = cov / np.outer(std, std)
+            elif method == 'window':
+                n, sx = self._n[:k, :k], self._sx[:k, :k]
+                cov = self._sxy[:k, :k] - sx * sx.T / n
+                var = self._sxx[:k, :k] - sx * sx / n
+                corr = cov / np.sqrt(var * var.T)
+                corr[n < 2] = np.nan
+            else:
+                raise ValueError(f"Unknown correlation method: {method}")
+        corr = np.clip(np.nan_to_num(corr, nan=0.0, posinf=0.0, neginf=0.0), -1.0, 1.0)
+        np.fill_diagonal(corr, 1.0)
+        corr.setflags(write=False)
+        self._matrices[method] = corr
+        return corr
+    
+    def correlation_matrix(self, symbols: Optional[Iterable[str]] = None, method: str = 'window') -> np.ndarray:
+        """
+        Correlation matrix for symbols, in the given order.
+        
+        Unknown symbols correlate 0 with everything but themselves.
+        """
+        idx = self._indices(symbols)
+        corr = self._full_matrix(method)
+        known = idx >= 0
+        sub = np.zeros((len(idx), len(idx)))
+        sub[np.ix_(known, known)] = corr[np.ix_(idx[known], idx[known])]
+        np.fill_diagonal(sub, 1.0)
+        return sub
+    
+    def correlation_frame(self, symbols: Optional[Iterable[str]] = None, method: str = 'window') -> pd.DataFrame:
+        """Correlation matrix as a labelled DataFrame."""
+        symbols = list(self.index) if symbols is None else list(symbols)
+        return pd.DataFrame(self.correlation_matrix(symbols, method), index=symbols, columns=symbols)
+    
+    def correlation(self, symbol1: str, symbol2: str, method: str = 'window') -> float:
+        """Correlation of one pair (0.0 if unknown)."""
+        return float(self.correlation_matrix([symbol1, symbol2], method)[0, 1])
+    
+    def portfolio_heat(self, symbols: List[str], risks, method: str = 'window') -> float:
+        """
+        Σ risk_i · risk_j · corr_ij over pairs i < j, as one quadratic form.
+        
+        Args:
+            symbols: Position symbols (repeats allowed)
+            risks: Risk of each position
+            method: 'window' or 'ewma'
+        """
+        if len(symbols) <= 1:
+            return 0.0
+        r = np.asarray(risks, dtype=np.float64)
+        corr = self.correlation_matrix(symbols, method)
+        return float((r @ corr @ r - np.dot(r * r, np.diag(corr))) / 2.0)
+
+
 class CorrelationAnalyzer:
     """
     Analyze correlations between crypto assets and calculate portfolio risk.
@@ -37,14 +282,41 @@ class CorrelationAnalyzer:
         self.correlation_threshold = correlation_threshold
         self.max_portfolio_heat = max_portfolio_heat
         
-        # Cache for correlation data
+        # Correlation data, refreshed whenever a bar or history arrives
         self.correlation_matrix = {}
         self.last_update = None
-        self.update_interval = timedelta(hours=1)  # Recalculate hourly
         
         # Historical price cache for correlation calculation
         self.price_history = {}
         self.lookback_period = 30  # Days for correlation calculation
+        
+        # Incremental correlations (30 days of 1h bars), seeded from price_history
+        self.engine = OnlineCorrelationEngine(window=self.lookback_period * 24)
+        self._history_changed = False
+        self._matrix_stale = True
+    
+    def update_bar(self, prices: Dict[str, float], timestamp: datetime = None):
+        """
+        Add one candle of closing prices to the correlations (O(k²) per call).
+        
+        Args:
+            prices: Symbol -> close price of the candle
+            timestamp: Candle time (defaults to now)
+        """
+        self._sync_engine()
+        self.engine.update_prices(prices)
+        self._matrix_stale = True
+        self.last_update = timestamp or datetime.now()
+    
+    def _sync_engine(self):
+        """Reseed the engine after update_price_history() replaced a series."""
+        if not self._history_changed:
+            return
+        df = pd.DataFrame(self.price_history).ffill().bfill()
+        self.engine.seed(df)
+        self._history_changed = False
+        self._matrix_stale = True
+        self.last_update = datetime.now()
     
     def update_price_history(self, symbol: str, prices: pd.Series):
         """
@@ -57,6 +329,7 @@ class CorrelationAnalyzer:
         # Store only last N days
         cutoff = datetime.now() - timedelta(days=self.lookback_period)
         self.price_history[symbol] = prices[prices.index > cutoff]
+        self._history_changed = True
         
         logger.debug(f"Updated price history for {symbol}: {len(prices)} data points")
     
@@ -70,39 +343,22 @@ class CorrelationAnalyzer:
         Returns:
             DataFrame with pairwise correlations
         """
+        self._sync_engine()
         if symbols is None:
-            symbols = list(self.price_history.keys())
-        
-        # Check if we need to recalculate
-        if (self.last_update is not None and 
-            datetime.now() - self.last_update < self.update_interval and
-            self.correlation_matrix):
-            logger.debug("Using cached correlation matrix")
-            return pd.DataFrame(self.correlation_matrix)
-        
-        # Build price DataFrame
-        price_data = {}
-        for symbol in symbols:
-            if symbol in self.price_history:
-                price_data[symbol] = self.price_history[symbol]
+            symbols = self.engine.symbols
+        symbols = [symbol for symbol in symbols if symbol in self.engine.index]
         
-        if len(price_data) < 2:
+        if len(symbols) < 2:
             logger.warning("Need at least 2 symbols for correlation calculation")
             return pd.DataFrame()
         
-        # Create aligned DataFrame and calculate returns
-        df = pd.DataFrame(price_data)
-        df = df.fillna(method='ffill').fillna(method='bfill')
-        returns = df.pct_change().dropna()
+        correlation_df = self.engine.correlation_frame(symbols)
         
-        # Calculate correlation matrix
-        correlation_df = returns.corr()
-        
-        # Cache results
-        self.correlation_matrix = correlation_df.to_dict()
-        self.last_update = datetime.now()
-        
-        logger.info(f"Updated correlation matrix for {len(symbols)} symbols")
+        # Keep the full matrix as a dict for get_correlation_report() callers
+        if self._matrix_stale:
+            self.correlation_matrix = self.engine.correlation_frame().to_dict()
+            self._matrix_stale = False
+            logger.debug(f"Refreshed correlation matrix for {len(self.engine.symbols)} symbols")
         return correlation_df
     
     def get_correlation(self, symbol1: str, symbol2: str) -> float:
@@ -116,14 +372,8 @@ class CorrelationAnalyzer:
         Returns:
             Correlation coefficient (-1 to 1)
         """
-        if not self.correlation_matrix:
-            self.calculate_correlation_matrix()
-        
-        try:
-            return self.correlation_matrix.get(symbol1, {}).get(symbol2, 0.0)
-        except Exception as e:
-            logger.warning(f"Error getting correlation for {symbol1}/{symbol2}: {e}")
-            return 0.0
+        self._sync_engine()
+        return self.engine.correlation(symbol1, symbol2)
     
     def calculate_portfolio_heat(
         self,
@@ -144,37 +394,27 @@ class CorrelationAnalyzer:
         if len(active_positions) <= 1:
             return 0.0, {}
         
-        total_heat = 0.0
-        breakdown = {}
+        self._sync_engine()
+        symbols = [pos['symbol'] for pos in active_positions]
+        risks = np.array([pos.get('risk_amount', 0.0) for pos in active_positions], dtype=np.float64)
+        corr = self.engine.correlation_matrix(symbols)
+        
+        # Pairwise heat for every pair above the diagonal
+        rows, cols = np.triu_indices(len(symbols), k=1)
+        pair_corr = corr[rows, cols]
+        pair_heat = risks[rows] * risks[cols] * pair_corr
+        
+        breakdown = {
+            f"{symbols[i]}/{symbols[j]}": {
+                'correlation': c,
+                'risk1': risks[i],
+                'risk2': risks[j],
+                'heat_contribution': h
+            }
+            for i, j, c, h in zip(rows.tolist(), cols.tolist(), pair_corr.tolist(), pair_heat.tolist())
+        }
         
-        # Calculate pairwise heat
-        for i, pos1 in enumerate(active_positions):
-            for j, pos2 in enumerate(active_positions):
-                if i >= j:  # Skip self and duplicate pairs
-                    continue
-                
-                symbol1 = pos1['symbol']
-                symbol2 = pos2['symbol']
-                risk1 = pos1.get('risk_amount', 0.0)
-                risk2 = pos2.get('risk_amount', 0.0)
-                
-                # Get correlation
-                corr = self.get_correlation(symbol1, symbol2)
-                
-                # Calculate heat contribution
-                pair_heat = risk1 * risk2 * corr
-                total_heat += pair_heat
-                
-                # Store in breakdown
-                pair_key = f"{symbol1}/{symbol2}"
-                breakdown[pair_key] = {
-                    'correlation': corr,
-                    'risk1': risk1,
-                    'risk2': risk2,
-                    'heat_contribution': pair_heat
-                }
-        
-        return total_heat, breakdown
+        return float(pair_heat.sum()), breakdown
     
     def check_new_position_allowed(
         self,
@@ -193,15 +433,12 @@ class CorrelationAnalyzer:
         Returns:
             Tuple of (allowed: bool, reason: str, projected_heat: float)
         """
-        # Calculate current heat (not used but good for logging)
-        _, _ = self.calculate_portfolio_heat(active_positions)
+        self._sync_engine()
         
-        # Calculate projected heat with new position
-        projected_positions = active_positions + [{
-            'symbol': new_symbol,
-            'risk_amount': new_risk
-        }]
-        projected_heat, _ = self.calculate_portfolio_heat(projected_positions)
+        # Calculate projected heat with new position (one quadratic form)
+        symbols = [pos['symbol'] for pos in active_positions] + [new_symbol]
+        risks = [pos.get('risk_amount', 0.0) for pos in active_positions] + [new_risk]
+        projected_heat = self.engine.portfolio_heat(symbols, risks)
         
         # Check against limit
         if projected_heat > self.max_portfolio_heat:
@@ -213,11 +450,12 @@ class CorrelationAnalyzer:
             return False, reason, projected_heat
         
         # Check individual correlations
-        high_corr_symbols = []
-        for pos in active_positions:
-            corr = self.get_correlation(new_symbol, pos['symbol'])
-            if abs(corr) > self.correlation_threshold:
-                high_corr_symbols.append(f"{pos['symbol']} ({corr:.2f})")
+        new_row = self.engine.correlation_matrix(symbols)[-1, :-1]
+        high_corr_symbols = [
+            f"{symbol} ({corr:.2f})"
+            for symbol, corr in zip(symbols[:-1], new_row.tolist())
+            if abs(corr) > self.correlation_threshold
+        ]
         
         if high_corr_symbols:
             warning = (
@@ -242,18 +480,9 @@ class CorrelationAnalyzer:
             return 1.0
         
         # Get average absolute correlation
-        correlations = []
-        for i, pos1 in enumerate(active_positions):
-            for j, pos2 in enumerate(active_positions):
-                if i >= j:
-                    continue
-                corr = self.get_correlation(pos1['symbol'], pos2['symbol'])
-                correlations.append(abs(corr))
-        
-        if not correlations:
-            return 1.0
-        
-        avg_correlation = np.mean(correlations)
+        self._sync_engine()
+        corr = self.engine.correlation_matrix([pos['symbol'] for pos in active_positions])
+        avg_correlation = np.abs(corr[np.triu_indices(len(corr), k=1)]).mean()
         
         # Convert to diversification score (inverse of correlation)
         diversification_score = 1.0 - avg_correlation
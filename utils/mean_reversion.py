@@ -266,43 +266,75 @@ class MeanReversionAnalyzer:
         upper_bb, middle_bb, lower_bb = self.calculate_bollinger_bands(df)
         zscore = self.calculate_zscore(df)
         
-        # Current values
-        current_price = df['close'].iloc[-1]
+        return self.analyze_price_extension_from_values(
+            df['close'].iloc[-1],
+            upper_bb.iloc[-1],
+            middle_bb.iloc[-1],
+            lower_bb.iloc[-1],
+            zscore.iloc[-1],
+            signal_direction
+        )
+    
+    def analyze_price_extension_from_values(
+        self,
+        current_price: float,
+        upper_band: float,
+        middle_band: float,
+        lower_band: float,
+        zscore: float,
+        signal_direction: str
+    ) -> Dict:
+        """
+        Build the price extension analysis from already computed indicators.
+        
+        Lets streaming callers (utils.streaming_indicators) pass the latest
+        band and z-score values instead of recomputing them over the frame.
+        
+        Args:
+            current_price: Current price
+            upper_band: Upper Bollinger Band as of the current candle
+            middle_band: Middle Bollinger Band as of the current candle
+            lower_band: Lower Bollinger Band as of the current candle
+            zscore: Z-score as of the current candle
+            signal_direction: 'BUY' or 'SELL'
+            
+        Returns:
+            Dict with complete analysis
+        """
         current_bb_position = self.calculate_bb_position(
             current_price,
-            upper_bb.iloc[-1],
-            lower_bb.iloc[-1]
+            upper_band,
+            lower_band
         )
-        current_zscore = zscore.iloc[-1]
         
         # Detect condition
         condition, severity = self.detect_extended_move(
             current_bb_position,
-            current_zscore
+            zscore
         )
         
         # Calculate adjustment
         multiplier, reasoning = self.calculate_position_adjustment(
             signal_direction,
             current_bb_position,
-            current_zscore
+            zscore
         )
         
         # Additional metrics
-        distance_to_upper = ((upper_bb.iloc[-1] - current_price) / current_price) * 100
-        distance_to_lower = ((current_price - lower_bb.iloc[-1]) / current_price) * 100
+        distance_to_upper = ((upper_band - current_price) / current_price) * 100
+        distance_to_lower = ((current_price - lower_band) / current_price) * 100
         
         return {
             'bb_position': current_bb_position,
-            'zscore': current_zscore,
+            'zscore': zscore,
             'condition': condition,
             'severity': severity,
             'position_multiplier': multiplier,
             'reasoning': reasoning,
             'bollinger_bands': {
-                'upper': upper_bb.iloc[-1],
-                'middle': middle_bb.iloc[-1],
-                'lower': lower_bb.iloc[-1],
+                'upper': upper_band,
+                'middle': middle_band,
+                'lower': lower_band,
                 'distance_to_upper_pct': distance_to_upper,
                 'distance_to_lower_pct': distance_to_lower
             },
@@ -0,0 +1,606 @@
+"""
+Async notification dispatcher with per-channel queues, rate limits and coalescing.
+
+Callers on the signal path only enqueue; a background event loop delivers
+over one persistent connection per channel (keep-alive HTTP session, open
+SMTP connection). Notifications of the same category that arrive within
+the coalescing window are merged into one digest, so a burst such as four
+symbols signalling in one scan cycle becomes a single message per channel.
+"""
+
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Deque, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# External dependencies with graceful degradation
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class NotificationError(Exception):
+    """A channel failed to deliver a notification"""
+
+
+@dataclass
+class Notification:
+    """Message queued for delivery"""
+    text: str
+    subject: str = ''
+    html: Optional[str] = None
+    category: str = 'general'        # Same-category notifications may be merged
+    recipient: Optional[str] = None  # Channel default when None
+    urgent: bool = False             # Sent without waiting out the coalescing window
+    created_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def digest(cls, notifications: List['Notification']) -> 'Notification':
+        """
+        Merge notifications of one category/recipient into a single message.
+
+        Args:
+            notifications: Notifications in arrival order
+
+        Returns:
+            Digest notification (the original when there is only one)
+        """
+        if len(notifications) == 1:
+            return notifications[0]
+
+        first = notifications[0]
+        count = len(notifications)
+        separator = "\n\n" + "─" * 20 + "\n\n"
+        html = None
+        if all(n.html for n in notifications):
+            html = "<hr>".join(n.html for n in notifications)
+
+        return cls(
+            text=f"📬 {count} notifications\n\n" + separator.join(n.text for n in notifications),
+            subject=f"{first.subject} (+{count - 1} more)" if first.subject else '',
+            html=html,
+            category=first.category,
+            recipient=first.recipient,
+            urgent=any(n.urgent for n in notifications),
+            created_at=first.created_at
+        )
+
+
+def coalesce(notifications: List[Notification]) -> List[Notification]:
+    """
+    Group a batch by category and recipient, one digest per group.
+
+    Args:
+        notifications: Batch in arrival order
+
+    Returns:
+        Messages to send, ordered by each group's first arrival
+    """
+    groups: Dict[tuple, List[Notification]] = {}
+    for notification in notifications:
+        groups.setdefault((notification.category, notification.recipient), []).append(notification)
+    return [Notification.digest(group) for group in groups.values()]
+
+
+def truncate(text: str, max_length: Optional[int]) -> str:
+    """Cut text to a channel's message size limit."""
+    if max_length is None or len(text) <= max_length:
+        return text
+    return text[:max_length - 1] + "…"
+
+
+class RateLimiter:
+    """Token bucket: `rate` sends per `per` seconds with bursts up to `rate`."""
+
+    def __init__(self, rate: float, per: float = 1.0):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Sends allowed per period
+            per: Period length in seconds
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+        self.capacity = rate
+        self.fill_rate = rate / per
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Wait for a token."""
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+            self._refill()
+        self.tokens -= 1
+
+
+class NotificationChannel:
+    """
+    Delivery channel with a persistent connection.
+
+    Subclasses implement send(); open() and close() run on the dispatcher
+    loop around the channel's lifetime.
+    """
+
+    name = 'channel'
+    max_length: Optional[int] = None
+
+    def __init__(self, rate: float = 1.0, per: float = 1.0, name: Optional[str] = None):
+        """
+        Initialize channel.
+
+        Args:
+            rate: Messages allowed per period
+            per: Rate limit period in seconds
+            name: Channel name (class default if None)
+        """
+        if name:
+            self.name = name
+        self.limiter = RateLimiter(rate, per)
+
+    async def open(self):
+        """Open the persistent connection."""
+
+    async def send(self, notification: Notification):
+        """Deliver one message, raising NotificationError on failure."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Close the persistent connection."""
+
+
+class HTTPChannel(NotificationChannel):
+    """Channel posting to an HTTP API over one keep-alive session."""
+
+    expected_status = (200,)
+
+    def __init__(self, timeout: float = 10.0, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout
+        self.session = None
+
+    async def open(self):
+        if aiohttp is None:
+            raise NotificationError("aiohttp is required for HTTP notification channels")
+        if self.session is None or self.session.closed:
+            # One connection per channel, kept alive between sends
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=1, keepalive_timeout=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def _post(self, url: str, **kwargs):
+        await self.open()
+        async with self.session.post(url, **kwargs) as response:
+            if response.status not in self.expected_status:
+                body = await response.text()
+                raise NotificationError(f"{self.name} returned {response.status}: {body[:200]}")
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class DiscordChannel(HTTPChannel):
+    """Discord webhook."""
+
+    name = 'discord'
+    max_length = 2000
+    expected_status = (200, 204)
+
+    def __init__(self, webhook_url: str, username: str = "Crypto Trading Bot", **kwargs):
+        kwargs.setdefault('rate', 5)
+        kwargs.setdefault('per', 2.0)  # Discord webhook limit: 5 requests / 2s
+        super().__init__(**kwargs)
+        self.webhook_url = webhook_url
+        self.username = username
+
+    async def send(self, notification: Notification):
+        await self._post(self.webhook_url, json={
+            "content": truncate(notification.text, self.max_length),
+            "username": self.username
+        })
+
+
+class TelegramChannel(HTTPChannel):
+    """Telegram bot sendMessage."""
+
+    name = 'telegram'
+    max_length = 4096
+
+    def __init__(self, token: str, chat_id: str, api_url: str = "https://api.telegram.org", **kwargs):
+        kwargs.setdefault('rate', 1)  # Telegram: about one message per second per chat
+        super().__init__(**kwargs)
+        self.url = f"{api_url}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+
+    async def send(self, notification: Notification):
+        await self._post(self.url, json={
+            "chat_id": notification.recipient or self.chat_id,
+            "text": truncate(notification.text, self.max_length),
+            "parse_mode": "Markdown"
+        })
+
+
+class TwilioSMSChannel(HTTPChannel):
+    """Twilio SMS."""
+
+    name = 'sms'
+    max_length = 1600
+    expected_status = (201,)
+
+    def __init__(self, account_sid: str, auth_token: str, from_number: str,
+                 to_number: Optional[str] = None, api_url: str = "https://api.twilio.com", **kwargs):
+        kwargs.setdefault('rate', 1)
+        super().__init__(**kwargs)
+        self.url = f"{api_url}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.auth = (account_sid, auth_token)
+        self.from_number = from_number
+        self.to_number = to_number
+
+    async def send(self, notification: Notification):
+        to_number = notification.recipient or self.to_number
+        if not to_number:
+            raise NotificationError("No SMS recipient")
+        await self._post(self.url, auth=aiohttp.BasicAuth(*self.auth), data={
+            'From': self.from_number,
+            'To': to_number,
+            'Body': truncate(notification.text, self.max_length)
+        })
+
+
+class SMTPChannel(NotificationChannel):
+    """
+    Email over one SMTP connection kept open between messages.
+
+    smtplib is blocking, so the connection lives on a dedicated worker
+    thread; the dispatcher loop only awaits it. A connection idle for
+    longer than `idle_check` is probed with NOOP and reopened if the
+    server dropped it.
+    """
+
+    name = 'email'
+
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None,
+                 password: Optional[str] = None, from_addr: Optional[str] = None,
+                 to_addrs: Optional[List[str]] = None, starttls: bool = True,
+                 timeout: float = 10.0, idle_check: float = 60.0, **kwargs):
+        kwargs.setdefault('rate', 2)
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.from_addr = from_addr or username
+        self.to_addrs = to_addrs or ([self.from_addr] if self.from_addr else [])
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_check = idle_check
+
+        self.connections_opened = 0
+        self._smtp = None
+        self._last_used = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'smtp-{host}')
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username and self.password:
+            smtp.login(self.username, self.password)
+        self._smtp = smtp
+        self.connections_opened += 1
+
+    def _disconnect(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def _ensure_connected(self):
+        if self._smtp is not None and time.monotonic() - self._last_used > self.idle_check:
+            try:
+                if self._smtp.noop()[0] != 250:
+                    self._disconnect()
+            except (smtplib.SMTPException, OSError):
+                self._smtp = None
+        if self._smtp is None:
+            self._connect()
+
+    def _build_message(self, notification: Notification, recipients: List[str]):
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self.from_addr
+        msg['To'] = ', '.join(recipients)
+        msg['Subject'] = notification.subject or notification.category
+        msg.attach(MIMEText(notification.text, 'plain'))
+        if notification.html:
+            msg.attach(MIMEText(notification.html, 'html'))
+        return msg
+
+    def _send_blocking(self, notification: Notification):
+        recipients = [notification.recipient] if notification.recipient else self.to_addrs
+        if not recipients:
+            raise NotificationError("No email recipient")
+        msg = self._build_message(notification, recipients)
+
+        for attempt in range(2):
+            try:
+                self._ensure_connected()
+                self._smtp.send_message(msg, self.from_addr, recipients)
+                self._last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Server closed the kept-alive connection: reconnect once
+                self._smtp = None
+                if attempt:
+                    raise
+            except (smtplib.SMTPException, OSError) as e:
+                self._disconnect()
+                raise NotificationError(f"SMTP send failed: {e}") from e
+
+    async def send(self, notification: Notification):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._send_blocking, notification)
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._disconnect)
+        self._executor.shutdown(wait=False)
+
+
+class _ChannelMetrics:
+    """Counters and recent latencies of one channel"""
+
+    def __init__(self, window: int = 1000):
+        self.submitted = 0
+        self.delivered = 0    # Notifications delivered (digest members count individually)
+        self.messages = 0     # Messages actually sent
+        self.coalesced = 0    # Notifications merged into another message
+        self.failed = 0
+        self.dropped = 0      # Rejected because the queue was full
+        self.latencies: Deque[float] = deque(maxlen=window)   # Enqueue -> delivered, seconds
+        self.send_times: Deque[float] = deque(maxlen=window)  # Duration of the send call, seconds
+
+    @staticmethod
+    def _percentiles(values: Deque[float]) -> Dict:
+        if not values:
+            return {'p50_ms': None, 'p95_ms': None, 'max_ms': None}
+        array = np.fromiter(values, dtype=np.float64) * 1000
+        return {
+            'p50_ms': round(float(np.percentile(array, 50)), 2),
+            'p95_ms': round(float(np.percentile(array, 95)), 2),
+            'max_ms': round(float(array.max()), 2)
+        }
+
+    def as_dict(self, queue_depth: int) -> Dict:
+        return {
+            'queue_depth': queue_depth,
+            'submitted': self.submitted,
+            'delivered': self.delivered,
+            'messages_sent': self.messages,
+            'coalesced': self.coalesced,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'latency': self._percentiles(self.latencies),
+            'send_time': self._percentiles(self.send_times)
+        }
+
+
+class NotificationDispatcher:
+    """
+    Bounded-queue notification delivery on a background event loop.
+
+    submit() is thread-safe and never blocks: it rejects (and counts) a
+    notification when the channel's queue is full. Each channel has one
+    worker that takes everything queued within `coalesce_window`, merges
+    it per category, waits for its rate limiter and sends.
+    """
+
+    def __init__(self, channels: Iterable[NotificationChannel] = (), max_queue: int = 1000,
+                 coalesce_window: float = 1.0, max_batch: int = 50):
+        """
+        Initialize dispatcher.
+
+        Args:
+            channels: Delivery channels (names must be unique)
+            max_queue: Most notifications waiting per channel
+            coalesce_window: Seconds a notification waits for others to merge with
+            max_batch: Most notifications taken into one batch
+        """
+        self.logger = logging.getLogger(__name__)
+        self.channels: Dict[str, NotificationChannel] = {}
+        self.max_queue = max_queue
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+
+        self._metrics: Dict[str, _ChannelMetrics] = {}
+        self._depth: Dict[str, int] = {}
+        self._idle = threading.Condition()
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        for channel in channels:
+            self.add_channel(channel)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_channel(self, channel: NotificationChannel):
+        """Register a channel (before start())."""
+        if self.running:
+            raise RuntimeError("Channels must be added before the dispatcher starts")
+        if channel.name in self.channels:
+            raise ValueError(f"Duplicate notification channel: {channel.name}")
+        self.channels[channel.name] = channel
+        self._metrics[channel.name] = _ChannelMetrics()
+        self._depth[channel.name] = 0
+
+    def start(self):
+        """Start the delivery loop thread."""
+        if self.running:
+            return
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(started,),
+                                        name='notification-dispatcher', daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def _run_loop(self, started: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        for name, channel in self.channels.items():
+            self._queues[name] = asyncio.Queue()
+            self._workers.append(loop.create_task(self._worker(channel, self._queues[name])))
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def submit(self, notification: Notification, channels: Optional[Iterable[str]] = None) -> int:
+        """
+        Queue a notification for delivery (any thread, never blocks).
+
+        Args:
+            notification: Message to deliver
+            channels: Channel names (all if None)
+
+        Returns:
+            Number of channels that accepted it
+        """
+        if not self.running:
+            self.start()
+
+        accepted = 0
+        for name in (self.channels if channels is None else channels):
+            if name not in self.channels:
+                continue
+            metrics = self._metrics[name]
+            with self._idle:
+                if self._depth[name] >= self.max_queue:
+                    metrics.dropped += 1
+                    self.logger.warning(f"Notification queue for {name} full, dropping {notification.category}")
+                    continue
+                self._depth[name] += 1
+                metrics.submitted += 1
+            self._loop.call_soon_threadsafe(self._queues[name].put_nowait, notification)
+            accepted += 1
+        return accepted
+
+    async def _collect(self, queue: asyncio.Queue) -> List[Notification]:
+        """Take the next batch: the first notification plus whatever arrives in the window."""
+        batch = [await queue.get()]
+        deadline = self._loop.time() + self.coalesce_window
+        while len(batch) < self.max_batch and not batch[-1].urgent:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        while len(batch) < self.max_batch and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def _worker(self, channel: NotificationChannel, queue: asyncio.Queue):
+        metrics = self._metrics[channel.name]
+        try:
+            await channel.open()
+        except Exception as e:
+            self.logger.error(f"Could not open {channel.name} notification channel: {e}")
+
+        while True:
+            batch = await self._collect(queue)
+            messages = coalesce(batch)
+            metrics.coalesced += len(batch) - len(messages)
+            members = {}
+            for notification in batch:
+                members.setdefault((notification.category, notification.recipient), []).append(notification)
+
+            for message in messages:
+                group = members[(message.category, message.recipient)]
+                await channel.limiter.acquire()
+                started = time.monotonic()
+                try:
+                    await channel.send(message)
+                except Exception as e:
+                    metrics.failed += len(group)
+                    self.logger.error(f"Error sending {channel.name} notification: {e}")
+                    continue
+                finished = time.monotonic()
+                metrics.messages += 1
+                metrics.delivered += len(group)
+                metrics.send_times.append(finished - started)
+                metrics.latencies.extend(finished - n.created_at for n in group)
+
+            with self._idle:
+                self._depth[channel.name] -= len(batch)
+                self._idle.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued notification was sent or failed.
+
+        Returns:
+            True if all queues drained within the timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not any(self._depth.values()), timeout)
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Deliver what is queued, close the channel connections and stop the loop."""
+        if not self.running:
+            return
+        self.flush(timeout)
+
+        async def shutdown():
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            for channel in self.channels.values():
+                try:
+                    await channel.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing {channel.name} channel: {e}")
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._workers = []
+        self._queues = {}
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """
+        Queue depth, delivery counters and latency percentiles per channel.
+
+        Returns:
+            Dict of channel name -> metrics
+        """
+        with self._idle:
+            depths = dict(self._depth)
+        return {name: metrics.as_dict(depths[name]) for name, metrics in self._metrics.items()}
@@ -1,6 +1,7 @@
 """
 Secure notification system for trading alerts and updates.
 Supports Discord, Telegram, and Email notifications with rate limiting.
+Alerts are queued on a NotificationDispatcher so callers never wait on the network.
 """
 
 import os
@@ -25,14 +26,24 @@ try:
 except ImportError:
     EMAIL_AVAILABLE = False
 
+from utils.notification_dispatcher import (
+    DiscordChannel, Notification, NotificationDispatcher, SMTPChannel, TelegramChannel, aiohttp
+)
+
 
 class NotificationManager:
     """
     Manages secure notifications for trading events with rate limiting.
     """
     
-    def __init__(self):
-        """Initialize notification manager with environment configuration."""
+    def __init__(self, dispatcher: Optional[NotificationDispatcher] = None, use_dispatcher: bool = True):
+        """
+        Initialize notification manager with environment configuration.
+        
+        Args:
+            dispatcher: Dispatcher to queue alerts on (built from the configuration if None)
+            use_dispatcher: Queue alerts in the background; False sends inline
+        """
         self.logger = logging.getLogger(__name__)
         
         # Rate limiting (prevent spam)
@@ -41,6 +52,10 @@ class NotificationManager:
         
         # Load configuration
         self._load_config()
+        
+        if dispatcher is None and use_dispatcher:
+            dispatcher = self._build_dispatcher()
+        self.dispatcher = dispatcher
     
     def _load_config(self) -> None:
         """Load notification configuration from environment."""
@@ -62,6 +77,65 @@ class NotificationManager:
         self.enable_telegram = bool(self.telegram_token and self.telegram_chat_id)
         self.enable_email = bool(self.email_address and self.email_password and EMAIL_AVAILABLE)
     
+    def _build_dispatcher(self) -> Optional[NotificationDispatcher]:
+        """Create a dispatcher with a channel for each enabled service."""
+        channels = []
+        if aiohttp is not None:
+            if self.enable_discord:
+                channels.append(DiscordChannel(self.discord_webhook))
+            if self.enable_telegram:
+                channels.append(TelegramChannel(self.telegram_token, self.telegram_chat_id))
+        if self.enable_email:
+            channels.append(SMTPChannel(self.email_server, self.email_port, self.email_address,
+                                        self.email_password, to_addrs=[self.email_address]))
+        # Channels without a dispatcher channel (no aiohttp) fall back to inline sends
+        return NotificationDispatcher(channels) if channels else None
+    
+    def _deliver(self, message: str, channels: List[str], category: str,
+                 subject: str = '', urgent: bool = False) -> bool:
+        """
+        Queue a message on the dispatcher, or send it inline without one.
+        
+        Args:
+            message: Message text
+            channels: Target channel names ('discord', 'telegram', 'email')
+            category: Category used to merge bursts into one digest
+            subject: Email subject
+            urgent: Send without waiting out the coalescing window
+            
+        Returns:
+            True if at least one channel queued or sent the message
+        """
+        success_count = 0
+        queued = set()
+        if self.dispatcher is not None:
+            queued = {name for name in channels if name in self.dispatcher.channels}
+            if queued:
+                notification = Notification(message, subject=subject, category=category, urgent=urgent)
+                success_count += self.dispatcher.submit(notification, queued)
+        
+        senders = {
+            'discord': lambda: self._send_discord_message(message),
+            'telegram': lambda: self._send_telegram_message(message),
+            'email': lambda: self._send_email(subject, message)
+        }
+        for name in channels:
+            if name not in queued and senders[name]():
+                success_count += 1
+        
+        return success_count > 0
+    
+    def _enabled_channels(self, email: bool = False) -> List[str]:
+        """Names of the enabled channels, email only when requested."""
+        channels = []
+        if self.enable_discord:
+            channels.append('discord')
+        if self.enable_telegram:
+            channels.append('telegram')
+        if email and self.enable_email:
+            channels.append('email')
+        return channels
+    
     def _should_send_notification(self, notification_type: str) -> bool:
         """
         Check if notification should be sent based on rate limiting.
@@ -94,7 +168,7 @@ class NotificationManager:
             urgent: Whether to bypass rate limiting
             
         Returns:
-            True if at least one notification was sent successfully
+            True if at least one notification was queued or sent
         """
         notification_key = f"trade_{alert_type}_{symbol}"
         
@@ -114,25 +188,9 @@ Time: {timestamp}
 {message}
         """.strip()
         
-        success_count = 0
-        
-        # Send to Discord
-        if self.enable_discord:
-            if self._send_discord_message(formatted_message):
-                success_count += 1
-        
-        # Send to Telegram
-        if self.enable_telegram:
-            if self._send_telegram_message(formatted_message):
-                success_count += 1
-        
-        # Send email for urgent alerts
-        if urgent and self.enable_email:
-            subject = f"URGENT: {alert_type} Alert for {symbol}"
-            if self._send_email(subject, formatted_message):
-                success_count += 1
-        
-        return success_count > 0
+        # Email only for urgent alerts
+        return self._deliver(formatted_message, self._enabled_channels(email=urgent), 'trade_alert',
+                             subject=f"URGENT: {alert_type} Alert for {symbol}", urgent=urgent)
     
     def send_system_alert(self, alert_type: str, message: str, urgent: bool = True) -> bool:
         """
@@ -144,7 +202,7 @@ Time: {timestamp}
             urgent: Whether to bypass rate limiting
             
         Returns:
-            True if at least one notification was sent successfully
+            True if at least one notification was queued or sent
         """
         notification_key = f"system_{alert_type}"
         
@@ -162,23 +220,9 @@ Time: {timestamp}
 {message}
         """.strip()
         
-        success_count = 0
-        
         # Send to all enabled channels for system alerts
-        if self.enable_discord:
-            if self._send_discord_message(formatted_message):
-                success_count += 1
-        
-        if self.enable_telegram:
-            if self._send_telegram_message(formatted_message):
-                success_count += 1
-        
-        if urgent and self.enable_email:
-            subject = f"System {alert_type}: Trading Algorithm"
-            if self._send_email(subject, formatted_message):
-                success_count += 1
-        
-        return success_count > 0
+        return self._deliver(formatted_message, self._enabled_channels(email=urgent), f"system_{alert_type}",
+                             subject=f"System {alert_type}: Trading Algorithm", urgent=urgent)
     
     def send_performance_report(self, report_data: Dict) -> bool:
         """
@@ -188,7 +232,7 @@ Time: {timestamp}
             report_data: Dictionary containing performance metrics
             
         Returns:
-            True if at least one notification was sent successfully
+            True if at least one notification was queued or sent
         """
         if not self._should_send_notification("performance_report"):
             return False
@@ -209,17 +253,7 @@ Time: {timestamp}
 Risk Level: {report_data.get('risk_level', 'UNKNOWN')}
         """.strip()
         
-        success_count = 0
-        
-        if self.enable_discord:
-            if self._send_discord_message(message):
-                success_count += 1
-        
-        if self.enable_telegram:
-            if self._send_telegram_message(message):
-                success_count += 1
-        
-        return success_count > 0
+        return self._deliver(message, self._enabled_channels(), 'performance_report')
     
     def _send_discord_message(self, message: str) -> bool:
         """Send message to Discord webhook."""
@@ -326,6 +360,15 @@ Risk Level: {report_data.get('risk_level', 'UNKNOWN')}
             results['email'] = self._send_email("Test Notification", test_message)
         
         return results
+    
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Queue depth, delivery counters and latencies per dispatcher channel."""
+        return self.dispatcher.get_metrics() if self.dispatcher is not None else {}
+    
+    def close(self, timeout: float = 10.0) -> None:
+        """Deliver queued notifications and close channel connections."""
+        if self.dispatcher is not None:
+            self.dispatcher.stop(timeout)
 
 
 # Global notification manager instance
@@ -0,0 +1,533 @@
+"""
+Streaming Indicator Kernels
+===========================
+
+Constant-time-per-bar versions of the indicators VolatilityAnalyzer and
+MeanReversionAnalyzer compute with pandas over the whole frame:
+
+- EMA: pandas ewm(adjust=False).mean(), same recursion
+- ATR: true range smoothed by EMA (span, as calculate_atr) or Wilder's 1/period
+- RollingStats: sliding Welford mean/sample std (rolling(window).mean()/.std())
+- RollingExtrema: rolling min/max from monotonic deques
+
+IndicatorState composes them for one symbol/timeframe and StreamingIndicators
+keeps one state per (symbol, timeframe); its sync() brings a stream up to date
+from a frame that is re-fetched every cycle, replaying only the new candles.
+compute_indicators() replays the same kernels over a whole DataFrame, so
+backtests get exactly the values the live stream would have produced.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Fallback of VolatilityAnalyzer.calculate_normalized_volatility below `lookback` candles
+DEFAULT_VOLATILITY = 0.03
+
+COLUMNS = ('atr', 'volatility', 'bb_upper', 'bb_middle', 'bb_lower', 'zscore', 'range_high', 'range_low')
+
+
+def _copy_slots(kernel):
+    """Shallow copy of a __slots__ kernel with its deques duplicated"""
+    clone = object.__new__(type(kernel))
+    for name in type(kernel).__slots__:
+        value = getattr(kernel, name)
+        setattr(clone, name, value.copy() if isinstance(value, deque) else value)
+    return clone
+
+
+class EMA:
+    """
+    Exponential moving average, matching pandas ewm(adjust=False).mean().
+
+    Missing values (NaN) hold the average and age its weight like pandas
+    does with ignore_na=False.
+    """
+
+    __slots__ = ('alpha', 'value', '_old_wt')
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None):
+        if alpha is None:
+            if span is None or span < 1:
+                raise ValueError("span must be at least 1")
+            alpha = 2.0 / (span + 1.0)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.value = math.nan
+        self._old_wt = 1.0
+
+    def update(self, x: float) -> float:
+        value = self.value
+        if value == value:
+            self._old_wt *= 1.0 - self.alpha
+            if x == x:
+                if value != x:
+                    value = (self._old_wt * value + self.alpha * x) / (self._old_wt + self.alpha)
+                self._old_wt = 1.0
+        elif x == x:
+            value = float(x)
+        self.value = value
+        return value
+
+    def copy(self) -> 'EMA':
+        return _copy_slots(self)
+
+
+class ATR:
+    """
+    Average True Range.
+
+    The default smoothing is EMA with span=period, as in
+    VolatilityAnalyzer.calculate_atr; wilder=True uses Wilder's RMA
+    (alpha = 1/period) instead.
+    """
+
+    __slots__ = ('period', '_ema', '_prev_close')
+
+    def __init__(self, period: int = 14, wilder: bool = False):
+        self.period = period
+        self._ema = EMA(alpha=1.0 / period) if wilder else EMA(span=period)
+        self._prev_close = math.nan
+
+    @property
+    def value(self) -> float:
+        return self._ema.value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close = self._prev_close
+        self._prev_close = close
+        # Max of the three components, skipping missing ones like DataFrame.max(axis=1)
+        tr = math.nan
+        for component in (high - low, abs(high - prev_close), abs(low - prev_close)):
+            if component == component and not component <= tr:
+                tr = component
+        return self._ema.update(tr)
+
+    def copy(self) -> 'ATR':
+        clone = _copy_slots(self)
+        clone._ema = self._ema.copy()
+        return clone
+
+
+class RollingStats:
+    """
+    Rolling mean and sample standard deviation (ddof=1) of the last `window` values.
+
+    Sliding Welford updates (add the new value, remove the evicted one), with
+    the sums rebuilt from the buffer every `window` values to bound float
+    drift. Like pandas rolling, NaNs are skipped, results are NaN below
+    `min_periods` valid values and a window of identical values has exactly
+    zero deviation.
+    """
+
+    __slots__ = ('window', 'min_periods', '_values', '_count', '_mean', '_m2',
+                 '_last', '_same_run', '_since_rebuild')
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values = deque(maxlen=window)
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._last = math.nan       # Last valid value
+        self._same_run = 0          # Consecutive valid values equal to it
+        self._since_rebuild = 0
+
+    def update(self, x: float) -> Tuple[float, float]:
+        """Push a value and return (mean, std)"""
+        x = float(x)
+        if len(self._values) == self.window:
+            old = self._values[0]
+            if old == old:
+                self._remove(old)
+        self._values.append(x)
+
+        if x == x:
+            self._add(x)
+            self._same_run = self._same_run + 1 if x == self._last else 1
+            self._last = x
+
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+        return self.mean, self.std
+
+    def _add(self, x: float):
+        self._count += 1
+        delta = x - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x: float):
+        self._count -= 1
+        if self._count == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (x - self._mean)
+
+    def _rebuild(self):
+        """Recompute mean and M2 exactly from the buffer"""
+        self._since_rebuild = 0
+        valid = [v for v in self._values if v == v]
+        if not valid:
+            self._mean = self._m2 = 0.0
+            return
+        self._mean = math.fsum(valid) / len(valid)
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in valid)
+
+    def copy(self) -> 'RollingStats':
+        return _copy_slots(self)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        if self._count == 0 or self._count < self.min_periods:
+            return math.nan
+        return self._last if self._same_run >= self._count else self._mean
+
+    @property
+    def std(self) -> float:
+        if self._count < 2 or self._count < self.min_periods:
+            return math.nan
+        if self._same_run >= self._count:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self._count - 1))
+
+
+class RollingExtrema:
+    """
+    Rolling min and max of the last `window` values from monotonic deques.
+
+    Each value enters and leaves each deque once, so updates are amortized
+    O(1). NaNs are skipped; results are NaN below `min_periods` valid values.
+    """
+
+    __slots__ = ('window', 'min_periods', '_index', '_valid', '_count', '_max', '_min')
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._index = 0
+        self._valid = deque(maxlen=window)
+        self._count = 0
+        self._max = deque()     # (index, value), values decreasing
+        self._min = deque()     # (index, value), values increasing
+
+    def update(self, x: float) -> Tuple[float, float]:
+        """Push a value and return (min, max)"""
+        x = float(x)
+        index = self._index
+        self._index += 1
+
+        if len(self._valid) == self.window and self._valid[0]:
+            self._count -= 1
+        valid = x == x
+        self._valid.append(valid)
+
+        expired = index - self.window
+        if self._max and self._max[0][0] <= expired:
+            self._max.popleft()
+        if self._min and self._min[0][0] <= expired:
+            self._min.popleft()
+
+        if valid:
+            self._count += 1
+            while self._max and self._max[-1][1] <= x:
+                self._max.pop()
+            self._max.append((index, x))
+            while self._min and self._min[-1][1] >= x:
+                self._min.pop()
+            self._min.append((index, x))
+        return self.min, self.max
+
+    def copy(self) -> 'RollingExtrema':
+        return _copy_slots(self)
+
+    @property
+    def min(self) -> float:
+        if self._count == 0 or self._count < self.min_periods:
+            return math.nan
+        return self._min[0][1]
+
+    @property
+    def max(self) -> float:
+        if self._count == 0 or self._count < self.min_periods:
+            return math.nan
+        return self._max[0][1]
+
+
+def _zscore(close: float, mean: float, std: float) -> float:
+    """(close - mean) / std with calculate_zscore's fillna(0) semantics"""
+    if std == 0:
+        diff = close - mean
+        return 0.0 if diff == 0 or diff != diff else math.copysign(math.inf, diff)
+    zscore = (close - mean) / std
+    return zscore if zscore == zscore else 0.0
+
+
+class IndicatorState:
+    """
+    Volatility and mean-reversion indicators for one symbol/timeframe.
+
+    Defaults match VolatilityAnalyzer and MeanReversionAnalyzer, and each
+    value equals what those analyzers compute over the full history up to
+    the same candle:
+    - atr: calculate_atr(df, atr_period)
+    - volatility: calculate_normalized_volatility(df, volatility_lookback)
+    - bb_upper/bb_middle/bb_lower: calculate_bollinger_bands(df)
+    - zscore: calculate_zscore(df)
+    - range_high/range_low: rolling high/low over range_period candles
+    """
+
+    def __init__(
+        self,
+        atr_period: int = 14,
+        bb_period: int = 20,
+        bb_std: float = 2.0,
+        zscore_period: int = 50,
+        volatility_lookback: int = 20,
+        range_period: int = 20,
+        wilder: bool = False
+    ):
+        self.bb_std = bb_std
+        self.volatility_lookback = volatility_lookback
+        self.atr = ATR(atr_period, wilder=wilder)
+        self.bands = RollingStats(bb_period)
+        self.zscore_stats = RollingStats(zscore_period)
+        self.returns = RollingStats(volatility_lookback, min_periods=2)  # Series.std() needs 2 values
+        self.range_high = RollingExtrema(range_period)
+        self.range_low = RollingExtrema(range_period)
+        self.bars = 0
+        self.close = math.nan
+        self.values: Dict[str, float] = dict.fromkeys(COLUMNS, math.nan)
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        """
+        Add a closed candle.
+
+        Returns:
+            Dict of indicator values as of this candle (keys: COLUMNS)
+        """
+        high, low, close = float(high), float(low), float(close)
+        prev_close = self.close
+        self.bars += 1
+        self.close = close
+
+        atr = self.atr.update(high, low, close)
+
+        # pct_change(): first candle and zero prices give no return
+        ret = close / prev_close - 1.0 if prev_close == prev_close and prev_close != 0 else math.nan
+        _, returns_std = self.returns.update(ret)
+        volatility = DEFAULT_VOLATILITY if self.bars < self.volatility_lookback else returns_std * np.sqrt(365)
+
+        middle, std = self.bands.update(close)
+        z_mean, z_std = self.zscore_stats.update(close)
+
+        values = self.values
+        values['atr'] = atr
+        values['volatility'] = float(volatility)
+        values['bb_upper'] = middle + (self.bb_std * std)
+        values['bb_middle'] = middle
+        values['bb_lower'] = middle - (self.bb_std * std)
+        values['zscore'] = _zscore(close, z_mean, z_std)
+        values['range_high'] = self.range_high.update(high)[1]
+        values['range_low'] = self.range_low.update(low)[0]
+        return dict(values)
+
+    def copy(self) -> 'IndicatorState':
+        """Independent copy (O(window)), e.g. to evaluate candles that are still forming"""
+        clone = object.__new__(IndicatorState)
+        clone.__dict__.update(self.__dict__)
+        for name in ('atr', 'bands', 'zscore_stats', 'returns', 'range_high', 'range_low'):
+            setattr(clone, name, getattr(self, name).copy())
+        clone.values = dict(self.values)
+        return clone
+
+
+class StreamingIndicators:
+    """
+    IndicatorState per (symbol, timeframe).
+
+    Feed closed candles with update(); candles whose timestamp is not newer
+    than the last one seen for that stream (re-polled or duplicate candles)
+    are ignored.
+    """
+
+    def __init__(self, **params):
+        """
+        Initialize the indicator registry.
+
+        Args:
+            **params: IndicatorState parameters shared by every stream
+        """
+        self.params = params
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._last_time: Dict[Tuple[str, str], pd.Timestamp] = {}
+        self._latest: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    @classmethod
+    def for_analyzers(cls, volatility_analyzer=None, mean_reversion_analyzer=None, **params) -> 'StreamingIndicators':
+        """Registry using the periods configured on existing analyzers"""
+        if volatility_analyzer is not None:
+            params.setdefault('atr_period', volatility_analyzer.atr_period)
+        if mean_reversion_analyzer is not None:
+            params.setdefault('bb_period', mean_reversion_analyzer.bb_period)
+            params.setdefault('bb_std', mean_reversion_analyzer.bb_std)
+            params.setdefault('zscore_period', mean_reversion_analyzer.zscore_period)
+        return cls(**params)
+
+    def state(self, symbol: str, timeframe: str) -> IndicatorState:
+        key = (symbol, timeframe)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = IndicatorState(**self.params)
+        return state
+
+    def update(self, symbol: str, timeframe: str, candle: Mapping) -> Dict[str, float]:
+        """
+        Add a closed candle to a stream.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe (e.g. '15m')
+            candle: Mapping with 'high', 'low', 'close' and optionally 'timestamp'
+
+        Returns:
+            Indicator values as of the stream's latest candle
+        """
+        key = (symbol, timeframe)
+        timestamp = candle.get('timestamp')
+        if timestamp is not None:
+            timestamp = pd.Timestamp(timestamp)
+            last = self._last_time.get(key)
+            if last is not None and timestamp <= last:
+                return dict(self._latest[key])
+            self._last_time[key] = timestamp
+
+        values = self.state(symbol, timeframe).update(candle['high'], candle['low'], candle['close'])
+        self._latest[key] = values
+        return dict(values)
+
+    def seed(self, symbol: str, timeframe: str, df: pd.DataFrame) -> Optional[Dict[str, float]]:
+        """
+        Reset a stream and replay historical candles.
+
+        Args:
+            df: DataFrame with 'high', 'low', 'close' columns, oldest first;
+                a DatetimeIndex sets the stream's last timestamp
+        """
+        self.reset(symbol, timeframe)
+        if df.empty:
+            return None
+        state = self.state(symbol, timeframe)
+        for high, low, close in zip(df['high'].to_numpy(float), df['low'].to_numpy(float),
+                                    df['close'].to_numpy(float)):
+            values = state.update(high, low, close)
+        key = (symbol, timeframe)
+        self._latest[key] = values
+        if isinstance(df.index, pd.DatetimeIndex):
+            self._last_time[key] = df.index[-1]
+        return dict(values)
+
+    def sync(self, symbol: str, timeframe: str, df: pd.DataFrame,
+             final_until: Optional[pd.Timestamp] = None) -> Optional[Dict[str, float]]:
+        """
+        Indicator values as of the last candle of a frame, updating the stream from it.
+
+        For callers that re-fetch a rolling frame every cycle. Candles up to
+        `final_until` (default: all but the last) are committed; only those
+        newer than the stream's last candle are replayed, and the stream is
+        reseeded when the frame no longer contains that candle. Later candles
+        are still forming: they are evaluated on a copy of the state, so the
+        next call sees their revised values.
+
+        Args:
+            df: DataFrame with 'high', 'low', 'close' columns and a DatetimeIndex, oldest first
+            final_until: Timestamp of the last candle that will not change
+
+        Returns:
+            Indicator values as of df's last row, or None for an empty frame
+        """
+        if df.empty:
+            return None
+        key = (symbol, timeframe)
+        index = df.index
+        n_final = len(df) - 1 if final_until is None else int(index.searchsorted(final_until, side='right'))
+
+        start = 0
+        last = self._last_time.get(key)
+        if last is not None and key in self._states:
+            pos = int(index.searchsorted(last))
+            if pos < n_final and index[pos] == last:
+                start = pos + 1
+            else:
+                self.reset(symbol, timeframe)
+        else:
+            self.reset(symbol, timeframe)
+
+        state = self.state(symbol, timeframe)
+        rows = np.column_stack([df[column].to_numpy(float)[start:] for column in ('high', 'low', 'close')])
+        committed = n_final - start
+        for high, low, close in rows[:committed]:
+            self._latest[key] = state.update(high, low, close)
+        if n_final > start:
+            self._last_time[key] = index[n_final - 1]
+        if committed >= len(rows):
+            return dict(self._latest[key])
+
+        forming = state.copy()
+        for high, low, close in rows[committed:]:
+            values = forming.update(high, low, close)
+        return values
+
+    def latest(self, symbol: str, timeframe: str) -> Optional[Dict[str, float]]:
+        values = self._latest.get((symbol, timeframe))
+        return dict(values) if values is not None else None
+
+    def reset(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """Drop the state of matching streams (all streams by default)"""
+        for key in list(self._states):
+            if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                self._states.pop(key)
+                self._last_time.pop(key, None)
+                self._latest.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+def compute_indicators(df: pd.DataFrame, **params) -> pd.DataFrame:
+    """
+    Batch mode: replay the streaming kernels over a whole OHLC DataFrame.
+
+    Every row equals what IndicatorState.update returned for that candle,
+    so a backtest sees the same numbers as the live stream.
+
+    Args:
+        df: DataFrame with 'high', 'low', 'close' columns
+        **params: IndicatorState parameters
+
+    Returns:
+        DataFrame with COLUMNS, indexed like df
+    """
+    state = IndicatorState(**params)
+    out = np.empty((len(df), len(COLUMNS)))
+    for i, (high, low, close) in enumerate(zip(df['high'].to_numpy(float), df['low'].to_numpy(float),
+                                               df['close'].to_numpy(float))):
+        values = state.update(high, low, close)
+        out[i] = [values[column] for column in COLUMNS]
+    return pd.DataFrame(out, index=df.index, columns=list(COLUMNS))
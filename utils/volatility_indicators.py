@@ -205,6 +205,26 @@ class VolatilityAnalyzer:
         # Calculate normalized volatility
         volatility = self.calculate_normalized_volatility(df)
         
+        return self.get_atr_analysis_from_values(current_atr, volatility, current_price)
+    
+    def get_atr_analysis_from_values(self, current_atr: float, volatility: float, current_price: float) -> Dict:
+        """
+        Build the ATR analysis from an already computed ATR and volatility.
+        
+        Lets backtests compute the ATR/volatility series once over the whole
+        history instead of once per signal.
+        
+        Args:
+            current_atr: ATR as of the current candle
+            volatility: Normalized volatility as of the current candle
+            current_price: Current price
+            
+        Returns:
+            Dict with ATR analysis results
+        """
+        if pd.isna(current_atr):
+            current_atr = current_price * 0.02
+        
         # Detect regime
         regime, stop_multiplier = self.detect_volatility_regime(volatility)
         